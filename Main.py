@@ -3,16 +3,18 @@
 统一的入口点，简化的架构
 """
 
+import time
+
+# 启动计时起点（尽量早，用于报告首帧时间）
+LAUNCH_TIME = time.perf_counter()
+
 import pygame
 import sys
 import os
 import traceback
 
-# 导入核心模块
+# 导入核心模块（登录/注册/主场景在首次切换时才导入）
 from game.core.scene_manager import SceneManager
-from game.scenes.login_scene import LoginScene
-from game.scenes.register_scene import RegisterScene
-from game.scenes.main_scene import MainScene
 from game.scenes.styles.theme import Theme
 from game.scenes.styles import fonts
 
@@ -245,19 +247,18 @@ class GameLauncher:
             #     print("ℹ️ 用户在引导层退出")
             #     return
             
-            # 导入场景类
+            # 导入首屏场景类
             from game.scenes.welcome_scene import WelcomeScene
-            from game.scenes.login_scene import LoginScene
-            from game.scenes.register_scene import RegisterScene
             
-            # 创建场景管理器
-            scene_manager = SceneManager(self.screen)
+            # 创建场景管理器（PYOKEMON_DIRTY_RECTS=1 启用脏矩形渲染）
+            dirty_rects = os.environ.get("PYOKEMON_DIRTY_RECTS", "0") == "1"
+            scene_manager = SceneManager(self.screen, dirty_rects=dirty_rects, launch_time=LAUNCH_TIME)
             
-            # 注册场景
+            # 注册场景（其余场景按模块路径延迟导入）
             scene_manager.add_scene("welcome", WelcomeScene)
-            scene_manager.add_scene("login", LoginScene)
-            scene_manager.add_scene("register", RegisterScene)
-            scene_manager.add_scene('game_main', MainScene)
+            scene_manager.add_scene("login", "game.scenes.login_scene:LoginScene")
+            scene_manager.add_scene("register", "game.scenes.register_scene:RegisterScene")
+            scene_manager.add_scene('game_main', "game.scenes.main_scene:MainScene")
             
             # 运行场景管理器，从欢迎页面开始
             scene_manager.run("welcome")
@@ -0,0 +1,423 @@
+"""
+资源注册表
+由构建步骤生成的清单（assets/asset_manifest.json）记录图片资源的路径、尺寸、大小和哈希，
+运行时不再扫描目录；图片在首次请求时才解码，按引用计数在各场景间共享。
+
+构建清单（在项目根目录）：
+    python -m game.core.asset_registry --build
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+# 清单文件与扫描范围
+MANIFEST_PATH = os.path.join("assets", "asset_manifest.json")
+ASSET_ROOT = "assets"
+SCAN_DIRS = ("icons", "images")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+MANIFEST_VERSION = 1
+
+# 引用计数归零后仍保留的解码表面上限（重复打开窗口时免去重新解码）
+IDLE_CACHE_BYTES = 48 * 1024 * 1024
+
+SizeKey = Optional[Tuple[int, int]]
+
+
+# ==================== 清单构建 ====================
+
+def _read_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """只读取文件头获得图片尺寸（PNG/GIF/JPEG），不解码像素"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(26)
+            if head[:8] == b"\x89PNG\r\n\x1a\n":
+                return struct.unpack(">II", head[16:24])
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", head[6:10])
+            if head[:2] == b"\xff\xd8":
+                f.seek(2)
+                while True:
+                    marker = f.read(2)
+                    if len(marker) < 2 or marker[0] != 0xFF:
+                        return None
+                    length = struct.unpack(">H", f.read(2))[0]
+                    # SOF0..SOF15（除DHT/JPG/DAC）记录尺寸
+                    if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                        height, width = struct.unpack(">xHH", f.read(5))
+                        return width, height
+                    f.seek(length - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _file_hash(path: str) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def asset_id_for(path: str, root: str = ASSET_ROOT) -> str:
+    """
+    文件路径对应的资源ID（相对assets、去扩展名、使用/分隔）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        str: 如 "icons/store"、"images/packets/packet1"
+    """
+    relative = os.path.relpath(path, root)
+    return os.path.splitext(relative)[0].replace(os.sep, "/")
+
+
+def scan_assets(root: str = ASSET_ROOT, with_hashes: bool = True) -> Dict[str, dict]:
+    """
+    扫描资源目录生成清单条目
+
+    Args:
+        root: 资源根目录
+        with_hashes: 是否计算文件哈希（运行时兜底扫描时跳过）
+
+    Returns:
+        Dict[str, dict]: {资源ID: {'path','width','height','bytes','hash'}}
+    """
+    entries = {}
+    for scan_dir in SCAN_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, scan_dir)):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                path = os.path.join(dirpath, filename)
+                asset_id = asset_id_for(path, root)
+                if asset_id in entries:
+                    # 同名不同扩展名，保留先出现的并带上扩展名区分
+                    asset_id = asset_id_for(path, root) + os.path.splitext(filename)[1].lower()
+                size = _read_image_size(path) or (0, 0)
+                entries[asset_id] = {
+                    "path": path.replace(os.sep, "/"),
+                    "width": size[0],
+                    "height": size[1],
+                    "bytes": os.path.getsize(path),
+                    "hash": _file_hash(path) if with_hashes else None,
+                }
+    return entries
+
+
+def build_manifest(root: str = ASSET_ROOT, manifest_path: str = MANIFEST_PATH) -> dict:
+    """
+    扫描资源目录并写入清单文件
+
+    Args:
+        root: 资源根目录
+        manifest_path: 清单输出路径
+
+    Returns:
+        dict: 清单内容
+    """
+    start = time.perf_counter()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "assets": scan_assets(root),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✅ 资源清单已生成: {manifest_path} ({len(manifest['assets'])} 项, {elapsed:.0f} ms)")
+    return manifest
+
+
+# ==================== 运行时注册表 ====================
+
+class AssetRegistry:
+    """
+    资源注册表
+
+    用法：
+        registry = get_asset_registry()
+        icon = registry.acquire("icons/store", size=(120, 120))
+        ...
+        registry.release("icons/store", size=(120, 120))
+
+    同一 (资源ID, 尺寸) 只解码/缩放一次（已打包进纹理图集的直接取图集子表面）；
+    引用计数归零后进入空闲缓存，超出 IDLE_CACHE_BYTES 时按最久未用释放。
+    """
+
+    def __init__(self, manifest_path: str = MANIFEST_PATH, idle_cache_bytes: int = IDLE_CACHE_BYTES):
+        """
+        初始化注册表（清单在首次使用时读取）
+
+        Args:
+            manifest_path: 清单路径
+            idle_cache_bytes: 空闲缓存上限
+        """
+        self.manifest_path = manifest_path
+        self.idle_cache_bytes = idle_cache_bytes
+
+        self._assets: Optional[Dict[str, dict]] = None
+        self._live: Dict[Tuple[str, SizeKey], List] = {}  # key -> [surface, refcount]
+        self._idle: "OrderedDict[Tuple[str, SizeKey], pygame.Surface]" = OrderedDict()
+        self._idle_bytes = 0
+        # 后台线程预先解码、尚未转换格式的原图（主线程取用时才 convert_alpha）
+        self._staged: Dict[str, pygame.Surface] = {}
+        self._stage_lock = threading.Lock()
+
+        self.loads = 0
+        self.hits = 0
+        self.atlas_hits = 0
+
+    # ==================== 清单 ====================
+
+    @property
+    def assets(self) -> Dict[str, dict]:
+        """清单条目（首次访问时读取清单，缺失时扫描目录兜底）"""
+        if self._assets is None:
+            self._assets = self._load_manifest()
+        return self._assets
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest["assets"]
+            print("⚠️ 资源清单版本不匹配，改为扫描目录（请运行 python -m game.core.asset_registry --build）")
+        except FileNotFoundError:
+            print(f"⚠️ 资源清单不存在: {self.manifest_path}，改为扫描目录（请运行 python -m game.core.asset_registry --build）")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ 资源清单读取失败: {e}，改为扫描目录")
+        return scan_assets(with_hashes=False)
+
+    def has(self, asset_id: str) -> bool:
+        """资源是否存在于清单"""
+        return asset_id in self.assets
+
+    def info(self, asset_id: str) -> Optional[dict]:
+        """资源的清单条目（路径、尺寸、大小、哈希）"""
+        return self.assets.get(asset_id)
+
+    def path_of(self, asset_id: str) -> Optional[str]:
+        """资源文件路径"""
+        entry = self.assets.get(asset_id)
+        return entry["path"] if entry else None
+
+    def list_assets(self, prefix: str, recursive: bool = False, extensions: Tuple[str, ...] = None) -> List[str]:
+        """
+        列出目录下的资源ID（来自清单，不访问文件系统）
+
+        Args:
+            prefix: 目录前缀（如 "images/packets"）
+            recursive: 是否包含子目录
+            extensions: 只保留这些扩展名（如 (".gif",)）
+
+        Returns:
+            List[str]: 资源ID列表（按ID排序）
+        """
+        prefix = prefix.rstrip("/") + "/"
+        result = []
+        for asset_id, entry in self.assets.items():
+            if not asset_id.startswith(prefix):
+                continue
+            if not recursive and "/" in asset_id[len(prefix):]:
+                continue
+            if extensions and not entry["path"].lower().endswith(extensions):
+                continue
+            result.append(asset_id)
+        return sorted(result)
+
+    # ==================== 表面 ====================
+
+    def acquire(self, asset_id: str, size: SizeKey = None, smooth: bool = True) -> Optional[pygame.Surface]:
+        """
+        获取资源表面并增加引用计数
+
+        Args:
+            asset_id: 资源ID
+            size: 目标尺寸（None为原始尺寸）
+            smooth: 缩放时是否使用 smoothscale
+
+        Returns:
+            Optional[pygame.Surface]: 共享表面（不要修改），资源不存在或解码失败时为None
+        """
+        key = (asset_id, tuple(size) if size else None)
+
+        live = self._live.get(key)
+        if live is not None:
+            live[1] += 1
+            self.hits += 1
+            return live[0]
+
+        surface = self._idle.pop(key, None)
+        if surface is not None:
+            self._idle_bytes -= self._surface_bytes(surface)
+            self.hits += 1
+        else:
+            surface = self._create(asset_id, key[1], smooth)
+            if surface is None:
+                return None
+
+        self._live[key] = [surface, 1]
+        return surface
+
+    def release(self, asset_id: str, size: SizeKey = None):
+        """
+        释放一次引用（归零后进入空闲缓存）
+
+        Args:
+            asset_id: 资源ID
+            size: 与 acquire 时相同的尺寸
+        """
+        key = (asset_id, tuple(size) if size else None)
+        live = self._live.get(key)
+        if live is None:
+            return
+        live[1] -= 1
+        if live[1] > 0:
+            return
+
+        del self._live[key]
+        surface = live[0]
+        self._idle[key] = surface
+        self._idle_bytes += self._surface_bytes(surface)
+        while self._idle_bytes > self.idle_cache_bytes and self._idle:
+            _, evicted = self._idle.popitem(last=False)
+            self._idle_bytes -= self._surface_bytes(evicted)
+
+    def preload(self, asset_ids: List[str]):
+        """
+        预先解码资源（可在后台线程调用）
+
+        只做文件读取和解码；像素格式转换要求在主线程进行，留给之后的 acquire()。
+        已打包进纹理图集的资源改为预先解码所在的图集。
+
+        Args:
+            asset_ids: 资源ID列表
+        """
+        from game.core.texture_atlas import get_texture_atlas
+        atlas = get_texture_atlas()
+
+        for asset_id in asset_ids:
+            sheet_names = atlas.sheet_names_for(asset_id)
+            if sheet_names:
+                for sheet_name in sheet_names:
+                    atlas.preload_sheet(sheet_name)
+                continue
+
+            key = (asset_id, None)
+            if asset_id in self._staged or key in self._live or key in self._idle:
+                continue
+            path = self.path_of(asset_id)
+            if path is None:
+                continue
+            try:
+                surface = pygame.image.load(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"⚠️ 资源预解码失败 {path}: {e}")
+                continue
+            with self._stage_lock:
+                self._staged[asset_id] = surface
+
+    def ref_count(self, asset_id: str, size: SizeKey = None) -> int:
+        """当前引用计数"""
+        live = self._live.get((asset_id, tuple(size) if size else None))
+        return live[1] if live else 0
+
+    def _create(self, asset_id: str, size: SizeKey, smooth: bool) -> Optional[pygame.Surface]:
+        """解码（并缩放）资源，图集中已打包该尺寸时直接取子表面"""
+        if smooth:
+            # 图集按 smoothscale 打包；延迟导入避免循环依赖
+            from game.core.texture_atlas import get_texture_atlas
+            entry = self.assets.get(asset_id)
+            surface = get_texture_atlas().get(asset_id, size, entry["hash"] if entry else None)
+            if surface is not None:
+                self.atlas_hits += 1
+                return surface
+
+        if size is not None:
+            # 缩放版本从原图生成，原图用完即还
+            base = self.acquire(asset_id)
+            if base is None:
+                return None
+            try:
+                if base.get_size() == size:
+                    return base
+                scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+                return scale(base, size)
+            finally:
+                self.release(asset_id)
+
+        with self._stage_lock:
+            surface = self._staged.pop(asset_id, None)
+        if surface is None:
+            path = self.path_of(asset_id)
+            if path is None:
+                print(f"⚠️ 资源不在清单中: {asset_id}")
+                return None
+            try:
+                surface = pygame.image.load(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"❌ 资源加载失败 {path}: {e}")
+                return None
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.loads += 1
+        return surface
+
+    @staticmethod
+    def _surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get_stats(self) -> dict:
+        """获取注册表统计"""
+        return {
+            'assets': len(self.assets),
+            'live': len(self._live),
+            'idle': len(self._idle),
+            'idle_bytes': self._idle_bytes,
+            'loads': self.loads,
+            'hits': self.hits,
+            'atlas_hits': self.atlas_hits,
+            'staged': len(self._staged),
+        }
+
+
+_registry: Optional[AssetRegistry] = None
+
+
+def get_asset_registry() -> AssetRegistry:
+    """获取全局资源注册表"""
+    global _registry
+    if _registry is None:
+        _registry = AssetRegistry()
+    return _registry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="资源清单工具")
+    parser.add_argument("--build", action="store_true", help="扫描assets并生成清单")
+    parser.add_argument("--output", default=MANIFEST_PATH, help="清单输出路径")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        build_manifest(manifest_path=args.output)
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
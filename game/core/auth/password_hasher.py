@@ -0,0 +1,225 @@
+"""
+密码哈希
+使用 hashlib.scrypt（内存困难型KDF，OpenSSL不支持时退回PBKDF2-SHA256）并保存带版本与参数的哈希字符串：
+
+    scrypt$<n>$<r>$<p>$<盐>$<哈希>
+    pbkdf2_sha256$<迭代次数>$<盐>$<哈希>
+
+旧版本的无盐SHA-256十六进制哈希仍可验证，验证成功后应调用 needs_rehash() 判断并改存新格式。
+
+同步函数供客户端（单用户）直接调用；服务器使用 PasswordHasher，
+在进程池中计算KDF并限制排队数量（队列满时立即抛出 HasherBusyError），事件循环不会被每次约50ms的计算阻塞。
+"""
+
+import os
+import hmac
+import base64
+import asyncio
+import hashlib
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# scrypt参数：n=2^14, r=8 约占16MB内存、单核约50ms
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 200_000
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+SCRYPT_AVAILABLE = hasattr(hashlib, "scrypt")
+
+# 每个工作进程允许排队的请求数（超出时拒绝新请求）
+QUEUE_PER_WORKER = 4
+
+
+class HasherBusyError(RuntimeError):
+    """哈希队列已满（调用方应返回“服务器繁忙”，由客户端稍后重试）"""
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _is_legacy(stored: str) -> bool:
+    """旧版无盐SHA-256哈希（64位十六进制）"""
+    return len(stored) == 64 and "$" not in stored
+
+
+# 用户不存在时用来验证的哈希：算法与参数与 hash_password 相同（耗时一致），摘要不对应任何密码
+if SCRYPT_AVAILABLE:
+    DUMMY_HASH = (f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$"
+                  f"{_b64encode(bytes(SALT_BYTES))}${_b64encode(bytes(HASH_BYTES))}")
+else:
+    DUMMY_HASH = f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64encode(bytes(SALT_BYTES))}${_b64encode(bytes(HASH_BYTES))}"
+
+
+def hash_password(password: str) -> str:
+    """
+    计算密码哈希（同步，约50ms）
+
+    Args:
+        password: 原始密码
+
+    Returns:
+        str: 带算法与参数的哈希字符串
+    """
+    salt = secrets.token_bytes(SALT_BYTES)
+    if SCRYPT_AVAILABLE:
+        digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                                maxmem=128 * SCRYPT_N * SCRYPT_R * 2, dklen=HASH_BYTES)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS, HASH_BYTES)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    """
+    验证密码（同步）
+
+    Args:
+        password: 原始密码
+        stored: 数据库中保存的哈希
+
+    Returns:
+        bool: 是否匹配
+    """
+    if not stored:
+        return False
+    try:
+        if _is_legacy(stored):
+            candidate = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(candidate, stored.lower())
+
+        parts = stored.split("$")
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            expected = _b64decode(parts[5])
+            digest = hashlib.scrypt(password.encode("utf-8"), salt=_b64decode(parts[4]), n=n, r=r, p=p,
+                                    maxmem=128 * n * r * 2, dklen=len(expected))
+            return hmac.compare_digest(digest, expected)
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            expected = _b64decode(parts[3])
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), _b64decode(parts[2]),
+                                         int(parts[1]), len(expected))
+            return hmac.compare_digest(digest, expected)
+    except (ValueError, TypeError) as e:
+        print(f"⚠️ 密码哈希格式无效: {e}")
+    return False
+
+
+def needs_rehash(stored: Optional[str]) -> bool:
+    """
+    哈希是否需要按当前算法与参数重新计算（旧版SHA-256或参数已调整）
+
+    Args:
+        stored: 数据库中保存的哈希
+
+    Returns:
+        bool: 需要重新计算时为True
+    """
+    if not stored:
+        return False
+    if SCRYPT_AVAILABLE:
+        return not stored.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+    return not stored.startswith(f"pbkdf2_sha256${PBKDF2_ITERATIONS}$")
+
+
+class PasswordHasher:
+    """
+    进程池密码哈希服务（服务器用）
+
+    KDF在工作进程中计算，吞吐随CPU核数增长；已提交（计算中与排队中）的请求数有上限，
+    超出时立即拒绝，请求既不会无限堆积在进程池队列里，也不会在事件循环中无限等待。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, queue_per_worker: int = QUEUE_PER_WORKER):
+        """
+        初始化哈希服务（进程池在首次使用时创建）
+
+        Args:
+            max_workers: 工作进程数（默认CPU核数）
+            queue_per_worker: 每个工作进程允许的排队请求数
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = self.max_workers * queue_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run(self, function, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusyError(f"密码哈希队列已满 ({self.pending}/{self.max_pending})")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), function, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        """在进程池中计算密码哈希（见 hash_password；队列满时抛出 HasherBusyError）"""
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, stored: Optional[str]) -> bool:
+        """在进程池中验证密码（见 verify_password；队列满时抛出 HasherBusyError）"""
+        if not stored:
+            return False
+        return await self._run(verify_password, password, stored)
+
+    def shutdown(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        """获取服务统计"""
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self.pending,
+            'completed': self.completed,
+            'rejected': self.rejected,
+        }
+
+
+_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """获取全局密码哈希服务"""
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher()
+    return _hasher
+
+
+def configure_password_hasher(max_workers: Optional[int] = None) -> PasswordHasher:
+    """
+    替换全局密码哈希服务（多工作进程部署时按进程数分配哈希进程，避免超额占用CPU）
+
+    Args:
+        max_workers: 哈希进程数（默认CPU核数）
+
+    Returns:
+        PasswordHasher: 新的全局实例
+    """
+    global _hasher
+    if _hasher is not None:
+        _hasher.shutdown()
+    _hasher = PasswordHasher(max_workers)
+    return _hasher
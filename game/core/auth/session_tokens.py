@@ -0,0 +1,211 @@
+"""
+会话令牌
+令牌自带用户ID、过期时间和会话ID，并用HMAC-SHA256签名，校验只需计算一次哈希，不查询数据库。
+
+令牌格式（URL安全，不含 ':'）：
+    v1.<用户ID>.<过期时间戳>.<会话ID>.<签名>
+
+签名密钥优先取环境变量 PYOKEMON_SESSION_SECRET（多进程/多机部署时需一致），
+否则在 data/session_secret.key 中生成并保存一个随机密钥。
+注销的会话记在进程内的吊销缓存中；其他进程的注销在存活缓存过期后由数据库复核得知。
+"""
+
+import os
+import hmac
+import time
+import base64
+import hashlib
+import secrets
+import threading
+from typing import Dict, Optional, Tuple
+
+TOKEN_VERSION = "v1"
+SECRET_ENV = "PYOKEMON_SESSION_SECRET"
+SECRET_PATH = os.path.join("data", "session_secret.key")
+
+# 会话有效期（秒）
+SESSION_TTL = 2 * 60 * 60
+# 存活缓存：同一令牌在该时间内不再查询数据库（秒）
+LIVE_CACHE_TTL = 60
+# 过期会话批量清理间隔（秒）
+CLEANUP_INTERVAL = 10 * 60
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def load_secret(path: str = SECRET_PATH) -> bytes:
+    """
+    读取签名密钥（不存在时生成）
+
+    Args:
+        path: 密钥文件路径
+
+    Returns:
+        bytes: 密钥
+    """
+    env_secret = os.environ.get(SECRET_ENV)
+    if env_secret:
+        return env_secret.encode("utf-8")
+
+    try:
+        with open(path, "rb") as f:
+            secret = f.read().strip()
+        if secret:
+            return _b64decode(secret.decode("ascii"))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 会话密钥读取失败，重新生成: {e}")
+
+    secret = secrets.token_bytes(32)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_b64encode(secret).encode("ascii"))
+        print(f"🔑 已生成会话签名密钥: {path}")
+    except OSError as e:
+        print(f"⚠️ 会话密钥无法保存（重启后已签发的令牌失效）: {e}")
+    return secret
+
+
+class SessionTokenSigner:
+    """签发与校验HMAC签名的会话令牌"""
+
+    def __init__(self, secret: Optional[bytes] = None):
+        """
+        初始化签名器
+
+        Args:
+            secret: 签名密钥（默认由 load_secret() 读取）
+        """
+        self._secret = secret if secret is not None else load_secret()
+
+    def _signature(self, payload: str) -> str:
+        digest = hmac.new(self._secret, payload.encode("ascii"), hashlib.sha256).digest()
+        return _b64encode(digest)
+
+    def issue(self, user_id: int, ttl: int = SESSION_TTL, now: Optional[float] = None) -> Tuple[str, int]:
+        """
+        签发令牌
+
+        Args:
+            user_id: 用户ID
+            ttl: 有效期（秒）
+            now: 当前时间戳（默认 time.time()）
+
+        Returns:
+            (令牌, 过期时间戳)
+        """
+        expires = int(now if now is not None else time.time()) + ttl
+        payload = f"{TOKEN_VERSION}.{int(user_id)}.{expires}.{secrets.token_hex(8)}"
+        return f"{payload}.{self._signature(payload)}", expires
+
+    def verify(self, token: str, now: Optional[float] = None) -> Optional[Tuple[int, int, str]]:
+        """
+        校验签名与过期时间（不查询数据库）
+
+        Args:
+            token: 令牌
+            now: 当前时间戳（默认 time.time()）
+
+        Returns:
+            Optional[Tuple[int, int, str]]: (用户ID, 过期时间戳, 会话ID)，无效或过期时为None
+        """
+        if not token or not isinstance(token, str):
+            return None
+        payload, _, signature = token.rpartition(".")
+        parts = payload.split(".")
+        if len(parts) != 4 or parts[0] != TOKEN_VERSION:
+            return None
+        if not hmac.compare_digest(signature, self._signature(payload)):
+            return None
+        try:
+            user_id, expires = int(parts[1]), int(parts[2])
+        except ValueError:
+            return None
+        if expires <= (now if now is not None else time.time()):
+            return None
+        return user_id, expires, parts[3]
+
+
+class SessionCache:
+    """
+    进程内会话缓存
+
+    revoked: 已注销的会话ID（保留到令牌本身过期为止）
+    live:    数据库确认过仍有效的令牌及确认时间，LIVE_CACHE_TTL 内不再查询数据库
+    """
+
+    def __init__(self, live_ttl: float = LIVE_CACHE_TTL):
+        self.live_ttl = live_ttl
+        self._revoked: Dict[str, int] = {}
+        self._live: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def is_revoked(self, session_id: str) -> bool:
+        """会话是否已在本进程注销"""
+        return session_id in self._revoked
+
+    def revoke(self, token: str, session_id: str, expires: int):
+        """记录注销（令牌过期后自动清除）"""
+        with self._lock:
+            self._revoked[session_id] = expires
+            self._live.pop(token, None)
+
+    def get_live(self, token: str, now: float) -> Optional[int]:
+        """
+        查询存活缓存
+
+        Returns:
+            Optional[int]: 缓存未过期时为用户ID
+        """
+        entry = self._live.get(token)
+        if entry is not None and now - entry[1] < self.live_ttl:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def put_live(self, token: str, user_id: int, now: float):
+        """记录数据库已确认的令牌"""
+        with self._lock:
+            self._live[token] = (user_id, now)
+
+    def discard(self, token: str):
+        """移除存活记录（数据库中已失效）"""
+        with self._lock:
+            self._live.pop(token, None)
+
+    def prune(self, now: float) -> int:
+        """
+        清除过期条目
+
+        Returns:
+            int: 清除的条目数
+        """
+        with self._lock:
+            revoked = [sid for sid, expires in self._revoked.items() if expires <= now]
+            for sid in revoked:
+                del self._revoked[sid]
+            live = [token for token, (_, checked) in self._live.items() if now - checked >= self.live_ttl]
+            for token in live:
+                del self._live[token]
+        return len(revoked) + len(live)
+
+    def get_stats(self) -> dict:
+        """获取缓存统计"""
+        return {
+            'live': len(self._live),
+            'revoked': len(self._revoked),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
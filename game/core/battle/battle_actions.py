@@ -475,8 +475,9 @@ class ActionProcessor:
             
             # 检查获胜条件
             if player_state.check_win_condition():
+                from game.core.battle.battle_state import GameResult
                 battle_state.end_battle(
-                    battle_state.GameResult.PLAYER_WIN if request.player_id == battle_state.player1_id else battle_state.GameResult.OPPONENT_WIN,
+                    GameResult.PLAYER_WIN if request.player_id == battle_state.player1_id else GameResult.OPPONENT_WIN,
                     request.player_id
                 )
                 response.add_effect("获得胜利!")
@@ -546,9 +547,11 @@ class ActionProcessor:
     
     def _process_surrender(self, request: ActionRequest, battle_state, player_state) -> ActionResponse:
         """处理投降行动"""
+        from game.core.battle.battle_state import GameResult
+
         # 结束战斗
         winner_id = battle_state.get_opponent_id(request.player_id)
-        battle_state.end_battle(battle_state.GameResult.FORFEIT, winner_id)
+        battle_state.end_battle(GameResult.FORFEIT, winner_id)
         
         response = ActionResponse(
             result=ActionResult.SUCCESS,
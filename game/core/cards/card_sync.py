@@ -0,0 +1,205 @@
+"""
+卡牌目录增量同步
+流式读取 cards.json，为每张卡牌计算内容哈希，与 cards 表中保存的哈希比较，
+只把新增/变更/删除的部分在一个事务里写入数据库，并递增目录版本供各缓存订阅。
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from game.core.cards.card_data import Card
+
+# 可选：ijson 可以边读边解析大文件，未安装时整体读入
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# catalog_meta 中使用的键
+META_CATALOG_VERSION = "catalog_version"
+META_SOURCE_FINGERPRINT = "source_fingerprint"
+
+# 写入数据库的列顺序（与 CardDAO.apply_card_delta 一致，content_hash 追加在末尾）
+ROW_FIELDS = ('id', 'name', 'hp', 'types', 'rarity', 'attacks', 'image_path',
+              'set_name', 'card_number', 'description')
+
+
+@dataclass
+class CatalogDelta:
+    """一次同步的结果"""
+    version: int
+    inserted: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    # 受影响卡牌的图片路径（新旧都包含），用于清理图片缓存
+    image_paths: Set[str] = field(default_factory=set)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    @property
+    def changed_ids(self) -> Set[str]:
+        return set(self.inserted) | set(self.updated) | set(self.deleted)
+
+    def __str__(self) -> str:
+        return (f"v{self.version}: +{len(self.inserted)} "
+                f"~{len(self.updated)} -{len(self.deleted)}")
+
+
+def compute_content_hash(row: Tuple) -> str:
+    """
+    计算卡牌行的内容哈希
+
+    Args:
+        row: 按 ROW_FIELDS 顺序排列的列值
+
+    Returns:
+        str: 十六进制哈希
+    """
+    payload = json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def iter_json_cards(path: str) -> Iterator[dict]:
+    """
+    逐张读取 cards.json 中的卡牌数据
+
+    Args:
+        path: JSON文件路径（顶层为数组）
+    """
+    with open(path, 'rb') as f:
+        if IJSON_AVAILABLE:
+            yield from ijson.items(f, 'item')
+        else:
+            yield from json.load(f)
+
+
+class CardCatalogSync:
+    """
+    卡牌目录同步器
+
+    源文件指纹（大小+修改时间）未变时直接跳过；指纹变了但内容没变（只是touch）
+    时只解析和比较哈希，不写卡牌行、不递增版本。
+    """
+
+    def __init__(self, card_dao, cards_json_path: str):
+        """
+        初始化同步器
+
+        Args:
+            card_dao: CardDAO实例
+            cards_json_path: cards.json 路径
+        """
+        self.card_dao = card_dao
+        self.cards_json_path = cards_json_path
+
+    def get_version(self) -> int:
+        """当前目录版本"""
+        try:
+            return int(self.card_dao.get_catalog_meta(META_CATALOG_VERSION, 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def _source_fingerprint(self) -> Optional[str]:
+        try:
+            stat = os.stat(self.cards_json_path)
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _read_source(self) -> Tuple[Dict[str, Tuple], bool]:
+        """
+        解析源文件
+
+        Returns:
+            ({卡牌ID: 行(含哈希)}, 是否完整解析)
+        """
+        rows: Dict[str, Tuple] = {}
+        complete = True
+        for card_data in iter_json_cards(self.cards_json_path):
+            try:
+                card_dict = Card.from_json_card(card_data).to_dict()
+            except Exception as e:
+                card_id = card_data.get('id', 'unknown') if isinstance(card_data, dict) else 'unknown'
+                print(f"解析卡牌数据失败 {card_id}: {e}")
+                complete = False
+                continue
+
+            row = tuple(card_dict[name] for name in ROW_FIELDS)
+            # 重复ID以后出现的为准（与原先 INSERT OR REPLACE 的行为一致）
+            rows[row[0]] = row + (compute_content_hash(row),)
+        return rows, complete
+
+    def sync(self, force: bool = False) -> CatalogDelta:
+        """
+        执行增量同步
+
+        Args:
+            force: 忽略源文件指纹，强制比较内容
+
+        Returns:
+            CatalogDelta: 同步结果（无变化时 changed 为False）
+        """
+        version = self.get_version()
+        fingerprint = self._source_fingerprint()
+        if fingerprint is None:
+            print(f"⚠️ 卡牌文件不存在: {self.cards_json_path}")
+            return CatalogDelta(version=version)
+
+        if not force and fingerprint == self.card_dao.get_catalog_meta(META_SOURCE_FINGERPRINT):
+            return CatalogDelta(version=version)
+
+        try:
+            source_rows, complete = self._read_source()
+        except (OSError, ValueError) as e:
+            print(f"❌ 读取卡牌文件失败 {self.cards_json_path}: {e}")
+            return CatalogDelta(version=version)
+
+        if not source_rows:
+            # 空文件视为异常，不能据此删除整个目录（会级联删除用户收藏）
+            print("⚠️ 卡牌文件中没有有效卡牌，跳过同步")
+            return CatalogDelta(version=version)
+
+        existing = self.card_dao.get_card_sync_state()
+
+        delta = CatalogDelta(version=version)
+        upserts = []
+        for card_id, row in source_rows.items():
+            old = existing.get(card_id)
+            if old is None:
+                delta.inserted.append(card_id)
+            elif old[0] != row[-1]:
+                delta.updated.append(card_id)
+                delta.image_paths.add(old[1])
+            else:
+                continue
+            upserts.append(row)
+            delta.image_paths.add(row[6])
+
+        if complete:
+            for card_id, (_, image_path) in existing.items():
+                if card_id not in source_rows:
+                    delta.deleted.append(card_id)
+                    delta.image_paths.add(image_path)
+        else:
+            print("⚠️ 卡牌文件未完整解析，本次不删除卡牌")
+
+        meta = {META_SOURCE_FINGERPRINT: fingerprint}
+        if delta.changed:
+            delta.version = version + 1
+            meta[META_CATALOG_VERSION] = delta.version
+
+        if not self.card_dao.apply_card_delta(upserts, delta.deleted, meta):
+            return CatalogDelta(version=version)
+
+        if delta.changed:
+            print(f"🔄 卡牌目录已同步 {delta}")
+        else:
+            print(f"✅ 卡牌目录内容无变化 (v{version})")
+        delta.image_paths.discard('')
+        return delta
@@ -0,0 +1,192 @@
+"""
+服务器卡牌目录缓存
+向服务器请求自上次同步以来的目录差异（get_catalog_delta，分页、zlib 压缩），
+校验每行的内容哈希后在一个事务里写入本地 cards 表，并递增本地目录版本供各缓存订阅。
+
+服务器的目录版本与本地 cards.json 同步的版本分开记录。本地文件同步改动过 cards 表后
+（本地目录版本不再等于应用服务器目录时的版本），下次向服务器请求完整目录；
+完整目录中内容哈希未变的卡牌不会重写，客户端自带的卡牌与服务器一致时几乎没有写入。
+"""
+
+import json
+import zlib
+import base64
+from typing import Any, Callable, Dict, List
+
+from game.core.cards.card_sync import (
+    CatalogDelta, ROW_FIELDS, META_CATALOG_VERSION, compute_content_hash
+)
+
+# catalog_meta 中使用的键
+META_REMOTE_VERSION = "remote_catalog_version"
+META_REMOTE_ID = "remote_catalog_id"
+META_REMOTE_BASE = "remote_catalog_base"
+
+# 服务器页内容的编码方式
+PAGE_ENCODING = "zlib+base64"
+# 下载期间服务器目录变化时重新开始的最多次数
+MAX_RESTARTS = 3
+
+
+class CatalogCacheError(Exception):
+    """服务器目录同步失败"""
+
+
+def decode_page(response: Dict[str, Any]) -> Dict[str, List]:
+    """
+    解码目录页数据
+
+    Args:
+        response: get_catalog_delta 的响应
+
+    Returns:
+        dict: {'added': [行], 'changed': [行], 'removed': [卡牌ID]}
+    """
+    if response.get('encoding') != PAGE_ENCODING:
+        raise CatalogCacheError(f"不支持的目录页编码: {response.get('encoding')}")
+    return json.loads(zlib.decompress(base64.b64decode(response['data'])).decode('utf-8'))
+
+
+class RemoteCatalogCache:
+    """把服务器的目录差异应用到本地 cards 表"""
+
+    def __init__(self, card_dao, catalog_sync):
+        """
+        初始化缓存
+
+        Args:
+            card_dao: CardDAO实例
+            catalog_sync: CardCatalogSync实例（提供本地目录版本）
+        """
+        self.card_dao = card_dao
+        self.catalog_sync = catalog_sync
+
+    def _meta_int(self, key: str) -> int:
+        try:
+            return int(self.card_dao.get_catalog_meta(key, 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def get_remote_version(self) -> int:
+        """已应用的服务器目录版本（0 表示尚未同步或需要完整同步）"""
+        if self._meta_int(META_REMOTE_BASE) != self.catalog_sync.get_version():
+            return 0
+        return self._meta_int(META_REMOTE_VERSION)
+
+    def build_request(self, page: int = 0, version: int = None) -> Dict[str, Any]:
+        """
+        构造 get_catalog_delta 请求
+
+        Args:
+            page: 页码
+            version: 第一页返回的服务器目录版本（后续页必须提供）
+        """
+        request = {
+            'action': 'get_catalog_delta',
+            'since': self.get_remote_version(),
+            'catalog_id': self.card_dao.get_catalog_meta(META_REMOTE_ID, ''),
+            'page': page,
+        }
+        if version is not None:
+            request['version'] = version
+        return request
+
+    def sync(self, request: Callable[[Dict[str, Any]], Dict[str, Any]]) -> CatalogDelta:
+        """
+        从服务器同步目录
+
+        Args:
+            request: 发送一条消息并返回服务器响应的函数（由调用方的网络层提供）
+
+        Returns:
+            CatalogDelta: 本地目录的变化（无变化时 changed 为False）
+
+        Raises:
+            CatalogCacheError: 服务器返回错误或数据校验失败
+        """
+        for _ in range(MAX_RESTARTS):
+            first = request(self.build_request())
+            if not first or not first.get('success'):
+                raise CatalogCacheError((first or {}).get('message', "服务器没有响应"))
+
+            responses = [first]
+            for page in range(1, first['pages']):
+                response = request(self.build_request(page, first['version']))
+                if response and response.get('error') == 'catalog_changed':
+                    break
+                if not response or not response.get('success'):
+                    raise CatalogCacheError((response or {}).get('message', "服务器没有响应"))
+                responses.append(response)
+            else:
+                return self.apply(responses)
+
+        raise CatalogCacheError("下载期间服务器目录反复变化")
+
+    def apply(self, responses: List[Dict[str, Any]]) -> CatalogDelta:
+        """
+        在一个事务中应用全部页
+
+        Args:
+            responses: 同一次同步的所有页（按页码顺序）
+
+        Returns:
+            CatalogDelta: 本地目录的变化
+        """
+        first = responses[0]
+        if tuple(first.get('fields', ())) != ROW_FIELDS + ('content_hash',):
+            raise CatalogCacheError(f"目录字段不一致: {first.get('fields')}")
+
+        version = self.catalog_sync.get_version()
+        existing = self.card_dao.get_card_sync_state()
+        delta = CatalogDelta(version=version)
+        upserts = []
+        received = set()
+        removed = []
+
+        for response in responses:
+            page = decode_page(response)
+            for row in page['added'] + page['changed']:
+                row = tuple(row)
+                if compute_content_hash(row[:-1]) != row[-1]:
+                    raise CatalogCacheError(f"卡牌数据校验失败: {row[0]}")
+                card_id = row[0]
+                received.add(card_id)
+                old = existing.get(card_id)
+                if old is None:
+                    delta.inserted.append(card_id)
+                elif old[0] != row[-1]:
+                    delta.updated.append(card_id)
+                    delta.image_paths.add(old[1])
+                else:
+                    continue
+                upserts.append(row)
+                delta.image_paths.add(row[6])
+            removed.extend(page['removed'])
+
+        if first.get('full'):
+            # 完整目录：本地多出的卡牌也删除
+            removed.extend(card_id for card_id in existing if card_id not in received)
+        delta.deleted = [card_id for card_id in dict.fromkeys(removed) if card_id in existing]
+        for card_id in delta.deleted:
+            delta.image_paths.add(existing[card_id][1])
+
+        if delta.changed:
+            delta.version = version + 1
+        meta = {
+            META_REMOTE_VERSION: first['version'],
+            META_REMOTE_ID: first.get('catalog_id', ''),
+            META_REMOTE_BASE: delta.version,
+        }
+        if delta.changed:
+            meta[META_CATALOG_VERSION] = delta.version
+
+        if not self.card_dao.apply_card_delta(upserts, delta.deleted, meta):
+            raise CatalogCacheError("写入本地卡牌目录失败")
+
+        size = sum(len(response['data']) for response in responses)
+        if delta.changed:
+            print(f"🌐 已同步服务器卡牌目录 (服务器 v{first['version']}) {delta} ({len(responses)} 页, {size} 字节)")
+        else:
+            print(f"✅ 服务器卡牌目录 v{first['version']} 与本地一致 ({size} 字节)")
+        delta.image_paths.discard('')
+        return delta
@@ -9,6 +9,11 @@ import os
 from typing import List, Dict, Optional, Any, Tuple
 from game.core.cards.card_data import Card, parse_cards_from_json_file, get_rarity_probabilities
 from game.core.database.daos.card_dao import CardDAO
+from game.core.cards.card_sync import CardCatalogSync, CatalogDelta
+from game.core.cards.catalog_cache import RemoteCatalogCache
+from game.core.database.schema_version import (
+    SCHEMA_VERSION, RARITY_CONFIG_VERSION, get_version, set_version
+)
 
 class CardManager:
     """卡牌管理器类"""
@@ -22,21 +27,28 @@ class CardManager:
             cards_json_path: 卡牌JSON文件路径
         """
         self.card_dao = CardDAO(db_connection)
+        self.connection = db_connection
         self.cards_json_path = cards_json_path
         self.rarity_probabilities = get_rarity_probabilities()
         
-        # 初始化数据库表
-        self.card_dao.create_card_tables()
+        # 初始化数据库表（表结构已是当前版本时跳过）
+        if get_version(db_connection, "schema") != SCHEMA_VERSION:
+            self.card_dao.create_card_tables()
         
-        # 如果数据库为空且存在JSON文件，则导入数据
-        if self.card_dao.get_card_count() == 0 and os.path.exists(cards_json_path):
-            self.load_cards_from_json()
+        # 按内容哈希增量同步 cards.json（只写入变化的卡牌）
+        self.catalog_sync = CardCatalogSync(self.card_dao, cards_json_path)
+        self.last_catalog_delta = self.sync_catalog()
+        # 服务器目录的增量缓存（连接服务器后调用 sync_remote_catalog）
+        self.remote_catalog = RemoteCatalogCache(self.card_dao, self.catalog_sync)
         
         # 初始化稀有度配置
         self._init_rarity_config()
     
     def _init_rarity_config(self):
-        """初始化稀有度配置"""
+        """初始化稀有度配置（种子版本一致时跳过）"""
+        if get_version(self.connection, "rarity_config") == RARITY_CONFIG_VERSION:
+            return
+        
         rarity_configs = {
             "Common": {"probability": 0.35, "dust_value": 5, "sort_order": 1},
             "Uncommon": {"probability": 0.25, "dust_value": 10, "sort_order": 2},
@@ -56,13 +68,37 @@ class CardManager:
             "Rare Shining": {"probability": 0.005, "dust_value": 1200, "sort_order": 16}
         }
         
-        for rarity, config in rarity_configs.items():
-            self.card_dao.insert_rarity_config(
-                rarity=rarity,
-                probability=config["probability"],
-                dust_value=config["dust_value"],
-                sort_order=config["sort_order"]
-            )
+        if self.card_dao.insert_rarity_configs_batch(rarity_configs):
+            set_version(self.connection, "rarity_config", RARITY_CONFIG_VERSION)
+            self.connection.commit()
+    
+    def sync_catalog(self, force: bool = False) -> CatalogDelta:
+        """
+        增量同步卡牌目录
+        
+        Args:
+            force: 忽略源文件指纹，强制比较内容
+        
+        Returns:
+            CatalogDelta: 同步结果
+        """
+        return self.catalog_sync.sync(force=force)
+    
+    def sync_remote_catalog(self, request) -> CatalogDelta:
+        """
+        从服务器增量同步卡牌目录
+        
+        Args:
+            request: 发送一条消息并返回服务器响应的函数
+        
+        Returns:
+            CatalogDelta: 同步结果
+        """
+        return self.remote_catalog.sync(request)
+    
+    def get_catalog_version(self) -> int:
+        """获取卡牌目录版本（每次目录内容变化递增）"""
+        return self.catalog_sync.get_version()
     
     def load_cards_from_json(self) -> Tuple[int, int]:
         """
@@ -0,0 +1,289 @@
+"""
+图鉴搜索索引
+为DexPage预建卡牌索引：名称/ID的n-gram倒排表、稀有度/类型/拥有状态位图、
+预计算的"有效果文本"标记。过滤变为位图求交，输入时在上一次结果上继续细化，
+并在同一次查询中返回各稀有度/类型的分面计数。
+
+位图使用Python整数表示，第i位对应 cards[i]。
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 建立索引的n-gram最大长度（查询时取 min(len(query), NGRAM_SIZE)）
+NGRAM_SIZE = 3
+
+
+def normalize_text(text: str) -> str:
+    """规范化搜索文本（去首尾空格并转小写）"""
+    return (text or "").strip().lower()
+
+
+def _iter_ngrams(text: str, n: int) -> Iterable[str]:
+    """枚举长度为n的所有子串"""
+    for i in range(len(text) - n + 1):
+        yield text[i:i + n]
+
+
+def _parse_json_list(value) -> list:
+    """兼容数据库中以JSON字符串保存的列表字段"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (ValueError, TypeError):
+            return []
+    return value if isinstance(value, list) else []
+
+
+def _attack_has_text(attack) -> bool:
+    """检查攻击是否带有效果文本（兼容dict与Attack对象）"""
+    if isinstance(attack, dict):
+        text = attack.get('text', '')
+    else:
+        text = getattr(attack, 'text', '')
+    return bool(text and str(text).strip())
+
+
+@dataclass
+class DexSearchResult:
+    """一次过滤的结果"""
+    mask: int
+    cards: List = field(default_factory=list)
+    rarity_counts: Dict[str, int] = field(default_factory=dict)
+    type_counts: Dict[str, int] = field(default_factory=dict)
+    collection_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return len(self.cards)
+
+
+class DexSearchIndex:
+    """
+    图鉴搜索索引
+
+    构建一次（卡牌缓存版本变化时重建），之后每次过滤只做整数位运算。
+    """
+
+    def __init__(self, cards: List = None):
+        self.cards: List = []
+        self.all_mask = 0
+        self.id_bits: Dict[str, int] = {}
+
+        self._search_keys: List[Tuple[str, str]] = []
+        self._ngrams: Dict[str, int] = {}
+        self.rarity_bits: Dict[str, int] = {}
+        self.type_bits: Dict[str, int] = {}
+        self.effect_mask = 0
+        self.owned_mask = 0
+
+        # 增量搜索状态：上一次的查询串及其文本匹配位图
+        self._last_query = ""
+        self._last_text_mask = 0
+
+        if cards is not None:
+            self.build(cards)
+
+    # ==================== 构建 ====================
+
+    def build(self, cards: List):
+        """
+        构建索引
+
+        Args:
+            cards: 卡牌列表（顺序即结果顺序）
+        """
+        self.cards = list(cards)
+        self.all_mask = (1 << len(self.cards)) - 1
+        self.id_bits = {}
+        self._search_keys = []
+        self._ngrams = {}
+        self.rarity_bits = {}
+        self.type_bits = {}
+        self.effect_mask = 0
+        self.owned_mask = 0
+        self._reset_incremental()
+
+        ngrams = self._ngrams
+        for pos, card in enumerate(self.cards):
+            bit = 1 << pos
+            card_id = getattr(card, 'id', '') or ''
+            self.id_bits[card_id] = self.id_bits.get(card_id, 0) | bit
+
+            name_key = normalize_text(getattr(card, 'name', ''))
+            id_key = normalize_text(card_id)
+            self._search_keys.append((name_key, id_key))
+
+            # n-gram倒排表（名称和ID共用）
+            grams: Set[str] = set()
+            for key in (name_key, id_key):
+                for n in range(1, NGRAM_SIZE + 1):
+                    grams.update(_iter_ngrams(key, n))
+            for gram in grams:
+                ngrams[gram] = ngrams.get(gram, 0) | bit
+
+            # 稀有度位图
+            rarity = getattr(card, 'rarity', '') or ''
+            self.rarity_bits[rarity] = self.rarity_bits.get(rarity, 0) | bit
+
+            # 类型位图
+            for card_type in set(_parse_json_list(getattr(card, 'types', []))):
+                self.type_bits[card_type] = self.type_bits.get(card_type, 0) | bit
+
+            # 效果文本标记
+            attacks = _parse_json_list(getattr(card, 'attacks', []))
+            if any(_attack_has_text(attack) for attack in attacks):
+                self.effect_mask |= bit
+
+        print(f"🗂️ 图鉴索引构建完成: {len(self.cards)} 张卡牌, {len(ngrams)} 个n-gram")
+
+    def set_owned(self, owned_ids: Iterable[str]):
+        """
+        更新拥有状态位图
+
+        Args:
+            owned_ids: 用户拥有的卡牌ID集合
+        """
+        mask = 0
+        for card_id in owned_ids:
+            mask |= self.id_bits.get(card_id, 0)
+        self.owned_mask = mask
+
+    # ==================== 查询 ====================
+
+    def _reset_incremental(self):
+        self._last_query = ""
+        self._last_text_mask = self.all_mask
+
+    def text_mask(self, query: str) -> int:
+        """
+        获取文本匹配位图
+
+        若新查询是上一次查询的延伸（继续输入），只在上一次的结果里细化。
+
+        Args:
+            query: 搜索文本
+
+        Returns:
+            int: 匹配的位图
+        """
+        query = normalize_text(query)
+        if not query:
+            self._reset_incremental()
+            return self.all_mask
+
+        if query == self._last_query:
+            return self._last_text_mask
+
+        if self._last_query and self._last_query in query:
+            # 新查询包含旧查询，结果必为旧结果的子集
+            candidates = self._last_text_mask
+        else:
+            candidates = self.all_mask
+
+        # n-gram求交得到候选集
+        n = min(len(query), NGRAM_SIZE)
+        for gram in set(_iter_ngrams(query, n)):
+            candidates &= self._ngrams.get(gram, 0)
+            if not candidates:
+                break
+
+        # 长查询需要逐个确认子串（n-gram求交只是必要条件）
+        if candidates and len(query) > NGRAM_SIZE:
+            verified = 0
+            for pos in self.iter_positions(candidates):
+                name_key, id_key = self._search_keys[pos]
+                if query in name_key or query in id_key:
+                    verified |= 1 << pos
+            candidates = verified
+
+        self._last_query = query
+        self._last_text_mask = candidates
+        return candidates
+
+    def search(self,
+               query: str = "",
+               rarities: Set[str] = None,
+               types: Set[str] = None,
+               owned: Optional[bool] = None,
+               effects_only: bool = False) -> DexSearchResult:
+        """
+        执行过滤并计算分面计数
+
+        分面计数采用常见的"排除自身维度"语义：稀有度计数应用了除稀有度之外的
+        所有过滤条件，类型计数同理，这样按钮上显示的是点选后会得到的数量。
+
+        Args:
+            query: 搜索文本（匹配名称或ID）
+            rarities: 选中的稀有度（空表示不过滤）
+            types: 选中的类型（任一匹配即可）
+            owned: True只显示已拥有，False只显示未拥有，None不过滤
+            effects_only: 只显示带效果文本的卡牌
+
+        Returns:
+            DexSearchResult: 过滤结果
+        """
+        base = self.text_mask(query)
+        if effects_only:
+            base &= self.effect_mask
+
+        rarity_mask = self._union(self.rarity_bits, rarities)
+        type_mask = self._union(self.type_bits, types)
+
+        # 收集状态维度之前的公共部分
+        facet_base = base & rarity_mask & type_mask
+        if owned is True:
+            collection_mask = self.owned_mask
+        elif owned is False:
+            collection_mask = self.all_mask & ~self.owned_mask
+        else:
+            collection_mask = self.all_mask
+
+        mask = facet_base & collection_mask
+
+        rarity_base = base & type_mask & collection_mask
+        type_base = base & rarity_mask & collection_mask
+        rarity_counts = {
+            rarity: (rarity_base & bits).bit_count()
+            for rarity, bits in self.rarity_bits.items()
+        }
+        type_counts = {
+            card_type: (type_base & bits).bit_count()
+            for card_type, bits in self.type_bits.items()
+        }
+        owned_count = (facet_base & self.owned_mask).bit_count()
+        total_count = facet_base.bit_count()
+        collection_counts = {
+            'all': total_count,
+            'owned': owned_count,
+            'missing': total_count - owned_count,
+        }
+
+        cards = [self.cards[pos] for pos in self.iter_positions(mask)]
+        return DexSearchResult(
+            mask=mask,
+            cards=cards,
+            rarity_counts=rarity_counts,
+            type_counts=type_counts,
+            collection_counts=collection_counts,
+        )
+
+    def _union(self, bits_map: Dict[str, int], keys: Optional[Set[str]]) -> int:
+        """多选维度内取并集，未选择时返回全集"""
+        if not keys:
+            return self.all_mask
+        mask = 0
+        for key in keys:
+            mask |= bits_map.get(key, 0)
+        return mask
+
+    @staticmethod
+    def iter_positions(mask: int) -> Iterable[int]:
+        """按升序枚举位图中置位的位置"""
+        # 一次性转为二进制串比逐位移位快得多（大整数的每次位运算都是O(n)）
+        bits = bin(mask)[:1:-1]
+        pos = bits.find('1')
+        while pos != -1:
+            yield pos
+            pos = bits.find('1', pos + 1)
@@ -37,11 +37,25 @@ class CardDAO:
                 set_name TEXT,
                 card_number TEXT,
                 description TEXT,
+                content_hash TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
             ''')
             
+            # 旧数据库补充内容哈希列（增量同步用）
+            columns = {row[1] for row in self.cursor.execute("PRAGMA table_info(cards)")}
+            if 'content_hash' not in columns:
+                self.cursor.execute("ALTER TABLE cards ADD COLUMN content_hash TEXT")
+            
+            # 卡牌目录同步状态（目录版本、源文件指纹等）
+            self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS catalog_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+            ''')
+            
             # 创建稀有度配置表
             self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS rarity_config (
@@ -145,6 +159,83 @@ class CardDAO:
             print(f"批量插入事务失败: {e}")
             return 0, len(cards)
     
+    # 目录增量同步相关方法
+    def get_card_sync_state(self) -> Dict[str, Tuple[Optional[str], str]]:
+        """
+        获取所有卡牌的同步状态
+        
+        Returns:
+            {卡牌ID: (内容哈希, 图片路径)}
+        """
+        try:
+            self.cursor.execute("SELECT id, content_hash, image_path FROM cards")
+            return {row[0]: (row[1], row[2] or '') for row in self.cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"获取卡牌同步状态失败: {e}")
+            return {}
+    
+    def get_catalog_meta(self, key: str, default: str = None) -> Optional[str]:
+        """读取目录同步状态值"""
+        try:
+            self.cursor.execute("SELECT value FROM catalog_meta WHERE key = ?", (key,))
+            row = self.cursor.fetchone()
+            return row[0] if row else default
+        except sqlite3.Error:
+            return default
+    
+    def apply_card_delta(self,
+                         upserts: List[Tuple],
+                         deletes: List[str],
+                         meta: Dict[str, str] = None) -> bool:
+        """
+        在单个事务中应用卡牌目录差异
+        
+        Args:
+            upserts: 新增/变更的行 (id, name, hp, types, rarity, attacks, image_path,
+                     set_name, card_number, description, content_hash)
+            deletes: 需要删除的卡牌ID
+            meta: 同时写入 catalog_meta 的键值
+        
+        Returns:
+            成功标志
+        """
+        try:
+            if self.connection.in_transaction:
+                self.connection.commit()
+            self.cursor.execute("BEGIN")
+            if upserts:
+                # 使用UPSERT而非INSERT OR REPLACE：REPLACE会先删除旧行，触发user_cards的级联删除
+                self.cursor.executemany('''
+                INSERT INTO cards
+                (id, name, hp, types, rarity, attacks, image_path, set_name, card_number, description, content_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name,
+                    hp = excluded.hp,
+                    types = excluded.types,
+                    rarity = excluded.rarity,
+                    attacks = excluded.attacks,
+                    image_path = excluded.image_path,
+                    set_name = excluded.set_name,
+                    card_number = excluded.card_number,
+                    description = excluded.description,
+                    content_hash = excluded.content_hash,
+                    updated_at = CURRENT_TIMESTAMP
+                ''', upserts)
+            if deletes:
+                self.cursor.executemany("DELETE FROM cards WHERE id = ?", [(card_id,) for card_id in deletes])
+            if meta:
+                self.cursor.executemany(
+                    "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)",
+                    [(key, str(value)) for key, value in meta.items()]
+                )
+            self.connection.commit()
+            return True
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"应用卡牌目录差异失败: {e}")
+            return False
+    
     def get_card_by_id(self, card_id: str) -> Optional[Card]:
         """
         根据ID获取卡牌
@@ -624,6 +715,37 @@ class CardDAO:
             print(f"插入稀有度配置失败: {e}")
             return False
     
+    def insert_rarity_configs_batch(self, configs: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        在单个事务中批量写入稀有度配置
+        
+        Args:
+            configs: {稀有度: {'probability', 'dust_value', 'sort_order', 'description'}}
+        
+        Returns:
+            成功标志
+        """
+        rows = [
+            (rarity,
+             config["probability"],
+             config.get("dust_value", 0),
+             config.get("sort_order", 0),
+             config.get("description", ""))
+            for rarity, config in configs.items()
+        ]
+        try:
+            self.cursor.executemany('''
+            INSERT OR REPLACE INTO rarity_config (rarity, probability, dust_value, sort_order, description)
+            VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+            
+            self.connection.commit()
+            return True
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"批量插入稀有度配置失败: {e}")
+            return False
+    
     def get_rarity_config(self) -> Dict[str, Dict[str, Any]]:
         """
         获取稀有度配置
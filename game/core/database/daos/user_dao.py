@@ -4,9 +4,10 @@
 """
 
 import sqlite3
-import hashlib
 from datetime import datetime
 
+from game.core.auth import password_hasher
+
 class UserDAO:
     """用户数据访问对象，处理用户相关的数据库操作"""
     
@@ -42,7 +43,7 @@ class UserDAO:
     
     def hash_password(self, password):
         """
-        对密码进行哈希处理
+        对密码进行哈希处理（scrypt，带盐与参数，见 password_hasher）
         
         Args:
             password: 原始密码
@@ -50,10 +51,9 @@ class UserDAO:
         Returns:
             哈希后的密码
         """
-        # 使用SHA-256进行哈希，实际生产环境建议使用bcrypt
-        return hashlib.sha256(password.encode()).hexdigest()
+        return password_hasher.hash_password(password)
     
-    def create_user(self, username, password, email=None):
+    def create_user(self, username, password, email=None, password_hash=None):
         """
         创建新用户
         
@@ -61,6 +61,7 @@ class UserDAO:
             username: 用户名
             password: 密码
             email: 邮箱（可选）
+            password_hash: 已在别处（如服务器进程池）计算好的哈希，给出时不再计算
         
         Returns:
             (成功标志, 用户ID或错误消息)
@@ -71,7 +72,7 @@ class UserDAO:
                 return False, "El nombre de usuario ya existe"
             
             # 哈希密码
-            hashed_password = self.hash_password(password)
+            hashed_password = password_hash or self.hash_password(password)
             
             # 插入新用户
             self.cursor.execute(
@@ -98,25 +99,58 @@ class UserDAO:
         Returns:
             (成功标志, 用户ID或错误消息)
         """
+        credentials = self.get_credentials(username)
+        if credentials is None or not password_hasher.verify_password(password, credentials[1]):
+            return False, "Nombre de usuario o contraseña incorrectos"
+        
+        user_id, stored_hash = credentials
+        # 旧版SHA-256哈希在验证成功后改存新格式
+        if password_hasher.needs_rehash(stored_hash):
+            self.set_password_hash(user_id, self.hash_password(password))
+        return True, user_id
+    
+    def get_credentials(self, username):
+        """
+        获取用户ID与密码哈希（供在别处验证密码）
+        
+        Args:
+            username: 用户名
+        
+        Returns:
+            (用户ID, 密码哈希) 或 None
+        """
         try:
-            # 哈希密码
-            hashed_password = self.hash_password(password)
-            
-            # 验证用户名和密码
             self.cursor.execute(
-                "SELECT id FROM users WHERE username = ? AND password = ? AND is_active = 1",
-                (username, hashed_password)
+                "SELECT id, password FROM users WHERE username = ? AND is_active = 1",
+                (username,)
             )
-            user = self.cursor.fetchone()
-            
-            if user:
-                return True, user[0]
-            else:
-                return False, "Nombre de usuario o contraseña incorrectos"
-                
+            row = self.cursor.fetchone()
+            return (row[0], row[1]) if row else None
         except sqlite3.Error as e:
             print(f"用户认证失败: {e}")
-            return False, f"Error de autenticación: {str(e)}"
+            return None
+    
+    def set_password_hash(self, user_id, password_hash):
+        """
+        直接保存密码哈希（重新哈希旧格式时使用，不更新 updated_at）
+        
+        Args:
+            user_id: 用户ID
+            password_hash: 哈希字符串
+        
+        Returns:
+            成功标志
+        """
+        try:
+            self.cursor.execute(
+                "UPDATE users SET password = ? WHERE id = ?",
+                (password_hash, user_id)
+            )
+            self.connection.commit()
+            return self.cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"更新密码哈希失败: {e}")
+            return False
     
     def get_user_by_id(self, user_id):
         """
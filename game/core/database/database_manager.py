@@ -8,6 +8,7 @@ import os
 from datetime import datetime
 from .daos.user_dao import UserDAO
 from .daos.card_dao import CardDAO
+from .schema_version import SCHEMA_VERSION, get_version, set_version
 
 class DatabaseManager:
     """
@@ -74,7 +75,10 @@ class DatabaseManager:
                 print(f"❌ 关闭数据库连接时出错: {e}")
     
     def setup_database(self):
-        """设置数据库表结构"""
+        """设置数据库表结构（schema_version 已是当前版本时跳过）"""
+        if get_version(self.connection, "schema") == SCHEMA_VERSION:
+            return True
+        
         try:
             # 创建用户表
             if self.user_dao:
@@ -289,8 +293,9 @@ class DatabaseManager:
             # 创建索引
             self._create_indexes()
             
+            set_version(self.connection, "schema", SCHEMA_VERSION)
             self.connection.commit()
-            print("✅ 数据库表结构设置完成")
+            print(f"✅ 数据库表结构设置完成 (schema v{SCHEMA_VERSION})")
             return True
             
         except sqlite3.Error as e:
@@ -324,12 +329,12 @@ class DatabaseManager:
                 print(f"创建索引失败: {e}")
     
     # 保留原有的用户相关方法
-    def register_user(self, username, password, email=None):
-        """注册新用户"""
+    def register_user(self, username, password, email=None, password_hash=None):
+        """注册新用户（password_hash 为已计算好的哈希，可省去同步计算）"""
         if not self.user_dao:
             return False, "数据库未初始化"
         
-        success, result = self.user_dao.create_user(username, password, email)
+        success, result = self.user_dao.create_user(username, password, email, password_hash=password_hash)
         if success:
             # 创建用户游戏统计记录
             self._create_user_stats(result)
@@ -345,6 +350,18 @@ class DatabaseManager:
             return False, "数据库未初始化"
         return self.user_dao.authenticate_user(username, password)
     
+    def get_user_credentials(self, username):
+        """获取用户ID与密码哈希（在进程池中验证密码时使用）"""
+        if not self.user_dao:
+            return None
+        return self.user_dao.get_credentials(username)
+    
+    def set_user_password_hash(self, user_id, password_hash):
+        """保存重新计算的密码哈希"""
+        if not self.user_dao:
+            return False
+        return self.user_dao.set_password_hash(user_id, password_hash)
+    
     def get_user_info(self, user_id):
         """获取用户信息"""
         if not self.user_dao:
@@ -0,0 +1,60 @@
+"""
+数据库结构版本
+记录各组件（表结构、种子数据）已应用的版本，启动时版本一致即可跳过建表和种子写入
+"""
+
+import sqlite3
+from typing import Optional
+
+# 表结构版本（修改 setup_database 中的表或索引时递增）
+SCHEMA_VERSION = 2
+# 稀有度配置种子数据版本（修改 CardManager 中的稀有度配置时递增）
+RARITY_CONFIG_VERSION = 1
+
+
+def ensure_version_table(connection):
+    """创建版本表（若不存在）"""
+    connection.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        component TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+
+def get_version(connection, component: str) -> Optional[int]:
+    """
+    读取组件的已应用版本
+
+    Args:
+        connection: 数据库连接
+        component: 组件名称（如 "schema"、"rarity_config"）
+
+    Returns:
+        Optional[int]: 版本号，未记录时返回None
+    """
+    try:
+        row = connection.execute(
+            "SELECT version FROM schema_version WHERE component = ?", (component,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # 版本表尚不存在
+        return None
+    return row[0] if row else None
+
+
+def set_version(connection, component: str, version: int):
+    """
+    记录组件版本（不提交，由调用方所在事务一并提交）
+
+    Args:
+        connection: 数据库连接
+        component: 组件名称
+        version: 版本号
+    """
+    ensure_version_table(connection)
+    connection.execute('''
+    INSERT OR REPLACE INTO schema_version (component, version, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ''', (component, version))
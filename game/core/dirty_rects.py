@@ -0,0 +1,138 @@
+"""
+脏矩形渲染支持
+为SceneManager的脏矩形模式提供区域收集与静态图层缓存
+"""
+
+import pygame
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class DirtyRectTracker:
+    """
+    脏矩形收集器
+
+    组件在一帧内通过 mark() 报告变化区域，主循环用 consume() 取出结果：
+    None 表示需要整屏重绘，空列表表示本帧无需绘制。
+    """
+
+    def __init__(self, screen_size: Tuple[int, int], max_rects: int = 24, full_ratio: float = 0.6):
+        """
+        初始化收集器
+
+        Args:
+            screen_size: 屏幕尺寸
+            max_rects: 超过此数量时合并为整屏重绘
+            full_ratio: 脏区域面积超过屏幕此比例时改为整屏重绘
+        """
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.max_rects = max_rects
+        self.full_ratio = full_ratio
+        self._rects: List[pygame.Rect] = []
+        self._full = True
+
+    def resize(self, screen_size: Tuple[int, int]):
+        """屏幕尺寸变化"""
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.mark_full()
+
+    def mark(self, rect):
+        """标记一个变化区域"""
+        if self._full or rect is None:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self._rects.append(rect)
+
+    def mark_many(self, rects):
+        """标记多个变化区域（None表示整屏）"""
+        if rects is None:
+            self.mark_full()
+            return
+        for rect in rects:
+            self.mark(rect)
+
+    def mark_full(self):
+        """标记整屏重绘"""
+        self._full = True
+        self._rects.clear()
+
+    def consume(self) -> Optional[List[pygame.Rect]]:
+        """
+        取出本帧的脏矩形并重置
+
+        Returns:
+            None表示整屏重绘，否则为（可能为空的）矩形列表
+        """
+        if self._full:
+            self._full = False
+            self._rects.clear()
+            return None
+
+        rects = self._merge(self._rects)
+        self._rects = []
+
+        if len(rects) > self.max_rects:
+            return None
+        area = sum(r.width * r.height for r in rects)
+        if area > self.screen_rect.width * self.screen_rect.height * self.full_ratio:
+            return None
+        return rects
+
+    @staticmethod
+    def _merge(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """合并互相重叠的矩形"""
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.copy()
+            changed = True
+            while changed:
+                changed = False
+                for i, other in enumerate(merged):
+                    if rect.colliderect(other):
+                        rect.union_ip(merged.pop(i))
+                        changed = True
+                        break
+            merged.append(rect)
+        return merged
+
+
+class StaticLayerCache:
+    """
+    静态图层缓存
+
+    背景、Logo、导航栏底板等不随帧变化的内容只合成一次，之后整块blit；
+    部分重绘时在裁剪区域内blit即可恢复被覆盖的背景。
+    """
+
+    def __init__(self, max_layers: int = 4):
+        self.max_layers = max_layers
+        self._layers: Dict[Hashable, pygame.Surface] = {}
+
+    def get(self, key: Hashable, size: Tuple[int, int],
+            builder: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        """
+        获取静态图层（不存在时调用builder合成）
+
+        Args:
+            key: 图层内容的键（内容组合变化时应不同）
+            size: 图层尺寸
+            builder: 合成函数，接收目标表面
+
+        Returns:
+            pygame.Surface: 静态图层
+        """
+        cache_key = (key, tuple(size))
+        layer = self._layers.get(cache_key)
+        if layer is None:
+            layer = pygame.Surface(size)
+            if pygame.display.get_surface():
+                layer = layer.convert()
+            builder(layer)
+            if len(self._layers) >= self.max_layers:
+                self._layers.pop(next(iter(self._layers)))
+            self._layers[cache_key] = layer
+        return layer
+
+    def invalidate(self):
+        """清空所有图层"""
+        self._layers.clear()
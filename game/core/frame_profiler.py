@@ -0,0 +1,317 @@
+"""
+帧性能分析器
+SceneManager主循环中的事件/更新/绘制计时，加上可放入热点代码的命名区段；
+提供可切换的p50/p95/p99覆盖层，并可导出Chrome Trace（chrome://tracing、Perfetto）JSON。
+
+未启用时 span() 返回共享的空上下文，profiled 装饰器只多一次属性检查。
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pygame
+
+# 每个区段保留的最近样本数（用于滚动分位数）
+ROLLING_WINDOW = 240
+# Chrome Trace 事件缓冲上限（约几分钟的帧）
+MAX_TRACE_EVENTS = 200_000
+# 覆盖层统计刷新间隔（秒）
+OVERLAY_REFRESH = 0.25
+# 追踪文件输出目录
+TRACE_DIR = os.path.join("data", "profiles")
+
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """计时区段（上下文管理器）"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """
+    帧性能分析器
+
+    用法：
+        with get_profiler().span("dex.draw"):
+            ...
+    或者：
+        @profiled("battle.update_state")
+        def _update_battle_state(self): ...
+    """
+
+    def __init__(self, window: int = ROLLING_WINDOW, max_trace_events: int = MAX_TRACE_EVENTS):
+        """
+        初始化分析器
+
+        Args:
+            window: 每个区段的滚动样本数
+            max_trace_events: 追踪事件缓冲上限
+        """
+        self.enabled = False
+        self.window = window
+
+        self._samples: Dict[str, deque] = {}
+        self._trace: deque = deque(maxlen=max_trace_events)
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+        self._frame_start = 0.0
+        self.frame_count = 0
+
+        # 覆盖层状态
+        self._font: Optional[pygame.font.Font] = None
+        self._overlay_surface: Optional[pygame.Surface] = None
+        self._overlay_updated = 0.0
+
+    # ==================== 开关 ====================
+
+    def enable(self):
+        """启用分析器（清空旧样本）"""
+        self._samples.clear()
+        self._trace.clear()
+        self._overlay_surface = None
+        self.enabled = True
+        print("⏱️ 帧性能分析器已启用（F3 覆盖层，F4 导出追踪）")
+
+    def disable(self):
+        """停用分析器"""
+        self.enabled = False
+        print("⏱️ 帧性能分析器已停用")
+
+    def toggle(self):
+        """切换启用状态"""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    # ==================== 计时 ====================
+
+    def span(self, name: str):
+        """
+        创建命名计时区段
+
+        Args:
+            name: 区段名称（如 "scene.draw"）
+
+        Returns:
+            上下文管理器；未启用时为共享的空上下文
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, start: float, end: float):
+        """
+        记录一段耗时
+
+        Args:
+            name: 区段名称
+            start: 开始时间（perf_counter）
+            end: 结束时间（perf_counter）
+        """
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+        samples.append((end - start) * 1000.0)
+
+        self._trace.append((name, start, end, threading.get_ident()))
+
+    def begin_frame(self):
+        """标记一帧开始"""
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """标记一帧结束（记录整帧耗时，不含帧率等待）"""
+        if self.enabled and self._frame_start:
+            self.record("frame", self._frame_start, time.perf_counter())
+            self.frame_count += 1
+
+    # ==================== 统计 ====================
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], pct: float) -> float:
+        """最近秩法计算分位数"""
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+        return sorted_values[index]
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        获取各区段的滚动统计
+
+        Returns:
+            Dict[str, Dict[str, float]]: {名称: {'p50','p95','p99','last','count'}}，单位毫秒
+        """
+        stats = {}
+        for name, samples in self._samples.items():
+            if not samples:
+                continue
+            values = sorted(samples)
+            stats[name] = {
+                'p50': self._percentile(values, 50),
+                'p95': self._percentile(values, 95),
+                'p99': self._percentile(values, 99),
+                'last': samples[-1],
+                'count': len(samples),
+            }
+        return stats
+
+    # ==================== 覆盖层 ====================
+
+    def draw_overlay(self, screen: pygame.Surface):
+        """
+        绘制统计覆盖层（左上角）
+
+        统计文本按 OVERLAY_REFRESH 间隔重建，其余帧直接blit缓存表面。
+
+        Args:
+            screen: 目标表面
+        """
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if self._overlay_surface is None or now - self._overlay_updated >= OVERLAY_REFRESH:
+            self._overlay_surface = self._build_overlay()
+            self._overlay_updated = now
+
+        screen.blit(self._overlay_surface, (8, 8))
+
+    def overlay_rect(self) -> Optional[pygame.Rect]:
+        """覆盖层占用的区域（供脏矩形模式标记）"""
+        if not self.enabled or self._overlay_surface is None:
+            return None
+        return self._overlay_surface.get_rect(topleft=(8, 8))
+
+    def _build_overlay(self) -> pygame.Surface:
+        """重建覆盖层表面"""
+        if self._font is None:
+            self._font = pygame.font.SysFont("dejavusansmono,consolas,couriernew,monospace", 13)
+
+        stats = self.get_stats()
+        # 整帧放第一行，其余按p95降序
+        names = sorted((n for n in stats if n != "frame"), key=lambda n: -stats[n]['p95'])
+        if "frame" in stats:
+            names.insert(0, "frame")
+
+        lines = [f"{'span':<24}{'p50':>8}{'p95':>8}{'p99':>8}  (ms)"]
+        for name in names:
+            s = stats[name]
+            lines.append(f"{name[:24]:<24}{s['p50']:>8.2f}{s['p95']:>8.2f}{s['p99']:>8.2f}")
+        if "frame" in stats and stats["frame"]['p50'] > 0:
+            lines.append(f"~{1000.0 / stats['frame']['p50']:.0f} fps (work only)  frames: {self.frame_count}")
+
+        rendered = [self._font.render(line, True, (220, 255, 220)) for line in lines]
+        line_height = self._font.get_linesize()
+        width = max(surface.get_width() for surface in rendered) + 16
+        height = line_height * len(rendered) + 12
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for i, text in enumerate(rendered):
+            surface.blit(text, (8, 6 + i * line_height))
+        return surface
+
+    # ==================== Chrome Trace ====================
+
+    def dump_chrome_trace(self, path: str = None) -> Optional[str]:
+        """
+        导出Chrome Trace JSON
+
+        Args:
+            path: 输出路径（默认 data/profiles/frame_trace_<时间>.json）
+
+        Returns:
+            Optional[str]: 写入的文件路径，无数据时返回None
+        """
+        if not self._trace:
+            print("⚠️ 没有可导出的性能追踪数据")
+            return None
+
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(TRACE_DIR, f"frame_trace_{stamp}.json")
+
+        origin = self._origin
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": round((start - origin) * 1e6, 3),
+                "dur": round((end - start) * 1e6, 3),
+                "pid": self._pid,
+                "tid": tid,
+            }
+            for name, start, end, tid in self._trace
+        ]
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+        print(f"💾 性能追踪已导出: {path} ({len(events)} 个事件)")
+        return path
+
+
+_profiler: Optional[FrameProfiler] = None
+
+
+def get_profiler() -> FrameProfiler:
+    """
+    获取全局帧性能分析器
+
+    设置环境变量 PYOKEMON_PROFILE=1 时启动即启用。
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = FrameProfiler()
+        if os.environ.get("PYOKEMON_PROFILE", "0") == "1":
+            _profiler.enable()
+    return _profiler
+
+
+def profiled(name: str):
+    """
+    为函数添加命名计时区段的装饰器
+
+    Args:
+        name: 区段名称
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, start, time.perf_counter())
+        return wrapper
+    return decorator
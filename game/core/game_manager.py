@@ -13,7 +13,6 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from game.core.database.database_manager import DatabaseManager
 from game.core.cards.collection_manager import CardManager
-from game.core.battle.battle_manager import BattleManager
 from game.core.cards.card_data import Card
 
 class GameManager:
@@ -103,6 +102,7 @@ class GameManager:
             'last_update': None
         }
         self._image_cache = {}  # 图片缓存
+        self._catalog_listeners = []  # 卡牌目录变化订阅者
 
         # 🆕 检查是否需要加载卡牌缓存
         self._check_and_load_card_cache()
@@ -113,85 +113,99 @@ class GameManager:
         print(f"图片缓存系统已初始化，当前缓存大小: {len(self._image_cache)}")
 
     def _check_and_load_card_cache(self):
-        """检查并加载卡牌缓存（带持久化版本检查）"""
-        cache_info_file = "cache_info.txt"
+        """同步卡牌缓存版本（目录版本由CardManager按内容哈希增量同步维护）"""
+        self._card_cache['version'] = self.card_manager.get_catalog_version()
+        self._card_cache['all_cards'] = None
+        self._card_cache['last_update'] = None
         
-        # 读取持久化的缓存信息
-        try:
-            with open(cache_info_file, 'r') as f:
-                lines = f.read().strip().split('\n')
-                last_cache_time = float(lines[0])
-                last_cache_version = int(lines[1]) if len(lines) > 1 else 1
-        except (OSError, ValueError, IndexError):
-            last_cache_time = 0
-            last_cache_version = 0
-        
-        # 获取cards.json的修改时间
-        try:
-            cards_mtime = os.path.getmtime("card_assets/cards.json")
-        except OSError:
-            cards_mtime = 0
-        
-        # 检查是否需要更新
-        if cards_mtime > last_cache_time + 1:  # +1秒容错
-            print(f"🔄 检测到卡牌库文件更新，需要重新加载缓存...")
-            print(f"   📅 cards.json修改时间: {datetime.fromtimestamp(cards_mtime) if cards_mtime > 0 else '未知'}")
-            print(f"   📅 上次缓存时间: {datetime.fromtimestamp(last_cache_time) if last_cache_time > 0 else '从未缓存'}")
-            
-            # 🆕 关键修改：只清空缓存数据，不重置版本号
-            self._card_cache['all_cards'] = None
-            self._card_cache['version'] = last_cache_version  # 保持版本号连续性
-            self._card_cache['last_update'] = None
-            self._pending_cache_time = cards_mtime
+        delta = getattr(self.card_manager, 'last_catalog_delta', None)
+        if delta is not None and delta.changed:
+            print(f"🔄 卡牌目录已更新: {delta}")
         else:
-            print(f"✅ 卡牌库无变化，使用缓存版本 v{last_cache_version}")
-            # 🆕 关键修改：恢复完整的缓存状态，包括缓存数据
-            self._card_cache['version'] = last_cache_version
-            self._card_cache['last_update'] = last_cache_time
-            self._card_cache['all_cards'] = "CACHED"  # 🆕 标记为已缓存，避免重新加载
-            self._pending_cache_time = None
+            print(f"✅ 卡牌库无变化，使用目录版本 v{self._card_cache['version']}")
 
     def get_cached_cards(self):
-        """获取缓存的卡牌数据"""
-        # 🆕 检查是否已经有有效缓存
-        if self._card_cache['all_cards'] == "CACHED":
-            # 从数据库重新加载（这比从cards.json加载快很多）
-            print("📦 从数据库快速加载卡牌数据...")
-            cards = self.card_manager.search_cards(limit=10000)
-            self._card_cache['all_cards'] = cards
-            print(f"✅ 快速加载完成: {len(cards)} 张卡牌")
-            return cards
-        elif self._card_cache['all_cards'] is None:
-            # 需要完整加载
+        """获取缓存的卡牌数据（首次调用时从数据库加载）"""
+        if self._card_cache['all_cards'] is None:
             self._load_cards_to_cache()
         
         return self._card_cache['all_cards']
     
     def _load_cards_to_cache(self):
-        """加载卡牌到缓存"""
-        print("🔄 正在加载卡牌到缓存...")
+        """从数据库加载卡牌到缓存"""
+        print("📦 从数据库加载卡牌数据...")
         cards = self.card_manager.search_cards(limit=10000)
         self._card_cache['all_cards'] = cards
-        self._card_cache['version'] += 1  # 版本号递增
         self._card_cache['last_update'] = time.time()
-        
-        # 🆕 保存缓存信息到文件
-        try:
-            cache_info_file = "cache_info.txt"
-            with open(cache_info_file, 'w') as f:
-                # 使用实际的文件修改时间，而不是当前时间
-                cache_time = getattr(self, '_pending_cache_time', None) or time.time()
-                f.write(f"{cache_time}\n{self._card_cache['version']}")
-            print(f"💾 缓存信息已保存 (版本: v{self._card_cache['version']})")
-        except OSError as e:
-            print(f"⚠️ 无法保存缓存信息: {e}")
-        
-        print(f"✅ 卡牌缓存完成: {len(cards)} 张卡牌")
+        print(f"✅ 卡牌缓存完成: {len(cards)} 张卡牌 (v{self._card_cache['version']})")
     
     def get_card_cache_version(self):
-        """获取缓存版本号"""
+        """获取缓存版本号（即卡牌目录版本）"""
         return self._card_cache['version']
     
+    def subscribe_catalog(self, callback):
+        """
+        订阅卡牌目录变化
+        
+        Args:
+            callback: 目录变化时调用，参数为 CatalogDelta
+        """
+        if callback not in self._catalog_listeners:
+            self._catalog_listeners.append(callback)
+    
+    def unsubscribe_catalog(self, callback):
+        """取消订阅卡牌目录变化"""
+        if callback in self._catalog_listeners:
+            self._catalog_listeners.remove(callback)
+    
+    def sync_card_catalog(self, force=False):
+        """
+        增量同步 cards.json 并通知订阅者
+        
+        Args:
+            force: 忽略源文件指纹，强制比较内容
+        
+        Returns:
+            CatalogDelta: 同步结果
+        """
+        delta = self.card_manager.sync_catalog(force=force)
+        if delta.changed:
+            self._apply_catalog_delta(delta)
+        return delta
+    
+    def sync_remote_catalog(self, request):
+        """
+        从服务器下载目录差异并通知订阅者
+        
+        Args:
+            request: 发送一条消息并返回服务器响应的函数
+        
+        Returns:
+            CatalogDelta: 同步结果
+        """
+        delta = self.card_manager.sync_remote_catalog(request)
+        if delta.changed:
+            self._apply_catalog_delta(delta)
+        return delta
+    
+    def _apply_catalog_delta(self, delta):
+        """目录变化后更新本地缓存并通知订阅者"""
+        self._card_cache['version'] = delta.version
+        self._card_cache['all_cards'] = None
+        self._card_cache['last_update'] = None
+        
+        # 只清理受影响卡牌的图片
+        suffixes = tuple(path.replace('\\', '/') for path in delta.image_paths)
+        if suffixes:
+            for key in [key for key in self._image_cache if key.replace('\\', '/').endswith(suffixes)]:
+                del self._image_cache[key]
+        
+        for callback in list(self._catalog_listeners):
+            try:
+                callback(delta)
+            except Exception as e:
+                print(f"⚠️ 卡牌目录订阅者处理失败: {e}")
+    
     def invalidate_card_cache(self):
         """清理卡牌缓存（卡牌库更新时调用）"""
         print("🗑️ 清理卡牌缓存...")
@@ -748,6 +762,9 @@ class GameManager:
     # ==================== 战斗系统 ====================
     def create_battle_manager(self, player_deck_id, opponent_type="AI", opponent_id=None):
         """创建战斗管理器"""
+        # 战斗系统较重，首次开战时才导入
+        from game.core.battle.battle_manager import BattleManager
+        
         try:
             self.battle_manager = BattleManager(
                 game_manager=self,
@@ -1,6 +1,7 @@
 import pygame
 import time
 from typing import List, Optional, Tuple
+from game.scenes.styles.fonts import get_font_manager
 
 class Message:
     """消息类"""
@@ -91,14 +92,17 @@ class MessageManager:
         # 字体设置
         self.font_size_base = 16
         self.font = None
+        self.font_size = None
         self.init_font()
     
-    def init_font(self):
+    def init_font(self, font_size: int = None):
         """初始化字体"""
+        font_size = font_size or self.font_size_base
         try:
-            self.font = pygame.font.SysFont("arial", self.font_size_base)
+            self.font = pygame.font.SysFont("arial", font_size)
         except:
-            self.font = pygame.font.Font(None, self.font_size_base)
+            self.font = pygame.font.Font(None, font_size)
+        self.font_size = font_size
     
     def add_message(self, text: str, message_type: str = "info", duration: float = 3.0):
         """
@@ -163,12 +167,11 @@ class MessageManager:
         screen_width, screen_height = screen.get_size()
         
         # 计算缩放后的尺寸
+        # 字体高度与字号不一定相等，按字号判断是否需要重建
         font_size = int(self.font_size_base * scale_factor)
-        if self.font.get_height() != font_size:
-            try:
-                self.font = pygame.font.SysFont("arial", font_size)
-            except:
-                self.font = pygame.font.Font(None, font_size)
+        if self.font_size != font_size:
+            self.init_font(font_size)
+        render = get_font_manager().render_font_cached
         
         # 消息配置
         message_width = int(400 * scale_factor)
@@ -204,7 +207,7 @@ class MessageManager:
             
             # 绘制文本
             text_color = (*message.color, alpha)
-            text_surface = self.font.render(message.text, True, text_color[:3])
+            text_surface = render(self.font, message.text, True, text_color[:3])
             
             # 文本位置（居中）
             text_rect = text_surface.get_rect()
@@ -218,7 +221,7 @@ class MessageManager:
                 while self.font.size(truncated_text + "...")[0] > message_width - 2 * padding and len(truncated_text) > 0:
                     truncated_text = truncated_text[:-1]
                 truncated_text += "..."
-                text_surface = self.font.render(truncated_text, True, text_color[:3])
+                text_surface = render(self.font, truncated_text, True, text_color[:3])
             
             message_surface.blit(text_surface, (text_x, text_y))
             
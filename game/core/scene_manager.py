@@ -1,25 +1,75 @@
 import pygame
 import time
+import os
+import importlib
 from game.core.simple_transition import SimpleTransition
-from game.scenes.welcome_scene import WelcomeScene
-from game.scenes.login_scene import LoginScene
-from game.scenes.register_scene import RegisterScene
-from game.scenes.main_scene import MainScene
+from game.core.dirty_rects import DirtyRectTracker
+from game.core.frame_profiler import get_profiler
+from game.core.scene_prefetch import ScenePrefetcher
+
+# 帧率配置
+ACTIVE_FPS = 60
+IDLE_FPS = 10
+# 最后一次输入后保持全帧率的时间（秒）
+IDLE_DELAY = 0.5
+# 淡出结束后最多等待预取完成的时间（秒），超时则直接构造场景
+PREFETCH_WAIT_LIMIT = 2.0
 
 class SceneManager:
-    def __init__(self, screen):
-        """初始化场景管理器"""
+    def __init__(self, screen, dirty_rects=False, idle_fps=IDLE_FPS, launch_time=None):
+        """
+        初始化场景管理器
+        
+        Args:
+            screen: 屏幕表面
+            dirty_rects: 是否启用脏矩形渲染模式（场景需实现 get_dirty_rects）
+            idle_fps: 脏矩形模式下无动画时的帧率
+            launch_time: 进程启动时刻（perf_counter），用于报告首帧时间
+        """
         self.screen = screen
         self.scenes = {}
         self.current_scene = None
         self.transition = SimpleTransition(screen)
-        print("🎮 场景管理器初始化完成")
+        
+        # 转场淡出期间在后台预取下一个场景
+        self.prefetcher = ScenePrefetcher(self._resolve_scene_class)
+        self._switch_wait_start = None
+        
+        # 脏矩形模式
+        self.dirty_rects_enabled = dirty_rects
+        self.idle_fps = idle_fps
+        self.dirty_tracker = DirtyRectTracker(screen.get_size())
+        self._last_input_time = 0.0
+        
+        # 帧性能分析器（F3 开关覆盖层，F4 导出Chrome Trace）
+        self.profiler = get_profiler()
+        
+        # 启动计时（首帧呈现后报告一次）
+        self.launch_time = launch_time
+        self.first_frame_ms = None
+        
+        print(f"🎮 场景管理器初始化完成{'（脏矩形模式）' if dirty_rects else ''}")
     
     def add_scene(self, name, scene_class):
-        """添加场景类"""
+        """
+        添加场景类
+        
+        Args:
+            name: 场景名称
+            scene_class: 场景类，或 "模块路径:类名" 字符串（首次切换时才导入）
+        """
         self.scenes[name] = scene_class
         print(f"📝 注册场景: {name}")
     
+    def _resolve_scene_class(self, scene_name):
+        """获取场景类（延迟注册的场景在此导入）"""
+        scene_class = self.scenes[scene_name]
+        if isinstance(scene_class, str):
+            module_path, class_name = scene_class.split(":")
+            scene_class = getattr(importlib.import_module(module_path), class_name)
+            self.scenes[scene_name] = scene_class
+        return scene_class
+    
     def run(self, initial_scene):
         """运行场景管理器主循环"""
         print(f"🚀 启动场景管理器，初始场景: {initial_scene}")
@@ -35,15 +85,27 @@ class SceneManager:
         running = True
         
         while running and self.current_scene is not None:
+            profiler = self.profiler
+            profiler.begin_frame()
+            
             # 处理事件
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                    break
-                
-                # 传递事件给当前场景
-                if self.current_scene and hasattr(self.current_scene, 'handle_event'):
-                    self.current_scene.handle_event(event)
+            had_input = False
+            with profiler.span("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                        break
+                    had_input = True
+                    
+                    if event.type == pygame.VIDEORESIZE:
+                        self.dirty_tracker.resize(event.size)
+                    
+                    if event.type == pygame.KEYDOWN and self._handle_profiler_key(event):
+                        continue
+                    
+                    # 传递事件给当前场景
+                    if self.current_scene and hasattr(self.current_scene, 'handle_event'):
+                        self.current_scene.handle_event(event)
             
             if not running:
                 break
@@ -55,22 +117,104 @@ class SceneManager:
             dt = min(dt, 0.05)  # 限制最大时间步长
             
             # 更新场景管理器
-            if not self.update(dt):
+            with profiler.span("update"):
+                keep_running = self.update(dt)
+            if not keep_running:
                 print("🛑 场景管理器更新返回False，退出主循环")
                 break
             
             # 绘制
-            self.screen.fill((0, 0, 0))  # 清屏
-            self.draw()
-            pygame.display.flip()
+            with profiler.span("draw"):
+                if self._use_dirty_rects():
+                    animating = self._present_dirty(had_input, current_time)
+                else:
+                    self.screen.fill((0, 0, 0))  # 清屏
+                    self.draw()
+                    pygame.display.flip()
+                    animating = True
+            
+            profiler.end_frame()
+            
+            if self.first_frame_ms is None:
+                self._report_first_frame()
+                if os.environ.get("PYOKEMON_EXIT_AFTER_FIRST_FRAME", "0") == "1":
+                    break
             
-            # 控制帧率
-            clock.tick(60)
+            # 控制帧率（脏矩形模式下空闲时降低帧率）
+            clock.tick(ACTIVE_FPS if animating or profiler.enabled else self.idle_fps)
         
         print("🏁 场景管理器主循环结束")
         self.cleanup()
         return True
     
+    def _report_first_frame(self):
+        """报告启动到首帧呈现的耗时"""
+        if self.launch_time is None:
+            self.first_frame_ms = 0.0
+            return
+        self.first_frame_ms = (time.perf_counter() - self.launch_time) * 1000
+        # 固定格式的一行，供 tests/startup_benchmark.py 解析
+        print(f"⏱️ 首帧时间: {self.first_frame_ms:.1f} ms")
+        print(f"STARTUP_FIRST_FRAME_MS={self.first_frame_ms:.1f}")
+    
+    def _handle_profiler_key(self, event):
+        """
+        处理性能分析器快捷键
+        
+        Returns:
+            bool: 事件是否已被消费
+        """
+        if event.key == pygame.K_F3:
+            self.profiler.toggle()
+            self.dirty_tracker.mark_full()
+            return True
+        if event.key == pygame.K_F4 and self.profiler.enabled:
+            self.profiler.dump_chrome_trace()
+            return True
+        return False
+    
+    def _use_dirty_rects(self):
+        """当前场景是否走脏矩形流程"""
+        return (self.dirty_rects_enabled and self.current_scene is not None
+                and hasattr(self.current_scene, 'get_dirty_rects'))
+    
+    def _present_dirty(self, had_input, now):
+        """
+        脏矩形模式的一帧
+        
+        场景的draw()会先blit自己的静态图层，所以部分重绘时只需把绘制
+        裁剪到脏区域内，再用 display.update(rects) 提交。
+        
+        Returns:
+            bool: 是否需要保持全帧率
+        """
+        if had_input:
+            self._last_input_time = now
+        
+        # 输入后短时间内和转换期间整屏重绘（hover、焦点等状态变化无法逐一追踪）
+        recent_input = now - self._last_input_time < IDLE_DELAY
+        if recent_input or self.transition.is_busy():
+            self.dirty_tracker.mark_full()
+        else:
+            self.dirty_tracker.mark_many(self.current_scene.get_dirty_rects())
+            self.dirty_tracker.mark(self.profiler.overlay_rect())
+        
+        rects = self.dirty_tracker.consume()
+        if rects is None:
+            self.screen.fill((0, 0, 0))
+            self.draw()
+            pygame.display.flip()
+        elif rects:
+            clip = rects[0].unionall(rects[1:])
+            self.screen.set_clip(clip)
+            self.draw()
+            self.screen.set_clip(None)
+            pygame.display.update(rects)
+        
+        scene_animating = (not hasattr(self.current_scene, 'is_animating')
+                           or self.current_scene.is_animating())
+        return scene_animating or recent_input or self.transition.is_busy()
+    
     def start_scene(self, scene_name, *args, **kwargs):
         """启动初始场景"""
         return self.switch_scene(scene_name, *args, **kwargs)
@@ -80,8 +224,8 @@ class SceneManager:
         # 更新转换动画
         self.transition.update(dt)
         
-        # 检查是否需要切换场景
-        if self.transition.is_switch_ready():
+        # 检查是否需要切换场景（黑屏保持到预取完成，避免构造时再做IO）
+        if self.transition.is_switch_ready() and self._prefetch_settled(self.transition.get_target_scene()):
             target_scene = self.transition.get_target_scene()
             print(f"🔄 执行场景切换: {target_scene}")
             
@@ -98,6 +242,32 @@ class SceneManager:
         
         return True
     
+    def _prefetch_settled(self, scene_name):
+        """目标场景的预取是否已完成（或等待超时）"""
+        if self.prefetcher.is_ready(scene_name):
+            self._switch_wait_start = None
+            return True
+        
+        now = time.perf_counter()
+        if self._switch_wait_start is None:
+            self._switch_wait_start = now
+        if now - self._switch_wait_start >= PREFETCH_WAIT_LIMIT:
+            print(f"⚠️ 场景预取超时，直接切换: {scene_name}")
+            self._switch_wait_start = None
+            return True
+        return False
+    
+    def begin_transition(self, scene_name):
+        """
+        开始转场：淡出的同时在后台预取目标场景
+        
+        Args:
+            scene_name: 目标场景名
+        """
+        if scene_name in self.scenes:
+            self.prefetcher.start(scene_name)
+        self.transition.start_transition(scene_name)
+    
     def draw(self):
         """绘制场景和转换效果"""
         # 绘制当前场景
@@ -106,19 +276,22 @@ class SceneManager:
         
         # 绘制转换遮罩
         self.transition.draw()
+        
+        # 性能覆盖层（未启用时直接返回）
+        self.profiler.draw_overlay(self.screen)
     
     def scene_callback(self, result):
         """场景回调函数 - 现在只是触发转换"""
         print(f"📞 场景请求: {result}")
         
         if result == "login":
-            self.transition.start_transition("login")
+            self.begin_transition("login")
         elif result == "register":
-            self.transition.start_transition("register")
+            self.begin_transition("register")
         elif result == "back":
-            self.transition.start_transition("welcome")
+            self.begin_transition("welcome")
         elif result == "game_main":
-            self.transition.start_transition("game_main")
+            self.begin_transition("game_main")
         elif result == "exit":
             print("👋 用户退出")
             self.current_scene = None
@@ -137,13 +310,18 @@ class SceneManager:
                 self.current_scene.cleanup()
             
             # 创建新场景
-            scene_class = self.scenes[scene_name]
+            scene_class = self._resolve_scene_class(scene_name)
             self.current_scene = scene_class(
                 screen=self.screen,
                 callback=self.scene_callback,
                 *args, **kwargs
             )
             
+            self.prefetcher.finish(scene_name)
+            
+            # 新场景需要整屏绘制
+            self.dirty_tracker.mark_full()
+            
             print(f"✅ 已切换到场景: {scene_name}")
             return True
             
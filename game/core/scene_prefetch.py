@@ -0,0 +1,112 @@
+"""
+场景预取
+转场淡出期间在后台线程预热下一个场景的依赖：导入场景模块、解码图片资源与精灵图集、
+执行线程安全的数据准备（数据库同步等）。场景构造时只剩主线程上的像素格式转换和布局。
+
+场景类可以声明：
+    @classmethod
+    def get_prefetch_plan(cls) -> PrefetchPlan
+未声明的场景只预先导入模块。
+"""
+
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from game.core.asset_registry import get_asset_registry
+from game.utils.sprite_sheet_cache import preload_sprite_sheet
+
+
+@dataclass
+class PrefetchPlan:
+    """场景依赖声明"""
+    # 资源注册表中的资源ID（后台解码，acquire时在主线程转换格式）
+    assets: List[str] = field(default_factory=list)
+    # GIF路径（后台转换/解码精灵图集）
+    sprite_sheets: List[str] = field(default_factory=list)
+    # 线程安全的数据准备函数（不得创建或转换表面、不得访问当前场景）
+    tasks: List[Callable[[], None]] = field(default_factory=list)
+
+    def extend(self, other: "PrefetchPlan") -> "PrefetchPlan":
+        """合并另一个计划（用于场景汇总其子页面的依赖）"""
+        self.assets.extend(other.assets)
+        self.sprite_sheets.extend(other.sprite_sheets)
+        self.tasks.extend(other.tasks)
+        return self
+
+
+class ScenePrefetcher:
+    """
+    场景预取器
+
+    每次只预取一个场景；重复请求同一场景时不重复启动。
+    """
+
+    def __init__(self, resolve_scene_class: Callable[[str], type]):
+        """
+        初始化预取器
+
+        Args:
+            resolve_scene_class: 场景名 -> 场景类（负责导入延迟注册的模块）
+        """
+        self.resolve_scene_class = resolve_scene_class
+        self._scene_name: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self.last_duration_ms: Optional[float] = None
+
+    def start(self, scene_name: str):
+        """
+        开始在后台预取场景
+
+        Args:
+            scene_name: 场景名
+        """
+        if scene_name == self._scene_name and self._thread is not None:
+            return
+        self._scene_name = scene_name
+        self.last_duration_ms = None
+        self._thread = threading.Thread(
+            target=self._run, args=(scene_name,), name=f"prefetch-{scene_name}", daemon=True
+        )
+        self._thread.start()
+
+    def is_ready(self, scene_name: str) -> bool:
+        """
+        场景的预取是否已结束（未预取过的场景视为就绪）
+
+        Args:
+            scene_name: 场景名
+        """
+        if scene_name != self._scene_name or self._thread is None:
+            return True
+        return not self._thread.is_alive()
+
+    def finish(self, scene_name: str):
+        """场景已构造，清除预取记录（下次切换到该场景时重新预取）"""
+        if scene_name == self._scene_name:
+            self._scene_name = None
+            self._thread = None
+
+    def _run(self, scene_name: str):
+        start = time.perf_counter()
+        try:
+            scene_class = self.resolve_scene_class(scene_name)
+            get_plan = getattr(scene_class, 'get_prefetch_plan', None)
+            plan = get_plan() if get_plan else PrefetchPlan()
+        except Exception as e:
+            print(f"⚠️ 场景预取失败 {scene_name}: {e}")
+            return
+
+        if plan.assets:
+            get_asset_registry().preload(plan.assets)
+        for gif_path in plan.sprite_sheets:
+            preload_sprite_sheet(gif_path)
+        for task in plan.tasks:
+            try:
+                task()
+            except Exception as e:
+                print(f"⚠️ 预取任务失败 {getattr(task, '__name__', task)}: {e}")
+
+        self.last_duration_ms = (time.perf_counter() - start) * 1000
+        print(f"⚡ 场景预取完成: {scene_name} ({self.last_duration_ms:.0f} ms)")
@@ -1,15 +1,20 @@
 import pygame
 
+from game.scenes.animations.tween import TweenEngine
+
 class SimpleTransition:
     """简单的场景转换管理器"""
     
     def __init__(self, screen):
         self.screen = screen
         self.state = "idle"  # idle, fade_out, fade_in
-        self.alpha = 0
-        self.fade_speed = 500  # 淡化速度
+        self.fade_speed = 500  # 淡化速度（每秒alpha变化量）
         self.target_scene = None  # 目标场景名称
         
+        # 遮罩透明度为线性补间，状态切换由完成事件驱动
+        self.tweens = TweenEngine()
+        self._alpha = self.tweens.tween(0.0, 0.0, 0.0, easing="linear")
+        
         # 创建黑色遮罩
         self.overlay = pygame.Surface(screen.get_size())
         self.overlay.fill((0, 0, 0))
@@ -18,24 +23,28 @@ class SimpleTransition:
         """开始转换到目标场景"""
         print(f"🎬 开始转换到场景: {target_scene}")
         self.state = "fade_out"
-        self.alpha = 0
         self.target_scene = target_scene
+        self._alpha.cancel()
+        self._alpha = self.tweens.tween(0.0, 255.0, 255 / self.fade_speed, easing="linear",
+                                        on_complete=self._on_fade_out_complete)
+    
+    @property
+    def alpha(self):
+        """遮罩透明度"""
+        return self._alpha.value
+    
+    def _on_fade_out_complete(self):
+        self.state = "switch_ready"  # 准备切换场景
+        print(f"🔄 淡出完成，准备切换到: {self.target_scene}")
+    
+    def _on_fade_in_complete(self):
+        self.state = "idle"
+        print("✨ 转换完成")
     
     def update(self, dt):
         """更新转换状态"""
-        if self.state == "fade_out":
-            self.alpha += dt * self.fade_speed
-            if self.alpha >= 255:
-                self.alpha = 255
-                self.state = "switch_ready"  # 准备切换场景
-                print(f"🔄 淡出完成，准备切换到: {self.target_scene}")
-        
-        elif self.state == "fade_in":
-            self.alpha -= dt * self.fade_speed
-            if self.alpha <= 0:
-                self.alpha = 0
-                self.state = "idle"
-                print("✨ 转换完成")
+        self.tweens.update(dt)
+        self.tweens.dispatch_events()
     
     def draw(self):
         """绘制遮罩"""
@@ -55,6 +64,9 @@ class SimpleTransition:
         """确认场景已切换，开始淡入"""
         self.state = "fade_in"
         self.target_scene = None
+        self._alpha.cancel()
+        self._alpha = self.tweens.tween(255.0, 0.0, 255 / self.fade_speed, easing="linear",
+                                        on_complete=self._on_fade_in_complete)
         print("🎬 开始淡入")
     
     def is_busy(self):
@@ -0,0 +1,347 @@
+"""
+纹理图集
+构建步骤把小图标、UI按钮图和特效纹理按实际使用的尺寸打包成少数几张图集，并写出JSON索引；
+运行时整张图集只解码一次，各图标以子表面（subsurface）返回，不再逐个打开文件或在绘制时缩放。
+
+资源注册表在解码前会先查询图集，调用方照常使用 get_asset_registry().acquire()。
+
+构建图集（在项目根目录，资源清单需先生成）：
+    python -m game.core.texture_atlas --build
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from game.core.asset_registry import get_asset_registry
+from game.utils.particles import PARTICLE_TEXTURES
+
+# 图集输出目录与索引
+ATLAS_DIR = os.path.join("assets", "atlas")
+ATLAS_INDEX_PATH = os.path.join(ATLAS_DIR, "atlas.json")
+ATLAS_VERSION = 1
+
+# 图集内各图之间的留白（避免双线性采样时取到相邻图标的像素）
+PADDING = 1
+# 单张图集的最大宽度
+MAX_SHEET_WIDTH = 2048
+
+# 导航栏图标：24像素，悬停放大到1.1倍时为25/26像素
+NAV_ICONS = ("dex", "friends", "home", "combat", "menu")
+NAV_ICON_SIZES = [(size, size) for size in range(24, int(24 * 1.1) + 1)]
+
+# 图集内容：{图集名: [(资源ID, [尺寸...]), ...]}，尺寸None表示原始尺寸
+ATLAS_SPEC: Dict[str, List[Tuple[str, List[Optional[Tuple[int, int]]]]]] = {
+    "nav": [
+        (f"icons/{name}{suffix}", NAV_ICON_SIZES)
+        for name in NAV_ICONS for suffix in ("", "_dark")
+    ],
+    "ui": [
+        (f"icons/ui/{name}", [None])
+        for name in ("close", "close_white", "left", "left_white", "right", "right_white", "gem", "gold_coin")
+    ] + [
+        ("icons/store", [None]),
+        ("icons/magic", [None]),
+    ],
+    "effects": [
+        (f"icons/effects/{name}", [None])
+        for name in ("blue_circle", "purple_circle", "golden_circle")
+    ] + [
+        # 粒子纹理只需要一个基础尺寸，更小的档位由粒子系统生成
+        (asset_id, [size]) for asset_id, size in PARTICLE_TEXTURES.items()
+    ],
+}
+
+SizeKey = Optional[Tuple[int, int]]
+
+
+def sprite_key(asset_id: str, size: SizeKey = None) -> str:
+    """
+    图集索引中的条目键
+
+    Args:
+        asset_id: 资源ID
+        size: 尺寸（None为原始尺寸）
+
+    Returns:
+        str: 如 "icons/home@24x24"、"icons/ui/close"
+    """
+    if size is None:
+        return asset_id
+    return f"{asset_id}@{int(size[0])}x{int(size[1])}"
+
+
+# ==================== 图集构建 ====================
+
+def _shelf_pack(sizes: List[Tuple[int, int]], sheet_width: int) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    按行（shelf）排布，调用方应先按高度降序排序
+
+    Returns:
+        (每个矩形的左上角, 图集高度)
+    """
+    positions = []
+    x = y = shelf_height = 0
+    for width, height in sizes:
+        if x and x + width > sheet_width:
+            y += shelf_height + PADDING
+            x = shelf_height = 0
+        positions.append((x, y))
+        x += width + PADDING
+        shelf_height = max(shelf_height, height)
+    return positions, y + shelf_height
+
+
+def _pack_sheet(sizes: List[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], Tuple[int, int]]:
+    """
+    在若干候选宽度中选面积最小的排布
+
+    Args:
+        sizes: 按高度降序排列的矩形尺寸
+
+    Returns:
+        (每个矩形的左上角, 图集尺寸)
+    """
+    widest = max(width for width, _ in sizes)
+    total_width = sum(width + PADDING for width, _ in sizes)
+    best = None
+    for sheet_width in range(widest, min(total_width, MAX_SHEET_WIDTH) + 32, 32):
+        sheet_width = max(widest, min(sheet_width, total_width, MAX_SHEET_WIDTH))
+        positions, sheet_height = _shelf_pack(sizes, sheet_width)
+        used_width = max(x + w for (x, _), (w, _) in zip(positions, sizes))
+        if best is None or used_width * sheet_height < best[1][0] * best[1][1]:
+            best = (positions, (used_width, sheet_height))
+    return best
+
+
+def build_atlas(output_dir: str = ATLAS_DIR, index_path: str = ATLAS_INDEX_PATH) -> dict:
+    """
+    按 ATLAS_SPEC 生成图集PNG和索引
+
+    Args:
+        output_dir: 图集输出目录
+        index_path: 索引输出路径
+
+    Returns:
+        dict: 索引内容
+    """
+    start = time.perf_counter()
+    registry = get_asset_registry()
+    os.makedirs(output_dir, exist_ok=True)
+
+    index = {"version": ATLAS_VERSION, "sheets": {}, "sprites": {}}
+    for sheet_name, entries in ATLAS_SPEC.items():
+        sprites = []  # [(键, 资源ID, 表面)]
+        for asset_id, sizes in entries:
+            path = registry.path_of(asset_id)
+            if path is None:
+                print(f"⚠️ 资源不在清单中，跳过: {asset_id}")
+                continue
+            source = pygame.image.load(path)
+            for size in sizes:
+                # 与注册表运行时缩放一致（smoothscale），打包前后像素相同
+                surface = source if size is None else pygame.transform.smoothscale(source, size)
+                sprites.append((sprite_key(asset_id, size), asset_id, surface))
+
+        if not sprites:
+            continue
+
+        sprites.sort(key=lambda item: (-item[2].get_height(), -item[2].get_width(), item[0]))
+        positions, sheet_size = _pack_sheet([surface.get_size() for _, _, surface in sprites])
+
+        sheet = pygame.Surface(sheet_size, pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        for (key, asset_id, surface), position in zip(sprites, positions):
+            # 直接拷贝像素（含alpha），不与透明底混合
+            sheet.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+            index["sprites"][key] = {
+                "sheet": sheet_name,
+                "rect": [position[0], position[1], surface.get_width(), surface.get_height()],
+                "source_hash": registry.info(asset_id)["hash"],
+            }
+
+        sheet_path = os.path.join(output_dir, f"{sheet_name}.png")
+        pygame.image.save(sheet, sheet_path)
+        index["sheets"][sheet_name] = {
+            "path": sheet_path.replace(os.sep, "/"),
+            "width": sheet_size[0],
+            "height": sheet_size[1],
+        }
+        print(f"🧩 图集 {sheet_name}: {len(sprites)} 项, {sheet_size[0]}x{sheet_size[1]}")
+
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1, sort_keys=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✅ 图集索引已生成: {index_path} ({len(index['sprites'])} 项, {elapsed:.0f} ms)")
+    return index
+
+
+# ==================== 运行时加载 ====================
+
+class TextureAtlas:
+    """
+    运行时图集
+
+    索引在首次查询时读取，每张图集在首次取用其中的图标时解码一次。
+    源图哈希与资源清单不一致的条目视为过期，不从图集返回（由注册表改为读原文件）。
+    """
+
+    def __init__(self, index_path: str = ATLAS_INDEX_PATH):
+        """
+        初始化图集（不读取文件）
+
+        Args:
+            index_path: 索引路径
+        """
+        self.index_path = index_path
+        self._index: Optional[dict] = None
+        self._sheets: Dict[str, pygame.Surface] = {}
+        # 后台线程预先解码、尚未转换格式的图集
+        self._staged_sheets: Dict[str, pygame.Surface] = {}
+        self._stage_lock = threading.Lock()
+        self.sheet_loads = 0
+
+    @property
+    def index(self) -> dict:
+        """图集索引（缺失或版本不符时为空）"""
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _load_index(self) -> dict:
+        empty = {"sheets": {}, "sprites": {}}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            print(f"⚠️ 图集索引不存在: {self.index_path}（请运行 python -m game.core.texture_atlas --build）")
+            return empty
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 图集索引读取失败: {e}")
+            return empty
+        if index.get("version") != ATLAS_VERSION:
+            print("⚠️ 图集索引版本不匹配，不使用图集")
+            return empty
+        return index
+
+    def has(self, asset_id: str, size: SizeKey = None) -> bool:
+        """图集中是否有该资源的该尺寸"""
+        return sprite_key(asset_id, size) in self.index["sprites"]
+
+    def sheet_names_for(self, asset_id: str) -> List[str]:
+        """包含该资源（任意尺寸）的图集名"""
+        prefix = asset_id + "@"
+        return sorted({
+            sprite["sheet"] for key, sprite in self.index["sprites"].items()
+            if key == asset_id or key.startswith(prefix)
+        })
+
+    def _decode_sheet(self, sheet_name: str) -> Optional[pygame.Surface]:
+        info = self.index["sheets"].get(sheet_name)
+        if info is None:
+            return None
+        try:
+            return pygame.image.load(info["path"])
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"❌ 图集加载失败 {info['path']}: {e}")
+            return None
+
+    def preload_sheet(self, sheet_name: str):
+        """
+        预先解码图集（可在后台线程调用，格式转换留给主线程首次取用时）
+
+        Args:
+            sheet_name: 图集名
+        """
+        if sheet_name in self._sheets or sheet_name in self._staged_sheets:
+            return
+        sheet = self._decode_sheet(sheet_name)
+        if sheet is not None:
+            with self._stage_lock:
+                self._staged_sheets[sheet_name] = sheet
+
+    def _get_sheet(self, sheet_name: str) -> Optional[pygame.Surface]:
+        sheet = self._sheets.get(sheet_name)
+        if sheet is not None:
+            return sheet
+
+        with self._stage_lock:
+            sheet = self._staged_sheets.pop(sheet_name, None)
+        if sheet is None:
+            sheet = self._decode_sheet(sheet_name)
+            if sheet is None:
+                return None
+
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        self._sheets[sheet_name] = sheet
+        self.sheet_loads += 1
+        return sheet
+
+    def get(self, asset_id: str, size: SizeKey = None,
+            source_hash: Optional[str] = None) -> Optional[pygame.Surface]:
+        """
+        获取图集中的图标
+
+        Args:
+            asset_id: 资源ID
+            size: 尺寸（None为原始尺寸），需与打包时的尺寸完全一致
+            source_hash: 资源清单中的源图哈希，给出时与打包时的哈希比较
+
+        Returns:
+            Optional[pygame.Surface]: 图集子表面（共享，不要修改），不在图集中或已过期时为None
+        """
+        sprite = self.index["sprites"].get(sprite_key(asset_id, size))
+        if sprite is None:
+            return None
+        if source_hash and sprite.get("source_hash") and sprite["source_hash"] != source_hash:
+            return None
+
+        sheet = self._get_sheet(sprite["sheet"])
+        if sheet is None:
+            return None
+        return sheet.subsurface(pygame.Rect(sprite["rect"]))
+
+    def get_stats(self) -> dict:
+        """获取图集统计"""
+        return {
+            'sprites': len(self.index["sprites"]),
+            'sheets': len(self.index["sheets"]),
+            'sheets_loaded': len(self._sheets),
+            'sheet_loads': self.sheet_loads,
+        }
+
+
+_atlas: Optional[TextureAtlas] = None
+
+
+def get_texture_atlas() -> TextureAtlas:
+    """获取全局纹理图集"""
+    global _atlas
+    if _atlas is None:
+        _atlas = TextureAtlas()
+    return _atlas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="纹理图集工具")
+    parser.add_argument("--build", action="store_true", help="按ATLAS_SPEC打包图集并生成索引")
+    parser.add_argument("--output-dir", default=ATLAS_DIR, help="图集输出目录")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        build_atlas(output_dir=args.output_dir,
+                    index_path=os.path.join(args.output_dir, "atlas.json"))
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,87 +1,173 @@
 """
 动画管理器
 统一管理各种动画效果
+
+状态字典的接口保持不变，数值由补间引擎（tween.py）推进：
+按钮缩放为 follow 补间、闪光与淡入淡出为线性补间、呼吸为 wave 补间。
 """
 
-import pygame
-import math
-import time
+from collections.abc import MutableMapping
+
 from ..styles.theme import Theme
+from .tween import TweenEngine, follow_rate
+
+
+class AnimationState(MutableMapping):
+    """
+    动画状态字典
+
+    普通键直接存值；绑定到补间的键在读取时返回补间的当前值，写入时修改补间。
+    """
+
+    def __init__(self, **fields):
+        self._fields = dict(fields)
+        self._bindings = {}
+        self.tweens = []
+
+    def bind(self, key, getter, setter):
+        """把键绑定到取值/赋值函数"""
+        self._fields.pop(key, None)
+        self._bindings[key] = (getter, setter)
+
+    def release(self):
+        """归还全部补间槽位"""
+        for tween in self.tweens:
+            tween.cancel()
+        self.tweens.clear()
+
+    def __getitem__(self, key):
+        binding = self._bindings.get(key)
+        if binding is not None:
+            return binding[0]()
+        return self._fields[key]
+
+    def __setitem__(self, key, value):
+        binding = self._bindings.get(key)
+        if binding is not None:
+            binding[1](value)
+        else:
+            self._fields[key] = value
+
+    def __delitem__(self, key):
+        if self._bindings.pop(key, None) is None:
+            del self._fields[key]
+
+    def __iter__(self):
+        yield from self._bindings
+        yield from self._fields
+
+    def __len__(self):
+        return len(self._bindings) + len(self._fields)
+
+    def __repr__(self):
+        return f"AnimationState({dict(self)!r})"
+
 
 class AnimationManager:
     """动画管理器，处理各种动画效果"""
-    
+
     def __init__(self):
         self.animations = {}
-        self.start_time = time.time()
-    
+        # 独占的补间引擎（update() 会取走其中全部完成事件）
+        self.engine = TweenEngine()
+
     def create_button_animation(self, button_id):
         """
         创建按钮动画
-        
+
         Args:
             button_id: 按钮ID
-            
+
         Returns:
             dict: 动画状态字典
         """
         if button_id not in self.animations:
-            self.animations[button_id] = {
-                'scale': Theme.ANIMATION['scale_normal'],
-                'target_scale': Theme.ANIMATION['scale_normal'],
-                'glow': 0.0,
-                'flash': 0.0,
-                'hover': False,
-                'type': 'button'
-            }
+            anim = AnimationState(glow=0.0, hover=False, type='button')
+            scale = self.engine.follow(Theme.ANIMATION['scale_normal'],
+                                       follow_rate(Theme.ANIMATION['speed_normal']), epsilon=0.01)
+            flash = self.engine.tween(0.0, 0.0, 0.0, easing="linear")
+            anim.tweens.extend((scale, flash))
+
+            def set_flash(intensity):
+                # 闪光按每秒4的速度线性衰减到0
+                flash.value = intensity
+                flash.retarget(0.0, max(0.0, intensity) / 4)
+
+            anim.bind('scale', lambda: scale.value, lambda value: self.engine.set_value(scale, value))
+            anim.bind('target_scale', lambda: scale.target, scale.retarget)
+            anim.bind('flash', lambda: flash.value, set_flash)
+            self.animations[button_id] = anim
         return self.animations[button_id]
-    
+
     def create_fade_animation(self, fade_id, initial_alpha=255, fade_direction=-1):
         """
         创建淡入淡出动画
-        
+
         Args:
             fade_id: 动画ID
             initial_alpha: 初始透明度
             fade_direction: 淡化方向 (-1淡入, 1淡出)
-            
+
         Returns:
             dict: 动画状态字典
         """
         if fade_id not in self.animations:
-            self.animations[fade_id] = {
-                'alpha': initial_alpha,
-                'direction': fade_direction,
-                'speed': Theme.ANIMATION['fade_speed'],
-                'target_alpha': 0 if fade_direction == -1 else 255,
-                'callback': None,
-                'type': 'fade'
-            }
+            anim = AnimationState(direction=0, speed=Theme.ANIMATION['fade_speed'],
+                                  target_alpha=0 if fade_direction == -1 else 255,
+                                  callback=None, type='fade')
+            alpha = self.engine.tween(initial_alpha, initial_alpha, 0.0, easing="linear", tag=fade_id)
+            anim.tweens.append(alpha)
+
+            def set_direction(direction):
+                anim._fields['direction'] = direction
+                if direction == 0:
+                    # 停在当前透明度
+                    alpha.retarget(alpha.value, 0.0)
+                    return
+                target = 0 if direction == -1 else 255
+                anim._fields['target_alpha'] = target
+                # 每秒变化 speed * 255
+                alpha.retarget(target, abs(target - alpha.value) / (anim['speed'] * 255))
+
+            anim.bind('alpha', lambda: alpha.value, lambda value: self.engine.set_value(alpha, value))
+            anim.bind('direction', lambda: anim._fields['direction'], set_direction)
+            anim._fields['direction'] = 0
+            self.animations[fade_id] = anim
+            anim['direction'] = fade_direction
         return self.animations[fade_id]
-    
+
     def create_breath_animation(self, breath_id):
         """
         创建呼吸动画
-        
+
         Args:
             breath_id: 动画ID
-            
+
         Returns:
             dict: 动画状态字典
         """
         if breath_id not in self.animations:
-            self.animations[breath_id] = {
-                'scale': Theme.ANIMATION['breath_scale_min'],
-                'time': 0.0,
-                'speed': Theme.ANIMATION['breath_speed'],
-                'type': 'breath'
-            }
+            anim = AnimationState(type='breath')
+            self._start_breath(anim, Theme.ANIMATION['breath_speed'], 0.0)
+            self.animations[breath_id] = anim
         return self.animations[breath_id]
-    
+
+    def _start_breath(self, anim, speed, phase):
+        """（重新）创建呼吸的wave补间，保留已经过的时间"""
+        anim.release()
+        wave = self.engine.wave(Theme.ANIMATION['breath_scale_min'],
+                                Theme.ANIMATION['breath_scale_max'], speed, phase)
+        anim.tweens.append(wave)
+        anim.bind('scale', lambda: wave.value, lambda value: None)
+        anim.bind('time', lambda: wave.elapsed,
+                  lambda value: self._start_breath(anim, anim['speed'], value))
+        anim.bind('speed', lambda: speed,
+                  lambda value: self._start_breath(anim, value, wave.elapsed))
+
     def update_button_hover(self, button_id, is_hover):
         """
         更新按钮悬停状态
-        
+
         Args:
             button_id: 按钮ID
             is_hover: 是否悬停
@@ -95,22 +181,22 @@ class AnimationManager:
             else:
                 anim['target_scale'] = Theme.ANIMATION['scale_normal']
                 anim['glow'] = 0.0
-    
+
     def trigger_button_flash(self, button_id, intensity=1.0):
         """
         触发按钮闪光效果
-        
+
         Args:
             button_id: 按钮ID
             intensity: 闪光强度
         """
         anim = self.create_button_animation(button_id)
         anim['flash'] = intensity
-    
+
     def start_fade_out(self, fade_id, callback=None):
         """
         开始淡出动画
-        
+
         Args:
             fade_id: 动画ID
             callback: 完成回调函数
@@ -118,11 +204,11 @@ class AnimationManager:
         anim = self.create_fade_animation(fade_id, 0, 1)
         anim['direction'] = 1
         anim['callback'] = callback
-    
+
     def start_fade_in(self, fade_id, callback=None):
         """
         开始淡入动画
-        
+
         Args:
             fade_id: 动画ID
             callback: 完成回调函数
@@ -130,119 +216,83 @@ class AnimationManager:
         anim = self.create_fade_animation(fade_id, 255, -1)
         anim['direction'] = -1
         anim['callback'] = callback
-    
+
     def update(self, dt):
         """
         更新所有动画
-        
+
         Args:
             dt: 时间增量（秒）
-            
+
         Returns:
             list: 完成的动画回调函数列表
         """
+        self.engine.update(dt)
+
         completed_callbacks = []
-        
-        for anim_id, anim in self.animations.items():
-            if anim['type'] == 'button':
-                self._update_button_animation(anim, dt)
-            elif anim['type'] == 'fade':
-                callback = self._update_fade_animation(anim, dt)
+        for event in self.engine.poll_events():
+            anim = self.animations.get(event.tag)
+            if anim is None or anim['type'] != 'fade' or anim['direction'] == 0:
+                continue
+            direction = anim['direction']
+            anim._fields['direction'] = 0
+            # 只有淡出完成时返回回调（与原行为一致）
+            if direction == 1:
+                callback = anim['callback']
+                anim['callback'] = None
                 if callback:
                     completed_callbacks.append(callback)
-            elif anim['type'] == 'breath':
-                self._update_breath_animation(anim, dt)
-        
+
         return completed_callbacks
-    
-    def _update_button_animation(self, anim, dt):
-        """更新按钮动画"""
-        # 缩放动画
-        scale_diff = anim['target_scale'] - anim['scale']
-        if abs(scale_diff) < 0.01:
-            anim['scale'] = anim['target_scale']
-        else:
-            anim['scale'] += scale_diff * Theme.ANIMATION['speed_normal']
-        
-        # 闪光动画
-        if anim['flash'] > 0:
-            anim['flash'] -= dt * 4
-            anim['flash'] = max(0, anim['flash'])
-    
-    def _update_fade_animation(self, anim, dt):
-        """更新淡入淡出动画"""
-        if anim['direction'] != 0:
-            anim['alpha'] += anim['direction'] * anim['speed'] * dt * 255
-            
-            if anim['direction'] == -1:  # 淡入
-                if anim['alpha'] <= 0:
-                    anim['alpha'] = 0
-                    anim['direction'] = 0
-            else:  # 淡出
-                if anim['alpha'] >= 255:
-                    anim['alpha'] = 255
-                    anim['direction'] = 0
-                    # 返回回调函数
-                    callback = anim['callback']
-                    anim['callback'] = None
-                    return callback
-        
-        return None
-    
-    def _update_breath_animation(self, anim, dt):
-        """更新呼吸动画"""
-        anim['time'] += dt
-        # 使用正弦波创建平滑的呼吸效果
-        progress = (math.sin(anim['time'] * anim['speed']) + 1) / 2
-        min_scale = Theme.ANIMATION['breath_scale_min']
-        max_scale = Theme.ANIMATION['breath_scale_max']
-        anim['scale'] = min_scale + (max_scale - min_scale) * progress
-    
+
     def get_animation(self, anim_id):
         """
         获取动画状态
-        
+
         Args:
             anim_id: 动画ID
-            
+
         Returns:
             dict: 动画状态字典，如果不存在返回None
         """
         return self.animations.get(anim_id)
-    
+
     def remove_animation(self, anim_id):
         """
         移除动画
-        
+
         Args:
             anim_id: 动画ID
         """
-        if anim_id in self.animations:
-            del self.animations[anim_id]
-    
+        anim = self.animations.pop(anim_id, None)
+        if anim is not None:
+            anim.release()
+
     def clear_all(self):
         """清除所有动画"""
+        for anim in self.animations.values():
+            anim.release()
         self.animations.clear()
-    
+
     def is_animating(self, anim_id):
         """
         检查动画是否正在进行
-        
+
         Args:
             anim_id: 动画ID
-            
+
         Returns:
             bool: 是否正在动画
         """
         anim = self.animations.get(anim_id)
         if not anim:
             return False
-        
+
         if anim['type'] == 'fade':
             return anim['direction'] != 0
         elif anim['type'] == 'button':
-            return abs(anim['scale'] - anim['target_scale']) > 0.01 or anim['flash'] > 0
+            return any(tween.active for tween in anim.tweens)
         elif anim['type'] == 'breath':
             return True  # 呼吸动画始终进行
-        
-        return False
\ No newline at end of file
+
+        return False
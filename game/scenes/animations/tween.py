@@ -0,0 +1,511 @@
+"""
+补间引擎
+所有补间记录按槽位存放在定长类型数组中（起点、终点、当前值、已用时间、时长、延迟、速率…），
+引擎每帧统一推进一次：活跃补间较多且numpy已被其他模块加载时整列向量化计算，否则逐槽位计算。
+
+三种补间：
+    tween()  起点到终点、按缓动函数在固定时长内完成（淡入淡出、转场）
+    follow() 以指数衰减逼近可随时改变的目标值（悬停缩放），与帧率无关
+    wave()   在两值之间按正弦往复（呼吸），不会结束
+
+完成回调不在 update() 中直接调用，而是放入事件队列，由调用方在合适的时机 dispatch_events()。
+"""
+
+import sys
+import math
+from array import array
+from collections import deque, namedtuple
+from typing import Callable, Deque, List, Optional
+
+# 补间模式（0表示空闲槽位）
+MODE_FREE = 0
+MODE_TWEEN = 1
+MODE_FOLLOW = 2
+MODE_WAVE = 3
+
+# 活跃补间数达到该值且numpy已加载时走向量化路径（少量补间时逐个计算更快）
+VECTORIZE_MIN = 32
+
+# follow() 默认的到位阈值
+DEFAULT_EPSILON = 0.001
+
+# 完成事件
+TweenEvent = namedtuple("TweenEvent", "tween_id tag callback")
+
+
+class _ScalarOps:
+    """与numpy同名的标量运算，使缓动函数可同时用于单值和数组"""
+    pi = math.pi
+    sin = staticmethod(math.sin)
+    cos = staticmethod(math.cos)
+
+    @staticmethod
+    def where(condition, a, b):
+        return a if condition else b
+
+
+def _linear(t, ops):
+    return t
+
+
+def _in_quad(t, ops):
+    return t * t
+
+
+def _out_quad(t, ops):
+    return t * (2 - t)
+
+
+def _in_out_quad(t, ops):
+    return ops.where(t < 0.5, 2 * t * t, 1 - (-2 * t + 2) ** 2 / 2)
+
+
+def _out_cubic(t, ops):
+    return 1 - (1 - t) ** 3
+
+
+def _in_out_cubic(t, ops):
+    return ops.where(t < 0.5, 4 * t * t * t, 1 - (-2 * t + 2) ** 3 / 2)
+
+
+def _in_out_sine(t, ops):
+    return -(ops.cos(ops.pi * t) - 1) / 2
+
+
+def _out_back(t, ops):
+    c1 = 1.70158
+    return 1 + (c1 + 1) * (t - 1) ** 3 + c1 * (t - 1) ** 2
+
+
+# 缓动函数表（补间记录中只保存序号）
+EASINGS = {
+    "linear": _linear,
+    "in_quad": _in_quad,
+    "out_quad": _out_quad,
+    "in_out_quad": _in_out_quad,
+    "out_cubic": _out_cubic,
+    "in_out_cubic": _in_out_cubic,
+    "in_out_sine": _in_out_sine,
+    "out_back": _out_back,
+}
+_EASING_NAMES = list(EASINGS)
+_EASING_FUNCTIONS = list(EASINGS.values())
+
+
+def follow_rate(per_frame: float, fps: float = 60.0) -> float:
+    """
+    把"每帧靠近目标的比例"换算为 follow() 的速率，在该帧率下与原写法逐帧一致
+
+    Args:
+        per_frame: 每帧比例（如 value += (target - value) * 0.12 中的0.12）
+        fps: 原写法假定的帧率
+
+    Returns:
+        float: 每秒速率
+    """
+    return -math.log(1.0 - per_frame) * fps
+
+
+class Tween:
+    """
+    补间句柄
+
+    只保存槽位号和代数；句柄被回收或调用 cancel() 时槽位归还引擎。
+    """
+
+    __slots__ = ("_engine", "slot", "generation", "__weakref__")
+
+    def __init__(self, engine: "TweenEngine", slot: int, generation: int):
+        self._engine = engine
+        self.slot = slot
+        self.generation = generation
+
+    @property
+    def valid(self) -> bool:
+        """槽位仍属于该句柄"""
+        return self._engine._generation[self.slot] == self.generation
+
+    @property
+    def value(self) -> float:
+        """当前值"""
+        return self._engine._value[self.slot]
+
+    @value.setter
+    def value(self, value: float):
+        self._engine.set_value(self, value)
+
+    @property
+    def target(self) -> float:
+        """终点（follow为当前目标）"""
+        return self._engine._end[self.slot]
+
+    @property
+    def elapsed(self) -> float:
+        """已推进的时间（秒，含延迟）"""
+        return self._engine._elapsed[self.slot]
+
+    @property
+    def active(self) -> bool:
+        """是否仍在变化（已完成或已到位的为False）"""
+        return self.valid and self.slot in self._engine._live
+
+    def retarget(self, target: float, duration: Optional[float] = None):
+        """
+        改变终点
+
+        follow 从当前值继续逼近新目标；tween 从当前值重新开始，时长默认不变。
+
+        Args:
+            target: 新终点
+            duration: 新时长（秒，仅tween）
+        """
+        self._engine.retarget(self, target, duration)
+
+    def cancel(self):
+        """停止并归还槽位（不触发完成回调）"""
+        self._engine.release(self)
+
+    def __del__(self):
+        try:
+            self._engine.release(self)
+        except Exception:
+            pass
+
+
+class TweenEngine:
+    """
+    补间引擎
+
+    每个场景/窗口持有一个引擎，并在自己的 update(dt) 中调用一次 update(dt) 与 dispatch_events()。
+    """
+
+    def __init__(self):
+        # 每个槽位一列（定长类型数组，向量化时零拷贝转成numpy视图）
+        self._start = array("d")
+        self._end = array("d")
+        self._value = array("d")
+        self._elapsed = array("d")
+        self._duration = array("d")
+        self._delay = array("d")
+        self._rate = array("d")
+        self._epsilon = array("d")
+        self._mode = array("b")
+        self._easing = array("b")
+        self._generation = array("l")
+        self._callbacks: List[Optional[Callable[[], None]]] = []
+        self._tags: List[object] = []
+
+        self._free: List[int] = []
+        self._live = set()  # 需要每帧推进的槽位
+        self.events: Deque[TweenEvent] = deque()
+
+    # ==================== 槽位 ====================
+
+    def _allocate(self, mode: int, start: float, end: float, callback, tag) -> Tween:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._mode)
+            for column in (self._start, self._end, self._value, self._elapsed,
+                           self._duration, self._delay, self._rate, self._epsilon):
+                column.append(0.0)
+            self._mode.append(MODE_FREE)
+            self._easing.append(0)
+            self._generation.append(0)
+            self._callbacks.append(None)
+            self._tags.append(None)
+
+        self._generation[slot] += 1
+        self._mode[slot] = mode
+        self._start[slot] = start
+        self._end[slot] = end
+        self._value[slot] = start
+        self._elapsed[slot] = 0.0
+        self._duration[slot] = 0.0
+        self._delay[slot] = 0.0
+        self._rate[slot] = 0.0
+        self._epsilon[slot] = 0.0
+        self._easing[slot] = 0
+        self._callbacks[slot] = callback
+        self._tags[slot] = tag
+        self._live.add(slot)
+        return Tween(self, slot, self._generation[slot])
+
+    def release(self, tween: Tween):
+        """归还补间的槽位（句柄失效）"""
+        slot = tween.slot
+        if self._generation[slot] != tween.generation or self._mode[slot] == MODE_FREE:
+            return
+        self._generation[slot] += 1
+        self._mode[slot] = MODE_FREE
+        self._callbacks[slot] = None
+        self._tags[slot] = None
+        self._live.discard(slot)
+        self._free.append(slot)
+
+    # ==================== 创建 ====================
+
+    def tween(self, start: float, end: float, duration: float, easing: str = "out_cubic",
+              delay: float = 0.0, on_complete: Optional[Callable[[], None]] = None,
+              tag: object = None) -> Tween:
+        """
+        创建定时补间
+
+        Args:
+            start: 起点
+            end: 终点
+            duration: 时长（秒）
+            easing: 缓动函数名（见 EASINGS）
+            delay: 开始前的延迟（秒）
+            on_complete: 完成回调（进入事件队列）
+            tag: 事件中携带的标记
+
+        Returns:
+            Tween: 句柄
+        """
+        handle = self._allocate(MODE_TWEEN, start, end, on_complete, tag)
+        slot = handle.slot
+        self._duration[slot] = max(0.0, duration)
+        self._delay[slot] = max(0.0, delay)
+        self._easing[slot] = _EASING_NAMES.index(easing)
+        return handle
+
+    def follow(self, value: float, rate: float, target: Optional[float] = None,
+               epsilon: float = DEFAULT_EPSILON, on_settle: Optional[Callable[[], None]] = None,
+               tag: object = None) -> Tween:
+        """
+        创建跟随补间：value 每秒以 rate 的指数速率逼近目标，距离小于 epsilon 时到位并停止推进
+
+        Args:
+            value: 初始值
+            rate: 速率（1/秒），可由 follow_rate() 从旧的每帧比例换算
+            target: 初始目标（默认等于初始值）
+            epsilon: 到位阈值
+            on_settle: 每次到位时的回调（进入事件队列）
+            tag: 事件中携带的标记
+
+        Returns:
+            Tween: 句柄
+        """
+        target = value if target is None else target
+        handle = self._allocate(MODE_FOLLOW, value, target, on_settle, tag)
+        slot = handle.slot
+        self._rate[slot] = rate
+        self._epsilon[slot] = epsilon
+        if abs(target - value) <= epsilon:
+            self._live.discard(slot)
+        return handle
+
+    def wave(self, low: float, high: float, speed: float, phase: float = 0.0, tag: object = None) -> Tween:
+        """
+        创建正弦往复补间：value = low + (high - low) * (sin(t * speed) + 1) / 2
+
+        Args:
+            low: 最小值
+            high: 最大值
+            speed: 角速度（弧度/秒）
+            phase: 初始时间（秒）
+            tag: 标记
+
+        Returns:
+            Tween: 句柄
+        """
+        handle = self._allocate(MODE_WAVE, low, high, None, tag)
+        slot = handle.slot
+        self._rate[slot] = speed
+        self._elapsed[slot] = phase
+        self._value[slot] = low + (high - low) * (math.sin(phase * speed) + 1) / 2
+        return handle
+
+    # ==================== 修改 ====================
+
+    def retarget(self, tween: Tween, target: float, duration: Optional[float] = None):
+        """改变补间终点（见 Tween.retarget）"""
+        slot = tween.slot
+        if self._generation[slot] != tween.generation:
+            return
+        mode = self._mode[slot]
+        if mode == MODE_FOLLOW:
+            if target == self._end[slot]:
+                return
+            self._end[slot] = target
+            if abs(target - self._value[slot]) > self._epsilon[slot]:
+                self._live.add(slot)
+        elif mode == MODE_TWEEN:
+            self._start[slot] = self._value[slot]
+            self._end[slot] = target
+            self._elapsed[slot] = 0.0
+            if duration is not None:
+                self._duration[slot] = max(0.0, duration)
+            self._live.add(slot)
+
+    def set_value(self, tween: Tween, value: float):
+        """直接设置当前值（follow会继续逼近目标，进行中的tween从该值重新开始）"""
+        slot = tween.slot
+        if self._generation[slot] != tween.generation:
+            return
+        self._value[slot] = value
+        mode = self._mode[slot]
+        if mode == MODE_FOLLOW:
+            if abs(self._end[slot] - value) > self._epsilon[slot]:
+                self._live.add(slot)
+        elif mode == MODE_TWEEN and slot in self._live:
+            self._start[slot] = value
+            self._elapsed[slot] = 0.0
+
+    # ==================== 推进 ====================
+
+    def update(self, dt: float):
+        """
+        推进全部活跃补间
+
+        Args:
+            dt: 时间步长（秒）
+        """
+        if not self._live or dt <= 0:
+            return
+        if len(self._live) >= VECTORIZE_MIN and "numpy" in sys.modules:
+            self._update_vectorized(dt, sys.modules["numpy"])
+        else:
+            self._update_scalar(dt)
+
+    def _finish(self, slot: int):
+        """补间完成或跟随到位：停止推进，回调进入事件队列"""
+        self._live.discard(slot)
+        callback = self._callbacks[slot]
+        if callback is not None or self._tags[slot] is not None:
+            self.events.append(TweenEvent(slot, self._tags[slot], callback))
+
+    def _update_scalar(self, dt: float):
+        finished = []
+        for slot in self._live:
+            mode = self._mode[slot]
+            if mode == MODE_FOLLOW:
+                target = self._end[slot]
+                value = self._value[slot]
+                value += (target - value) * (1.0 - math.exp(-self._rate[slot] * dt))
+                if abs(target - value) <= self._epsilon[slot]:
+                    value = target
+                    finished.append(slot)
+                self._value[slot] = value
+            elif mode == MODE_TWEEN:
+                elapsed = self._elapsed[slot] + dt
+                self._elapsed[slot] = elapsed
+                elapsed -= self._delay[slot]
+                if elapsed < 0:
+                    continue
+                duration = self._duration[slot]
+                if elapsed >= duration:
+                    self._value[slot] = self._end[slot]
+                    finished.append(slot)
+                    continue
+                eased = _EASING_FUNCTIONS[self._easing[slot]](elapsed / duration, _ScalarOps)
+                start = self._start[slot]
+                self._value[slot] = start + (self._end[slot] - start) * eased
+            elif mode == MODE_WAVE:
+                elapsed = self._elapsed[slot] + dt
+                self._elapsed[slot] = elapsed
+                start = self._start[slot]
+                self._value[slot] = start + (self._end[slot] - start) * (math.sin(elapsed * self._rate[slot]) + 1) / 2
+        for slot in finished:
+            self._finish(slot)
+
+    def _update_vectorized(self, dt: float, np):
+        live = np.fromiter(self._live, dtype=np.int64, count=len(self._live))
+        # 定长数组的零拷贝视图（函数返回前释放，数组才能继续增长）
+        start = np.frombuffer(self._start, dtype=np.float64)
+        end = np.frombuffer(self._end, dtype=np.float64)
+        value = np.frombuffer(self._value, dtype=np.float64)
+        elapsed = np.frombuffer(self._elapsed, dtype=np.float64)
+        mode = np.frombuffer(self._mode, dtype=np.int8)[live]
+        finished = []
+
+        follow = live[mode == MODE_FOLLOW]
+        if follow.size:
+            rate = np.frombuffer(self._rate, dtype=np.float64)[follow]
+            epsilon = np.frombuffer(self._epsilon, dtype=np.float64)[follow]
+            target = end[follow]
+            current = value[follow]
+            current += (target - current) * (1.0 - np.exp(-rate * dt))
+            settled = np.abs(target - current) <= epsilon
+            current[settled] = target[settled]
+            value[follow] = current
+            finished.extend(follow[settled].tolist())
+
+        timed = live[mode == MODE_TWEEN]
+        if timed.size:
+            elapsed[timed] += dt
+            running = elapsed[timed] - np.frombuffer(self._delay, dtype=np.float64)[timed]
+            duration = np.frombuffer(self._duration, dtype=np.float64)[timed]
+            started = running >= 0
+            done = started & (running >= duration)
+            progress = np.where(done, 1.0, np.clip(running / np.maximum(duration, 1e-9), 0.0, 1.0))
+            easing = np.frombuffer(self._easing, dtype=np.int8)[timed]
+            eased = np.empty_like(progress)
+            for easing_index in np.unique(easing).tolist():
+                group = easing == easing_index
+                eased[group] = _EASING_FUNCTIONS[easing_index](progress[group], np)
+            eased[done] = 1.0
+            moving = timed[started]
+            value[moving] = start[moving] + (end[moving] - start[moving]) * eased[started]
+            finished.extend(timed[done].tolist())
+
+        waves = live[mode == MODE_WAVE]
+        if waves.size:
+            elapsed[waves] += dt
+            rate = np.frombuffer(self._rate, dtype=np.float64)[waves]
+            value[waves] = start[waves] + (end[waves] - start[waves]) * (np.sin(elapsed[waves] * rate) + 1) / 2
+
+        del start, end, value, elapsed
+        for slot in finished:
+            self._finish(slot)
+
+    # ==================== 事件 ====================
+
+    def poll_events(self) -> List[TweenEvent]:
+        """取出全部完成事件（不调用回调）"""
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+    def dispatch_events(self) -> int:
+        """
+        调用全部完成事件的回调（回调中可以创建新补间）
+
+        Returns:
+            int: 处理的事件数
+        """
+        count = 0
+        while self.events:
+            event = self.events.popleft()
+            count += 1
+            if event.callback is not None:
+                event.callback()
+        return count
+
+    # ==================== 查询 ====================
+
+    def is_animating(self) -> bool:
+        """是否有未完成的 tween/follow（wave 持续运行，不计入）"""
+        return any(self._mode[slot] != MODE_WAVE for slot in self._live)
+
+    def clear(self):
+        """停止全部补间（已有句柄全部失效）"""
+        for slot in range(len(self._mode)):
+            if self._mode[slot] != MODE_FREE:
+                self._generation[slot] += 1
+                self._mode[slot] = MODE_FREE
+                self._callbacks[slot] = None
+                self._tags[slot] = None
+                self._free.append(slot)
+        self._live.clear()
+        self.events.clear()
+
+    def get_stats(self) -> dict:
+        """获取引擎统计"""
+        return {
+            'slots': len(self._mode),
+            'free': len(self._free),
+            'live': len(self._live),
+            'events': len(self.events),
+        }
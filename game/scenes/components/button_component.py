@@ -6,11 +6,13 @@
 import pygame
 from game.scenes.styles.theme import Theme
 from game.scenes.styles import fonts
+from game.utils import ui_chrome
+from game.scenes.animations.tween import TweenEngine, follow_rate
 
 class ModernButton:
     """现代毛玻璃风格按钮组件"""
     
-    def __init__(self, rect, text, icon="", button_type="primary", font_size="md"):
+    def __init__(self, rect, text, icon="", button_type="primary", font_size="md", tweens=None):
         """
         初始化按钮
         
@@ -20,23 +22,46 @@ class ModernButton:
             icon: 按钮图标（emoji或符号）
             button_type: 按钮类型 ("primary", "secondary", "text")
             font_size: 字体大小名称
+            tweens: 所属窗口的补间引擎（由窗口统一推进；不传时按钮自带一个，在 update_animation 中推进）
         """
-        fonts.font_manager = fonts.FontManager()
+        fonts.get_font_manager()
         self.rect = rect
         self.text = text
         self.icon = icon
         self.button_type = button_type
         self.font_size = font_size
         
-        # 动画状态
-        self.scale = Theme.ANIMATION['scale_normal']
-        self.target_scale = Theme.ANIMATION['scale_normal']
+        # 动画状态（缩放与闪光由补间引擎推进）
+        self._owns_tweens = tweens is None
+        self.tweens = TweenEngine() if tweens is None else tweens
+        self._scale = self.tweens.follow(Theme.ANIMATION['scale_normal'],
+                                         follow_rate(Theme.ANIMATION['speed_normal']), epsilon=0.01)
+        self._flash = self.tweens.tween(0.0, 0.0, 0.0, easing="linear")
         self.glow = 0.0
-        self.flash = 0.0
         self.is_hover = False
-        
-        # 缓存的表面
-        self._cached_surfaces = {}
+
+    @property
+    def scale(self):
+        """当前缩放"""
+        return self._scale.value
+
+    @scale.setter
+    def scale(self, value):
+        self._scale.value = value
+
+    @property
+    def target_scale(self):
+        """目标缩放"""
+        return self._scale.target
+
+    @target_scale.setter
+    def target_scale(self, value):
+        self._scale.retarget(value)
+
+    @property
+    def flash(self):
+        """闪光强度（每秒衰减4）"""
+        return self._flash.value
     
     def update_hover(self, mouse_pos):
         """
@@ -69,21 +94,14 @@ class ModernButton:
         Args:
             dt: 时间增量
         """
-        # 缩放动画
-        scale_diff = self.target_scale - self.scale
-        if abs(scale_diff) < 0.01:
-            self.scale = self.target_scale
-        else:
-            self.scale += scale_diff * Theme.ANIMATION['speed_normal']
-        
-        # 闪光动画
-        if self.flash > 0:
-            self.flash -= dt * 4
-            self.flash = max(0, self.flash)
+        # 共享引擎由所属窗口推进
+        if self._owns_tweens:
+            self.tweens.update(dt)
     
     def trigger_flash(self, intensity=1.0):
         """触发闪光效果"""
-        self.flash = intensity
+        self._flash.value = intensity
+        self._flash.retarget(0.0, max(0.0, intensity) / 4)
     
     def draw(self, screen, scale_factor=1.0):
         """
@@ -119,118 +137,28 @@ class ModernButton:
             self._draw_flash_effect(screen, animated_rect)
     
     def _draw_button_background(self, screen, rect, scale_factor):
-        """绘制按钮背景"""
-        radius = Theme.get_scaled_size('border_radius_large', scale_factor)
-        
-        # 绘制阴影
-        if self.button_type in ["primary", "secondary"]:
-            self._draw_button_shadow(screen, rect, radius)
-        
-        # 绘制主背景
-        self._draw_main_background(screen, rect, radius)
-        
-        # 绘制高光效果
-        self._draw_highlight_effect(screen, rect, radius)
-        
-        # 绘制内部边框效果
-        self._draw_inner_border_effect(screen, rect)
-    
-    def _draw_button_shadow(self, screen, rect, radius):
-        """绘制按钮阴影"""
-        shadow_layers = 3 if self.is_hover else 2
-        shadow_offset = 8 if self.is_hover else 4
-        
-        for i in range(shadow_layers):
-            shadow_alpha = (20 - i * 6) if self.is_hover else (15 - i * 5)
-            if shadow_alpha > 0:
-                shadow_rect = rect.copy()
-                shadow_rect.x += shadow_offset + i
-                shadow_rect.y += shadow_offset + i
-                shadow_rect.width += i * 2
-                shadow_rect.height += i * 2
-                
-                shadow_surface = pygame.Surface((shadow_rect.width, shadow_rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(shadow_surface, (0, 0, 0, shadow_alpha),
-                               (0, 0, shadow_rect.width, shadow_rect.height),
-                               border_radius=radius + i)
-                
-                screen.blit(shadow_surface, (shadow_rect.x - i, shadow_rect.y - i))
-    
-    def _draw_main_background(self, screen, rect, radius):
-        """绘制主背景"""
-        # 创建背景表面
-        bg_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        
-        # 根据按钮类型选择背景色
-        if self.button_type == "primary":
-            if self.is_hover:
-                bg_base = Theme.get_color('accent_hover')
-                brighter_color = tuple(min(255, c + 25) for c in bg_base[:3])
-                bg_color = brighter_color + (220,)
-            else:
-                bg_base = Theme.get_color('accent')
-                brighter_color = tuple(min(255, c + 25) for c in bg_base[:3])
-                bg_color = brighter_color + (220,)
-        elif self.button_type == "secondary":
-            if self.is_hover:
-                bg_color = Theme.get_color('button_hover_bg') + (220,)
-            else:
-                bg_color = Theme.get_color('glass_bg_modern')[:3] + (200,)
-        else:  # text button
-            bg_color = (255, 255, 255, 0)  # 完全透明
-        
-        if bg_color[3] > 0:  # 如果不是完全透明
-            bg_surface.fill(bg_color)
-            
-            # 应用圆角蒙版
-            mask = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(mask, (255, 255, 255, 255),
-                           (0, 0, rect.width, rect.height), border_radius=radius)
-            
-            final_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            final_surface.blit(bg_surface, (0, 0))
-            final_surface.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-            
-            screen.blit(final_surface, rect.topleft)
-    
-    def _draw_highlight_effect(self, screen, rect, radius):
-        """绘制高光效果"""
+        """绘制按钮背景（阴影、背景、高光和内部边框合成后由ui_chrome缓存）"""
         if self.button_type == "text":
             return
         
-        highlight_height = rect.height // 3
-        highlight_surface = pygame.Surface((rect.width, highlight_height), pygame.SRCALPHA)
-        
-        highlight_color = Theme.get_color('button_shadow_light')[:3] + (40,)
-        pygame.draw.rect(highlight_surface, highlight_color,
-                        (0, 0, rect.width, highlight_height),
-                        border_radius=radius)
-        
-        screen.blit(highlight_surface, rect.topleft)
+        radius = Theme.get_scaled_size('border_radius_large', scale_factor)
+        button_surface = ui_chrome.glass_button(
+            rect.size,
+            radius=radius,
+            bg_color=self._get_background_color(),
+            highlight_color=Theme.get_color('button_shadow_light')[:3] + (40,),
+            hover=self.is_hover
+        )
+        screen.blit(button_surface, rect.topleft)
     
-    def _draw_inner_border_effect(self, screen, rect):
-        """绘制内部边框效果"""
-        if self.button_type == "text":
-            return
-        
-        # 顶部内侧高光
-        inner_highlight = pygame.Rect(rect.x + 1, rect.y + 1, rect.width - 2, 1)
-        highlight_surface = pygame.Surface((inner_highlight.width, inner_highlight.height), pygame.SRCALPHA)
-        highlight_surface.fill((255, 255, 255, 30))
-        screen.blit(highlight_surface, inner_highlight)
-        
-        # 底部内侧阴影
-        inner_shadow = pygame.Rect(rect.x + 1, rect.bottom - 2, rect.width - 2, 1)
-        shadow_surface = pygame.Surface((inner_shadow.width, inner_shadow.height), pygame.SRCALPHA)
-        shadow_surface.fill((0, 0, 0, 20))
-        screen.blit(shadow_surface, inner_shadow)
-        
-        # 悬停时的额外高光
+    def _get_background_color(self):
+        """根据按钮类型和悬停状态获取背景色"""
+        if self.button_type == "primary":
+            bg_base = Theme.get_color('accent_hover') if self.is_hover else Theme.get_color('accent')
+            return tuple(min(255, c + 25) for c in bg_base[:3]) + (220,)
         if self.is_hover:
-            top_glow = pygame.Rect(rect.x + 2, rect.y + 2, rect.width - 4, 1)
-            glow_surface = pygame.Surface((top_glow.width, top_glow.height), pygame.SRCALPHA)
-            glow_surface.fill((255, 255, 255, 40))
-            screen.blit(glow_surface, top_glow)
+            return Theme.get_color('button_hover_bg')[:3] + (220,)
+        return Theme.get_color('glass_bg_modern')[:3] + (200,)
     
     def _draw_button_content(self, screen, rect, screen_height, scale_factor):
         """绘制按钮内容（图标和文字）"""
@@ -291,12 +219,12 @@ class ModernButton:
         if self.flash <= 0:
             return
         
-        flash_alpha = int(self.flash * 200)
+        flash_alpha = ui_chrome.quantize(self.flash * 200)
+        if flash_alpha <= 0:
+            return
         radius = Theme.get_size('border_radius_large')
         
-        flash_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(flash_surface, (255, 255, 255, flash_alpha),
-                        (0, 0, rect.width, rect.height), border_radius=radius)
+        flash_surface = ui_chrome.rounded_rect(rect.size, (255, 255, 255, flash_alpha), radius)
         screen.blit(flash_surface, rect.topleft)
     
     def is_clicked(self, mouse_pos, mouse_button):
@@ -22,7 +22,7 @@ class ModernInput:
             is_password: 是否为密码输入框
             ui_manager: pygame-gui管理器
         """
-        fonts.font_manager = fonts.FontManager()
+        fonts.get_font_manager()
         self.rect = rect
         self.placeholder = placeholder
         self.label = label
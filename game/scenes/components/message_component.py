@@ -7,12 +7,13 @@ import pygame
 import time
 from game.scenes.styles.theme import Theme
 from game.scenes.styles import fonts
+from game.utils import ui_chrome
 
 class MessageManager:
     """消息管理器，处理各种消息提示"""
     
     def __init__(self):
-        fonts.font_manager = fonts.FontManager()
+        fonts.get_font_manager()
         self.messages = []
     
     def show_message(self, text, message_type="info", duration=3000, position="center"):
@@ -126,7 +127,8 @@ class MessageManager:
         # 绘制消息框背景
         self._draw_message_background(screen, msg_rect, message['type'], message['alpha'], scale_factor)
         
-        # 绘制文本
+        # 绘制文本（缓存的文本表面是共享的，改透明度前先复制）
+        text_surface = text_surface.copy()
         text_surface.set_alpha(message['alpha'])
         text_rect = text_surface.get_rect(center=msg_rect.center)
         screen.blit(text_surface, text_rect)
@@ -135,31 +137,16 @@ class MessageManager:
         """绘制消息背景"""
         radius = Theme.get_scaled_size('border_radius_medium', scale_factor)
         
-        # 背景色
-        bg_color = (255, 255, 255, int(220 * alpha / 255))
-        
-        # 创建背景表面
-        bg_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        bg_surface.fill(bg_color)
-        
-        # 应用圆角蒙版
-        mask = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, rect.width, rect.height), border_radius=radius)
-        
-        final_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        final_surface.blit(bg_surface, (0, 0))
-        final_surface.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+        alpha = ui_chrome.quantize(alpha)
         
-        # 设置整体透明度
-        final_surface.set_alpha(alpha)
-        screen.blit(final_surface, rect.topleft)
+        # 背景（逐像素透明度随整体透明度一起淡出）
+        bg_color = (255, 255, 255, int(220 * alpha / 255))
+        screen.blit(ui_chrome.rounded_rect(rect.size, bg_color, radius, alpha=alpha), rect.topleft)
         
-        # 绘制边框
+        # 边框
         border_color = self._get_message_color(message_type)
-        border_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(border_surface, border_color, (0, 0, rect.width, rect.height), width=2, border_radius=radius)
-        border_surface.set_alpha(alpha)
-        screen.blit(border_surface, rect.topleft)
+        screen.blit(ui_chrome.rounded_rect(rect.size, border_color, radius, width=2, alpha=alpha),
+                    rect.topleft)
     
     def _get_message_color(self, message_type):
         """获取消息类型对应的颜色"""
@@ -265,22 +252,12 @@ class ToastMessage:
         
         # 绘制背景
         radius = Theme.get_scaled_size('border_radius_medium', scale_factor)
-        bg_surface = pygame.Surface((bg_width, bg_height), pygame.SRCALPHA)
-        bg_surface.fill((255, 255, 255, 220))
-        
-        # 应用圆角
-        mask = pygame.Surface((bg_width, bg_height), pygame.SRCALPHA)
-        pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, bg_width, bg_height), border_radius=radius)
-        
-        final_bg = pygame.Surface((bg_width, bg_height), pygame.SRCALPHA)
-        final_bg.blit(bg_surface, (0, 0))
-        final_bg.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-        
-        # 设置透明度并绘制
-        final_bg.set_alpha(self.alpha)
+        final_bg = ui_chrome.rounded_rect((bg_width, bg_height), (255, 255, 255, 220), radius,
+                                          alpha=ui_chrome.quantize(self.alpha))
         screen.blit(final_bg, bg_rect.topleft)
         
-        # 绘制文本
+        # 绘制文本（缓存的文本表面是共享的，改透明度前先复制）
+        text_surface = text_surface.copy()
         text_surface.set_alpha(self.alpha)
         text_rect = text_surface.get_rect(center=bg_rect.center)
         screen.blit(text_surface, text_rect)
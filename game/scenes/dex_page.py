@@ -9,7 +9,6 @@ from pygame_gui.elements import UIButton, UITextEntryLine, UIDropDownMenu, UIVer
 from pygame_gui.core import ObjectID
 import math
 import os
-import json
 from typing import Dict, List, Optional, Set, Tuple, Any
 from enum import Enum
 
@@ -28,6 +27,19 @@ except ImportError:
     # def get_auth_manager(): return None
     get_auth_manager = lambda: None  # 添加这一行
 
+from game.core.cards.dex_search_index import DexSearchIndex
+from game.scenes.styles.fonts import get_font_manager
+from game.core.frame_profiler import profiled
+from game.scenes.animations.tween import TweenEngine
+
+# 稀有度/类型下拉菜单：(“全部”选项文本, x坐标)
+FACET_DROPDOWNS = {
+    'rarity_dropdown': ('Todas las rarezas', 340),
+    'type_dropdown': ('Todos los tipos', 510),
+}
+# “全部”选项的ID（其余选项的ID为稀有度/类型本身，显示文本带分面计数）
+FACET_ALL = '__all__'
+
 class CollectionStatus(Enum):
     """收集状态枚举"""
     ALL = "todos"           # 全部
@@ -59,7 +71,8 @@ class DexColors:
 class CardDisplay:
     """卡牌显示组件 - 性能优化版本"""
     
-    def __init__(self, card: Card, card_manager, collection_data: Dict[str, Any] = None, game_manager=None):
+    def __init__(self, card: Card, card_manager, collection_data: Dict[str, Any] = None, game_manager=None,
+                 tweens: Optional[TweenEngine] = None):
         self.card = card
         self.card_manager = card_manager  # card_manager引用
         self.game_manager = game_manager  # game_manager引用
@@ -80,9 +93,10 @@ class CardDisplay:
         self.is_owned = self.quantity > 0
         self.obtained_at = self.collection_data.get('obtained_at')
         
-        # 动画属性
-        self.hover_scale = 1.0
-        self.target_scale = 1.0
+        # 动画属性（悬停缩放为跟随补间，由页面的引擎统一推进；不传引擎时自带一个）
+        self._owns_tweens = tweens is None
+        self.tweens = TweenEngine() if tweens is None else tweens
+        self._hover = self.tweens.follow(1.0, 12.0, epsilon=0.002)
         self.shine_alpha = 0
         self.shine_offset = 0
         
@@ -94,6 +108,21 @@ class CardDisplay:
         # 预渲染静态内容
         self._create_static_surfaces()
     
+    @property
+    def hover_scale(self) -> float:
+        """当前悬停缩放"""
+        return self._hover.value
+
+    @property
+    def target_scale(self) -> float:
+        """目标悬停缩放"""
+        return self._hover.target
+
+    @property
+    def is_scaling(self) -> bool:
+        """悬停缩放是否尚未到位"""
+        return self._hover.active
+
     def _create_static_surfaces(self):
         """预创建静态表面（使用缓存优化）"""
         self.card_image = None
@@ -175,11 +204,11 @@ class CardDisplay:
         """更新动画"""
         # 检查悬停
         is_hovered = self.rect.collidepoint(mouse_pos)
-        self.target_scale = 1.08 if is_hovered else 1.0
+        self._hover.retarget(1.08 if is_hovered else 1.0)
         
-        # 平滑缩放
-        scale_diff = self.target_scale - self.hover_scale
-        self.hover_scale += scale_diff * dt * 12
+        # 平滑缩放（共享引擎由页面推进）
+        if self._owns_tweens:
+            self.tweens.update(dt)
         
         # 检查缓存
         if abs(self.hover_scale - self._last_scale) > 0.01:
@@ -326,6 +355,8 @@ class DexPage:
         self.filtered_cards: List[Card] = []
         self.user_collection: Dict[str, Dict] = {}
         self.card_displays: List[CardDisplay] = []
+        # 全部卡牌的悬停缩放补间（卡牌较多时按列向量化推进）
+        self.tweens = TweenEngine()
         
         # 滚动相关
         self.scroll_y = 0
@@ -352,6 +383,22 @@ class DexPage:
         self.collection_filter = CollectionStatus.ALL
         self.effect_cards_only = False
         
+        # 搜索索引（位图过滤 + 分面计数）
+        self.search_index = DexSearchIndex()
+        self.rarity_counts: Dict[str, int] = {}
+        self.type_counts: Dict[str, int] = {}
+        self.collection_counts: Dict[str, int] = {}
+        # 下拉菜单的取值、当前显示的选项与最近选中的选项ID
+        self.facet_values: Dict[str, List[str]] = {}
+        self.facet_options: Dict[str, List[Tuple[str, str]]] = {}
+        self.facet_selected: Dict[str, str] = {}
+        # 有焦点（可能展开着）的下拉菜单计数已变化，等它失去焦点后在 update() 中重建
+        self.facet_counts_pending = False
+        
+        # 头部字体（只创建一次，避免每帧加载）
+        self.header_title_font = pygame.font.Font(None, 32)
+        self.header_stats_font = pygame.font.Font(None, 18)
+        
         # 统计数据
         self.total_cards = 0
         self.owned_cards = 0
@@ -367,6 +414,10 @@ class DexPage:
             self._cached_version = 0
         self._card_displays_pool = {}  # CardDisplay对象池
         
+        # 订阅卡牌目录变化（增量同步后只刷新受影响的卡牌）
+        if self.game_manager and hasattr(self.game_manager, 'subscribe_catalog'):
+            self.game_manager.subscribe_catalog(self._on_catalog_changed)
+        
         # 初始化数据
         self._load_card_data()
         self._load_user_collection()
@@ -406,6 +457,9 @@ class DexPage:
             print(f"Cargar datos de las cartas falló: {e}")
             self.all_cards = []
         
+        # 重建搜索索引
+        self.search_index.build(self.all_cards)
+        
         self.total_cards = len(self.all_cards)
         print(f"📊 Finalmente cargado: {self.total_cards} cartas")  # Confirmar que se cargaron las cartas
 
@@ -466,6 +520,7 @@ class DexPage:
                         'quantity': card_info['quantity'],
                         'obtained_at': card_info['obtained_at']
                     }
+                self.search_index.set_owned(self.user_collection.keys())
                 
                 # 使用正确的键名访问统计数据
                 self.owned_cards = collection_stats['total_progress']['collected']  # 修复：使用correct key
@@ -482,6 +537,7 @@ class DexPage:
     def _reset_collection_data(self):
         """重置收集数据"""
         self.user_collection = {}
+        self.search_index.set_owned(())
         self.owned_cards = 0
         self.completion_rate = 0.0
         self.total_cards = len(self.all_cards) if hasattr(self, 'all_cards') else 0
@@ -503,25 +559,13 @@ class DexPage:
         self.ui_elements['search'].set_text_length_limit(50)
         self.ui_elements['search'].set_text("")
         
-        # 稀有度下拉菜单
-        rarities = self._get_all_rarities()
-        self.ui_elements['rarity_dropdown'] = UIDropDownMenu(
-            relative_rect=pygame.Rect(340, 20, 150, 35),
-            options_list=['Todas las rarezas'] + rarities,
-            starting_option='Todas las rarezas',
-            manager=self.ui_manager,
-            object_id=ObjectID('#rarity_dropdown')
-        )
-        
-        # 类型下拉菜单  
-        types = self._get_all_types()
-        self.ui_elements['type_dropdown'] = UIDropDownMenu(
-            relative_rect=pygame.Rect(510, 20, 150, 35),
-            options_list=['Todos los tipos'] + types,
-            starting_option='Todos los tipos',
-            manager=self.ui_manager,
-            object_id=ObjectID('#type_dropdown')
-        )
+        # 稀有度/类型下拉菜单（选项显示分面计数）
+        self.facet_values = {
+            'rarity_dropdown': self._get_all_rarities(),
+            'type_dropdown': self._get_all_types(),
+        }
+        for key in FACET_DROPDOWNS:
+            self._create_facet_dropdown(key)
         
         # 收集状态按钮组
         self.ui_elements['filter_all'] = UIButton(
@@ -608,6 +652,35 @@ class DexPage:
     #     """设置页面是否活跃"""
     #     self.is_active = active
 
+    def _facet_dropdown_options(self, key: str) -> List[Tuple[str, str]]:
+        """下拉菜单选项 (显示文本, 选项ID)，文本带当前过滤条件下的分面计数"""
+        all_text, _ = FACET_DROPDOWNS[key]
+        counts = self.rarity_counts if key == 'rarity_dropdown' else self.type_counts
+        options = [(all_text, FACET_ALL)]
+        for value in self.facet_values.get(key, []):
+            options.append((f"{value} ({counts[value]})" if value in counts else value, value))
+        return options
+    
+    def _create_facet_dropdown(self, key: str):
+        """创建（或按新的计数重建）稀有度/类型下拉菜单，保留最近选中的选项"""
+        options = self._facet_dropdown_options(key)
+        selected = self.facet_selected.get(key, FACET_ALL)
+        starting_option = next((option for option in options if option[1] == selected), options[0])
+        
+        old_dropdown = self.ui_elements.get(key)
+        if old_dropdown:
+            old_dropdown.kill()
+        
+        _, x_pos = FACET_DROPDOWNS[key]
+        self.ui_elements[key] = UIDropDownMenu(
+            relative_rect=pygame.Rect(x_pos, 20, 150, 35),
+            options_list=options,
+            starting_option=starting_option,
+            manager=self.ui_manager,
+            object_id=ObjectID('#' + key)
+        )
+        self.facet_options[key] = options
+    
     def _get_all_rarities(self) -> List[str]:
         """获取所有稀有度"""
         try:
@@ -637,60 +710,28 @@ class DexPage:
         return rows * (self.card_height + self.card_spacing) + 100
     
     def _apply_filters(self):
-        """应用过滤器"""
-        self.filtered_cards = []
+        """应用过滤器（基于搜索索引的位图求交）"""
+        if self.collection_filter == CollectionStatus.OWNED:
+            owned = True
+        elif self.collection_filter == CollectionStatus.MISSING:
+            owned = False
+        else:
+            owned = None
+        
+        result = self.search_index.search(
+            query=self.search_text,
+            rarities=self.selected_rarities,
+            types=self.selected_types,
+            owned=owned,
+            effects_only=self.effect_cards_only
+        )
+        self.filtered_cards = result.cards
         
-        for card in self.all_cards:
-            # 搜索过滤
-            if self.search_text:
-                search_lower = self.search_text.lower()
-                if (search_lower not in card.name.lower() and 
-                    search_lower not in getattr(card, 'id', '').lower()):
-                    continue
-            
-            # 稀有度过滤
-            if self.selected_rarities and getattr(card, 'rarity', '') not in self.selected_rarities:
-                continue
-            
-            # 类型过滤
-            if self.selected_types:
-                card_types = getattr(card, 'types', [])
-                if isinstance(card_types, str):
-                    try:
-                        card_types = json.loads(card_types)
-                    except:
-                        card_types = []
-                
-                if not any(card_type in self.selected_types for card_type in card_types):
-                    continue
-            
-            # 收集状态过滤
-            is_owned = getattr(card, 'id', '') in self.user_collection
-            if self.collection_filter == CollectionStatus.OWNED and not is_owned:
-                continue
-            elif self.collection_filter == CollectionStatus.MISSING and is_owned:
-                continue
-            
-            # 效果卡过滤
-            if self.effect_cards_only:
-                attacks = getattr(card, 'attacks', [])
-                if isinstance(attacks, str):
-                    try:
-                        attacks = json.loads(attacks)
-                    except:
-                        attacks = []
-                
-                has_effects = False
-                if isinstance(attacks, list):
-                    for attack in attacks:
-                        if isinstance(attack, dict) and attack.get('text', '').strip():
-                            has_effects = True
-                            break
-                
-                if not has_effects:
-                    continue
-            
-            self.filtered_cards.append(card)
+        # 分面计数（供过滤按钮显示实时数量）
+        self.rarity_counts = result.rarity_counts
+        self.type_counts = result.type_counts
+        self.collection_counts = result.collection_counts
+        self._refresh_filter_counts()
         
         # 重新创建卡牌显示组件
         self._create_card_displays()
@@ -716,7 +757,8 @@ class DexPage:
                     card, 
                     self.card_manager, 
                     collection_data,
-                    game_manager=self.game_manager  # 🆕 确保传递game_manager
+                    game_manager=self.game_manager,  # 🆕 确保传递game_manager
+                    tweens=self.tweens
                 )
             else:
                 print(f"♻️ 重用CardDisplay: {card.name} (ID: {card_id})")
@@ -767,8 +809,9 @@ class DexPage:
         # 下拉菜单事件
         elif event.type == pygame_gui.UI_DROP_DOWN_MENU_CHANGED:
             if event.ui_element == self.ui_elements.get('rarity_dropdown'):
-                selected = event.text
-                if selected == 'Todas las rarezas':
+                selected = event.selected_option_id
+                self.facet_selected['rarity_dropdown'] = selected
+                if selected == FACET_ALL:
                     self.selected_rarities.clear()
                 else:
                     # 简单切换逻辑
@@ -779,8 +822,9 @@ class DexPage:
                 self._apply_filters()
             
             elif event.ui_element == self.ui_elements.get('type_dropdown'):
-                selected = event.text
-                if selected == 'Todos los tipos':
+                selected = event.selected_option_id
+                self.facet_selected['type_dropdown'] = selected
+                if selected == FACET_ALL:
                     self.selected_types.clear()
                 else:
                     # 简单切换逻辑
@@ -879,6 +923,39 @@ class DexPage:
                 object_id=ObjectID(object_id)
             )
     
+    def _refresh_filter_counts(self):
+        """在收集状态按钮与稀有度/类型下拉菜单上显示分面计数"""
+        labels = [
+            ('filter_all', 'Todas', 'all'),
+            ('filter_owned', 'Tengo', 'owned'),
+            ('filter_missing', 'Falta', 'missing')
+        ]
+
+        for key, text, facet in labels:
+            button = self.ui_elements.get(key)
+            if button and facet in self.collection_counts:
+                button.set_text(f"{text} ({self.collection_counts[facet]})")
+
+        self._refresh_facet_dropdowns()
+
+    def _refresh_facet_dropdowns(self):
+        """
+        计数变化时重建稀有度/类型下拉菜单（下拉菜单没有修改选项文本的接口）
+
+        有焦点的菜单可能正展开着，重建会把它收起，因此推迟到失去焦点后由 update() 重试。
+        菜单自身的计数不受自身选择影响，选择选项不会让它推迟更新。
+        """
+        focused = self.ui_manager.get_focus_set() or set()
+        self.facet_counts_pending = False
+        for key in FACET_DROPDOWNS:
+            dropdown = self.ui_elements.get(key)
+            if not dropdown or self._facet_dropdown_options(key) == self.facet_options.get(key):
+                continue
+            if focused & dropdown.get_focus_set():
+                self.facet_counts_pending = True
+            else:
+                self._create_facet_dropdown(key)
+
     def _update_effect_button(self):
         """更新效果按钮样式"""
         if 'effect_toggle' in self.ui_elements:
@@ -896,6 +973,9 @@ class DexPage:
     
     def update(self, dt: float):
         """更新页面"""
+        if self.facet_counts_pending:
+            self._refresh_facet_dropdowns()
+
         # # 临时调试代码（测试完删除）
         # if hasattr(self, 'debug_timer'):
         #     self.debug_timer += dt
@@ -968,7 +1048,49 @@ class DexPage:
                 
                 # 使用真实屏幕鼠标坐标
                 card_display.update(dt, mouse_pos)
+
+        self.tweens.update(dt)
     
+    def _is_scrolling(self) -> bool:
+        """滚动动画或滚动条淡入淡出是否进行中"""
+        return abs(self.target_scroll - self.scroll_y) > 0.5 or self.scroll_bar_visible
+
+    def _visible_card_displays(self):
+        """当前可见（参与update）的卡牌显示对象"""
+        visible_start = max(0, int(self.scroll_y // (self.card_height + self.card_spacing)) * self.cards_per_row - self.cards_per_row)
+        visible_end = min(len(self.card_displays), visible_start + (self.cards_per_row * 8))
+        return self.card_displays[visible_start:visible_end]
+
+    def get_dirty_rects(self):
+        """
+        本帧可能变化的区域（供脏矩形模式使用）
+        
+        Returns:
+            滚动中返回None（整屏重绘），否则为悬停缩放未稳定的卡牌区域
+        """
+        if self._is_scrolling():
+            return None
+        
+        rects = []
+        for card_display in self._visible_card_displays():
+            if card_display.is_scaling:
+                rect = card_display.rect
+                # 覆盖最大缩放和阴影
+                rects.append(rect.inflate(int(rect.width * 0.1) + 8, int(rect.height * 0.1) + 8))
+        return rects
+
+    def is_animating(self) -> bool:
+        """
+        是否有滚动或悬停动画进行中
+        
+        Returns:
+            bool: 有动画时为True
+        """
+        if self._is_scrolling():
+            return True
+        return self.tweens.is_animating()
+
+    @profiled("dex.draw")
     def draw(self, screen: pygame.Surface):
         """绘制页面"""
 
@@ -1000,15 +1122,15 @@ class DexPage:
         header_bg.fill((*DexColors.GLASS_BG[:3], 180))
         screen.blit(header_bg, (0, 0))
         
+        render = get_font_manager().render_font_cached
+        
         # 标题
-        title_font = pygame.font.Font(None, 32)
-        title_text = title_font.render("Colección de Cartas", True, DexColors.TEXT_PRIMARY)
+        title_text = render(self.header_title_font, "Colección de Cartas", True, DexColors.TEXT_PRIMARY)
         screen.blit(title_text, (20, 120))
         
         # 统计信息
-        stats_font = pygame.font.Font(None, 18)
         stats_text = f"Colección: {self.owned_cards}/{self.total_cards} ({self.completion_rate:.1f}%) | Mostrando: {len(self.filtered_cards)} cartas"
-        stats_surface = stats_font.render(stats_text, True, DexColors.TEXT_SECONDARY)
+        stats_surface = render(self.header_stats_font, stats_text, True, DexColors.TEXT_SECONDARY)
         screen.blit(stats_surface, (self.screen_width - stats_surface.get_width() - 20, 125))
         
         # 进度条
@@ -1198,8 +1320,27 @@ class DexPage:
         
         print("✅ DexPage资源清理完成（保留缓存）")
     
+    def _on_catalog_changed(self, delta):
+        """
+        卡牌目录增量同步后的回调
+        
+        Args:
+            delta: CatalogDelta，只丢弃变化卡牌的CardDisplay，其余对象保留
+        """
+        for card_id in delta.changed_ids:
+            self._card_displays_pool.pop(card_id, None)
+        # 版本已按增量处理，避免 _load_card_data 清空整个对象池
+        self._cached_version = delta.version
+        
+        self._load_card_data()
+        self._load_user_collection()
+        self._apply_filters()
+        print(f"🔄 图鉴已刷新: {delta}")
+    
     def force_cleanup(self):
         """强制清理所有缓存（游戏退出时调用）"""
+        if self.game_manager and hasattr(self.game_manager, 'unsubscribe_catalog'):
+            self.game_manager.unsubscribe_catalog(self._on_catalog_changed)
         self._card_displays_pool.clear()
         self.cleanup()
 
@@ -7,16 +7,17 @@ import os
 import sys
 import random
 import traceback
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 from game.core.database.database_manager import DatabaseManager
+from game.utils import ui_chrome
+from game.core.asset_registry import get_asset_registry
+from game.utils.sprite_sheet_cache import load_sprite_sheet
+from game.utils.particles import import_numpy
+from game.core.scene_prefetch import PrefetchPlan
+from game.scenes.animations.tween import TweenEngine, follow_rate
 
-# 导入PIL处理GIF动画
-try:
-    from PIL import Image, ImageSequence
-    PIL_AVAILABLE = True
-except ImportError:
-    print("警告: PIL/Pillow未安装，GIF动画将不可用")
-    PIL_AVAILABLE = False
+# 左上角Logo
+LOGO_ASSET_ID = "images/logo/game_logo"
 
 # 导入窗口类
 try:
@@ -60,12 +61,8 @@ class HomePage:
 
         self.ui_manager = ui_manager
 
-        # 初始化db管理器
+        # 初始化db管理器（表结构由DatabaseManager按schema_version统一维护）
         self.db_manager = DatabaseManager()
-        if hasattr(self.db_manager, "card_dao"):
-            self.db_manager.card_dao.create_card_tables()
-        if hasattr(self.db_manager, "user_dao"):
-            self.db_manager.user_dao.create_user_table()
         
         # 基准尺寸（1344x756）
         self.base_width = 1344
@@ -142,11 +139,11 @@ class HomePage:
         self.hover_magic = False
         self.hover_sprite = False
         
-        # 动画参数
-        self.pack_hover_scale = [1.0, 1.0, 1.0]  # 三个卡包的缩放
-        self.target_pack_scale = [1.0, 1.0, 1.0]  # 目标缩放
-        self.sprite_hover_scale = 1.0
-        self.target_sprite_scale = 1.0
+        # 动画参数（悬停缩放为跟随补间，在 draw 中按帧时间统一推进；到位阈值同脏矩形判断）
+        self.tweens = TweenEngine()
+        pack_rate = follow_rate(0.12)
+        self.pack_hover_scale = [self.tweens.follow(1.0, pack_rate, epsilon=0.002) for _ in range(3)]  # 三个卡包的缩放
+        self.sprite_hover_scale = self.tweens.follow(1.0, follow_rate(0.1), epsilon=0.002)
         self.sprite_shake_offset = [0, 0]  # 抖动偏移
         self.sprite_shake_timer = 0
         self.sprite_fade_alpha = 255  # 精灵透明度
@@ -154,10 +151,8 @@ class HomePage:
         self.sprite_fade_timer = 0
         
         # 功能按钮动画参数
-        self.magic_hover_scale = 1.0
-        self.target_magic_scale = 1.0
-        self.shop_hover_scale = 1.0
-        self.target_shop_scale = 1.0
+        self.magic_hover_scale = self.tweens.follow(1.0, pack_rate, epsilon=0.002)
+        self.shop_hover_scale = self.tweens.follow(1.0, pack_rate, epsilon=0.002)
         
         # 组件区域
         self.pack_areas = []
@@ -174,6 +169,7 @@ class HomePage:
         # 卡包图片
         self.pack_images = []
         self.selected_pack_images = []
+        self._acquired_assets = []  # 从资源注册表获取的 (资源ID, 尺寸)
         self.load_pack_images()
         
         # 精灵动图
@@ -181,7 +177,11 @@ class HomePage:
         self.sprite_frames = []
         self.sprite_frame_index = 0
         self.sprite_animation_timer = 0
-        self.sprite_frame_duration = 100  # 毫秒
+        self.sprite_frame_duration = 100  # 毫秒（GIF未提供帧时长时使用）
+        self.sprite_frame_durations = []  # 每帧时长（毫秒）
+        # 绘制用的复用表面：当前帧缩放到显示尺寸后写入，淡入淡出用表面alpha
+        self._sprite_canvas = None
+        self._sprite_canvas_key = None  # (帧序号, 尺寸)
         self.load_random_sprite()
         
         # 创建布局
@@ -236,35 +236,27 @@ class HomePage:
         
         return fonts
     
+    def _acquire_asset(self, asset_id: str, size=None):
+        """从资源注册表获取表面，并记录以便cleanup时释放"""
+        surface = get_asset_registry().acquire(asset_id, size)
+        if surface is not None:
+            self._acquired_assets.append((asset_id, size))
+        return surface
+    
     def load_icons(self):
         """加载功能图标"""
-        try:
-            # 加载商店图标
-            shop_icon_path = os.path.join("assets", "icons", "store.png")
-            if os.path.exists(shop_icon_path):
-                self.shop_icon = pygame.image.load(shop_icon_path)
-                # 调整图标大小 - 适应垂直布局，占据按钮上部分空间
-                icon_size = int(120 * self.scale_factor)  # 增大图标
-                self.shop_icon = pygame.transform.smoothscale(self.shop_icon, (icon_size, icon_size))
-                print("✅ 商店图标加载成功")
-            else:
-                self.shop_icon = None
-                
-            # 加载魔法图标  
-            magic_icon_path = os.path.join("assets", "icons", "magic.png")
-            if os.path.exists(magic_icon_path):
-                self.magic_icon = pygame.image.load(magic_icon_path)
-                # 调整图标大小 - 适应垂直布局，占据按钮上部分空间
-                icon_size = int(120 * self.scale_factor)  # 增大图标
-                self.magic_icon = pygame.transform.smoothscale(self.magic_icon, (icon_size, icon_size))
-                print("✅ 魔法图标加载成功")
-            else:
-                self.magic_icon = None
-                
-        except Exception as e:
-            print(f"⚠️ 图标加载失败: {e}")
-            self.shop_icon = None
-            self.magic_icon = None
+        # 调整图标大小 - 适应垂直布局，占据按钮上部分空间
+        icon_size = int(120 * self.scale_factor)  # 增大图标
+        
+        # 加载商店图标
+        self.shop_icon = self._acquire_asset("icons/store", (icon_size, icon_size))
+        if self.shop_icon:
+            print("✅ 商店图标加载成功")
+            
+        # 加载魔法图标  
+        self.magic_icon = self._acquire_asset("icons/magic", (icon_size, icon_size))
+        if self.magic_icon:
+            print("✅ 魔法图标加载成功")
 
     def setup_ui_theme(self):
         """设置现代UI主题"""
@@ -357,25 +349,59 @@ class HomePage:
         
         self.ui_manager.get_theme().load_theme(theme_data)
     
+    # 预取时提前决定的随机选择（构造时取用一次）
+    _reserved_pack_ids = None
+    _reserved_sprite_path = None
+    
+    @staticmethod
+    def _choose_pack_ids():
+        """从清单中随机选3张卡包图片"""
+        pack_ids = get_asset_registry().list_assets("images/packets")
+        return random.sample(pack_ids, 3) if len(pack_ids) >= 3 else pack_ids
+    
+    @staticmethod
+    def _choose_sprite_path():
+        """从清单中随机选一个精灵动图（animated 及其 female/shiny 子目录），不再扫描目录"""
+        registry = get_asset_registry()
+        available_sprites = registry.list_assets(
+            "images/sprites/animated", recursive=True, extensions=(".gif",)
+        )
+        if not available_sprites:
+            return None
+        return registry.path_of(random.choice(available_sprites))
+    
+    @classmethod
+    def get_prefetch_plan(cls) -> PrefetchPlan:
+        """
+        主页依赖（由场景预取在后台线程调用）
+        
+        卡包和精灵是随机的，这里先选好并保留，构造时使用同一选择。
+        """
+        cls._reserved_pack_ids = cls._choose_pack_ids()
+        cls._reserved_sprite_path = cls._choose_sprite_path()
+        return PrefetchPlan(
+            assets=[LOGO_ASSET_ID, "icons/store", "icons/magic"] + list(cls._reserved_pack_ids),
+            sprite_sheets=[cls._reserved_sprite_path] if cls._reserved_sprite_path else [],
+            # 开包窗口的粒子效果需要numpy，提前在后台导入
+            tasks=[import_numpy],
+        )
+    
     def load_pack_images(self):
         """加载卡包图片并随机选择3张"""
-        pack_dir = os.path.join("assets", "images", "packets")
+        # 先从清单中随机选3张（预取时已选好则沿用），只解码选中的图片
+        chosen_ids = HomePage._reserved_pack_ids
+        HomePage._reserved_pack_ids = None
+        if chosen_ids is None:
+            chosen_ids = self._choose_pack_ids()
         
-        # 加载所有可用的卡包图片
         available_packs = []
-        for i in range(1, 27):  # packet1.png 到 packet26.png
-            pack_path = os.path.join(pack_dir, f"packet{i}.png")
-            if os.path.exists(pack_path):
-                try:
-                    pack_image = pygame.image.load(pack_path)
-                    available_packs.append((pack_image, f"packet{i}"))
-                    print(f"已加载卡包图片: packet{i}.png")
-                except Exception as e:
-                    print(f"加载卡包图片失败 packet{i}.png: {e}")
+        for asset_id in chosen_ids:
+            pack_image = self._acquire_asset(asset_id)
+            if pack_image is not None:
+                available_packs.append((pack_image, asset_id.rsplit("/", 1)[-1]))
         
-        # 随机选择3张卡包
         if len(available_packs) >= 3:
-            self.selected_pack_images = random.sample(available_packs, 3)
+            self.selected_pack_images = available_packs
         else:
             print(f"警告: 只找到 {len(available_packs)} 张卡包图片，需要至少3张")
             while len(available_packs) < 3:
@@ -389,29 +415,13 @@ class HomePage:
     
     def load_random_sprite(self):
         """随机加载精灵动图"""
-        if not PIL_AVAILABLE:
-            print("PIL不可用，无法加载GIF动画")
-            return
+        # 预取时已选好则沿用（图集已在后台解码），否则随机选择
+        selected_sprite = HomePage._reserved_sprite_path
+        HomePage._reserved_sprite_path = None
+        if selected_sprite is None:
+            selected_sprite = self._choose_sprite_path()
         
-        sprite_dirs = [
-            os.path.join("assets", "images", "sprites", "animated"),
-            os.path.join("assets", "images", "sprites", "animated", "female"),
-            os.path.join("assets", "images", "sprites", "animated", "shiny"),
-            os.path.join("assets", "images", "sprites", "animated", "shiny", "female")
-        ]
-        
-        # 收集所有可用的gif文件
-        available_sprites = []
-        for sprite_dir in sprite_dirs:
-            if os.path.exists(sprite_dir):
-                for filename in os.listdir(sprite_dir):
-                    if filename.lower().endswith('.gif'):
-                        sprite_path = os.path.join(sprite_dir, filename)
-                        available_sprites.append(sprite_path)
-        
-        if available_sprites:
-            # 随机选择一个精灵
-            selected_sprite = random.choice(available_sprites)
+        if selected_sprite:
             try:
                 # 加载GIF动画帧
                 self.load_gif_frames(selected_sprite)
@@ -424,24 +434,20 @@ class HomePage:
             self.sprite_frames = []
     
     def load_gif_frames(self, gif_path):
-        """加载GIF的所有帧"""
+        """加载GIF的所有帧（来自磁盘上的预解码图集，首次使用时转换）"""
         self.sprite_frames = []
-        try:
-            gif = Image.open(gif_path)
-            for frame in ImageSequence.Iterator(gif):
-                # 转换为RGBA模式
-                frame = frame.convert('RGBA')
-                # 转换为pygame surface
-                frame_surface = pygame.image.fromstring(
-                    frame.tobytes(), frame.size, 'RGBA'
-                )
-                self.sprite_frames.append(frame_surface)
-            
-            self.sprite_frame_index = 0
-            print(f"GIF加载成功，共 {len(self.sprite_frames)} 帧")
-        except Exception as e:
-            print(f"加载GIF帧失败: {e}")
-            self.sprite_frames = []
+        self.sprite_frame_durations = []
+        self._sprite_canvas_key = None
+        
+        sheet = load_sprite_sheet(gif_path)
+        if sheet is None:
+            return
+        
+        self.sprite_frames = sheet.frames
+        self.sprite_frame_durations = sheet.durations
+        self.sprite_frame_index = 0
+        self.sprite_animation_timer = 0
+        print(f"GIF加载成功，共 {len(self.sprite_frames)} 帧")
     
     def create_layout(self):
         """创建页面布局 - 弹性盒子模式"""
@@ -523,14 +529,15 @@ class HomePage:
     def load_logo(self):
         """加载Logo"""
         try:
-            logo_path = os.path.join("assets", "images", "logo", "game_logo.png")
-            if os.path.exists(logo_path):
-                self.logo = pygame.image.load(logo_path)
+            # 原图尺寸来自资源清单，不需要先解码
+            info = get_asset_registry().info(LOGO_ASSET_ID)
+            if info and info['width'] and info['height']:
                 # 调整Logo大小 - 左上角小logo
                 logo_width = int(self.screen_width * 0.16)  # 改为8%宽度
-                logo_height = int(logo_width * (self.logo.get_height() / self.logo.get_width()))
-                self.logo = pygame.transform.smoothscale(self.logo, (logo_width, logo_height))
-                print("✅ Logo加载成功")
+                logo_height = int(logo_width * (info['height'] / info['width']))
+                self.logo = self._acquire_asset(LOGO_ASSET_ID, (logo_width, logo_height))
+                if self.logo:
+                    print("✅ Logo加载成功")
         except Exception as e:
             print(f"⚠️ Logo加载失败: {e}")
 
@@ -683,6 +690,7 @@ class HomePage:
         # 关闭现有的开包窗口
         if self.active_windows['pack_opening']:
             self.active_windows['pack_opening'].close()
+            self.active_windows['pack_opening'].cleanup()
         
         # 创建新的开包窗口
         try:
@@ -782,24 +790,28 @@ class HomePage:
         for window_name, window in self.active_windows.items():
             if window and window.is_visible:
                 window.close()
+            if window and hasattr(window, 'cleanup'):
+                window.cleanup()
         self.active_windows = {key: None for key in self.active_windows.keys()}
         print("🚪 关闭所有弹出窗口")
     
-    def update_sprite_animation(self):
-        """更新精灵动画 - 包含淡出淡入效果"""
+    def update_sprite_animation(self, dt_ms: float = 16):
+        """
+        更新精灵动画 - 包含淡出淡入效果
+        
+        Args:
+            dt_ms: 距上一帧的时间（毫秒），空闲降帧时保证动画速度不变
+        """
         if not self.sprite_frames:
             return
         
         # 正常播放动画
         if self.sprite_fade_state == "normal":
-            self.sprite_animation_timer += 16
-            if self.sprite_animation_timer >= self.sprite_frame_duration:
-                self.sprite_frame_index = (self.sprite_frame_index + 1) % len(self.sprite_frames)
-                self.sprite_animation_timer = 0
+            self._advance_sprite_frames(dt_ms)
         
         # 抖动状态
         elif self.sprite_fade_state == "shaking":
-            self.sprite_shake_timer -= 16
+            self.sprite_shake_timer -= dt_ms
             if self.sprite_shake_timer <= 0:
                 # 抖动完成，开始淡出
                 self.sprite_fade_state = "fading"
@@ -812,8 +824,8 @@ class HomePage:
         
         # 淡出状态
         elif self.sprite_fade_state == "fading":
-            self.sprite_fade_timer -= 16
-            self.sprite_fade_alpha = int(255 * (self.sprite_fade_timer / 300.0))
+            self.sprite_fade_timer -= dt_ms
+            self.sprite_fade_alpha = max(0, int(255 * (self.sprite_fade_timer / 300.0)))
             
             if self.sprite_fade_timer <= 0:
                 # 淡出完成，切换精灵
@@ -824,8 +836,8 @@ class HomePage:
         
         # 切换并淡入状态
         elif self.sprite_fade_state == "switching":
-            self.sprite_fade_timer -= 16
-            self.sprite_fade_alpha = int(255 * (1.0 - self.sprite_fade_timer / 300.0))
+            self.sprite_fade_timer -= dt_ms
+            self.sprite_fade_alpha = min(255, int(255 * (1.0 - self.sprite_fade_timer / 300.0)))
             
             if self.sprite_fade_timer <= 0:
                 # 淡入完成，回到正常状态
@@ -834,28 +846,34 @@ class HomePage:
                 self.sprite_shake_offset = [0, 0]
             
             # 正常播放新精灵的动画
-            self.sprite_animation_timer += 16
-            if self.sprite_animation_timer >= self.sprite_frame_duration:
-                self.sprite_frame_index = (self.sprite_frame_index + 1) % len(self.sprite_frames)
-                self.sprite_animation_timer = 0
+            self._advance_sprite_frames(dt_ms)
+    
+    def _advance_sprite_frames(self, dt_ms: float):
+        """按经过的时间推进精灵帧（低帧率时一次可推进多帧）"""
+        self.sprite_animation_timer += dt_ms
+        while True:
+            if self.sprite_frame_index < len(self.sprite_frame_durations):
+                duration = self.sprite_frame_durations[self.sprite_frame_index]
+            else:
+                duration = self.sprite_frame_duration
+            if self.sprite_animation_timer < duration:
+                break
+            self.sprite_frame_index = (self.sprite_frame_index + 1) % len(self.sprite_frames)
+            self.sprite_animation_timer -= duration
     
     def update_button_animations(self):
         """更新按钮动画"""
         # 更新魔法按钮动画
         if self.ui_elements['magic_button'] and self.ui_elements['magic_button'].hovered:
-            self.target_magic_scale = 1.05
+            self.magic_hover_scale.retarget(1.05)
         else:
-            self.target_magic_scale = 1.0
-        
-        self.magic_hover_scale += (self.target_magic_scale - self.magic_hover_scale) * 0.12
+            self.magic_hover_scale.retarget(1.0)
         
         # 更新商店按钮动画
         if self.ui_elements['shop_button'] and self.ui_elements['shop_button'].hovered:
-            self.target_shop_scale = 1.05
+            self.shop_hover_scale.retarget(1.05)
         else:
-            self.target_shop_scale = 1.0
-        
-        self.shop_hover_scale += (self.target_shop_scale - self.shop_hover_scale) * 0.12
+            self.shop_hover_scale.retarget(1.0)
     
     def draw_luxury_button(self, screen: pygame.Surface, area_data: dict, scale: float):
         """绘制现代毛玻璃风格按钮"""
@@ -875,84 +893,20 @@ class HomePage:
         else:
             animated_rect = rect
         
-        # 现代圆角矩形阴影效果 - 更柔和
-        shadow_offset = 8 if is_hover else 4
-        shadow_blur_layers = 3 if is_hover else 2
-        shadow_radius = int(20 * self.scale_factor)  # 阴影圆角半径
-
-        for i in range(shadow_blur_layers):
-            shadow_alpha = (20 - i * 6) if is_hover else (15 - i * 5)
-            if shadow_alpha > 0:
-                shadow_rect = animated_rect.copy()
-                shadow_rect.x += shadow_offset + i
-                shadow_rect.y += shadow_offset + i
-                shadow_rect.width += i * 2
-                shadow_rect.height += i * 2
-                
-                # 创建圆角矩形阴影
-                shadow_surface = pygame.Surface((shadow_rect.width, shadow_rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(shadow_surface, (0, 0, 0, shadow_alpha), 
-                                (0, 0, shadow_rect.width, shadow_rect.height), 
-                                border_radius=shadow_radius + i)
-                
-                screen.blit(shadow_surface, (shadow_rect.x - i, shadow_rect.y - i))
-        
-        # 毛玻璃背景效果
-        radius = int(20 * self.scale_factor)
-        bg_surface = pygame.Surface((animated_rect.width, animated_rect.height), pygame.SRCALPHA)
-        
-        # 主背景 - 毛玻璃效果
+        # 阴影、毛玻璃背景、高光一次合成后缓存，按尺寸/悬停状态复用
         if is_hover:
             bg_color = (*self.colors['button_hover_bg'], 220)
         else:
             bg_color = (*self.colors['glass_bg_modern'][:3], 200)
-        
-        bg_surface.fill(bg_color)
-        
-        # 应用圆角蒙版
-        mask = pygame.Surface((animated_rect.width, animated_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, animated_rect.width, animated_rect.height), border_radius=radius)
-        
-        final_surface = pygame.Surface((animated_rect.width, animated_rect.height), pygame.SRCALPHA)
-        final_surface.blit(bg_surface, (0, 0))
-        final_surface.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-        
-        # 添加顶部高光效果（完全圆角毛玻璃反光）
-        highlight_height = animated_rect.height // 3
-        highlight_surface = pygame.Surface((animated_rect.width, highlight_height), pygame.SRCALPHA)
-
-        # 创建完全圆角矩形高光
-        pygame.draw.rect(highlight_surface, (*self.colors['button_shadow_light'][:3], 40),
-                        (0, 0, animated_rect.width, highlight_height),
-                        border_radius=radius)
-
-        final_surface.blit(highlight_surface, (0, 0))
-        
-        screen.blit(final_surface, animated_rect.topleft)
-        
-        # 轻微立体感 - 减半宽度版本
-        # 顶部内侧高光 - 高度减半
-        inner_highlight = pygame.Rect(animated_rect.x + 0.5, animated_rect.y + 0.5, 
-                                    animated_rect.width - 2, 1)
-        highlight_surface = pygame.Surface((inner_highlight.width, inner_highlight.height), pygame.SRCALPHA)
-        highlight_surface.fill((255, 255, 255, 30))
-        screen.blit(highlight_surface, inner_highlight)
-
-        # 底部内侧阴影 - 高度减半
-        inner_shadow = pygame.Rect(animated_rect.x + 0.5, animated_rect.bottom - 1, 
-                                animated_rect.width - 2, 1)
-        shadow_surface = pygame.Surface((inner_shadow.width, inner_shadow.height), pygame.SRCALPHA)
-        shadow_surface.fill((0, 0, 0, 20))
-        screen.blit(shadow_surface, inner_shadow)
-
-        # hover时稍微加强效果
-        if is_hover:
-            # 额外的顶部高光 - 也减半
-            top_glow = pygame.Rect(animated_rect.x + 1, animated_rect.y + 1, 
-                                animated_rect.width - 4, 1)
-            glow_surface = pygame.Surface((top_glow.width, top_glow.height), pygame.SRCALPHA)
-            glow_surface.fill((255, 255, 255, 40))
-            screen.blit(glow_surface, top_glow)
+        button_surface = ui_chrome.glass_button(
+            animated_rect.size,
+            radius=int(20 * self.scale_factor),
+            bg_color=bg_color,
+            highlight_color=(*self.colors['button_shadow_light'][:3], 40),
+            hover=is_hover,
+            edge_inset=0
+        )
+        screen.blit(button_surface, animated_rect.topleft)
 
         # 图标和文字 - 使用PNG图标的垂直布局
         # 绘制PNG图标（在按钮上方70%区域）
@@ -990,15 +944,10 @@ class HomePage:
         is_hover = ui_button.hovered
         
         # 平滑缩放动画
-        if is_hover:
-            self.target_pack_scale[index] = 1.15
-        else:
-            self.target_pack_scale[index] = 1.0
-        
-        self.pack_hover_scale[index] += (self.target_pack_scale[index] - self.pack_hover_scale[index]) * 0.12
+        self.pack_hover_scale[index].retarget(1.15 if is_hover else 1.0)
         
         # 应用缩放
-        scale = self.pack_hover_scale[index]
+        scale = self.pack_hover_scale[index].value
         if scale != 1.0:
             scaled_width = int(rect.width * scale)
             scaled_height = int(rect.height * scale)
@@ -1037,31 +986,9 @@ class HomePage:
         shadow_center_x = animated_rect.centerx
         shadow_center_y = animated_rect.bottom + shadow_offset_y
 
-        # 创建羽化效果 - 多层椭圆
-        feather_layers = 16  # 羽化层数
-        for i in range(feather_layers):
-            # 计算当前层的参数
-            layer_scale = 1.0 + (i * 0.075)  # 每层递增15%
-            layer_alpha = max(0, 30 - i * 1.875)  # 透明度递减
-            
-            # 当前层椭圆尺寸
-            layer_width = int(shadow_width * layer_scale)
-            layer_height = int(shadow_height * layer_scale)
-            
-            # 创建椭圆表面
-            if layer_alpha > 0:
-                ellipse_surface = pygame.Surface((layer_width, layer_height), pygame.SRCALPHA)
-                
-                # 绘制椭圆
-                pygame.draw.ellipse(
-                    ellipse_surface, 
-                    (0, 0, 0, layer_alpha),  # 黑色半透明
-                    (0, 0, layer_width, layer_height)
-                )
-                
-                # 绘制到屏幕
-                ellipse_rect = ellipse_surface.get_rect(center=(shadow_center_x, shadow_center_y))
-                screen.blit(ellipse_surface, ellipse_rect)
+        # 羽化效果 - 多层椭圆合成一张表面，按尺寸缓存
+        shadow_surface = self._feathered_shadow(shadow_width, shadow_height)
+        screen.blit(shadow_surface, shadow_surface.get_rect(center=(shadow_center_x, shadow_center_y)))
 
         # 绘制卡包图片
         if pack_data['image']:
@@ -1074,6 +1001,37 @@ class HomePage:
             text_rect = placeholder_text.get_rect(center=animated_rect.center)
             screen.blit(placeholder_text, text_rect)
     
+    @staticmethod
+    def _feathered_shadow(shadow_width: int, shadow_height: int) -> pygame.Surface:
+        """获取羽化椭圆阴影（16层椭圆由内向外依次叠加后的结果）"""
+        feather_layers = 16  # 羽化层数
+        max_scale = 1.0 + (feather_layers - 1) * 0.075
+        size = (int(shadow_width * max_scale), int(shadow_height * max_scale))
+
+        def build():
+            shadow_surface = pygame.Surface(size, pygame.SRCALPHA)
+            center = (size[0] / 2, size[1] / 2)
+            for i in range(feather_layers):
+                # 计算当前层的参数
+                layer_scale = 1.0 + (i * 0.075)  # 每层递增7.5%
+                layer_alpha = max(0, 30 - i * 1.875)  # 透明度递减
+                if layer_alpha <= 0:
+                    continue
+                
+                # 当前层椭圆尺寸
+                layer_width = int(shadow_width * layer_scale)
+                layer_height = int(shadow_height * layer_scale)
+                ellipse_surface = pygame.Surface((layer_width, layer_height), pygame.SRCALPHA)
+                pygame.draw.ellipse(
+                    ellipse_surface, 
+                    (0, 0, 0, layer_alpha),  # 黑色半透明
+                    (0, 0, layer_width, layer_height)
+                )
+                shadow_surface.blit(ellipse_surface, ellipse_surface.get_rect(center=center))
+            return shadow_surface.convert_alpha() if pygame.display.get_surface() else shadow_surface
+
+        return ui_chrome.get_chrome_cache().get(('feather_shadow', shadow_width, shadow_height), build)
+    
     def draw_sprite_area(self, screen: pygame.Surface):
         """绘制精灵装饰区域"""
         if not self.sprite_frames:
@@ -1083,16 +1041,10 @@ class HomePage:
         is_hover = self.sprite_area['hover']
         
         # 平滑缩放动画
-        if is_hover:
-            self.target_sprite_scale = 1.1
-        else:
-            self.target_sprite_scale = 1.0
-        
-        # 平滑过渡
-        self.sprite_hover_scale += (self.target_sprite_scale - self.sprite_hover_scale) * 0.1
+        self.sprite_hover_scale.retarget(1.1 if is_hover else 1.0)
         
         # 应用缩放和抖动
-        scale = self.sprite_hover_scale
+        scale = self.sprite_hover_scale.value
         shake_x, shake_y = self.sprite_shake_offset
         
         if scale != 1.0:
@@ -1112,17 +1064,20 @@ class HomePage:
                 rect.height
             )
         
-        # 绘制当前帧（带透明度）
-        current_frame = self.sprite_frames[self.sprite_frame_index].copy()
+        # 当前帧缩放写入复用表面（帧或尺寸变化时才重新缩放）
+        current_frame = self.sprite_frames[self.sprite_frame_index]
+        size = animated_rect.size
+        if self._sprite_canvas is None or self._sprite_canvas.get_size() != size:
+            self._sprite_canvas = pygame.Surface(size, current_frame.get_flags(), current_frame)
+            self._sprite_canvas_key = None
+        canvas_key = (self.sprite_frame_index, size)
+        if self._sprite_canvas_key != canvas_key:
+            pygame.transform.scale(current_frame, size, self._sprite_canvas)
+            self._sprite_canvas_key = canvas_key
 
-        # 应用透明度
-        if self.sprite_fade_alpha < 255:
-            alpha_surface = pygame.Surface(current_frame.get_size(), pygame.SRCALPHA)
-            alpha_surface.fill((255, 255, 255, self.sprite_fade_alpha))
-            current_frame.blit(alpha_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-        scaled_sprite = pygame.transform.scale(current_frame, (animated_rect.width, animated_rect.height))
-        screen.blit(scaled_sprite, animated_rect)
+        # 透明度用表面alpha，不再逐帧创建alpha遮罩
+        self._sprite_canvas.set_alpha(self.sprite_fade_alpha)
+        screen.blit(self._sprite_canvas, animated_rect)
     
     def handle_mouse_motion(self, pos: tuple):
         """处理鼠标移动事件"""
@@ -1246,22 +1201,82 @@ class HomePage:
         #     logo_y = logo_margin
         #     screen.blit(self.subtitle_logo, (logo_x, logo_y))
 
-    def draw(self, screen: pygame.Surface, time_delta: float):
-        """绘制主页"""
+    # ==================== 脏矩形支持 ====================
+
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        """
+        本帧可能变化的区域（供脏矩形模式使用）
+        
+        精灵GIF持续播放，区域始终上报（按最大缩放和抖动外扩）；
+        卡包和功能按钮只在缩放动画未稳定时上报。
+        
+        Returns:
+            List[pygame.Rect]: 变化区域
+        """
+        rects = []
+        
+        if self.sprite_frames and self.sprite_area:
+            rect = self.sprite_area['rect']
+            rects.append(rect.inflate(int(rect.width * 0.1) + 10, int(rect.height * 0.1) + 10))
+        
+        for i, pack in enumerate(self.pack_areas):
+            if not self.pack_hover_scale[i].active:
+                continue
+            rect = pack['rect']
+            max_rect = rect.inflate(int(rect.width * 0.16) + 2, int(rect.height * 0.16) + 2)
+            # 羽化阴影最外层约为卡包宽度的2倍
+            shadow_rect = pygame.Rect(0, 0, rect.width * 2 + 4, int(rect.width * 0.7) + 4)
+            shadow_rect.center = (rect.centerx, max_rect.bottom + int(25 * self.scale_factor))
+            rects.append(max_rect.union(shadow_rect))
+        
+        for area, scale in ((self.magic_area, self.magic_hover_scale),
+                            (self.shop_area, self.shop_hover_scale)):
+            if area and scale.active:
+                rect = area['rect']
+                rects.append(rect.inflate(int(rect.width * 0.1) + 40, int(rect.height * 0.1) + 40))
+        
+        return rects
+
+    def is_animating(self) -> bool:
+        """
+        是否有需要全帧率的动画（精灵循环播放不计入，降帧时按时间推进）
+        
+        Returns:
+            bool: 有动画时为True
+        """
+        if self.sprite_fade_state != "normal":
+            return True
+        return self.tweens.is_animating()
+
+    def has_open_window(self) -> bool:
+        """是否有弹出窗口处于显示状态"""
+        return any(window and window.is_visible for window in self.active_windows.values())
+
+    def draw(self, screen: pygame.Surface, time_delta: float, include_logo: bool = True):
+        """
+        绘制主页
+        
+        Args:
+            screen: 目标表面
+            time_delta: 帧时间（秒）
+            include_logo: 是否绘制Logo（已合成进静态图层时传False）
+        """
         # 更新UI管理器
         self.ui_manager.update(time_delta)
         
         # 更新精灵动画
-        self.update_sprite_animation()
+        self.update_sprite_animation(time_delta * 1000)
         
         # 更新按钮动画
         self.update_button_animations()
+        self.tweens.update(time_delta)
         
         # 更新窗口
         self.update_windows(time_delta)
         
         # 绘制左上角logo
-        self.draw_logo(screen)
+        if include_logo:
+            self.draw_logo(screen)
 
         # 绘制精灵（背景层）
         self.draw_sprite_area(screen)
@@ -1274,8 +1289,8 @@ class HomePage:
         self.ui_manager.draw_ui(screen)
 
         # 绘制华丽的功能按钮（在UI按钮下方作为装饰层）
-        self.draw_luxury_button(screen, self.magic_area, self.magic_hover_scale)
-        self.draw_luxury_button(screen, self.shop_area, self.shop_hover_scale)
+        self.draw_luxury_button(screen, self.magic_area, self.magic_hover_scale.value)
+        self.draw_luxury_button(screen, self.shop_area, self.shop_hover_scale.value)
         
         # 绘制窗口自定义内容（在UI之上）
         self.draw_windows(screen)
@@ -1312,24 +1327,21 @@ class HomePage:
             elif element_list:
                 element_list.kill()
         
-        # 清理加载的图片
-        for image_data in self.selected_pack_images:
-            if image_data[0]:
-                try:
-                    del image_data[0]
-                except:
-                    pass
+        # 归还从资源注册表获取的图片
+        registry = get_asset_registry()
+        for asset_id, size in self._acquired_assets:
+            registry.release(asset_id, size)
+        self._acquired_assets = []
+        self.selected_pack_images = []
         
         # 添加数据库清理
         if hasattr(self, 'db_manager'):
             self.db_manager.close()
         
         # 清理精灵帧
-        for frame in self.sprite_frames:
-            try:
-                del frame
-            except:
-                pass
+        self.sprite_frames = []
+        self.sprite_frame_durations = []
+        self._sprite_canvas = None
         
         print("🧹 主页资源清理完成")
     
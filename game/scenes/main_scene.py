@@ -5,7 +5,6 @@ import os
 
 # 导入组件
 from game.scenes.home_page import HomePage
-from game.scenes.dex_page import DexPage
 from game.ui.navigation_bar import PokemonNavigationGUI
 from game.core.message_manager import MessageManager
 # from game.ui.toast_message import ToastMessage
@@ -13,6 +12,9 @@ from game.core.auth.auth_manager import get_auth_manager
 # 导入新的数据库管理器
 from game.core.database.database_manager import DatabaseManager
 from game.core.game_manager import GameManager
+from game.core.dirty_rects import StaticLayerCache
+from game.core.scene_prefetch import PrefetchPlan
+from game.utils import ui_chrome
 
 auth = get_auth_manager()
 print("测试当前用户 ID：", auth.get_current_user_id())
@@ -23,6 +25,25 @@ class MainScene:
     包含Pokemon风格的主页、导航栏和弹出窗口系统
     """
     
+    @classmethod
+    def get_prefetch_plan(cls) -> PrefetchPlan:
+        """主场景依赖：导航图标、主页资源，以及卡牌目录同步（由场景预取在后台线程调用）"""
+        plan = PrefetchPlan(
+            assets=PokemonNavigationGUI.icon_asset_ids(),
+            tasks=[cls._prefetch_card_catalog],
+        )
+        return plan.extend(HomePage.get_prefetch_plan())
+    
+    @staticmethod
+    def _prefetch_card_catalog():
+        """用独立连接先完成 cards.json 增量同步，构造时的同步只需比对源文件指纹"""
+        from game.core.cards.collection_manager import CardManager
+        db_manager = DatabaseManager()
+        try:
+            CardManager(db_manager.connection, os.path.join("card_assets", "cards.json"))
+        finally:
+            db_manager.close()
+    
     def __init__(self, screen, callback=None, *args, **kwargs):
         """初始化主场景"""
         print("🏠 初始化主场景...")
@@ -99,6 +120,10 @@ class MainScene:
         # 缓存渐变背景
         self.gradient_background = None
         
+        # 静态图层（渐变背景 + 主页Logo），脏矩形模式下用于恢复背景
+        self.static_layers = StaticLayerCache()
+        self._drawn_page = None
+        
         print("✅ 主场景初始化完成")
         print(f"[调试] UIManager id in MainScene: {id(self.ui_manager)}")
 
@@ -266,6 +291,8 @@ class MainScene:
                 # 切换到图鉴页面
                 self.current_page = nav_id
                 if not self.dex_page:
+                    # 图鉴模块首次打开时才导入
+                    from game.scenes.dex_page import DexPage
                     self.dex_page = DexPage(
                         self.screen_width, 
                         self.screen_height, 
@@ -320,20 +347,90 @@ class MainScene:
     def create_gradient_background(self):
         """创建渐变背景"""
         if self.gradient_background is None:
-            gradient_surface = pygame.Surface((self.screen_width, self.screen_height))
-            
-            for y in range(self.screen_height):
-                ratio = y / self.screen_height
-                r = int(self.background_colors['top'][0] * (1 - ratio) + self.background_colors['bottom'][0] * ratio)
-                g = int(self.background_colors['top'][1] * (1 - ratio) + self.background_colors['bottom'][1] * ratio)
-                b = int(self.background_colors['top'][2] * (1 - ratio) + self.background_colors['bottom'][2] * ratio)
-                
-                pygame.draw.line(gradient_surface, (r, g, b), (0, y), (self.screen_width, y))
-            
-            self.gradient_background = gradient_surface
+            self.gradient_background = ui_chrome.vertical_gradient(
+                (self.screen_width, self.screen_height),
+                self.background_colors['top'],
+                self.background_colors['bottom']
+            )
         
         return self.gradient_background
     
+    def _get_static_layer(self, with_logo: bool) -> pygame.Surface:
+        """
+        获取静态图层
+        
+        Args:
+            with_logo: 是否合成主页Logo
+            
+        Returns:
+            pygame.Surface: 渐变背景（可含Logo）
+        """
+        def build(surface):
+            surface.blit(self.create_gradient_background(), (0, 0))
+            if with_logo:
+                self.home_page.draw_logo(surface)
+        
+        key = 'home' if with_logo else 'plain'
+        return self.static_layers.get(key, (self.screen_width, self.screen_height), build)
+
+    def get_dirty_rects(self):
+        """
+        本帧可能变化的区域（SceneManager脏矩形模式调用）
+        
+        Returns:
+            None表示整屏重绘，否则为矩形列表
+        """
+        if self.current_page != self._drawn_page:
+            return None
+        if self.message_manager.has_messages() or self.toast_message:
+            return None
+        
+        if self.current_page == 'home':
+            if self.home_page.has_open_window():
+                return None
+            rects = self.home_page.get_dirty_rects()
+        elif self.current_page == 'pokedex':
+            if not self.dex_page:
+                return None
+            rects = self.dex_page.get_dirty_rects()
+            if rects is None:
+                return None
+        elif self.current_page in ('social', 'menu'):
+            # 占位页面是静态的
+            rects = []
+        else:
+            return None
+        
+        rects = list(rects)
+        if not self._should_hide_navbar():
+            rects.extend(self.nav_bar.get_dirty_rects())
+        
+        # 获得焦点的输入框有闪烁光标
+        for element in self.ui_manager.get_focus_set() or ():
+            if element.visible:
+                rects.append(element.rect)
+        
+        return rects
+
+    def is_animating(self) -> bool:
+        """
+        是否需要保持全帧率
+        
+        Returns:
+            bool: 有动画时为True
+        """
+        if self.current_page not in ('home', 'pokedex', 'social', 'menu'):
+            return True
+        if self.message_manager.has_messages() or self.toast_message:
+            return True
+        if self.nav_bar.is_animating():
+            return True
+        if self.current_page == 'home':
+            return self.home_page.has_open_window() or self.home_page.is_animating()
+        if self.current_page == 'pokedex':
+            return self.dex_page is None or self.dex_page.is_animating()
+        return False
+
     def draw_page_placeholder(self, page_name: str):
         """绘制其他页面的占位内容"""
         content_height = self.screen_height - self.nav_bar.height
@@ -479,6 +576,7 @@ class MainScene:
 
             # 清空渐变背景缓存（因为尺寸变了）
             self.gradient_background = None
+            self.static_layers.invalidate()
             
             print(f"📐 窗口调整: {self.screen_width}x{self.screen_height}")
         
@@ -614,13 +712,10 @@ class MainScene:
         # 限制最大时间增量，避免卡顿时动画跳跃
         time_delta = min(time_delta, 0.05) 
         
-        # 绘制统一的渐变背景
-        gradient_bg = self.create_gradient_background()
-        self.screen.blit(gradient_bg, (0, 0))
-
-        # 绘制统一的渐变背景
-        gradient_bg = self.create_gradient_background()
-        self.screen.blit(gradient_bg, (0, 0))
+        # 绘制静态图层（统一的渐变背景，主页时含Logo）
+        logo_in_layer = self.current_page == 'home' and self.home_page.logo is not None
+        self.screen.blit(self._get_static_layer(logo_in_layer), (0, 0))
+        self._drawn_page = self.current_page
         
         # 检查是否有开包窗口显示
         pack_window_visible = (self.current_page == 'home' and 
@@ -630,7 +725,7 @@ class MainScene:
         # 根据当前页面绘制内容
         if self.current_page == 'home':
             # 绘制主页内容（传入time_delta）
-            self.home_page.draw(self.screen, time_delta)
+            self.home_page.draw(self.screen, time_delta, include_logo=not logo_in_layer)
         elif self.current_page == 'pokedex':
             # 绘制图鉴页面
             if self.dex_page:
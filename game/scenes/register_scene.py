@@ -14,7 +14,8 @@ from game.core.auth.auth_manager import AuthManager
 from game.scenes.components.message_component import MessageManager, ToastMessage
 from game.scenes.styles.theme import Theme
 from game.scenes.styles import fonts
-from game.utils.video_background import VideoBackground
+from game.utils import ui_chrome
+from game.utils.video_background import create_video_background
 
 class RegisterScene:
     """现代化注册场景类，使用pygame_gui组件系统"""
@@ -38,7 +39,7 @@ class RegisterScene:
         self.setup_pygame_gui()
 
         # 初始化字体
-        fonts.font_manager = fonts.FontManager()
+        fonts.get_font_manager()
         
         # 组件管理器
         self.message_manager = MessageManager()
@@ -202,7 +203,7 @@ class RegisterScene:
             # 尝试加载视频背景
             video_path = "assets/videos/bg.mp4"
             if os.path.exists(video_path):
-                self.video_background = VideoBackground(video_path, self.screen.get_size())
+                self.video_background = create_video_background(video_path, self.screen.get_size())
                 print("✅ 视频背景加载成功")
             else:
                 print("⚠️ 视频背景文件不存在，使用渐变背景")
@@ -213,19 +214,12 @@ class RegisterScene:
     
     def create_gradient_background(self):
         """创建渐变背景"""
-        width, height = self.screen.get_size()
-        self.background_surface = pygame.Surface((width, height))
-        
-        # 创建垂直渐变
-        start_color = Theme.get_color('background_gradient_start')
-        end_color = Theme.get_color('background_gradient_end')
-        
-        for y in range(height):
-            progress = y / height
-            r = int(start_color[0] + (end_color[0] - start_color[0]) * progress)
-            g = int(start_color[1] + (end_color[1] - start_color[1]) * progress)
-            b = int(start_color[2] + (end_color[2] - start_color[2]) * progress)
-            pygame.draw.line(self.background_surface, (r, g, b), (0, y), (width, y))
+        # 创建垂直渐变（按尺寸和颜色缓存）
+        self.background_surface = ui_chrome.vertical_gradient(
+            self.screen.get_size(),
+            Theme.get_color('background_gradient_start'),
+            Theme.get_color('background_gradient_end')
+        )
     
     def load_logo(self):
         """加载Logo"""
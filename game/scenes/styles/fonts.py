@@ -7,6 +7,11 @@ import pygame
 import os
 import re
 import unicodedata
+from collections import OrderedDict
+
+# 文本渲染缓存上限（LRU淘汰）
+TEXT_SURFACE_CACHE_SIZE = 512
+TEXT_ANALYSIS_CACHE_SIZE = 2048
 
 class FontManager:
     """字体管理器，负责字体的加载、缓存和获取，支持emoji和unicode"""
@@ -14,6 +19,14 @@ class FontManager:
     def __init__(self):
         self._font_cache = {}
         self._available_fonts = {}
+        
+        # 渲染结果缓存: key -> Surface（返回的表面是共享的，调用方不要修改它）
+        self._text_surface_cache = OrderedDict()
+        # 字体选择缓存: text -> 'unicode' / 'body'
+        self._text_analysis_cache = OrderedDict()
+        self._render_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._analysis_stats = {'hits': 0, 'misses': 0}
+        
         self._init_font_paths()
         self._check_available_fonts()
         self._init_unicode_patterns()
@@ -93,7 +106,7 @@ class FontManager:
     
     def _analyze_text(self, text):
         """
-        分析文本内容，确定最适合的字体类型
+        分析文本内容，确定最适合的字体类型（结果按文本缓存）
         
         Args:
             text: 要分析的文本
@@ -104,6 +117,22 @@ class FontManager:
         if not text:
             return 'body'
         
+        cache = self._text_analysis_cache
+        result = cache.get(text)
+        if result is not None:
+            cache.move_to_end(text)
+            self._analysis_stats['hits'] += 1
+            return result
+        
+        self._analysis_stats['misses'] += 1
+        result = self._analyze_text_uncached(text)
+        cache[text] = result
+        if len(cache) > TEXT_ANALYSIS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+    
+    def _analyze_text_uncached(self, text):
+        """执行实际的unicode正则分析"""
         # 检查是否包含emoji
         if self.emoji_pattern.search(text):
             return 'unicode'
@@ -254,8 +283,12 @@ class FontManager:
         Returns:
             pygame.Surface: 渲染后的文本表面
         """
-        font = self.get_smart_font(text, size, font_type)
-        return font.render(text, antialias, color)
+        key = ('smart', text, size, tuple(color), font_type, antialias)
+        surface = self._get_cached_surface(key)
+        if surface is None:
+            font = self.get_smart_font(text, size, font_type)
+            surface = self._store_cached_surface(key, font.render(text, antialias, color))
+        return surface
     
     def render_mixed_text(self, text, size=24, color=(255, 255, 255), font_type='body', antialias=True):
         """
@@ -280,8 +313,73 @@ class FontManager:
         
         # 包含特殊字符，可能需要混合渲染
         # 目前先用unicode字体渲染整体，后续可以实现更复杂的混合渲染
-        font = self._get_unicode_font(size)
-        return font.render(text, antialias, color)
+        key = ('mixed', text, size, tuple(color), antialias)
+        surface = self._get_cached_surface(key)
+        if surface is None:
+            font = self._get_unicode_font(size)
+            surface = self._store_cached_surface(key, font.render(text, antialias, color))
+        return surface
+    
+    def render_font_cached(self, font, text, antialias=True, color=(255, 255, 255)):
+        """
+        使用指定字体对象渲染文本（带缓存）
+        
+        供自行持有pygame.Font的绘制路径使用，每帧绘制的静态标签只需一次字典查找。
+        返回的表面是共享的，需要set_alpha等修改时请先copy()。
+        
+        Args:
+            font: pygame.Font对象
+            text: 文本内容
+            antialias: 是否抗锯齿
+            color: 文本颜色
+            
+        Returns:
+            pygame.Surface: 渲染后的文本表面
+        """
+        key = ('font', font, text, antialias, tuple(color))
+        surface = self._get_cached_surface(key)
+        if surface is None:
+            surface = self._store_cached_surface(key, font.render(text, antialias, color))
+        return surface
+    
+    def _get_cached_surface(self, key):
+        """查找渲染缓存（命中时移到LRU末尾）"""
+        cache = self._text_surface_cache
+        surface = cache.get(key)
+        if surface is not None:
+            cache.move_to_end(key)
+            self._render_stats['hits'] += 1
+        else:
+            self._render_stats['misses'] += 1
+        return surface
+    
+    def _store_cached_surface(self, key, surface):
+        """写入渲染缓存并执行LRU淘汰"""
+        cache = self._text_surface_cache
+        cache[key] = surface
+        if len(cache) > TEXT_SURFACE_CACHE_SIZE:
+            cache.popitem(last=False)
+            self._render_stats['evictions'] += 1
+        return surface
+    
+    def get_render_cache_stats(self):
+        """
+        获取文本缓存统计
+        
+        Returns:
+            dict: 渲染缓存与字体选择缓存的命中统计
+        """
+        render_total = self._render_stats['hits'] + self._render_stats['misses']
+        analysis_total = self._analysis_stats['hits'] + self._analysis_stats['misses']
+        return {
+            'surfaces': len(self._text_surface_cache),
+            'surface_hits': self._render_stats['hits'],
+            'surface_misses': self._render_stats['misses'],
+            'surface_evictions': self._render_stats['evictions'],
+            'surface_hit_rate': self._render_stats['hits'] / render_total if render_total else 0.0,
+            'analysis_entries': len(self._text_analysis_cache),
+            'analysis_hit_rate': self._analysis_stats['hits'] / analysis_total if analysis_total else 0.0,
+        }
     
     def get_text_size_smart(self, text, size=24, font_type='body'):
         """
@@ -301,6 +399,8 @@ class FontManager:
     def clear_cache(self):
         """清理字体缓存"""
         self._font_cache.clear()
+        self._text_surface_cache.clear()
+        self._text_analysis_cache.clear()
     
     def get_available_fonts(self):
         """获取可用字体列表"""
@@ -470,4 +570,11 @@ class FontManager:
         pass
 
 # 全局字体管理器实例
-font_manager = None
\ No newline at end of file
+font_manager = None
+
+def get_font_manager():
+    """获取全局字体管理器（不存在时创建），保证渲染缓存在场景间共享"""
+    global font_manager
+    if font_manager is None:
+        font_manager = FontManager()
+    return font_manager
\ No newline at end of file
@@ -1,10 +1,19 @@
 import pygame
 import math
+import os
 import random
 import time
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
+
+from game.core.frame_profiler import profiled
+from game.utils import ui_chrome
+from game.utils.sprite_frames import RotationFrames, ScaledFrameCache, quantize_scale
+from game.utils.particles import ParticleSystem, EmitterConfig
+from game.scenes.animations.tween import TweenEngine
+from game.core.asset_registry import get_asset_registry
+
 # from game.core.game_manager import GameManager
 
 # 导入字体管理器
@@ -84,31 +93,114 @@ class CardResult:
     hp: Optional[int] = None
     types: Optional[List[str]] = None
 
+# ✅ 完整的稀有度颜色映射（15种稀有度）
+RARITY_COLORS = {
+    # 基础稀有度
+    "Common": (156, 163, 175),          # 灰色
+    "Uncommon": (34, 197, 94),          # 绿色  
+    "Rare": (59, 130, 246),             # 蓝色
+    
+    # 闪卡系列
+    "Rare Holo": (138, 43, 226),        # 紫色（闪卡）
+    "Rare Holo EX": (220, 38, 127),     # 粉红色（EX）
+    "Rare Holo GX": (239, 68, 68),      # 红色（GX）
+    "Rare Holo V": (251, 146, 60),      # 橙色（V卡）
+    
+    # 超稀有系列
+    "Ultra Rare": (245, 158, 11),       # 金色
+    "Rare Secret": (168, 85, 247),      # 深紫色（秘藏）
+    "Rare Ultra": (252, 211, 77),       # 亮金色
+    
+    # 特殊系列
+    "Promo": (16, 185, 129),            # 青绿色（推广）
+    "Rare Shiny": (192, 132, 252),      # 亮紫色（闪亮）
+    "Rare BREAK": (248, 113, 113),      # 珊瑚红（BREAK）
+    "Rare Shining": (255, 215, 0),      # 金黄色（闪耀）
+    "Amazing Rare": (236, 72, 153),     # 洋红色（惊奇）
+    "Rare Prism Star": (139, 69, 19)    # 棕色（棱镜星）
+}
+DEFAULT_RARITY_COLOR = (156, 163, 175)  # 默认灰色
+
+# 带外发光边框的稀有度
+GLOW_RARITIES = ("Ultra Rare", "Rare Secret", "Amazing Rare", "Rare Shining")
+
+# 稀有度对应的粒子档次
+RARITY_TIERS = {
+    "Rare": "rare",
+    "Promo": "rare",
+    "Rare Holo": "holo",
+    "Rare Holo EX": "holo",
+    "Rare Holo GX": "holo",
+    "Rare Holo V": "holo",
+    "Rare Shiny": "holo",
+    "Rare BREAK": "holo",
+    "Rare Prism Star": "holo",
+    "Ultra Rare": "ultra",
+    "Rare Secret": "ultra",
+    "Rare Ultra": "ultra",
+    "Rare Shining": "ultra",
+    "Amazing Rare": "ultra",
+}
+
+
+def _rarity_emitters(color: Tuple[int, int, int], tier: str) -> Tuple[EmitterConfig, ...]:
+    """
+    生成稀有度的发射器：卡牌揭示时的爆发（burst）与之后沿边框的持续闪光（rate）
+
+    Args:
+        color: 稀有度颜色
+        tier: 粒子档次 rare / holo / ultra
+
+    Returns:
+        Tuple[EmitterConfig, ...]: 发射器配置
+    """
+    light = tuple(min(255, c + (255 - c) // 2) for c in color)
+    white = (255, 255, 255)
+    if tier == "rare":
+        return (
+            EmitterConfig(colors=(color, light), burst=60, speed=(40, 160), life=(0.4, 0.9), size=(3, 8)),
+        )
+    if tier == "holo":
+        return (
+            EmitterConfig(colors=(color, light, white), burst=400, speed=(60, 320), life=(0.6, 1.4), size=(3, 10)),
+            EmitterConfig(texture="icons/effects/star1", colors=(light, white), burst=40,
+                          speed=(30, 140), life=(0.8, 1.6), size=(12, 24)),
+            EmitterConfig(texture="icons/effects/big_star", colors=(light, white), rate=24,
+                          speed=(5, 30), life=(0.5, 1.0), size=(8, 16), spawn="edge"),
+        )
+    return (
+        EmitterConfig(colors=(color, light, white), burst=2400, speed=(80, 520), life=(0.8, 1.8),
+                      size=(3, 12), gravity=60, drag=1.2),
+        EmitterConfig(texture="icons/effects/shining_star", colors=(light, white), burst=160,
+                      speed=(40, 240), life=(1.0, 2.0), size=(14, 32)),
+        EmitterConfig(texture="icons/effects/big_star", colors=(color, light, white), rate=90,
+                      speed=(5, 40), life=(0.5, 1.2), size=(8, 20), spawn="edge"),
+        EmitterConfig(colors=(light, white), rate=60, speed=(10, 50), life=(0.4, 0.9), size=(3, 6),
+                      gravity=-40, spawn="edge"),
+    )
+
+
+# 每种稀有度的粒子发射器（可按稀有度单独覆盖）
+RARITY_EMITTERS: Dict[str, Tuple[EmitterConfig, ...]] = {
+    rarity: _rarity_emitters(RARITY_COLORS[rarity], tier) for rarity, tier in RARITY_TIERS.items()
+}
+
 class GlassEffect:
     """高性能特效管理器"""
     
     @staticmethod
     def draw_dark_overlay(screen: pygame.Surface, alpha: int = 150):
         """绘制深色半透明遮罩（高性能版本）"""
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, alpha))
+        overlay = ui_chrome.solid_overlay(screen.get_size(), (0, 0, 0, ui_chrome.quantize(alpha)))
         screen.blit(overlay, (0, 0))
     
     @staticmethod
     def draw_glass_rect(screen: pygame.Surface, rect: pygame.Rect, 
                        alpha: int = 217, border_alpha: int = 76, radius: int = 16):
-        """绘制毛玻璃矩形"""
-        # 主体毛玻璃背景
-        glass_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(glass_surface, (255, 255, 255, alpha),
-                        (0, 0, rect.width, rect.height), border_radius=radius)
+        """绘制毛玻璃矩形（主体和边框合成后缓存）"""
+        glass_surface = ui_chrome.glass_panel(rect.size, fill_alpha=alpha,
+                                              border_alpha=border_alpha, radius=radius)
         screen.blit(glass_surface, rect.topleft)
-        
-        # 毛玻璃边框
-        border_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(border_surface, (255, 255, 255, border_alpha),
-                        (0, 0, rect.width, rect.height), width=2, border_radius=radius)
-        screen.blit(border_surface, rect.topleft)
 
 class PackOpeningWindow:
     def __init__(self, screen_width: int, screen_height: int, game_manager):
@@ -133,21 +225,39 @@ class PackOpeningWindow:
         # 资源管理
         self.textures = {}
         self.pack_images = {}
-        self.packet_images = []  # 存储所有packet图片
+        self.packet_ids = []  # 可用packet图片的资源ID（按需解码）
+        self.current_packet_id = None
         self.current_packet_image = None 
+        self._acquired_assets = []  # 从资源注册表获取的资源ID
         self.obtained_cards = []
 
         # 初始化字体
-        fonts.font_manager = fonts.FontManager()
+        fonts.get_font_manager()
         
         # 动画效果参数
         self.circle_rotation = 0.0
         self.circle_breath_scale = 1.0
         self.pack_bounce_offset = 0.0
 
+        # 预旋转/预缩放帧缓存（按当前品质配置量化，首次用到时生成）
+        self._circle_frames: Optional[RotationFrames] = None
+        self._circle_frames_texture = None
+        self._circle_scaled = ScaledFrameCache(max_entries=8)
+        self._pack_scaled = ScaledFrameCache(max_entries=48)
+
+        # 粒子效果：开包期间逐帧生成待用的着色纹理，卡牌揭示时按稀有度爆发
+        self.particles = ParticleSystem()
+        self._pending_emitters: List[EmitterConfig] = []
+        # 获得卡牌的缩放图片 {图片路径: 表面或None}（只加载一次；无图片的卡牌按ID记录，只提示一次）
+        self._card_images: Dict[str, Optional[pygame.Surface]] = {}
+        self._no_image_surface: Optional[pygame.Surface] = None
+
+        # 窗口内的补间（入场动画、按钮缩放与闪光），在 update 中统一推进
+        self.tweens = TweenEngine()
+
         # 窗口出现动画参数
-        self.entrance_animation_timer = 0.0
         self.entrance_duration = 0.8  # 入场动画持续时间
+        self._entrance = self.tweens.tween(0.0, 1.0, self.entrance_duration, easing="out_cubic")
         self.overlay_alpha = 0.0      # 遮罩透明度
         self.ui_alpha = 0.0          # UI按钮透明度
         self.content_offset_y = 100   # 内容向上偏移量
@@ -175,7 +285,8 @@ class PackOpeningWindow:
         self.close_button = ModernButton(
             pygame.Rect(self.screen_width - close_size - 50, 20, close_size, close_size),
             "",  # 空文本，我们用图标
-            button_type="secondary"
+            button_type="secondary",
+            tweens=self.tweens
         )
         
         # 左右切换按钮 - 全高度贴边
@@ -184,29 +295,30 @@ class PackOpeningWindow:
         self.left_arrow_button = ModernButton(
             pygame.Rect(0, 0, arrow_width, self.screen_height),  # 贴左边，全高度
             "",  # 空文本，我们用图标
-            button_type="secondary"
+            button_type="secondary",
+            tweens=self.tweens
         )
         
         self.right_arrow_button = ModernButton(
             pygame.Rect(self.screen_width - arrow_width, 0, arrow_width, self.screen_height),  # 贴右边，全高度
             "",  # 空文本，我们用图标
-            button_type="secondary"
+            button_type="secondary",
+            tweens=self.tweens
         )
 
     def _load_assets(self):
         """加载UI资源"""
+        registry = get_asset_registry()
         try:
-            # UI图标
+            # UI图标与Circle特效（与其他场景共享已解码的表面）
             ui_icons = ["close", "gem", "gold_coin", "left", "right", "close_white", "left_white", "right_white"]
-            for icon in ui_icons:
-                path = f"assets/icons/ui/{icon}.png"
-                self.textures[icon] = pygame.image.load(path).convert_alpha()
-            
-            # Circle特效
             circle_effects = ["blue_circle", "purple_circle", "golden_circle"]
-            for effect in circle_effects:
-                path = f"assets/icons/effects/{effect}.png"
-                self.textures[effect] = pygame.image.load(path).convert_alpha()
+            for asset_id in [f"icons/ui/{icon}" for icon in ui_icons] + [f"icons/effects/{effect}" for effect in circle_effects]:
+                surface = registry.acquire(asset_id)
+                if surface is None:
+                    raise FileNotFoundError(asset_id)
+                self._acquired_assets.append(asset_id)
+                self.textures[asset_id.rsplit("/", 1)[-1]] = surface
             
             # # 卡包图片
             # for quality in self.available_packs:
@@ -216,15 +328,8 @@ class PackOpeningWindow:
             #     except:
             #         self.pack_images[quality] = self._create_modern_pack_placeholder(quality)
 
-            # 加载随机卡包图片
-            self.packet_images = []
-            for i in range(1, 27):  # packet1 到 packet26
-                try:
-                    packet_path = f"assets/images/packets/packet{i}.png"
-                    packet_img = pygame.image.load(packet_path).convert_alpha()
-                    self.packet_images.append(packet_img)
-                except:
-                    print(f"⚠️ 无法加载 packet{i}.png")
+            # 卡包图片只记录ID，选中时才解码
+            self.packet_ids = registry.list_assets("images/packets")
 
             self._select_random_packet()
                 
@@ -236,8 +341,17 @@ class PackOpeningWindow:
 
     def _select_random_packet(self):
         """随机选择一个卡包图片"""
-        if self.packet_images:
-            self.current_packet_image = random.choice(self.packet_images)
+        registry = get_asset_registry()
+        if self.current_packet_id:
+            registry.release(self.current_packet_id)
+            self.current_packet_id = None
+        
+        if self.packet_ids:
+            self.current_packet_id = random.choice(self.packet_ids)
+            self.current_packet_image = registry.acquire(self.current_packet_id)
+            if self.current_packet_image is None:
+                self.current_packet_id = None
+                self.current_packet_image = self._create_modern_pack_placeholder(self.current_pack_quality)
         else:
             # 备用：创建占位符
             self.current_packet_image = self._create_modern_pack_placeholder(self.current_pack_quality)
@@ -308,7 +422,11 @@ class PackOpeningWindow:
                 "breath_speed": 1.2,
                 "breath_amplitude": 0.08,
                 "bounce_height": 8,
-                "glow_color": (100, 150, 255, 100)
+                "circle_angle_step": 3.0,     # 光圈旋转量化步长（度）
+                "circle_scale_step": 0.004,   # 光圈呼吸缩放量化步长
+                "glow_color": (100, 150, 255, 100),
+                "reveal_particles": EmitterConfig(colors=((100, 150, 255), (255, 255, 255)), rate=120,
+                                                  speed=(40, 160), life=(0.5, 1.0), size=(3, 8), spawn="edge")
             },
             PackQuality.PREMIUM: {
                 "circle_texture": "purple_circle", 
@@ -317,7 +435,11 @@ class PackOpeningWindow:
                 "breath_speed": 1.8,
                 "breath_amplitude": 0.12,
                 "bounce_height": 12,
-                "glow_color": (180, 100, 255, 120)
+                "circle_angle_step": 3.0,     # 光圈旋转量化步长（度）
+                "circle_scale_step": 0.004,   # 光圈呼吸缩放量化步长
+                "glow_color": (180, 100, 255, 120),
+                "reveal_particles": EmitterConfig(colors=((180, 100, 255), (255, 255, 255)), rate=300,
+                                                  speed=(60, 220), life=(0.5, 1.2), size=(3, 10), spawn="edge")
             },
             PackQuality.LEGENDARY: {
                 "circle_texture": "golden_circle",
@@ -326,7 +448,11 @@ class PackOpeningWindow:
                 "breath_speed": 2.2,
                 "breath_amplitude": 0.16,
                 "bounce_height": 16,
-                "glow_color": (255, 215, 0, 140)
+                "circle_angle_step": 3.0,     # 光圈旋转量化步长（度）
+                "circle_scale_step": 0.004,   # 光圈呼吸缩放量化步长
+                "glow_color": (255, 215, 0, 140),
+                "reveal_particles": EmitterConfig(colors=((255, 215, 0), (255, 255, 255)), rate=600,
+                                                  speed=(80, 300), life=(0.6, 1.4), size=(3, 12), spawn="edge")
             }
         }
 
@@ -384,7 +510,8 @@ class PackOpeningWindow:
         self.can_close = True
 
         # 重置入场动画
-        self.entrance_animation_timer = 0.0
+        self._entrance.value = 0.0
+        self._entrance.retarget(1.0)
         self.overlay_alpha = 0.0
         self.ui_alpha = 0.0
         self.content_offset_y = 100
@@ -423,6 +550,14 @@ class PackOpeningWindow:
             ))
         
         print(f"🎊 获得 {len(self.obtained_cards)} 张卡牌")
+
+        # 本次用到的发射器，在开包动画期间逐帧准备纹理
+        self.particles.clear()
+        self._pending_emitters = [self.quality_configs[current_quality]["reveal_particles"]]
+        for card in self.obtained_cards:
+            for emitter in RARITY_EMITTERS.get(card.rarity, ()):
+                if emitter not in self._pending_emitters:
+                    self._pending_emitters.append(emitter)
         
         # 开始开包动画
         self.animation_state = AnimationState.IDLE
@@ -466,17 +601,13 @@ class PackOpeningWindow:
 
     def update(self, dt: float):
         """更新动画和逻辑"""
-        # 处理入场动画
-        if self.entrance_animation_timer < self.entrance_duration:
-            progress = self.entrance_animation_timer / self.entrance_duration
-            # 缓动函数
-            eased_progress = 1 - (1 - progress) ** 3
-            
-            self.overlay_alpha = eased_progress * 160
-            self.ui_alpha = eased_progress
-            self.content_offset_y = (1 - eased_progress) * 100
+        self.tweens.update(dt)
 
-            self.entrance_animation_timer += dt 
+        # 处理入场动画
+        eased_progress = self._entrance.value
+        self.overlay_alpha = eased_progress * 160
+        self.ui_alpha = eased_progress
+        self.content_offset_y = (1 - eased_progress) * 100
 
         if not self.is_visible:
             return
@@ -521,6 +652,7 @@ class PackOpeningWindow:
             if self.animation_timer >= 4.5:
                 self.animation_state = AnimationState.COMPLETED
                 self.can_close = True
+                self._burst_card_particles()
         
         # 更新卡包点击区域 - 居中
         pack_display_height = 500
@@ -529,6 +661,36 @@ class PackOpeningWindow:
         pack_y = self.screen_height // 2 - pack_display_height // 2 - 30 + self.pack_bounce_offset + self.content_offset_y
         self.pack_click_rect = pygame.Rect(pack_x, pack_y, pack_display_width, pack_display_height)
 
+        self._update_particles(dt)
+        self.tweens.dispatch_events()
+
+    def _update_particles(self, dt: float):
+        """准备粒子纹理、持续发射并推进粒子"""
+        if self._pending_emitters and self.animation_state in (AnimationState.IDLE, AnimationState.OPENING):
+            # 每帧只准备一个发射器，避免开包时集中卡顿
+            self.particles.prepare(self._pending_emitters.pop(0))
+
+        if self.animation_state == AnimationState.REVEALING:
+            emitter = self.quality_configs[self.current_pack_quality]["reveal_particles"]
+            self.particles.emit_continuous("reveal", emitter, self.pack_click_rect, dt)
+        elif self.animation_state == AnimationState.COMPLETED:
+            for index, (card, card_rect) in enumerate(zip(self.obtained_cards, self._card_rects())):
+                for emitter in RARITY_EMITTERS.get(self._card_fields(card)[3], ()):
+                    self.particles.emit_continuous((index, emitter), emitter, card_rect, dt)
+
+        self.particles.update(dt)
+
+    def _burst_card_particles(self):
+        """卡牌揭示时按稀有度爆发粒子"""
+        for pending in self._pending_emitters:
+            self.particles.prepare(pending)
+        self._pending_emitters = []
+
+        for card, card_rect in zip(self.obtained_cards, self._card_rects()):
+            for emitter in RARITY_EMITTERS.get(self._card_fields(card)[3], ()):
+                if emitter.burst:
+                    self.particles.emit(emitter, card_rect)
+
     def handle_event(self, event):
         """处理输入事件"""
         if not self.is_visible:
@@ -581,6 +743,24 @@ class PackOpeningWindow:
         print("📦 关闭开包界面")
         self.is_visible = False
 
+    def cleanup(self):
+        """归还资源注册表中的图片（窗口不再使用时调用）"""
+        registry = get_asset_registry()
+        for asset_id in self._acquired_assets:
+            registry.release(asset_id)
+        self._acquired_assets = []
+        if self.current_packet_id:
+            registry.release(self.current_packet_id)
+            self.current_packet_id = None
+        self._circle_frames = None
+        self._circle_frames_texture = None
+        self._circle_scaled.clear()
+        self._pack_scaled.clear()
+        self.particles.cleanup()
+        self._pending_emitters = []
+        self._card_images.clear()
+
+    @profiled("pack_opening.draw")
     def draw(self, screen):
         """绘制全屏沉浸式开包界面"""
         if not self.is_visible:
@@ -597,25 +777,26 @@ class PackOpeningWindow:
             self._draw_selection_ui(screen)
         elif self.animation_state == AnimationState.COMPLETED:
             self._draw_cards(screen)
+
+        self.particles.draw(screen)
         
         self._draw_ui_elements(screen)
 
     def _draw_background_circle(self, screen):
         """绘制背景光圈效果"""
         config = self.quality_configs[self.current_pack_quality]
-        circle_texture = self.textures.get(config["circle_texture"])
+        frames = self._get_circle_frames(config)
         
-        if circle_texture:
+        if frames:
             center_x = self.screen_width // 2
             center_y = self.screen_height // 2 - 30 + self.content_offset_y
             
-            # 应用旋转和呼吸效果
-            rotated_circle = pygame.transform.rotate(circle_texture, self.circle_rotation)
-            scale = self.circle_breath_scale
-            scaled_circle = pygame.transform.scale(
-                rotated_circle,
-                (int(rotated_circle.get_width() * scale),
-                 int(rotated_circle.get_height() * scale))
+            # 旋转和呼吸效果按量化档位取缓存帧
+            rotated_circle = frames.get(self.circle_rotation)
+            scale = quantize_scale(self.circle_breath_scale, config["circle_scale_step"])
+            size = int(frames.frame_size * scale)
+            scaled_circle = self._circle_scaled.get(
+                frames.index_of(self.circle_rotation), rotated_circle, (size, size)
             )
             
             circle_rect = scaled_circle.get_rect(center=(center_x, center_y))
@@ -630,6 +811,21 @@ class PackOpeningWindow:
             
             screen.blit(scaled_circle, circle_rect)
 
+    def _get_circle_frames(self, config) -> Optional[RotationFrames]:
+        """获取当前品质光圈的旋转帧集合（切换品质时重建，只保留当前一套）"""
+        texture_name = config["circle_texture"]
+        if self._circle_frames_texture != texture_name:
+            circle_texture = self.textures.get(texture_name)
+            self._circle_frames = RotationFrames(circle_texture, config["circle_angle_step"]) if circle_texture else None
+            self._circle_frames_texture = texture_name
+            self._circle_scaled.clear()
+        return self._circle_frames
+
+    def _scaled_pack(self, pack_image, width: int, height: int) -> pygame.Surface:
+        """获取缩放后的卡包图片（按图片和尺寸缓存）"""
+        # 以图片对象本身为键（持有引用，避免id复用取到旧图）
+        return self._pack_scaled.get(pack_image, pack_image, (width, height))
+
     def _draw_pack(self, screen):
         """绘制卡包（应用原有动画逻辑）"""
         pack_image = self.current_packet_image
@@ -646,7 +842,7 @@ class PackOpeningWindow:
         # 根据动画状态绘制效果
         if self.animation_state == AnimationState.SELECTION or self.animation_state == AnimationState.IDLE:
             # 静态显示（带弹跳）
-            scaled_pack = pygame.transform.scale(pack_image, (pack_display_width, pack_display_height))
+            scaled_pack = self._scaled_pack(pack_image, pack_display_width, pack_display_height)
             screen.blit(scaled_pack, (pack_x, pack_y + self.pack_bounce_offset))
         
         elif self.animation_state == AnimationState.OPENING:
@@ -655,37 +851,46 @@ class PackOpeningWindow:
             shake_x = random.uniform(-shake_intensity, shake_intensity)
             shake_y = random.uniform(-shake_intensity, shake_intensity)
             
-            scale_factor = 1.0 + (self.animation_timer / 2.0) * 0.3
+            scale_factor = quantize_scale(1.0 + (self.animation_timer / 2.0) * 0.3)
             scaled_width = int(pack_display_width * scale_factor)
             scaled_height = int(pack_display_height * scale_factor)
             
-            scaled_pack = pygame.transform.scale(pack_image, (scaled_width, scaled_height))
+            scaled_pack = self._scaled_pack(pack_image, scaled_width, scaled_height)
             screen.blit(scaled_pack, (pack_x + shake_x - (scaled_width - pack_display_width) // 2, 
                                 pack_y + shake_y - (scaled_height - pack_display_height) // 2))
         
         elif self.animation_state == AnimationState.REVEALING:
             # 光芒展示动画
-            scaled_pack = pygame.transform.scale(pack_image, (pack_display_width, pack_display_height))
+            scaled_pack = self._scaled_pack(pack_image, pack_display_width, pack_display_height)
             
             # 强化的光芒效果
-            glow_alpha = int(200 * abs(math.sin(self.animation_timer * 4)))
-            glow_surface = pygame.Surface((pack_display_width + 60, pack_display_height + 60), pygame.SRCALPHA)
-            
-            # 多层光芒
-            for i in range(4):
-                layer_alpha = glow_alpha // (i + 1)
-                pygame.draw.rect(glow_surface, (255, 255, 255, layer_alpha),
-                            (i * 8, i * 8, pack_display_width + 60 - i * 16, pack_display_height + 60 - i * 16),
-                            border_radius=Theme.get_size('border_radius_xl'))
+            glow_alpha = ui_chrome.quantize(200 * abs(math.sin(self.animation_timer * 4)))
+            glow_surface = self._pack_glow_surface(pack_display_width + 60, pack_display_height + 60, glow_alpha)
             
             screen.blit(glow_surface, (pack_x - 30, pack_y - 30))
             screen.blit(scaled_pack, (pack_x, pack_y))
         
         elif self.animation_state == AnimationState.COMPLETED:
             # 完成状态
-            scaled_pack = pygame.transform.scale(pack_image, (pack_display_width, pack_display_height))
+            scaled_pack = self._scaled_pack(pack_image, pack_display_width, pack_display_height)
             screen.blit(scaled_pack, (pack_x, pack_y))
 
+    @staticmethod
+    def _pack_glow_surface(width: int, height: int, glow_alpha: int) -> pygame.Surface:
+        """获取多层光芒表面（按透明度档位缓存）"""
+        radius = Theme.get_size('border_radius_xl')
+
+        def build():
+            glow_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            for i in range(4):
+                layer_alpha = glow_alpha // (i + 1)
+                pygame.draw.rect(glow_surface, (255, 255, 255, layer_alpha),
+                                 (i * 8, i * 8, width - i * 16, height - i * 16),
+                                 border_radius=radius)
+            return glow_surface
+
+        return ui_chrome.get_chrome_cache().get(('pack_glow', width, height, glow_alpha, radius), build)
+
     def _draw_selection_ui(self, screen):
         """绘制选择阶段的UI"""
         # 绘制品质标题 - 屏幕上方
@@ -702,12 +907,8 @@ class PackOpeningWindow:
         title_rect = title_surface.get_rect(center=(self.screen_width // 2, 100 + self.content_offset_y))
         screen.blit(title_surface, title_rect)
 
-    def _draw_cards(self, screen):
-        """绘制获得的卡牌（现代风格）"""
-        if not self.obtained_cards:
-            return
-        
-        # 计算卡牌布局 - 屏幕下方
+    def _card_rects(self) -> List[pygame.Rect]:
+        """获得卡牌的布局（屏幕下方居中一行）"""
         card_width = 120
         card_height = 160
         card_spacing = 25
@@ -715,97 +916,80 @@ class PackOpeningWindow:
         
         start_x = self.screen_width // 2 - total_width // 2
         start_y = self.screen_height - 220 + self.content_offset_y  # 下方位置
+        return [
+            pygame.Rect(start_x + i * (card_width + card_spacing), start_y, card_width, card_height)
+            for i in range(len(self.obtained_cards))
+        ]
+
+    @staticmethod
+    def _card_fields(card) -> Tuple[Optional[str], str, str, str]:
+        """🔑 兼容字典和对象两种格式，返回 (图片路径, 名称, ID, 稀有度)"""
+        if isinstance(card, dict):
+            # 字典格式（从GameManager传来的）
+            return (card.get('image'), card.get('name', 'Unknown'),
+                    card.get('id', 'unknown'), card.get('rarity', 'Common'))
+        # 对象格式
+        return (getattr(card, 'image', None) or getattr(card, 'image_path', None),
+                getattr(card, 'name', 'Unknown'), getattr(card, 'id', 'unknown'),
+                getattr(card, 'rarity', 'Common'))
+
+    def _card_image(self, image_path: str, card_width: int, card_height: int) -> Optional[pygame.Surface]:
+        """加载并缩放卡牌图片（每张只加载一次，失败也记录，避免每帧重试）"""
+        if image_path in self._card_images:
+            return self._card_images[image_path]
+
+        card_image = None
+        try:
+            # ✅ 保持原始路径格式（Windows或Unix）
+            if os.path.exists(image_path):
+                original_image = pygame.image.load(image_path)
+                # 缩放图片适应卡牌区域，保持宽高比
+                image_width = card_width - 12  # 留边距
+                image_height = int(image_width * 330 / 240)  # 保持240:330比例
+                
+                # 如果图片太高，按高度缩放
+                max_image_height = card_height - 60  # 为名称和稀有度留空间
+                if image_height > max_image_height:
+                    image_height = max_image_height
+                    image_width = int(image_height * 240 / 330)
+                
+                card_image = pygame.transform.smoothscale(original_image, (image_width, image_height))
+                if pygame.display.get_surface() is not None:
+                    card_image = card_image.convert_alpha()
+            else:
+                print(f"❌ 卡牌图片文件不存在: {image_path}")
+        except Exception as e:
+            print(f"❌ 加载卡牌图片失败 {image_path}: {e}")
+
+        self._card_images[image_path] = card_image
+        return card_image
+
+    def _draw_cards(self, screen):
+        """绘制获得的卡牌（现代风格）"""
+        if not self.obtained_cards:
+            return
         
-        # ✅ 完整的稀有度颜色映射（15种稀有度）
-        rarity_colors = {
-            # 基础稀有度
-            "Common": (156, 163, 175),          # 灰色
-            "Uncommon": (34, 197, 94),          # 绿色  
-            "Rare": (59, 130, 246),             # 蓝色
-            
-            # 闪卡系列
-            "Rare Holo": (138, 43, 226),        # 紫色（闪卡）
-            "Rare Holo EX": (220, 38, 127),     # 粉红色（EX）
-            "Rare Holo GX": (239, 68, 68),      # 红色（GX）
-            "Rare Holo V": (251, 146, 60),      # 橙色（V卡）
-            
-            # 超稀有系列
-            "Ultra Rare": (245, 158, 11),       # 金色
-            "Rare Secret": (168, 85, 247),      # 深紫色（秘藏）
-            "Rare Ultra": (252, 211, 77),       # 亮金色
-            
-            # 特殊系列
-            "Promo": (16, 185, 129),            # 青绿色（推广）
-            "Rare Shiny": (192, 132, 252),      # 亮紫色（闪亮）
-            "Rare BREAK": (248, 113, 113),      # 珊瑚红（BREAK）
-            "Rare Shining": (255, 215, 0),      # 金黄色（闪耀）
-            "Amazing Rare": (236, 72, 153),     # 洋红色（惊奇）
-            "Rare Prism Star": (139, 69, 19)    # 棕色（棱镜星）
-        }
+        radius = Theme.get_size('border_radius_medium')
         
         # 绘制每张卡牌
-        for i, card in enumerate(self.obtained_cards):
-            card_x = start_x + i * (card_width + card_spacing)
-            card_rect = pygame.Rect(card_x, start_y, card_width, card_height)
+        for card, card_rect in zip(self.obtained_cards, self._card_rects()):
+            card_width, card_height = card_rect.size
             
             # 毛玻璃卡牌背景
             GlassEffect.draw_glass_rect(
                 screen, card_rect, alpha=200, border_alpha=80,
-                radius=Theme.get_size('border_radius_medium')
+                radius=radius
             )
             
             # ✅ 加载并绘制卡牌图片（兼容字典和对象格式）
-            card_image = None
-            
-            # 🔑 兼容字典和对象两种格式
-            card_image_path = None
-            if isinstance(card, dict):
-                # 字典格式（从GameManager传来的）
-                card_image_path = card.get('image')
-                card_name = card.get('name', 'Unknown')
-                card_id = card.get('id', 'unknown')
-                card_rarity = card.get('rarity', 'Common')
-            else:
-                # 对象格式
-                card_image_path = getattr(card, 'image', None) or getattr(card, 'image_path', None)
-                card_name = getattr(card, 'name', 'Unknown')
-                card_id = getattr(card, 'id', 'unknown')
-                card_rarity = getattr(card, 'rarity', 'Common')
-            
-            # print(f"🖼️ 检查卡牌数据格式:")
-            # print(f"  卡牌类型: {type(card)}")
-            # print(f"  卡牌名称: {card_name}")
-            # print(f"  图片路径: '{card_image_path}'")
+            card_image_path, card_name, card_id, card_rarity = self._card_fields(card)
             
+            card_image = None
             if card_image_path:
-                import os
-                try:
-                    # ✅ 保持原始路径格式（Windows或Unix）
-                    image_path = card_image_path
-                    
-                    # print(f"🖼️ 最终图片路径: '{image_path}'")
-                    
-                    # 加载卡牌图片
-                    if os.path.exists(image_path):
-                        original_image = pygame.image.load(image_path)
-                        # 缩放图片适应卡牌区域，保持宽高比
-                        image_width = card_width - 12  # 留边距
-                        image_height = int(image_width * 330 / 240)  # 保持240:330比例
-                        
-                        # 如果图片太高，按高度缩放
-                        max_image_height = card_height - 60  # 为名称和稀有度留空间
-                        if image_height > max_image_height:
-                            image_height = max_image_height
-                            image_width = int(image_height * 240 / 330)
-                        
-                        card_image = pygame.transform.smoothscale(original_image, (image_width, image_height))
-                        # print(f"✅ 成功加载卡牌图片: {card_name} - {card_image_path}")
-                    else:
-                        print(f"❌ 卡牌图片文件不存在: {card_image_path}")
-                except Exception as e:
-                    print(f"❌ 加载卡牌图片失败 {getattr(card, 'id', 'unknown')}: {e}")
-            else:
-                print(f"❌ 卡牌没有图片路径: {getattr(card, 'name', 'unknown')}")
+                card_image = self._card_image(card_image_path, card_width, card_height)
+            elif card_id not in self._card_images:
+                print(f"❌ 卡牌没有图片路径: {card_name}")
+                self._card_images[card_id] = None
             
             # 绘制卡牌图片
             if card_image:
@@ -822,17 +1006,14 @@ class PackOpeningWindow:
                 pygame.draw.rect(screen, (64, 64, 64), placeholder_rect, border_radius=8)
                 
                 # 绘制"无图片"文字
-                no_image_font = pygame.font.Font(None, 24)
-                no_image_text = no_image_font.render("No Image", True, (128, 128, 128))
+                no_image_text = self._no_image_text()
                 no_image_rect = no_image_text.get_rect(center=placeholder_rect.center)
                 screen.blit(no_image_text, no_image_rect)
             
-            # ✅ 稀有度边框（使用完整的颜色映射）
-            border_color = rarity_colors.get(card_rarity, (156, 163, 175))  # 默认灰色
-            border_surface = pygame.Surface((card_width, card_height), pygame.SRCALPHA)
-            pygame.draw.rect(border_surface, border_color + (200,),
-                        (0, 0, card_width, card_height), 
-                        width=4, border_radius=Theme.get_size('border_radius_medium'))
+            # ✅ 稀有度边框（使用完整的颜色映射，边框表面按颜色缓存）
+            border_color = RARITY_COLORS.get(card_rarity, DEFAULT_RARITY_COLOR)
+            border_surface = ui_chrome.rounded_rect((card_width, card_height), border_color + (200,),
+                                                    radius=radius, width=4)
             screen.blit(border_surface, card_rect.topleft)
             
             # 卡牌名称（缩短显示）
@@ -865,16 +1046,19 @@ class PackOpeningWindow:
             rarity_rect = rarity_text.get_rect(center=(card_rect.centerx, card_rect.bottom - 10))
             screen.blit(rarity_text, rarity_rect)
             
-            # ✅ 添加稀有度光效（可选）
-            if card_rarity in ["Ultra Rare", "Rare Secret", "Amazing Rare", "Rare Shining"]:
-                # 绘制闪光效果
-                glow_surface = pygame.Surface((card_width + 8, card_height + 8), pygame.SRCALPHA)
-                glow_color = border_color + (60,)
-                pygame.draw.rect(glow_surface, glow_color,
-                            (0, 0, card_width + 8, card_height + 8),
-                            width=6, border_radius=Theme.get_size('border_radius_medium') + 2)
+            # ✅ 添加稀有度光效（闪光粒子由粒子系统沿边框持续发射）
+            if card_rarity in GLOW_RARITIES:
+                glow_surface = ui_chrome.rounded_rect((card_width + 8, card_height + 8), border_color + (60,),
+                                                      radius=radius + 2, width=6)
                 screen.blit(glow_surface, (card_rect.x - 4, card_rect.y - 4))
 
+    def _no_image_text(self) -> pygame.Surface:
+        """缺少图片时的占位文字（只渲染一次）"""
+        if self._no_image_surface is None:
+            no_image_font = pygame.font.Font(None, 24)
+            self._no_image_surface = no_image_font.render("No Image", True, (128, 128, 128))
+        return self._no_image_surface
+
     def _draw_ui_elements(self, screen):
         """绘制UI元素"""
         # 绘制交互按钮
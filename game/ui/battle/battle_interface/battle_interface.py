@@ -19,6 +19,9 @@ from pygame_cards.set import CardsSet
 from pygame_cards.events import CARDSSET_CLICKED, CARD_MOVED
 from pygame_cards import constants
 
+from game.scenes.styles.fonts import get_font_manager
+from game.core.frame_profiler import profiled
+
 # 导入我们的适配器
 from .pokemon_card_adapter import PokemonCardAdapter, convert_to_pokemon_cardsset
 
@@ -346,6 +349,8 @@ class BattleControlPanel:
     
     def draw(self, screen, battle_state=None, player_state=None, opponent_state=None):
         """绘制控制面板"""
+        render = get_font_manager().render_font_cached
+        
         # 背景
         panel_surf = pygame.Surface((self.panel_rect.width, self.panel_rect.height), pygame.SRCALPHA)
         panel_surf.fill((40, 40, 60, 200))  # 半透明背景
@@ -353,7 +358,7 @@ class BattleControlPanel:
         
         # 标题
         title = "Panel de control"
-        title_surface = self.title_font.render(title, True, (255, 255, 255))
+        title_surface = render(self.title_font, title, True, (255, 255, 255))
         title_rect = title_surface.get_rect(centerx=self.panel_rect.centerx, y=self.panel_rect.y + 10)
         screen.blit(title_surface, title_rect)
         
@@ -364,13 +369,13 @@ class BattleControlPanel:
             # 当前阶段
             phase = battle_state.current_phase.value if hasattr(battle_state.current_phase, 'value') else str(battle_state.current_phase)
             phase_text = f"Fase: {phase}"
-            phase_surface = self.info_font.render(phase_text, True, (200, 200, 200))
+            phase_surface = render(self.info_font, phase_text, True, (200, 200, 200))
             screen.blit(phase_surface, (self.panel_rect.x + 10, info_y))
             
             # 当前玩家
             current_player = "Usted" if battle_state.current_turn_player == 1 else "AI"
             player_text = f"Turno: {current_player}"
-            player_surface = self.info_font.render(player_text, True, (200, 200, 200))
+            player_surface = render(self.info_font, player_text, True, (200, 200, 200))
             screen.blit(player_surface, (self.panel_rect.x + 10, info_y + 15))
         
         # 玩家状态
@@ -385,7 +390,7 @@ class BattleControlPanel:
             ]
             
             for i, stat in enumerate(stats):
-                stat_surface = self.info_font.render(stat, True, (255, 255, 255))
+                stat_surface = render(self.info_font, stat, True, (255, 255, 255))
                 screen.blit(stat_surface, (self.panel_rect.x + 10, info_y + i * 15))
         
         # 绘制按钮
@@ -402,7 +407,7 @@ class BattleControlPanel:
             
             # 按钮文字
             text_color = (255, 255, 255) if button['enabled'] else (150, 150, 150)
-            text_surface = self.button_font.render(button['text'], True, text_color)
+            text_surface = render(self.button_font, button['text'], True, text_color)
             text_rect = text_surface.get_rect(center=rect.center)
             screen.blit(text_surface, text_rect)
 
@@ -1145,6 +1150,7 @@ class BattleInterface:
             print(f"❌ [修复] 创建回退占位符也失败: {e}")
             return None
     
+    @profiled("battle.update_state")
     def _update_battle_state(self):
         """🔥 修复：更新战斗状态 - 使用真实数据"""
         try:
@@ -1,8 +1,24 @@
 import pygame
 import pygame_gui
-import os
 import math
 from typing import Optional, Callable
+from game.scenes.styles.fonts import get_font_manager
+from game.utils import ui_chrome
+from game.core.asset_registry import get_asset_registry
+from game.scenes.animations.tween import TweenEngine, follow_rate
+
+# 导航图标尺寸与悬停放大倍数
+ICON_SIZE = 24
+HOVER_SCALE = 1.1
+
+# 导航项目配置
+NAV_ITEMS = (
+    {'id': 'pokedex', 'text': 'Pokédex', 'icon': 'dex'},
+    {'id': 'social', 'text': 'Social', 'icon': 'friends'},
+    {'id': 'home', 'text': 'Inicio', 'icon': 'home'},
+    {'id': 'battle', 'text': 'Batalla', 'icon': 'combat'},
+    {'id': 'menu', 'text': 'Menú', 'icon': 'menu'},
+)
 
 class PokemonNavigationGUI:
     """
@@ -26,15 +42,11 @@ class PokemonNavigationGUI:
         self.y_position = screen_height - self.height
         
         # 导航项目配置
-        self.nav_items = [
-            {'id': 'pokedex', 'text': 'Pokédex', 'icon': 'dex'},
-            {'id': 'social', 'text': 'Social', 'icon': 'friends'},
-            {'id': 'home', 'text': 'Inicio', 'icon': 'home'},
-            {'id': 'battle', 'text': 'Batalla', 'icon': 'combat'},
-            {'id': 'menu', 'text': 'Menú', 'icon': 'menu'}
-        ]
-        
-        # 加载图标
+        self.nav_items = [dict(item) for item in NAV_ITEMS]
+        
+        # 加载图标（来自资源注册表，cleanup时归还）
+        self._acquired_assets = []
+        self._sized_icons = {}  # (icon_name, icon_type, 像素) -> surface，悬停缩放用
         self.icons = self.load_icons()
         
         # 导航状态
@@ -44,7 +56,16 @@ class PokemonNavigationGUI:
         # 动画参数
         self.animation_timer = 0
         self.float_offsets = {item['id']: 0 for item in self.nav_items}
-        self.hover_scales = {item['id']: 1.0 for item in self.nav_items}
+        # 悬停缩放为跟随补间（与帧率无关），在 update_animations 中推进
+        self.tweens = TweenEngine()
+        self.hover_scales = {
+            item['id']: self.tweens.follow(1.0, follow_rate(0.15), epsilon=0.002) for item in self.nav_items
+        }
+        # 上一次绘制时各项的 (浮动像素, 缩放)，用于计算脏矩形
+        self._drawn_states = {}
+        
+        # 毛玻璃背景缓存（尺寸不变时复用）
+        self._glass_surface = None
         
         # 计算按钮区域
         self.button_areas = self.calculate_button_areas()
@@ -55,6 +76,11 @@ class PokemonNavigationGUI:
         # 字体
         self.font = pygame.font.SysFont("arial", 11, bold=True)
     
+    @staticmethod
+    def icon_asset_ids() -> list:
+        """导航图标的资源ID（普通与dark），供场景预取声明依赖"""
+        return [f"icons/{item['icon']}{suffix}" for item in NAV_ITEMS for suffix in ("", "_dark")]
+    
     def load_icons(self) -> dict:
         """
         加载PNG图标文件
@@ -68,38 +94,43 @@ class PokemonNavigationGUI:
             icon_name = item['icon']
             icons[icon_name] = {}
             
-            # 加载普通图标
-            normal_path = os.path.join("assets", "icons", f"{icon_name}.png")
-            if os.path.exists(normal_path):
-                try:
-                    icon_surface = pygame.image.load(normal_path)
-                    icon_surface = pygame.transform.smoothscale(icon_surface, (24, 24))
-                    icons[icon_name]['normal'] = icon_surface
-                    print(f"✅ 普通图标加载: {icon_name}.png")
-                except Exception as e:
-                    print(f"❌ 普通图标加载失败 {icon_name}: {e}")
-                    icons[icon_name]['normal'] = None
-            else:
-                print(f"⚠️ 普通图标文件不存在: {normal_path}")
-                icons[icon_name]['normal'] = None
-            
-            # 加载dark图标
-            dark_path = os.path.join("assets", "icons", f"{icon_name}_dark.png")
-            if os.path.exists(dark_path):
-                try:
-                    dark_surface = pygame.image.load(dark_path)
-                    dark_surface = pygame.transform.smoothscale(dark_surface, (24, 24))
-                    icons[icon_name]['dark'] = dark_surface
-                    print(f"✅ Dark图标加载: {icon_name}_dark.png")
-                except Exception as e:
-                    print(f"❌ Dark图标加载失败 {icon_name}: {e}")
-                    icons[icon_name]['dark'] = None
-            else:
-                print(f"⚠️ Dark图标文件不存在: {dark_path}")
-                icons[icon_name]['dark'] = None
+            # 普通图标与dark图标（24像素及悬停放大的各尺寸都已打包在图集中）
+            for icon_type in ('normal', 'dark'):
+                for pixels in range(ICON_SIZE, int(ICON_SIZE * HOVER_SCALE) + 1):
+                    self._get_sized_icon(icon_name, icon_type, pixels)
+                icon_surface = self._sized_icons.get((icon_name, icon_type, ICON_SIZE))
+                if icon_surface is not None:
+                    print(f"✅ 图标加载: {icon_name} ({icon_type})")
+                else:
+                    print(f"⚠️ 图标不可用: {icon_name} ({icon_type})")
+                icons[icon_name][icon_type] = icon_surface
         
         return icons
     
+    def _get_sized_icon(self, icon_name: str, icon_type: str, pixels: int) -> Optional[pygame.Surface]:
+        """
+        获取指定像素尺寸的图标（首次使用时向注册表申请，之后直接取缓存）
+        
+        Args:
+            icon_name: 图标名
+            icon_type: 'normal' 或 'dark'
+            pixels: 边长
+            
+        Returns:
+            图标表面，资源不存在时为None
+        """
+        key = (icon_name, icon_type, pixels)
+        if key in self._sized_icons:
+            return self._sized_icons[key]
+        
+        asset_id = f"icons/{icon_name}" if icon_type == 'normal' else f"icons/{icon_name}_dark"
+        size = (pixels, pixels)
+        icon_surface = get_asset_registry().acquire(asset_id, size)
+        if icon_surface is not None:
+            self._acquired_assets.append((asset_id, size))
+        self._sized_icons[key] = icon_surface
+        return icon_surface
+    
     def calculate_button_areas(self):
         """计算按钮区域"""
         areas = {}
@@ -114,9 +145,16 @@ class PokemonNavigationGUI:
         
         return areas
     
-    def update_animations(self):
-        """更新动画效果"""
-        self.animation_timer += 1
+    def update_animations(self, time_delta: float = 1 / 60):
+        """
+        更新动画效果
+        
+        Args:
+            time_delta: 帧时间（秒），计时器按60fps的帧数推进
+        """
+        self.animation_timer += time_delta * 60
+        # 原先每帧乘0.9的回位衰减，按帧时间折算
+        settle = 0.9 ** (time_delta * 60)
         
         for item in self.nav_items:
             item_id = item['id']
@@ -132,13 +170,12 @@ class PokemonNavigationGUI:
                 self.float_offsets[item_id] = math.sin(phase) * 2
             else:
                 # 非活跃项目缓慢回到原位
-                current_offset = self.float_offsets[item_id]
-                self.float_offsets[item_id] = current_offset * 0.9
+                self.float_offsets[item_id] *= settle
             
             # 缩放动效
-            target_scale = 1.1 if item_id == self.hover_item else 1.0
-            current_scale = self.hover_scales[item_id]
-            self.hover_scales[item_id] = current_scale + (target_scale - current_scale) * 0.15
+            self.hover_scales[item_id].retarget(HOVER_SCALE if item_id == self.hover_item else 1.0)
+        
+        self.tweens.update(time_delta)
     
     def handle_mouse_motion(self, pos: tuple):
         """处理鼠标移动"""
@@ -188,23 +225,63 @@ class PokemonNavigationGUI:
     
     def update(self, time_delta: float):
         """更新导航栏"""
-        self.update_animations()
+        self.update_animations(time_delta)
     
-    def draw_glass_background(self, screen: pygame.Surface):
-        """绘制毛玻璃背景效果"""
-        # 创建半透明背景
-        bg_surface = pygame.Surface((self.screen_width, self.height), pygame.SRCALPHA)
+    def _item_state(self, item_id: str):
+        """导航项的可见状态（决定是否需要重绘）"""
+        return int(self.float_offsets[item_id]), round(self.hover_scales[item_id].value, 3)
+    
+    def get_dirty_rects(self) -> list:
+        """
+        自上次绘制以来外观发生变化的导航项区域
         
-        # 毛玻璃效果背景色
-        bg_color = (255, 255, 255, 217)  # 85% 透明度
-        bg_surface.fill(bg_color)
+        Returns:
+            list: 变化区域（每项为整列，覆盖缩放、浮动和底部指示线）
+        """
+        rects = []
+        for item in self.nav_items:
+            item_id = item['id']
+            if self._drawn_states.get(item_id) != self._item_state(item_id):
+                rect = self.button_areas[item_id]
+                pad = int(rect.width * 0.05) + 2
+                rects.append(pygame.Rect(rect.x - pad, self.y_position,
+                                         rect.width + pad * 2, self.height))
+        return rects
+    
+    def is_animating(self) -> bool:
+        """
+        是否有缩放或回位动画未完成（活跃项的循环浮动不计入）
         
-        # 绘制顶部边框
-        pygame.draw.line(bg_surface, (255, 255, 255, 77), 
-                        (0, 0), (self.screen_width, 0), 1)
+        Returns:
+            bool: 有动画时为True
+        """
+        for item in self.nav_items:
+            item_id = item['id']
+            if self.hover_scales[item_id].active:
+                return True
+            if item_id != self.active_item and abs(self.float_offsets[item_id]) >= 1:
+                return True
+        return False
+    
+    def draw_glass_background(self, screen: pygame.Surface):
+        """绘制毛玻璃背景效果"""
+        size = (self.screen_width, self.height)
+        if self._glass_surface is None or self._glass_surface.get_size() != size:
+            # 毛玻璃背景（85% 透明度）与顶部边框
+            self._glass_surface = ui_chrome.get_chrome_cache().get(
+                ('nav_glass', size), lambda: self._build_glass_background(size)
+            )
         
         # 绘制到主屏幕
-        screen.blit(bg_surface, (0, self.y_position))
+        screen.blit(self._glass_surface, (0, self.y_position))
+    
+    @staticmethod
+    def _build_glass_background(size: tuple) -> pygame.Surface:
+        """合成导航栏毛玻璃背景"""
+        bg_surface = pygame.Surface(size, pygame.SRCALPHA)
+        bg_surface.fill((255, 255, 255, 217))
+        pygame.draw.line(bg_surface, (255, 255, 255, 77), (0, 0), (size[0], 0), 1)
+        return bg_surface
     
     def draw_separators(self, screen: pygame.Surface):
         """绘制分隔符"""
@@ -232,7 +309,7 @@ class PokemonNavigationGUI:
             
             # 应用浮动和缩放动效
             float_offset = self.float_offsets[item_id]
-            scale = self.hover_scales[item_id]
+            scale = self.hover_scales[item_id].value
             
             # 计算动效后的位置
             animated_rect = rect.copy()
@@ -258,10 +335,10 @@ class PokemonNavigationGUI:
                 icon_x = animated_rect.centerx - 12
                 icon_y = animated_rect.y + 8
                 
-                # 如果有缩放效果，也缩放图标
+                # 如果有缩放效果，使用对应尺寸的图标（预先打包，不在绘制时缩放）
                 if scale != 1.0:
-                    scaled_size = int(24 * scale)
-                    scaled_icon = pygame.transform.smoothscale(icon_surface, (scaled_size, scaled_size))
+                    scaled_size = int(ICON_SIZE * scale)
+                    scaled_icon = self._get_sized_icon(icon_name, icon_type, scaled_size) or icon_surface
                     icon_x = animated_rect.centerx - scaled_size // 2
                     screen.blit(scaled_icon, (icon_x, icon_y))
                 else:
@@ -269,7 +346,7 @@ class PokemonNavigationGUI:
             
             # 绘制文字
             text_color = (45, 55, 72) if item_id == self.active_item else (113, 128, 150)
-            text_surface = self.font.render(item['text'], True, text_color)
+            text_surface = get_font_manager().render_font_cached(self.font, item['text'], True, text_color)
             text_rect = text_surface.get_rect(center=(animated_rect.centerx, animated_rect.bottom - 15))
             screen.blit(text_surface, text_rect)
             
@@ -298,6 +375,8 @@ class PokemonNavigationGUI:
         
         # 绘制导航项目
         self.draw_navigation_items(screen)
+        
+        self._drawn_states = {item['id']: self._item_state(item['id']) for item in self.nav_items}
     
     def resize(self, new_width: int, new_height: int):
         """调整导航栏大小"""
@@ -309,8 +388,12 @@ class PokemonNavigationGUI:
         self.button_areas = self.calculate_button_areas()
     
     def cleanup(self):
-        """清理资源"""
-        pass
+        """清理资源（归还注册表中的图标）"""
+        registry = get_asset_registry()
+        for asset_id, size in getattr(self, '_acquired_assets', []):
+            registry.release(asset_id, size)
+        self._acquired_assets = []
+        self._sized_icons = {}
     
     def __del__(self):
         """析构函数"""
@@ -0,0 +1,409 @@
+"""
+粒子系统
+粒子状态按"数组结构"（struct of arrays）存放在numpy数组中（位置、速度、剩余寿命、尺寸、透明度…），
+每帧的运动、衰减和回收都是整列的向量运算，不为单个粒子创建Python对象。
+
+绘制时把尺寸和透明度量化为档位，从预先着色（颜色与透明度已烘焙进像素）的小纹理中取帧，
+整批交给 Surface.blits() 一次提交。纹理来自 assets/icons/effects，按 PARTICLE_TEXTURES 的尺寸打包在特效图集中。
+
+numpy不在必需依赖中，首次发射粒子时才导入；不可用时粒子系统静默关闭，界面其余部分不受影响。
+"""
+
+import importlib.util
+from operator import itemgetter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+# numpy只在真正发射粒子时导入（冷导入约100ms，不放在启动路径上）
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+# 默认粒子容量（超出的粒子在发射时丢弃）
+DEFAULT_CAPACITY = 8192
+
+# 粒子纹理：{资源ID: 图集中的基础尺寸}（最大边为 max(SIZE_LEVELS)，其余档位由基础尺寸缩小）
+PARTICLE_TEXTURES: Dict[str, Tuple[int, int]] = {
+    "icons/effects/star1": (40, 40),
+    "icons/effects/big_star": (40, 23),
+    "icons/effects/shining_star": (34, 40),
+    "icons/effects/white_circle": (40, 40),
+}
+# 程序生成的柔光点（无对应图片）
+SPARK_TEXTURE = "spark"
+
+# 尺寸档位（像素，纹理最大边）与透明度档位数
+SIZE_LEVELS = (3, 4, 6, 8, 10, 12, 16, 20, 24, 32, 40)
+ALPHA_LEVELS = 16
+
+Color = Sequence[int]
+Range = Tuple[float, float]
+
+
+def import_numpy() -> bool:
+    """
+    导入numpy（可在后台线程提前调用）
+
+    Returns:
+        bool: numpy是否可用
+    """
+    global np
+    if np is None and NUMPY_AVAILABLE:
+        import numpy
+        np = numpy
+    return np is not None
+
+
+@dataclass(frozen=True)
+class EmitterConfig:
+    """发射器配置（每种稀有度/效果一份，作为字典键使用，需保持不可变）"""
+    # 纹理：PARTICLE_TEXTURES中的资源ID或 SPARK_TEXTURE
+    texture: str = SPARK_TEXTURE
+    # 着色（每个粒子随机取一种）
+    colors: Tuple[Tuple[int, int, int], ...] = ((255, 255, 255),)
+    # 一次爆发的粒子数
+    burst: int = 0
+    # 持续发射速率（粒子/秒）
+    rate: float = 0.0
+    # 初速度（像素/秒）与发射角度（度，0为向右，顺时针）
+    speed: Range = (60.0, 240.0)
+    angle: Range = (0.0, 360.0)
+    # 寿命（秒）、尺寸（像素）、初始透明度
+    life: Range = (0.6, 1.4)
+    size: Range = (4.0, 12.0)
+    alpha: Range = (160.0, 255.0)
+    # 重力加速度（像素/秒²，向下为正）与速度衰减（每秒比例）
+    gravity: float = 0.0
+    drag: float = 1.5
+    # 发射位置："area" 在区域内均匀分布，"edge" 在区域边框上
+    spawn: str = "area"
+
+
+class ParticleSystem:
+    """
+    粒子系统
+
+    存活的粒子始终紧凑地排在数组前 count 个位置，update() 结束时把死亡粒子挤掉。
+    每种（纹理, 颜色）组合称为一个样式，其全部尺寸/透明度档位的纹理在首次使用时一次生成。
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        初始化粒子系统（不分配数组、不导入numpy）
+
+        Args:
+            capacity: 最多同时存在的粒子数
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.enabled = NUMPY_AVAILABLE
+        self._arrays_ready = False
+
+        # 样式：{(纹理, 颜色): 样式序号}，帧表按 (样式, 尺寸档位, 透明度档位) 展平
+        self._styles: Dict[Tuple[str, Tuple[int, int, int]], int] = {}
+        self._frames: List[pygame.Surface] = []
+        self._frame_offsets_x: List[int] = []
+        self._frame_offsets_y: List[int] = []
+        self._offsets = None
+        self._base_textures: Dict[str, pygame.Surface] = {}
+        self._acquired_assets: List[Tuple[str, Tuple[int, int]]] = []
+
+        # 持续发射的小数部分累积 {键: 未发射的粒子数}
+        self._emit_carry: Dict[object, float] = {}
+        self.dropped = 0
+
+    # ==================== 存储 ====================
+
+    def _ensure_arrays(self) -> bool:
+        if self._arrays_ready:
+            return True
+        if not self.enabled or not import_numpy():
+            if self.enabled:
+                print("⚠️ numpy不可用，粒子效果已关闭")
+            self.enabled = False
+            return False
+
+        capacity = self.capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.alpha = np.zeros(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.drag = np.zeros(capacity, dtype=np.float32)
+        self.style = np.zeros(capacity, dtype=np.int32)
+        self._rng = np.random.default_rng()
+        self._size_levels = np.asarray(SIZE_LEVELS, dtype=np.float32)
+        self._arrays_ready = True
+        return True
+
+    # ==================== 纹理 ====================
+
+    def _base_texture(self, texture: str) -> Optional[pygame.Surface]:
+        surface = self._base_textures.get(texture)
+        if surface is not None:
+            return surface
+
+        if texture == SPARK_TEXTURE:
+            surface = _build_spark_texture(max(SIZE_LEVELS))
+        else:
+            from game.core.asset_registry import get_asset_registry
+
+            size = PARTICLE_TEXTURES.get(texture)
+            surface = get_asset_registry().acquire(texture, size=size)
+            if surface is None:
+                print(f"⚠️ 粒子纹理不可用: {texture}")
+                return None
+            self._acquired_assets.append((texture, size))
+        self._base_textures[texture] = surface
+        return surface
+
+    def _style_index(self, texture: str, color: Color) -> Optional[int]:
+        """样式序号（首次使用时生成该样式全部档位的着色帧）"""
+        key = (texture, tuple(int(c) for c in color[:3]))
+        index = self._styles.get(key)
+        if index is not None:
+            return index
+
+        base = self._base_texture(texture)
+        if base is None:
+            return None
+
+        index = len(self._styles)
+        self._styles[key] = index
+        base_width, base_height = base.get_size()
+        longest = max(base_width, base_height)
+        for level in SIZE_LEVELS:
+            size = (max(1, round(base_width * level / longest)), max(1, round(base_height * level / longest)))
+            scaled = pygame.transform.smoothscale(base, size)
+            for alpha_index in range(ALPHA_LEVELS):
+                # 颜色与透明度直接乘进像素，绘制时是普通的逐像素alpha混合（取档位中值）
+                alpha = min(255, (2 * alpha_index + 1) * 128 // ALPHA_LEVELS)
+                frame = scaled.copy()
+                frame.fill(key[1] + (alpha,), special_flags=pygame.BLEND_RGBA_MULT)
+                if pygame.display.get_surface() is not None:
+                    frame = frame.convert_alpha()
+                self._frames.append(frame)
+                self._frame_offsets_x.append(size[0] // 2)
+                self._frame_offsets_y.append(size[1] // 2)
+
+        self._offsets = (np.asarray(self._frame_offsets_x, dtype=np.int32),
+                         np.asarray(self._frame_offsets_y, dtype=np.int32))
+        return index
+
+    def prepare(self, config: EmitterConfig):
+        """
+        预先导入numpy并生成配置用到的着色帧（在窗口显示时调用，避免首次爆发时卡顿）
+
+        Args:
+            config: 发射器配置
+        """
+        if self._ensure_arrays():
+            for color in config.colors:
+                self._style_index(config.texture, color)
+
+    # ==================== 发射与更新 ====================
+
+    def emit(self, config: EmitterConfig, area, count: Optional[int] = None) -> int:
+        """
+        发射一批粒子
+
+        Args:
+            config: 发射器配置
+            area: 发射区域 pygame.Rect / (x, y, w, h)，或发射点 (x, y)
+            count: 粒子数（默认 config.burst）
+
+        Returns:
+            int: 实际发射的粒子数（超出容量的部分被丢弃）
+        """
+        count = config.burst if count is None else int(count)
+        if count <= 0 or not self._ensure_arrays():
+            return 0
+
+        styles = [self._style_index(config.texture, color) for color in config.colors]
+        styles = [style for style in styles if style is not None]
+        if not styles:
+            return 0
+
+        available = self.capacity - self.count
+        if count > available:
+            self.dropped += count - available
+            count = available
+        if count <= 0:
+            return 0
+
+        rng = self._rng
+        start, end = self.count, self.count + count
+        x, y, width, height = _area_tuple(area)
+
+        if config.spawn == "edge" and width and height:
+            # 沿周长均匀取点：上、右、下、左四条边依次展开成一条线段
+            distance = rng.uniform(0, 2 * (width + height), count)
+            px = np.select([distance < width, distance < width + height, distance < 2 * width + height],
+                           [distance, width, 2 * width + height - distance], 0)
+            py = np.select([distance < width, distance < width + height, distance < 2 * width + height],
+                           [0, distance - width, height], 2 * (width + height) - distance)
+            self.pos[start:end, 0] = x + px
+            self.pos[start:end, 1] = y + py
+        else:
+            self.pos[start:end, 0] = x + rng.uniform(0, width, count) if width else x
+            self.pos[start:end, 1] = y + rng.uniform(0, height, count) if height else y
+
+        angle = np.radians(rng.uniform(config.angle[0], config.angle[1], count))
+        speed = rng.uniform(config.speed[0], config.speed[1], count)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+
+        life = rng.uniform(config.life[0], config.life[1], count)
+        self.life[start:end] = life
+        self.max_life[start:end] = np.maximum(life, 1e-3)
+        self.size[start:end] = rng.uniform(config.size[0], config.size[1], count)
+        self.alpha[start:end] = rng.uniform(config.alpha[0], config.alpha[1], count)
+        self.gravity[start:end] = config.gravity
+        self.drag[start:end] = config.drag
+        self.style[start:end] = rng.choice(np.asarray(styles, dtype=np.int32), count)
+
+        self.count = end
+        return count
+
+    def emit_continuous(self, key, config: EmitterConfig, area, dt: float) -> int:
+        """
+        按 config.rate 持续发射（不足一个粒子的部分累积到下一帧）
+
+        Args:
+            key: 发射源的键（每个持续发射源一个）
+            config: 发射器配置
+            area: 发射区域或发射点
+            dt: 时间步长（秒）
+
+        Returns:
+            int: 本帧发射的粒子数
+        """
+        if config.rate <= 0 or not self.enabled:
+            return 0
+        pending = self._emit_carry.get(key, 0.0) + config.rate * dt
+        count = int(pending)
+        self._emit_carry[key] = pending - count
+        return self.emit(config, area, count) if count else 0
+
+    def update(self, dt: float):
+        """
+        推进全部粒子（运动、重力、阻尼、寿命），并回收寿命耗尽的粒子
+
+        Args:
+            dt: 时间步长（秒）
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        vel = self.vel[:n]
+        vel[:, 1] += self.gravity[:n] * dt
+        vel *= np.maximum(0.0, 1.0 - self.drag[:n] * dt)[:, None]
+        self.pos[:n] += vel * dt
+        self.life[:n] -= dt
+
+        alive = self.life[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            # 存活粒子前移，保持紧凑
+            for array in (self.pos, self.vel, self.life, self.max_life, self.size,
+                          self.alpha, self.gravity, self.drag, self.style):
+                array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+
+    def draw(self, surface: pygame.Surface, offset: Tuple[int, int] = (0, 0)):
+        """
+        批量绘制全部粒子
+
+        Args:
+            surface: 目标表面
+            offset: 整体偏移
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        # 透明度随剩余寿命线性淡出，尺寸随之略微收缩
+        remaining = self.life[:n] / self.max_life[:n]
+        alpha = self.alpha[:n] * remaining
+        alpha_index = (alpha * (ALPHA_LEVELS / 256.0)).astype(np.int32)
+        size = self.size[:n] * (0.5 + 0.5 * remaining)
+        size_index = np.searchsorted(self._size_levels, size).clip(0, len(SIZE_LEVELS) - 1)
+
+        frame_index = (self.style[:n] * len(SIZE_LEVELS) + size_index) * ALPHA_LEVELS + alpha_index.clip(0, ALPHA_LEVELS - 1)
+        visible = alpha_index > 0
+        if not visible.all():
+            frame_index = frame_index[visible]
+            positions = self.pos[:n][visible]
+        else:
+            positions = self.pos[:n]
+
+        offsets_x, offsets_y = self._offsets
+        xs = (positions[:, 0] + offset[0]).astype(np.int32) - offsets_x[frame_index]
+        ys = (positions[:, 1] + offset[1]).astype(np.int32) - offsets_y[frame_index]
+
+        # 取帧和组装 (表面, 坐标) 都在C层完成，不逐个粒子执行Python字节码
+        if len(frame_index) == 0:
+            return
+        if len(frame_index) == 1:
+            surface.blit(self._frames[int(frame_index[0])], (int(xs[0]), int(ys[0])))
+            return
+        frames = itemgetter(*frame_index.tolist())(self._frames)
+        surface.blits(zip(frames, np.stack((xs, ys), axis=1).tolist()), doreturn=False)
+
+    # ==================== 管理 ====================
+
+    def clear(self):
+        """移除全部粒子（保留已生成的纹理）"""
+        self.count = 0
+        self._emit_carry.clear()
+
+    def cleanup(self):
+        """移除粒子并归还纹理（不再使用时调用）"""
+        self.clear()
+        from game.core.asset_registry import get_asset_registry
+
+        registry = get_asset_registry()
+        for asset_id, size in self._acquired_assets:
+            registry.release(asset_id, size=size)
+        self._acquired_assets = []
+        self._base_textures.clear()
+        self._styles.clear()
+        self._frames = []
+        self._frame_offsets_x = []
+        self._frame_offsets_y = []
+        self._offsets = None
+
+    def get_stats(self) -> dict:
+        """获取粒子统计"""
+        return {
+            'particles': self.count,
+            'capacity': self.capacity,
+            'styles': len(self._styles),
+            'frames': len(self._frames),
+            'dropped': self.dropped,
+            'enabled': self.enabled,
+        }
+
+
+def _area_tuple(area) -> Tuple[float, float, float, float]:
+    """发射区域规范化为 (x, y, w, h)（发射点的宽高为0）"""
+    if isinstance(area, pygame.Rect):
+        return area.x, area.y, area.width, area.height
+    if len(area) == 2:
+        return float(area[0]), float(area[1]), 0.0, 0.0
+    return tuple(float(value) for value in area[:4])
+
+
+def _build_spark_texture(diameter: int) -> pygame.Surface:
+    """生成白色柔光点（中心不透明，向外按平方衰减）"""
+    surface = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+    radius = diameter / 2
+    center = (radius, radius)
+    for step in range(int(radius), 0, -1):
+        alpha = int(255 * (1 - step / radius) ** 2)
+        pygame.draw.circle(surface, (255, 255, 255, alpha), center, step)
+    return surface
@@ -0,0 +1,191 @@
+"""
+动画精灵帧缓存
+把连续变化的旋转角度/缩放比例量化为档位，帧在首次用到时生成并缓存，之后按索引取用，
+不再每帧对大纹理做 rotate/scale。
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import pygame
+
+
+class RotationFrames:
+    """
+    预旋转帧集合
+
+    只缓存 [0°, 90°) 内按 angle_step 量化的帧，其余角度由90°倍数的无损旋转得到，
+    内存为整圈预渲染的1/4。帧裁剪到纹理内容的外接圆范围，旋转后尺寸不变，便于居中绘制。
+    """
+
+    def __init__(self, source: pygame.Surface, angle_step: float = 3.0):
+        """
+        初始化帧集合
+
+        Args:
+            source: 原始纹理
+            angle_step: 角度量化步长（度），应能整除90
+        """
+        self.source = source
+        self.steps_per_quarter = max(1, int(round(90.0 / angle_step)))
+        self.angle_step = 90.0 / self.steps_per_quarter
+        self.frame_size = self._content_diameter(source)
+
+        self._quarter_frames: Dict[int, pygame.Surface] = {}
+        # 90°倍数旋转的结果不缓存（否则内存回到整圈），只记住最近一帧
+        self._last_index: Optional[int] = None
+        self._last_frame: Optional[pygame.Surface] = None
+
+    @staticmethod
+    def _content_diameter(source: pygame.Surface) -> int:
+        """纹理非透明内容绕中心旋转时扫过的圆的直径（二分查找能包住全部内容的最小圆）"""
+        width, height = source.get_size()
+        content = pygame.mask.from_surface(source, 0)
+        total = content.count()
+        center = (width / 2, height / 2)
+
+        low, high = 0, int(math.ceil(math.hypot(width, height) / 2))
+        disc_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        while total and low < high:
+            middle = (low + high) // 2
+            disc_surface.fill((0, 0, 0, 0))
+            pygame.draw.circle(disc_surface, (255, 255, 255, 255), center, middle)
+            disc = pygame.mask.from_surface(disc_surface, 0)
+            if content.overlap_area(disc, (0, 0)) == total:
+                high = middle
+            else:
+                low = middle + 1
+        return high * 2 + 2
+
+    @property
+    def frame_count(self) -> int:
+        """已生成的帧数"""
+        return len(self._quarter_frames)
+
+    @property
+    def memory_bytes(self) -> int:
+        """已生成帧占用的像素内存（估算）"""
+        return self.frame_count * self.frame_size * self.frame_size * 4
+
+    def index_of(self, angle: float) -> int:
+        """
+        角度对应的帧索引
+
+        Args:
+            angle: 角度（度，逆时针，与 pygame.transform.rotate 一致）
+
+        Returns:
+            int: 0 .. 4*steps_per_quarter-1
+        """
+        total = self.steps_per_quarter * 4
+        return int(round(angle / self.angle_step)) % total
+
+    def _build_quarter_frame(self, index: int) -> pygame.Surface:
+        rotated = pygame.transform.rotate(self.source, index * self.angle_step)
+        frame = pygame.Surface((self.frame_size, self.frame_size), pygame.SRCALPHA)
+        frame.blit(rotated, rotated.get_rect(center=frame.get_rect().center))
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert_alpha()
+        return frame
+
+    def get(self, angle: float) -> pygame.Surface:
+        """
+        获取量化角度的旋转帧
+
+        Args:
+            angle: 角度（度）
+
+        Returns:
+            pygame.Surface: 旋转后的帧（共享，不要修改）
+        """
+        index = self.index_of(angle)
+        if index == self._last_index:
+            return self._last_frame
+
+        quarter, sub_index = divmod(index, self.steps_per_quarter)
+        frame = self._quarter_frames.get(sub_index)
+        if frame is None:
+            frame = self._quarter_frames[sub_index] = self._build_quarter_frame(sub_index)
+        if quarter:
+            frame = pygame.transform.rotate(frame, 90 * quarter)
+
+        self._last_index = index
+        self._last_frame = frame
+        return frame
+
+    def prebuild(self):
+        """生成 [0°, 90°) 内的全部帧（用于在窗口显示时预热，避免首圈逐帧生成）"""
+        for sub_index in range(self.steps_per_quarter):
+            if sub_index not in self._quarter_frames:
+                self._quarter_frames[sub_index] = self._build_quarter_frame(sub_index)
+
+
+class ScaledFrameCache:
+    """
+    缩放帧缓存
+
+    以（源帧键, 目标尺寸）为键的LRU，适合缩放比例按固定公式随时间往返变化的动画
+    （呼吸、弹跳、放大），调用方应先把比例量化。
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多保留的缩放帧数
+        """
+        self.max_entries = max_entries
+        self._frames: "OrderedDict[Tuple[Hashable, Tuple[int, int]], pygame.Surface]" = OrderedDict()
+
+    def get(self, key: Hashable, source: pygame.Surface, size: Tuple[int, int],
+            smooth: bool = False) -> pygame.Surface:
+        """
+        获取缩放到指定尺寸的帧
+
+        Args:
+            key: 源帧的键（源帧变化时应不同）
+            source: 源帧
+            size: 目标尺寸
+            smooth: 是否使用 smoothscale
+
+        Returns:
+            pygame.Surface: 缩放后的帧（共享，不要修改）
+        """
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        if size == source.get_size():
+            return source
+
+        cache_key = (key, size)
+        frame = self._frames.get(cache_key)
+        if frame is not None:
+            self._frames.move_to_end(cache_key)
+            return frame
+
+        if smooth:
+            frame = pygame.transform.smoothscale(source, size)
+        else:
+            frame = pygame.transform.scale(source, size)
+        self._frames[cache_key] = frame
+        if len(self._frames) > self.max_entries:
+            self._frames.popitem(last=False)
+        return frame
+
+    def clear(self):
+        """清空缓存"""
+        self._frames.clear()
+
+
+def quantize_scale(scale: float, step: float = 0.01) -> float:
+    """
+    把缩放比例量化到固定步长
+
+    Args:
+        scale: 原始比例
+        step: 步长
+
+    Returns:
+        float: 量化后的比例
+    """
+    return round(scale / step) * step
@@ -0,0 +1,277 @@
+"""
+GIF精灵图集缓存
+每个GIF只用PIL解码一次，所有帧按网格打包成一张RGBA的PNG图集，连同每帧时长写入磁盘缓存；
+之后直接用 pygame.image.load 读取整张图集，帧以 convert_alpha() 后的子表面返回。
+
+预先转换全部精灵（可选，否则在首次使用时转换）：
+    python -m game.utils.sprite_sheet_cache --build
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import hashlib
+import argparse
+import threading
+import importlib.util
+from typing import List, Optional, Tuple
+
+import pygame
+
+# 图集缓存目录（与视频预解码缓存同在 data 下，不入库）
+SPRITE_CACHE_DIR = os.path.join("data", "sprite_cache")
+SPRITE_CACHE_VERSION = 1
+
+# GIF未声明或声明过小的帧时长按浏览器惯例处理（毫秒）
+DEFAULT_FRAME_DURATION = 100
+MIN_FRAME_DURATION = 20
+
+# PIL只在需要转换GIF时导入
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+# 后台线程预先解码、尚未转换格式的图集 {(GIF路径, 缓存目录): (表面, 元数据)}
+_staged_sheets = {}
+_stage_lock = threading.Lock()
+# 每个GIF的转换锁：后台预取与主线程不会同时转换同一个GIF {(GIF路径, 缓存目录): Lock}
+_build_locks = {}
+
+
+class SpriteSheet:
+    """已加载的精灵图集：帧子表面与每帧时长"""
+
+    def __init__(self, sheet: pygame.Surface, frame_size: Tuple[int, int],
+                 frame_count: int, durations: List[int]):
+        """
+        由整张图集切出各帧
+
+        Args:
+            sheet: 图集表面
+            frame_size: 单帧尺寸
+            frame_count: 帧数
+            durations: 每帧时长（毫秒）
+        """
+        self.sheet = sheet
+        self.frame_size = tuple(frame_size)
+        self.durations = list(durations)
+
+        width, height = self.frame_size
+        columns = max(1, sheet.get_width() // width)
+        self.frames = [
+            sheet.subsurface(pygame.Rect((index % columns) * width, (index // columns) * height, width, height))
+            for index in range(frame_count)
+        ]
+
+    @property
+    def total_duration(self) -> int:
+        """一轮动画的总时长（毫秒）"""
+        return sum(self.durations)
+
+
+def _cache_paths(gif_path: str, cache_dir: str) -> Tuple[str, str]:
+    """根据源文件计算缓存文件路径（源文件变化时路径随之变化）"""
+    stat = os.stat(gif_path)
+    key = f"{os.path.abspath(gif_path)}|{stat.st_size}|{stat.st_mtime}|v{SPRITE_CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(gif_path))[0]
+    base = os.path.join(cache_dir, f"{name}_{digest}")
+    return base + ".png", base + ".json"
+
+
+def _build_lock(gif_path: str, cache_dir: str) -> threading.Lock:
+    key = (os.path.abspath(gif_path), os.path.abspath(cache_dir))
+    with _stage_lock:
+        lock = _build_locks.get(key)
+        if lock is None:
+            lock = _build_locks[key] = threading.Lock()
+        return lock
+
+
+def _tmp_path(path: str) -> str:
+    """进程与线程唯一的临时文件名（写完后 os.replace 到目标路径）"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _frame_duration(value) -> int:
+    try:
+        duration = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_FRAME_DURATION
+    return duration if duration >= MIN_FRAME_DURATION else DEFAULT_FRAME_DURATION
+
+
+def build_sprite_sheet(gif_path: str, cache_dir: str = SPRITE_CACHE_DIR) -> Optional[dict]:
+    """
+    用PIL解码GIF并写出图集PNG与元数据
+
+    Args:
+        gif_path: GIF路径
+        cache_dir: 缓存目录
+
+    Returns:
+        Optional[dict]: 元数据（PIL不可用或解码失败时为None）
+    """
+    if not PIL_AVAILABLE:
+        print("PIL不可用，无法转换GIF动画")
+        return None
+
+    from PIL import Image, ImageSequence
+
+    sheet_path, meta_path = _cache_paths(gif_path, cache_dir)
+    with Image.open(gif_path) as gif:
+        frames = []
+        durations = []
+        for frame in ImageSequence.Iterator(gif):
+            frames.append(frame.convert('RGBA'))
+            durations.append(_frame_duration(frame.info.get('duration')))
+
+    if not frames:
+        return None
+
+    width, height = frames[0].size
+    columns = max(1, math.ceil(math.sqrt(len(frames))))
+    rows = math.ceil(len(frames) / columns)
+    sheet = Image.new('RGBA', (columns * width, rows * height), (0, 0, 0, 0))
+    for index, frame in enumerate(frames):
+        sheet.paste(frame, ((index % columns) * width, (index // columns) * height))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = _tmp_path(sheet_path)
+    sheet.save(tmp_path, format='PNG')
+    os.replace(tmp_path, sheet_path)
+
+    meta = {
+        'version': SPRITE_CACHE_VERSION,
+        'source': gif_path.replace(os.sep, '/'),
+        'frame_width': width,
+        'frame_height': height,
+        'frame_count': len(frames),
+        'durations': durations,
+    }
+    # 元数据最后写入：读取方看到元数据时图集已完整
+    tmp_path = _tmp_path(meta_path)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+    return meta
+
+
+def _decode_sprite_sheet(gif_path: str, cache_dir: str) -> Optional[Tuple[pygame.Surface, dict]]:
+    """读取（必要时先转换）图集PNG与元数据，不做像素格式转换"""
+    try:
+        sheet_path, meta_path = _cache_paths(gif_path, cache_dir)
+    except OSError as e:
+        print(f"加载GIF帧失败: {e}")
+        return None
+
+    # 另一线程正在转换时等待它完成，然后直接读取它写出的缓存
+    with _build_lock(gif_path, cache_dir):
+        return _read_or_build(gif_path, cache_dir, sheet_path, meta_path)
+
+
+def _read_or_build(gif_path: str, cache_dir: str, sheet_path: str,
+                   meta_path: str) -> Optional[Tuple[pygame.Surface, dict]]:
+
+    meta = None
+    if os.path.exists(sheet_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != SPRITE_CACHE_VERSION:
+                meta = None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 精灵图集缓存损坏，重新生成: {e}")
+            meta = None
+
+    if meta is None:
+        try:
+            meta = build_sprite_sheet(gif_path, cache_dir)
+        except Exception as e:
+            print(f"加载GIF帧失败: {e}")
+            return None
+        if meta is None:
+            return None
+
+    try:
+        sheet = pygame.image.load(sheet_path)
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"❌ 精灵图集加载失败 {sheet_path}: {e}")
+        return None
+    return sheet, meta
+
+
+def preload_sprite_sheet(gif_path: str, cache_dir: str = SPRITE_CACHE_DIR):
+    """
+    预先转换并解码精灵图集（可在后台线程调用，格式转换留给主线程的 load_sprite_sheet）
+
+    Args:
+        gif_path: GIF路径
+        cache_dir: 缓存目录
+    """
+    decoded = _decode_sprite_sheet(gif_path, cache_dir)
+    if decoded is not None:
+        with _stage_lock:
+            _staged_sheets[(gif_path, cache_dir)] = decoded
+
+
+def load_sprite_sheet(gif_path: str, cache_dir: str = SPRITE_CACHE_DIR) -> Optional[SpriteSheet]:
+    """
+    加载GIF对应的精灵图集（缓存不存在时先转换）
+
+    Args:
+        gif_path: GIF路径
+        cache_dir: 缓存目录
+
+    Returns:
+        Optional[SpriteSheet]: 图集，失败时为None
+    """
+    with _stage_lock:
+        decoded = _staged_sheets.pop((gif_path, cache_dir), None)
+    if decoded is None:
+        decoded = _decode_sprite_sheet(gif_path, cache_dir)
+        if decoded is None:
+            return None
+
+    sheet, meta = decoded
+    if pygame.display.get_surface() is not None:
+        sheet = sheet.convert_alpha()
+
+    return SpriteSheet(sheet, (meta['frame_width'], meta['frame_height']),
+                       meta['frame_count'], meta['durations'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GIF精灵图集缓存工具")
+    parser.add_argument("--build", action="store_true", help="转换全部动态精灵")
+    parser.add_argument("--source", default=os.path.join("assets", "images", "sprites", "animated"),
+                        help="GIF所在目录（含子目录）")
+    parser.add_argument("--cache-dir", default=SPRITE_CACHE_DIR, help="缓存目录")
+    args = parser.parse_args(argv)
+
+    if not args.build:
+        parser.print_help()
+        return 0
+
+    start = time.perf_counter()
+    converted = skipped = 0
+    for dirpath, _, filenames in os.walk(args.source):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(".gif"):
+                continue
+            gif_path = os.path.join(dirpath, filename)
+            sheet_path, meta_path = _cache_paths(gif_path, args.cache_dir)
+            if os.path.exists(sheet_path) and os.path.exists(meta_path):
+                skipped += 1
+                continue
+            try:
+                if build_sprite_sheet(gif_path, args.cache_dir):
+                    converted += 1
+            except Exception as e:
+                print(f"⚠️ 转换失败 {gif_path}: {e}")
+    print(f"✅ 精灵图集: 新转换 {converted}，已存在 {skipped}，用时 {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+程序化UI外观缓存
+渐变背景、毛玻璃面板、圆角按钮等由代码绘制的外观，按（类型、尺寸、颜色、状态）缓存成品表面，
+绘制时直接blit，不再每帧创建并合成多层alpha表面。
+
+渐变只计算1像素宽的颜色列（numpy已加载时经 pygame.surfarray 写入），再用 transform.scale 铺满。
+缓存返回的表面为共享对象，调用方不要修改（需要修改时先 copy()）。
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Sequence, Tuple
+
+import pygame
+
+# 缓存的表面数量上限（按钮缩放动画会产生一串相邻尺寸）
+MAX_CACHED_SURFACES = 256
+# 透明度类参数的量化步长（淡入淡出时避免每帧一个新键）
+ALPHA_STEP = 8
+
+Color = Sequence[int]
+
+
+class ChromeCache:
+    """
+    UI外观表面的LRU缓存
+
+    键由调用方组织，应包含影响像素的全部参数（类型、尺寸、颜色、量化后的状态）。
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_SURFACES):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多保留的表面数
+        """
+        self.max_entries = max_entries
+        self._surfaces: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, builder: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """
+        获取缓存表面（不存在时调用builder生成）
+
+        Args:
+            key: 缓存键
+            builder: 无参数的生成函数，返回新表面
+
+        Returns:
+            pygame.Surface: 缓存的表面
+        """
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = builder()
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空缓存（主题或分辨率变化时调用）"""
+        self._surfaces.clear()
+
+    def get_stats(self) -> dict:
+        """获取缓存统计"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_chrome_cache: Optional[ChromeCache] = None
+
+
+def get_chrome_cache() -> ChromeCache:
+    """获取全局UI外观缓存"""
+    global _chrome_cache
+    if _chrome_cache is None:
+        _chrome_cache = ChromeCache()
+    return _chrome_cache
+
+
+def quantize(value: float, step: int = ALPHA_STEP, maximum: int = 255) -> int:
+    """
+    把连续变化的参数（透明度、闪光强度等）量化为整数档位
+
+    Args:
+        value: 原始值
+        step: 步长
+        maximum: 上限
+
+    Returns:
+        int: 量化后的值（0..maximum）
+    """
+    value = int(round(value / step)) * step
+    return max(0, min(maximum, value))
+
+
+def _rgba(color: Color, alpha: Optional[int] = None) -> Tuple[int, int, int, int]:
+    """规范化为RGBA元组"""
+    color = tuple(int(c) for c in color)
+    if alpha is not None:
+        return color[:3] + (int(alpha),)
+    return color if len(color) == 4 else color[:3] + (255,)
+
+
+def _convert(surface: pygame.Surface, alpha: bool) -> pygame.Surface:
+    """有显示窗口时转换为显示格式，blit更快"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+# ==================== 渐变 ====================
+
+def fill_vertical_gradient(surface: pygame.Surface, top: Color, bottom: Color):
+    """
+    在表面上填充垂直线性渐变（第y行颜色为 top + (bottom - top) * y / height）
+
+    Args:
+        surface: 目标表面
+        top: 顶部颜色 (r, g, b)
+        bottom: 底部颜色 (r, g, b)
+    """
+    width, height = surface.get_size()
+    if width <= 0 or height <= 0:
+        return
+
+    # 先生成1像素宽的颜色列，再由 transform.scale 在C层横向铺满
+    column = pygame.Surface((1, height), 0, surface)
+    if "numpy" in sys.modules:
+        # numpy 已被其他模块加载时直接写像素；冷导入numpy的耗时远大于逐行写一列
+        np = sys.modules["numpy"]
+        start = np.asarray(top[:3], dtype=np.float64)
+        end = np.asarray(bottom[:3], dtype=np.float64)
+        progress = np.arange(height, dtype=np.float64)[:, None] / height
+        pixels = pygame.surfarray.pixels3d(column)  # (1, height, 3)
+        pixels[0] = (start + (end - start) * progress).astype(np.uint8)
+        del pixels  # 释放像素锁
+    else:
+        for y in range(height):
+            progress = y / height
+            column.set_at((0, y), tuple(int(top[i] + (bottom[i] - top[i]) * progress) for i in range(3)))
+
+    pygame.transform.scale(column, (width, height), surface)
+
+
+def vertical_gradient(size: Tuple[int, int], top: Color, bottom: Color) -> pygame.Surface:
+    """
+    获取缓存的不透明垂直渐变表面
+
+    Args:
+        size: 尺寸
+        top: 顶部颜色
+        bottom: 底部颜色
+
+    Returns:
+        pygame.Surface: 渐变表面（共享，不要修改）
+    """
+    size = (int(size[0]), int(size[1]))
+    key = ('vgradient', size, tuple(top[:3]), tuple(bottom[:3]))
+
+    def build():
+        surface = pygame.Surface(size)
+        fill_vertical_gradient(surface, top, bottom)
+        return _convert(surface, alpha=False)
+
+    return get_chrome_cache().get(key, build)
+
+
+# ==================== 圆角矩形与面板 ====================
+
+def rounded_rect(size: Tuple[int, int], color: Color, radius: int = 0,
+                 width: int = 0, alpha: Optional[int] = None) -> pygame.Surface:
+    """
+    获取缓存的半透明圆角矩形（填充或描边）
+
+    Args:
+        size: 尺寸
+        color: 颜色（RGB或RGBA，A为逐像素透明度）
+        radius: 圆角半径
+        width: 描边宽度，0表示填充
+        alpha: 表面整体透明度（None表示不设置），建议先用 quantize() 量化
+
+    Returns:
+        pygame.Surface: 圆角矩形表面（共享，不要修改）
+    """
+    size = (int(size[0]), int(size[1]))
+    rgba = _rgba(color)
+    key = ('rrect', size, rgba, int(radius), int(width), alpha)
+
+    def build():
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, rgba, (0, 0, size[0], size[1]),
+                         width=int(width), border_radius=int(radius))
+        surface = _convert(surface, alpha=True)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        return surface
+
+    return get_chrome_cache().get(key, build)
+
+
+def glass_panel(size: Tuple[int, int], fill_alpha: int = 217, border_alpha: int = 76,
+                radius: int = 16, border_width: int = 2) -> pygame.Surface:
+    """
+    获取缓存的白色毛玻璃面板（填充 + 半透明描边）
+
+    Args:
+        size: 尺寸
+        fill_alpha: 填充透明度
+        border_alpha: 描边透明度
+        radius: 圆角半径
+        border_width: 描边宽度
+
+    Returns:
+        pygame.Surface: 面板表面（共享，不要修改）
+    """
+    size = (int(size[0]), int(size[1]))
+    key = ('glass', size, int(fill_alpha), int(border_alpha), int(radius), int(border_width))
+
+    def build():
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, (255, 255, 255, fill_alpha),
+                         (0, 0, size[0], size[1]), border_radius=radius)
+        if border_alpha > 0 and border_width > 0:
+            border = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(border, (255, 255, 255, border_alpha),
+                             (0, 0, size[0], size[1]), width=border_width, border_radius=radius)
+            surface.blit(border, (0, 0))
+        return _convert(surface, alpha=True)
+
+    return get_chrome_cache().get(key, build)
+
+
+def solid_overlay(size: Tuple[int, int], color: Color) -> pygame.Surface:
+    """
+    获取缓存的纯色半透明遮罩
+
+    Args:
+        size: 尺寸
+        color: RGBA颜色，建议先用 quantize() 量化A
+
+    Returns:
+        pygame.Surface: 遮罩表面（共享，不要修改）
+    """
+    size = (int(size[0]), int(size[1]))
+    rgba = _rgba(color)
+    key = ('overlay', size, rgba)
+
+    def build():
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill(rgba)
+        return _convert(surface, alpha=True)
+
+    return get_chrome_cache().get(key, build)
+
+
+# ==================== 毛玻璃按钮 ====================
+
+def glass_button_shadow_extent(hover: bool) -> int:
+    """按钮阴影向右下方超出按钮矩形的像素数"""
+    layers, offset = (3, 8) if hover else (2, 4)
+    return offset + 2 * (layers - 1)
+
+
+def glass_button(size: Tuple[int, int], radius: int, bg_color: Color, highlight_color: Color,
+                 hover: bool = False, shadow: bool = True, edge_inset: int = 1) -> pygame.Surface:
+    """
+    获取缓存的毛玻璃按钮底板（阴影、圆角背景、顶部高光、内侧高光/阴影线）
+
+    返回表面的左上角对齐按钮矩形左上角，阴影只向右下延伸
+    （见 glass_button_shadow_extent）。图标、文字和闪光由调用方另行绘制。
+
+    Args:
+        size: 按钮尺寸（已应用悬停缩放）
+        radius: 圆角半径
+        bg_color: 背景RGBA，A为0时不绘制背景
+        highlight_color: 顶部高光RGBA
+        hover: 悬停状态（阴影更深、增加顶部辉光）
+        shadow: 是否绘制阴影
+        edge_inset: 内侧高光/阴影线距边缘的像素
+
+    Returns:
+        pygame.Surface: 按钮底板（共享，不要修改）
+    """
+    width, height = int(size[0]), int(size[1])
+    bg_rgba = _rgba(bg_color)
+    highlight_rgba = _rgba(highlight_color)
+    key = ('button', (width, height), int(radius), bg_rgba, highlight_rgba,
+           bool(hover), bool(shadow), int(edge_inset))
+
+    def build():
+        extent = glass_button_shadow_extent(hover) if shadow else 0
+        surface = pygame.Surface((width + extent, height + extent), pygame.SRCALPHA)
+
+        # 阴影：多层偏移的半透明圆角矩形
+        if shadow:
+            layers, offset = (3, 8) if hover else (2, 4)
+            for i in range(layers):
+                shadow_alpha = (20 - i * 6) if hover else (15 - i * 5)
+                if shadow_alpha <= 0:
+                    continue
+                layer = pygame.Surface((width + i * 2, height + i * 2), pygame.SRCALPHA)
+                pygame.draw.rect(layer, (0, 0, 0, shadow_alpha),
+                                 (0, 0, width + i * 2, height + i * 2), border_radius=radius + i)
+                surface.blit(layer, (offset, offset))
+
+        # 背景直接写入像素（覆盖下方阴影，避免在透明底上二次混合变暗）
+        if bg_rgba[3] > 0:
+            pygame.draw.rect(surface, bg_rgba, (0, 0, width, height), border_radius=radius)
+
+        # 顶部1/3高光
+        highlight_height = height // 3
+        if highlight_height > 0:
+            highlight = pygame.Surface((width, highlight_height), pygame.SRCALPHA)
+            pygame.draw.rect(highlight, highlight_rgba, (0, 0, width, highlight_height),
+                             border_radius=radius)
+            surface.blit(highlight, (0, 0))
+
+        # 内侧高光线、阴影线与悬停辉光
+        lines = [
+            ((edge_inset, edge_inset, width - 2, 1), (255, 255, 255, 30)),
+            ((edge_inset, height - 1 - edge_inset, width - 2, 1), (0, 0, 0, 20)),
+        ]
+        if hover:
+            lines.append(((edge_inset + 1, edge_inset + 1, width - 4, 1), (255, 255, 255, 40)))
+        for rect, color in lines:
+            if rect[2] > 0:
+                line = pygame.Surface((rect[2], 1), pygame.SRCALPHA)
+                line.fill(color)
+                surface.blit(line, rect[:2])
+
+        return _convert(surface, alpha=True)
+
+    return get_chrome_cache().get(key, build)
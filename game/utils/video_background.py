@@ -5,9 +5,18 @@
 
 import pygame
 import os
+import json
+import mmap
+import hashlib
 import threading
 import time
 
+from game.utils import ui_chrome
+
+# 预解码缓存目录与容量上限（超过上限时退回流式解码）
+VIDEO_CACHE_DIR = os.path.join("data", "video_cache")
+VIDEO_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
 class VideoBackground:
     """简化的视频背景类，避免复杂的OpenCV依赖"""
     
@@ -125,6 +134,310 @@ class VideoBackground:
         if hasattr(self, 'cap') and self.cap is not None:
             self.cap.release()
 
+class PreDecodedVideoBackground:
+    """
+    预解码视频背景
+    
+    首次使用时把整段循环视频按目标尺寸解码为原始RGB帧，写入磁盘缓存并内存映射；
+    播放时按呈现时间戳选帧，通过 pygame.image.frombuffer 直接引用映射内存，
+    只在帧序号变化时上传到复用的表面。窗口尺寸变化时重新编码一次缓存，
+    不再逐帧缩放。OpenCV 只在编码线程中导入（已有缓存时完全不需要），
+    缓存过大时在编码线程中改为流式解码。接口与 VideoBackground 一致。
+    """
+    
+    def __init__(self, video_path, target_size=(960, 540), cache_dir=VIDEO_CACHE_DIR):
+        self.video_path = video_path
+        self.target_size = tuple(target_size)
+        self.cache_dir = cache_dir
+        self.running = False
+        
+        # 当前播放的缓存（由后台编码线程整体替换）
+        self._lock = threading.Lock()
+        self._cache = None
+        self._pending_size = None
+        self._encoding = False
+        self._encode_thread = None
+        # 缓存过大时改用的流式解码背景
+        self._stream = None
+        
+        # 复用的帧表面
+        self._frame_surface = None
+        self._frame_index = -1
+        self._start_time = time.perf_counter()
+        
+        if not os.path.exists(video_path):
+            print(f"⚠️ 视频文件不存在: {video_path}")
+            return
+        
+        self.running = True
+        self._request_encode(self.target_size)
+    
+    # ==================== 缓存构建 ====================
+    
+    def _cache_paths(self, size):
+        """根据源文件与尺寸计算缓存文件路径"""
+        stat = os.stat(self.video_path)
+        key = f"{os.path.abspath(self.video_path)}|{stat.st_size}|{stat.st_mtime}|{size[0]}x{size[1]}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        base = os.path.join(self.cache_dir, f"{os.path.basename(self.video_path)}_{size[0]}x{size[1]}_{digest}")
+        return base + ".rgb", base + ".json"
+    
+    def _request_encode(self, size):
+        """请求为指定尺寸准备缓存（在后台线程执行）"""
+        with self._lock:
+            self._pending_size = size
+            if self._encoding:
+                # 编码线程退出前会在锁内检查 _pending_size
+                return
+            self._encoding = True
+        self._encode_thread = threading.Thread(target=self._encode_worker, daemon=True)
+        self._encode_thread.start()
+    
+    def _encode_worker(self):
+        """后台编码线程：处理最新的尺寸请求"""
+        while True:
+            # 取请求与退出在同一把锁内完成，退出前到达的请求不会丢失
+            with self._lock:
+                size = self._pending_size
+                self._pending_size = None
+                if size is None or not self.running or self._stream is not None:
+                    self._encoding = False
+                    return
+            
+            try:
+                cache = self._open_or_build_cache(size)
+            except ImportError:
+                print("⚠️ OpenCV未安装，无法预解码视频背景")
+                cache = None
+            except Exception as e:
+                print(f"⚠️ 视频预解码失败: {e}")
+                cache = None
+            
+            if cache is None:
+                continue
+            
+            with self._lock:
+                if not self.running or self._pending_size is not None:
+                    # 已关闭或已有更新的尺寸请求，丢弃这次结果
+                    stale = cache
+                else:
+                    stale = self._cache
+                    self._cache = cache
+                    self._frame_surface = None
+                    self._frame_index = -1
+            if stale:
+                stale.close()
+    
+    def _start_streaming(self, size):
+        """缓存过大时改用流式解码（在编码线程中调用）"""
+        stream = VideoBackground(self.video_path, size)
+        with self._lock:
+            if self.running and self._stream is None:
+                self._stream, stream = stream, None
+        if stream is not None:
+            stream.close()
+    
+    def _open_or_build_cache(self, size):
+        """打开已有缓存，不存在则解码生成"""
+        data_path, meta_path = self._cache_paths(size)
+        
+        if os.path.exists(data_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                print(f"✅ 使用视频预解码缓存: {data_path}")
+                return _RawFrameCache(data_path, meta)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 视频缓存损坏，重新生成: {e}")
+        
+        import cv2
+        
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            print(f"⚠️ 无法打开视频: {self.video_path}")
+            return None
+        
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30
+            estimated_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            frame_bytes = size[0] * size[1] * 3
+            if estimated_frames * frame_bytes > VIDEO_CACHE_MAX_BYTES:
+                print(f"⚠️ 视频缓存过大 ({estimated_frames} 帧 @ {size[0]}x{size[1]})，使用流式解码")
+                self._start_streaming(size)
+                return None
+            
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = data_path + ".tmp"
+            frame_count = 0
+            start = time.perf_counter()
+            
+            with open(tmp_path, 'wb') as f:
+                while self.running:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    f.write(frame.tobytes())
+                    frame_count += 1
+                    if (frame_count + 1) * frame_bytes > VIDEO_CACHE_MAX_BYTES:
+                        break
+        finally:
+            cap.release()
+        
+        if not self.running or frame_count == 0:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        
+        meta = {
+            'width': size[0],
+            'height': size[1],
+            'fps': fps,
+            'frame_count': frame_count,
+        }
+        os.replace(tmp_path, data_path)
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+        
+        print(f"✅ 视频预解码完成: {frame_count} 帧 {size[0]}x{size[1]}，用时 {time.perf_counter() - start:.2f}s")
+        return _RawFrameCache(data_path, meta)
+    
+    # ==================== 播放 ====================
+    
+    def get_surface(self, size=None):
+        """
+        获取当前视频帧的pygame表面
+        
+        Args:
+            size: 目标尺寸，如果与当前缓存不同会触发一次重新编码
+            
+        Returns:
+            pygame.Surface: 复用的视频帧表面，缓存未就绪时返回None
+        """
+        if size and tuple(size) != self.target_size:
+            self.update_size(size)
+        
+        stream = self._stream
+        if stream is not None:
+            return stream.get_surface()
+        
+        with self._lock:
+            cache = self._cache
+            if cache is None:
+                return None
+            
+            # 按呈现时间戳选帧（不依赖解码耗时或sleep精度）
+            elapsed = time.perf_counter() - self._start_time
+            index = int(elapsed * cache.fps) % cache.frame_count
+            
+            if index != self._frame_index or self._frame_surface is None:
+                try:
+                    frame = pygame.image.frombuffer(cache.frame_view(index), cache.size, 'RGB')
+                    if self._frame_surface is None:
+                        self._frame_surface = pygame.Surface(cache.size).convert() \
+                            if pygame.display.get_surface() else pygame.Surface(cache.size)
+                    self._frame_surface.blit(frame, (0, 0))
+                    self._frame_index = index
+                except Exception as e:
+                    print(f"获取视频帧失败: {e}")
+                    return None
+            
+            return self._frame_surface
+    
+    def update_size(self, new_size):
+        """更新目标尺寸（重新编码一次缓存）"""
+        new_size = tuple(new_size)
+        if new_size == self.target_size:
+            return
+        self.target_size = new_size
+        if self._stream is not None:
+            self._stream.update_size(new_size)
+        elif self.running:
+            self._request_encode(new_size)
+    
+    def update(self):
+        """更新方法（播放进度由时间戳决定，无需逐帧更新）"""
+        pass
+    
+    def close(self):
+        """关闭视频背景"""
+        self.running = False
+        
+        if self._encode_thread and self._encode_thread.is_alive():
+            self._encode_thread.join(timeout=1.0)
+        
+        with self._lock:
+            self._frame_surface = None
+            if self._cache:
+                self._cache.close()
+                self._cache = None
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+
+
+class _RawFrameCache:
+    """内存映射的原始RGB帧文件"""
+    
+    def __init__(self, data_path, meta):
+        self.size = (int(meta['width']), int(meta['height']))
+        self.fps = float(meta['fps']) or 30.0
+        self.frame_count = int(meta['frame_count'])
+        self.frame_bytes = self.size[0] * self.size[1] * 3
+        
+        self._file = open(data_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        
+        if len(self._mmap) < self.frame_count * self.frame_bytes:
+            self.close()
+            raise ValueError("视频缓存文件不完整")
+        self._view = memoryview(self._mmap)
+    
+    def frame_view(self, index):
+        """返回第index帧的缓冲区视图（不复制）"""
+        offset = index * self.frame_bytes
+        return self._view[offset:offset + self.frame_bytes]
+    
+    def close(self):
+        """释放映射"""
+        view = getattr(self, '_view', None)
+        if view is not None:
+            try:
+                view.release()
+            except BufferError:
+                # 仍有帧表面引用缓冲区，交给GC回收
+                return
+            self._view = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            return
+        self._file.close()
+
+
+def create_video_background(video_path, target_size=(960, 540), predecode=True):
+    """
+    创建视频背景
+    
+    Args:
+        video_path: 视频路径
+        target_size: 目标尺寸
+        predecode: 是否使用预解码缓存模式（需要OpenCV生成缓存）
+        
+    Returns:
+        PreDecodedVideoBackground 或 VideoBackground
+    """
+    if predecode:
+        # 不在这里导入OpenCV：缓存体积的预估与流式解码的退回都在编码线程中进行，场景构建不等待
+        return PreDecodedVideoBackground(video_path, target_size)
+    return VideoBackground(video_path, target_size)
+
+
 class StaticBackground:
     """静态背景类，作为视频背景的后备方案"""
     
@@ -135,16 +448,10 @@ class StaticBackground:
     
     def create_gradient_background(self):
         """创建渐变背景"""
-        width, height = self.target_size
-        self.background_surface = pygame.Surface((width, height))
-        
         # 创建深蓝到紫色的渐变
-        for y in range(height):
-            progress = y / height
-            r = int(20 + progress * 30)
-            g = int(25 + progress * 20)
-            b = int(60 + progress * 40)
-            pygame.draw.line(self.background_surface, (r, g, b), (0, y), (width, y))
+        self.background_surface = ui_chrome.vertical_gradient(
+            self.target_size, (20, 25, 60), (50, 45, 100)
+        )
     
     def get_surface(self, size=None):
         """获取背景表面"""
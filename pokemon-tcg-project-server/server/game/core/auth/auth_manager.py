@@ -3,7 +3,12 @@
 修复导入路径并优化代码结构
 """
 
+import time
+import datetime
+
 from game.core.database.database_manager import DatabaseManager
+from game.core.auth.session_tokens import SessionTokenSigner, SessionCache, CLEANUP_INTERVAL
+from game.core.auth.password_hasher import DUMMY_HASH, HasherBusyError, get_password_hasher, needs_rehash
 
 class AuthManager:
     """
@@ -22,53 +27,96 @@ class AuthManager:
         # self.current_user_id = None
         self.current_token = None
         self.username = None
+
+        # 令牌签名与进程内会话缓存（常见情况下校验令牌不查询数据库）
+        self.signer = SessionTokenSigner()
+        self.session_cache = SessionCache()
+        self._last_cleanup = 0.0
     
     def _generate_session_token(self, user_id):
-        """Generar un token de sesión para el usuario"""
-        import uuid
-        import base64
-        import time
-        import hashlib
+        """
+        签发会话令牌（HMAC签名，自带用户ID与过期时间）
+
+        Returns:
+            (令牌, 过期时间戳)
+        """
+        return self.signer.issue(user_id)
+
+    def verify_token(self, token):
+        """
+        校验会话令牌
+
+        签名与过期时间只需CPU计算；本进程注销过的会话直接拒绝；
+        数据库只在存活缓存过期后复核一次（发现其他进程的注销）。
+
+        Args:
+            token: 会话令牌
+
+        Returns:
+            用户ID或None
+        """
+        claims = self.signer.verify(token)
+        if claims is None:
+            return None
+
+        user_id, expires, session_id = claims
+        if self.session_cache.is_revoked(session_id):
+            return None
+
+        now = time.time()
+        cached_user_id = self.session_cache.get_live(token, now)
+        if cached_user_id is not None:
+            return cached_user_id
+
+        validated_user_id = self.db_manager.validate_session(token)
+        if validated_user_id != user_id:
+            self.session_cache.discard(token)
+            return None
+
+        self.session_cache.put_live(token, user_id, now)
+        return user_id
+
+    def cleanup_sessions(self, force=False):
+        """
+        批量清理过期会话（数据库与进程内缓存），两次清理至少间隔 CLEANUP_INTERVAL
+
+        Args:
+            force: 忽略间隔立即清理
+
+        Returns:
+            数据库中失效的会话数（未到清理时间时为0）
+        """
+        now = time.time()
+        if not force and now - self._last_cleanup < CLEANUP_INTERVAL:
+            return 0
+        self._last_cleanup = now
+        self.session_cache.prune(now)
+        return self.db_manager.cleanup_expired_sessions()
+
+    def _check_registration(self, username, password, confirm_password):
+        """
+        注册数据验证
+
+        Returns:
+            错误消息，通过时为None
+        """
+        if not username or not password:
+            return "El nombre de usuario y la contraseña son obligatorios"
         
-        # Crear el token de sesión
-        timestamp = str(int(time.time()))
-        random_part = str(uuid.uuid4())
-        raw_token = f"{user_id}:{timestamp}:{random_part}"
+        if password != confirm_password:
+            return "Las contraseñas no coinciden"
         
-        # Crear checksum
-        checksum = hashlib.md5(raw_token.encode()).hexdigest()[:8]
+        if len(username) < 3:
+            return "El nombre de usuario debe tener al menos 3 caracteres"
         
-        # Combinar el token y el checksum
-        full_token = f"{raw_token}:{checksum}"
-        encoded_token = base64.b64encode(full_token.encode()).decode()
+        if len(password) < 6:
+            return "La contraseña debe tener al menos 6 caracteres"
         
-        return encoded_token
-    
-    def _validate_token_format(self, token):
-        """Validar token de sesión"""
-        try:
-            import base64
-            import hashlib
-            
-            # Decodificar el token
-            decoded = base64.b64decode(token.encode()).decode()
-            parts = decoded.split(':')
-            
-            if len(parts) != 4:
-                return None
-            
-            user_id, timestamp, random_part, checksum = parts
-            
-            # Validar checksum
-            raw_token = f"{user_id}:{timestamp}:{random_part}"
-            expected_checksum = hashlib.md5(raw_token.encode()).hexdigest()[:8]
-            
-            if checksum != expected_checksum:
-                return None
-            
-            return int(user_id)
-        except Exception:
-            return None
+        # 验证密码强度
+        is_strong, strength_message = self.validate_password_strength(password)
+        if not is_strong:
+            return strength_message
+        return None
 
     def register(self, username, password, confirm_password):
         """
@@ -82,26 +130,52 @@ class AuthManager:
         Returns:
             (成功标志, 消息)
         """
-        # 数据验证
-        if not username or not password:
-            return False, "El nombre de usuario y la contraseña son obligatorios"
+        error = self._check_registration(username, password, confirm_password)
+        if error:
+            return False, error
         
-        if password != confirm_password:
-            return False, "Las contraseñas no coinciden"
-        
-        if len(username) < 3:
-            return False, "El nombre de usuario debe tener al menos 3 caracteres"
+        # 注册用户
+        return self.db_manager.register_user(username, password)
+
+    async def register_async(self, username, password, confirm_password, hasher=None):
+        """
+        注册新用户（服务器用：密码哈希在进程池中计算，不阻塞事件循环）
         
-        if len(password) < 6:
-            return False, "La contraseña debe tener al menos 6 caracteres"
+        Args:
+            username: 用户名
+            password: 密码
+            confirm_password: 确认密码
+            hasher: 密码哈希服务（默认全局实例）
         
-        # 验证密码强度
-        is_strong, strength_message = self.validate_password_strength(password)
-        if not is_strong:
-            return False, strength_message
+        Returns:
+            (成功标志, 消息)
         
-        # 注册用户
-        return self.db_manager.register_user(username, password)
+        Raises:
+            HasherBusyError: 哈希队列已满
+        """
+        error = self._check_registration(username, password, confirm_password)
+        if error:
+            return False, error
+        # 用户名已存在时不必计算哈希
+        if self.db_manager.get_user_credentials(username) is not None:
+            return False, "El nombre de usuario ya existe"
+        
+        password_hash = await (hasher or get_password_hasher()).hash(password)
+        return self.db_manager.register_user(username, password, password_hash=password_hash)
+    
+    def _start_session(self, user_id, username):
+        """为已验证的用户签发令牌并保存会话（2小时后过期）"""
+        session_token, expires = self._generate_session_token(user_id)
+        expires_at = datetime.datetime.fromtimestamp(expires)
+        
+        # Guardar la sesión en la base de datos
+        self.cleanup_sessions()
+        if self.db_manager.save_session(session_token, user_id, expires_at):
+            self.session_cache.put_live(session_token, user_id, time.time())
+            self.current_token = session_token
+            self.username = username
+            return True, "Inicio de sesión exitoso"
+        return False, "Error al crear sesión"
     
     def login(self, username, password):
         """
@@ -121,23 +195,50 @@ class AuthManager:
         
         if success:
             # Inicio de sesión exitoso, generar token de sesión
-            session_token = self._generate_session_token(result)
-            
-            # Calcular fecha de expiración (después de 2 horas)
-            import datetime
-            expires_at = datetime.datetime.now() + datetime.timedelta(hours=2)
-            
-            # Guardar la sesión en la base de datos
-            if self.db_manager.save_session(session_token, result, expires_at):
-                self.current_token = session_token
-                self.username = username
-                return True, "Inicio de sesión exitoso"
-            else:
-                return False, "Error al crear sesión"
+            return self._start_session(result, username)
         else:
             # Inicio de sesión fallido
             return False, result
 
+    async def login_async(self, username, password, hasher=None):
+        """
+        Inicio de sesión (servidor): la verificación de la contraseña se ejecuta en el pool de procesos
+        
+        Los hashes SHA-256 antiguos se recalculan tras una verificación correcta.
+        
+        Args:
+            username: Usuario
+            password: Contraseña
+            hasher: Servicio de hash (por defecto la instancia global)
+        
+        Returns:
+            (Signatura de exito, Mensaje)
+        
+        Raises:
+            HasherBusyError: La cola de hash está llena
+        """
+        if not username or not password:
+            return False, "El nombre de usuario y la contraseña son obligatorios"
+        
+        hasher = hasher or get_password_hasher()
+        credentials = self.db_manager.get_user_credentials(username)
+        if credentials is None:
+            # Usuario inexistente: se calcula el mismo KDF para que el tiempo de respuesta no revele
+            # qué usuarios existen y la petición cuente en el límite de la cola de hash
+            await hasher.verify(password, DUMMY_HASH)
+            return False, "Nombre de usuario o contraseña incorrectos"
+        if not await hasher.verify(password, credentials[1]):
+            return False, "Nombre de usuario o contraseña incorrectos"
+        
+        user_id, stored_hash = credentials
+        if needs_rehash(stored_hash):
+            try:
+                self.db_manager.set_user_password_hash(user_id, await hasher.hash(password))
+            except HasherBusyError:
+                # La contraseña ya está verificada; se recalculará en el próximo inicio de sesión
+                pass
+        return self._start_session(user_id, username)
+
     def logout(self):
         """
         Cerrar la sesión del usuario actual
@@ -146,12 +247,34 @@ class AuthManager:
             Signatura de exito
         """
         if self.current_token:
-            self.db_manager.delete_session(self.current_token)
+            self.revoke_token(self.current_token)
         
         self.current_token = None
         self.username = None
         return True
     
+    def revoke_token(self, token):
+        """
+        注销会话令牌（本进程立即生效，其他进程在存活缓存过期后生效）
+
+        Args:
+            token: 会话令牌
+        """
+        self.revoke_local(token)
+        self.db_manager.delete_session(token)
+
+    def revoke_local(self, token):
+        """
+        只在本进程的会话缓存中注销令牌（用于其他进程广播的注销，数据库已由注销方更新）
+
+        Args:
+            token: 会话令牌
+        """
+        claims = self.signer.verify(token)
+        if claims is not None:
+            _, expires, session_id = claims
+            self.session_cache.revoke(token, session_id, expires)
+
     def is_logged_in(self):
         """
         Comprueba si el usuario actual está autenticado
@@ -172,19 +295,13 @@ class AuthManager:
         if not self.current_token:
             return None
         
-        # Validar el formato del token
-        user_id = self._validate_token_format(self.current_token)
+        # Validar la firma del token y la sesión (caché en memoria)
+        user_id = self.verify_token(self.current_token)
         if not user_id:
-            self.current_token = None  # Eliminar token no válido
-            return None
-        
-        # Validar la sesión en la base de datos
-        validated_user_id = self.db_manager.validate_session(self.current_token)
-        if not validated_user_id:
-            self.current_token = None  # Eliminar token expirado
+            self.current_token = None  # Eliminar token no válido o expirado
             return None
         
-        return validated_user_id
+        return user_id
     
     def get_current_username(self):
         """
@@ -0,0 +1,234 @@
+"""
+在线会话存储
+保存已登录连接（原 authenticated_clients 字典）并在多个工作进程之间共享：
+
+- MemorySessionStore: 进程内字典（单进程模式的默认实现）
+- SQLiteSessionStore: 同一台机器上的多个工作进程共享一个 SQLite（WAL）文件；
+  本进程的连接同时保存在内存中，读取自己的连接不访问数据库，
+  全局查询（在线人数、用户所在进程）与注销广播通过数据库完成
+
+两种实现都支持按连接ID的字典式访问：store[client_id] = record、store.get(client_id)、
+client_id in store、del store[client_id]；len(store) 为本进程的连接数，count() 为全部进程的总数。
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+# 默认的共享存储文件
+STORE_PATH = os.path.join("data", "session_store.db")
+# 数据库忙时的等待时间（秒）
+BUSY_TIMEOUT = 5.0
+# 注销广播保留时间（秒），超过后由清理删除
+REVOCATION_TTL = 10 * 60
+# 工作进程拉取注销广播的间隔（秒）
+SYNC_INTERVAL = 1.0
+
+RECORD_FIELDS = ("user_id", "username", "token", "login_time")
+
+
+class MemorySessionStore:
+    """进程内会话存储"""
+
+    backend = "memory"
+
+    def __init__(self, worker_id: Optional[int] = None):
+        self.worker_id = worker_id if worker_id is not None else os.getpid()
+        self._clients: Dict[str, Dict[str, Any]] = {}
+
+    def __setitem__(self, client_id: str, record: Dict[str, Any]):
+        self._clients[client_id] = record
+
+    def __getitem__(self, client_id: str) -> Dict[str, Any]:
+        return self._clients[client_id]
+
+    def __delitem__(self, client_id: str):
+        del self._clients[client_id]
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._clients)
+
+    def get(self, client_id: str, default: Any = None) -> Any:
+        return self._clients.get(client_id, default)
+
+    def count(self) -> int:
+        """全部进程的在线连接数"""
+        return len(self._clients)
+
+    def find_user(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        查找用户的所有在线连接
+
+        Returns:
+            List[dict]: 连接记录（含 worker_id 与 client_id）
+        """
+        return [
+            dict(record, worker_id=self.worker_id, client_id=client_id)
+            for client_id, record in self._clients.items() if record.get("user_id") == user_id
+        ]
+
+    def publish_revocation(self, token: str):
+        """通知其他进程令牌已注销（单进程无需广播）"""
+
+    def poll_revocations(self) -> List[str]:
+        """获取其他进程新注销的令牌"""
+        return []
+
+    def remove_worker(self, worker_id: int) -> int:
+        """删除某个工作进程的全部连接（进程退出后由主进程调用）"""
+        return 0
+
+    def clear(self) -> int:
+        """删除所有进程的连接记录（主进程启动时清除上次异常退出的遗留记录）"""
+        count = len(self._clients)
+        self._clients.clear()
+        return count
+
+    def cleanup(self) -> int:
+        """清理过期的注销广播"""
+        return 0
+
+    def close(self):
+        self._clients.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取存储统计"""
+        return {
+            'backend': self.backend,
+            'worker_id': self.worker_id,
+            'local': len(self._clients),
+            'total': self.count(),
+        }
+
+
+class SQLiteSessionStore(MemorySessionStore):
+    """多进程共享的 SQLite 会话存储（写入时同步到数据库）"""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = STORE_PATH, worker_id: Optional[int] = None):
+        """
+        打开共享存储
+
+        Args:
+            path: 数据库文件路径（同一台机器的所有工作进程使用同一文件）
+            worker_id: 工作进程标识（默认进程ID；热重载期间新旧进程的标识不同）
+        """
+        super().__init__(worker_id)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript('''
+        CREATE TABLE IF NOT EXISTS online_clients (
+            worker_id INTEGER NOT NULL,
+            client_id TEXT NOT NULL,
+            user_id INTEGER,
+            username TEXT,
+            token TEXT,
+            login_time REAL,
+            PRIMARY KEY (worker_id, client_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_online_clients_user ON online_clients(user_id);
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            worker_id INTEGER NOT NULL,
+            token TEXT NOT NULL,
+            revoked_at REAL NOT NULL
+        );
+        ''')
+        # 只接收打开存储之后的注销广播
+        row = self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM revoked_tokens").fetchone()
+        self._last_revocation = row[0]
+
+    def _execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._connection.execute(sql, parameters)
+
+    def __setitem__(self, client_id: str, record: Dict[str, Any]):
+        super().__setitem__(client_id, record)
+        self._execute(
+            "INSERT OR REPLACE INTO online_clients (worker_id, client_id, user_id, username, token, login_time) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self.worker_id, client_id, *(record.get(field) for field in RECORD_FIELDS))
+        )
+
+    def __delitem__(self, client_id: str):
+        super().__delitem__(client_id)
+        self._execute("DELETE FROM online_clients WHERE worker_id = ? AND client_id = ?",
+                      (self.worker_id, client_id))
+
+    def count(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM online_clients").fetchone()[0]
+
+    def find_user(self, user_id: int) -> List[Dict[str, Any]]:
+        rows = self._execute(
+            "SELECT worker_id, client_id, user_id, username, token, login_time FROM online_clients WHERE user_id = ?",
+            (user_id,)
+        ).fetchall()
+        return [dict(zip(("worker_id", "client_id") + RECORD_FIELDS, row)) for row in rows]
+
+    def publish_revocation(self, token: str):
+        self._execute("INSERT INTO revoked_tokens (worker_id, token, revoked_at) VALUES (?, ?, ?)",
+                      (self.worker_id, token, time.time()))
+
+    def poll_revocations(self) -> List[str]:
+        rows = self._execute(
+            "SELECT id, token FROM revoked_tokens WHERE id > ? AND worker_id != ? ORDER BY id",
+            (self._last_revocation, self.worker_id)
+        ).fetchall()
+        if rows:
+            self._last_revocation = rows[-1][0]
+        return [token for _, token in rows]
+
+    def remove_worker(self, worker_id: int) -> int:
+        return self._execute("DELETE FROM online_clients WHERE worker_id = ?", (worker_id,)).rowcount
+
+    def clear(self) -> int:
+        super().clear()
+        return self._execute("DELETE FROM online_clients").rowcount
+
+    def cleanup(self) -> int:
+        return self._execute("DELETE FROM revoked_tokens WHERE revoked_at < ?",
+                             (time.time() - REVOCATION_TTL,)).rowcount
+
+    def close(self):
+        """关闭存储并删除本进程的连接记录"""
+        if self._connection is not None:
+            try:
+                self.remove_worker(self.worker_id)
+            except sqlite3.Error:
+                pass
+            self._connection.close()
+            self._connection = None
+        super().close()
+
+
+def create_session_store(backend: str = "memory", path: str = STORE_PATH, worker_id: Optional[int] = None):
+    """
+    创建会话存储
+
+    Args:
+        backend: "memory" 或 "sqlite"
+        path: SQLite 存储文件路径
+        worker_id: 工作进程标识（默认进程ID）
+
+    Returns:
+        会话存储实例
+    """
+    if backend == "sqlite":
+        return SQLiteSessionStore(path, worker_id)
+    if backend == "memory":
+        return MemorySessionStore(worker_id)
+    raise ValueError(f"未知的会话存储类型: {backend}")
@@ -0,0 +1,623 @@
+"""
+对战房间（服务器权威PvP）
+每个房间持有一份战斗引擎状态（BattleState + 双方PlayerState + ActionProcessor），
+由一个asyncio任务串行处理两名玩家提交的行动，验证后把结果广播给双方。
+
+- 所有房间复用同一个事件循环，不为房间创建线程；空闲房间只是一个挂在队列上的协程
+- 房间对象使用 __slots__，卡牌数据由 BattleRoomManager 共享，房间只保存对局状态
+- 回合超时自动结束，连续超时或断线的玩家判负
+"""
+
+import time
+import random
+import asyncio
+import secrets
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from game.core.cards.card_data import Card, parse_cards_from_json_file
+from game.core.battle.battle_state import BattleState, BattlePhase, GameResult, BattleAction
+from game.core.battle.player_state import PlayerState
+from game.core.battle.battle_actions import (
+    ActionType, ActionResult, ActionRequest, ActionResponse, ActionProcessor,
+    create_action_request, get_available_actions
+)
+
+# 每名玩家最多排队的行动数（超出时拒绝，避免刷消息占用内存）
+MAX_PENDING_ACTIONS = 4
+# 回合超时（秒），超时后服务器替玩家结束回合
+TURN_TIMEOUT = 60.0
+# 连续超时达到该次数判负
+MAX_TURN_TIMEOUTS = 3
+# 未指定卡组时随机组成的卡组大小
+RANDOM_DECK_SIZE = 20
+INITIAL_HAND_SIZE = 5
+
+# 卡牌数据不可变，序列化结果在所有房间间共享（Card.to_dict 走 dataclasses.asdict，开销较大）
+_card_dicts: Dict[str, Dict[str, Any]] = {}
+
+
+def _hand_entry(card_instance) -> Dict[str, Any]:
+    card_dict = _card_dicts.get(card_instance.card.id)
+    if card_dict is None:
+        card_dict = _card_dicts[card_instance.card.id] = card_instance.card.to_dict()
+    return {'card': card_dict, 'instance_id': card_instance.instance_id, 'position': card_instance.position}
+
+
+class BattleRoom:
+    """
+    对战房间
+
+    房间也充当 ActionProcessor 所需的 battle_manager（battle_state / player_states /
+    get_player_state / get_opponent_state），引擎状态只在第二名玩家加入后才创建。
+    """
+
+    __slots__ = (
+        "room_id", "player_ids", "connections", "decks", "deck_ids",
+        "battle_state", "player_states", "action_processor",
+        "actions", "pending", "timeouts", "task", "version",
+        "created_at", "on_finished",
+    )
+
+    def __init__(self, room_id: str, host_id: int, host_connection, host_deck: List[Card],
+                 host_deck_id: Optional[int] = None,
+                 on_finished: Optional[Callable[["BattleRoom"], None]] = None):
+        """
+        创建房间（等待对手加入）
+
+        Args:
+            room_id: 房间ID
+            host_id: 房主用户ID
+            host_connection: 房主的连接（WireSession）
+            host_deck: 房主卡组
+            host_deck_id: 房主卡组ID（随机卡组为None）
+            on_finished: 对战结束（或房间关闭）后的回调
+        """
+        self.room_id = room_id
+        self.player_ids = [host_id]
+        self.connections = {host_id: host_connection}
+        self.decks = [host_deck]
+        self.deck_ids = [host_deck_id]
+        self.battle_state: Optional[BattleState] = None
+        self.player_states: Dict[int, PlayerState] = {}
+        self.action_processor: Optional[ActionProcessor] = None
+        self.actions: Optional[asyncio.Queue] = None
+        self.pending: Dict[int, int] = {}
+        self.timeouts: Dict[int, int] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.version = 0
+        self.created_at = time.time()
+        self.on_finished = on_finished
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.player_ids) == 2
+
+    @property
+    def is_running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    # ---- ActionProcessor 需要的接口 ----
+
+    def get_player_state(self, player_id: int) -> Optional[PlayerState]:
+        """获取玩家状态"""
+        return self.player_states.get(player_id)
+
+    def get_opponent_state(self, player_id: int) -> Optional[PlayerState]:
+        """获取对手状态"""
+        return self.player_states.get(self.get_opponent_id(player_id))
+
+    def get_opponent_id(self, player_id: int) -> Optional[int]:
+        """获取对手ID（不经过 BattleState 的调试输出）"""
+        for pid in self.player_ids:
+            if pid != player_id:
+                return pid
+        return None
+
+    # ---- 生命周期 ----
+
+    def join(self, user_id: int, connection, deck: List[Card], deck_id: Optional[int] = None):
+        """
+        第二名玩家加入
+
+        Args:
+            user_id: 用户ID
+            connection: 连接（WireSession）
+            deck: 卡组
+            deck_id: 卡组ID（随机卡组为None）
+        """
+        self.player_ids.append(user_id)
+        self.connections[user_id] = connection
+        self.decks.append(deck)
+        self.deck_ids.append(deck_id)
+
+    def start(self, battle_id: int):
+        """
+        创建战斗引擎状态并启动房间任务（需在事件循环中调用）
+
+        Args:
+            battle_id: 数据库中的战斗记录ID
+        """
+        player1_id, player2_id = self.player_ids
+        self.battle_state = BattleState(battle_id, player1_id, player2_id)
+        for pid, deck in zip(self.player_ids, self.decks):
+            self.player_states[pid] = PlayerState(pid, deck)
+            self.pending[pid] = 0
+            self.timeouts[pid] = 0
+        # 卡组已复制进PlayerState，不再保留
+        self.decks = []
+        self.action_processor = ActionProcessor(self)
+        self._setup_initial_game_state()
+        self.battle_state.next_phase()  # 从SETUP到DRAW
+
+        self.actions = asyncio.Queue()
+        self.task = asyncio.create_task(self._run(), name=f"battle-room-{self.room_id}")
+
+    def _setup_initial_game_state(self):
+        """抽起始手牌并放置起始前排Pokemon（与 BattleManager 相同的规则）"""
+        for player_state in self.player_states.values():
+            player_state.draw_initial_hand(INITIAL_HAND_SIZE)
+
+            if not player_state.get_hand_pokemon():
+                # Mulligan: 重新洗牌并抽卡
+                player_state.hand.extend(player_state.deck)
+                player_state.deck = player_state.hand
+                player_state.hand = []
+                player_state.shuffle_deck()
+                player_state.draw_initial_hand(INITIAL_HAND_SIZE)
+
+        for player_state in self.player_states.values():
+            hand_pokemon = player_state.get_hand_pokemon()
+            if hand_pokemon:
+                starter_pokemon = max(hand_pokemon, key=lambda p: p.card.hp or 0)
+                player_state.play_pokemon_to_bench(starter_pokemon)
+                if player_state.bench_pokemon:
+                    player_state.set_active_pokemon(player_state.bench_pokemon[0])
+
+    def submit(self, user_id: int, data: Dict[str, Any]) -> Optional[str]:
+        """
+        提交行动（由房间任务按顺序处理，结果通过广播返回）
+
+        Args:
+            user_id: 已认证的用户ID（忽略客户端提供的player_id）
+            data: 行动数据 {'action_type', 'source_id', 'target_id', 'parameters'}
+
+        Returns:
+            Optional[str]: 错误信息，None表示已接受
+        """
+        if not self.is_running:
+            return "El combate no ha comenzado o ya ha terminado."
+        if user_id not in self.player_states:
+            return "No eres jugador de esta sala."
+        if self.pending[user_id] >= MAX_PENDING_ACTIONS:
+            return "Demasiadas acciones pendientes. Espera a que se procesen."
+
+        parameters = data.get('parameters') or {}
+        if not isinstance(parameters, dict):
+            return "Parámetros de acción inválidos."
+        try:
+            request = create_action_request(
+                str(data.get('action_type', '')), user_id,
+                source_id=data.get('source_id'),
+                target_id=data.get('target_id'),
+                parameters=parameters
+            )
+        except ValueError:
+            return f"Tipo de acción inválido: {data.get('action_type')}"
+
+        self.pending[user_id] += 1
+        self.actions.put_nowait((user_id, request))
+        return None
+
+    def forfeit(self, user_id: int):
+        """玩家离开或断线：判负（不受排队上限限制）"""
+        if self.is_running and user_id in self.player_states:
+            self.actions.put_nowait((user_id, None))
+
+    def cancel(self):
+        """取消房间任务（服务器关闭时）"""
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+    async def _run(self):
+        """房间主循环：串行处理行动、检查胜负并广播"""
+        try:
+            await self._broadcast("battle_start", None)
+
+            # 超时按回合计算：只有回合切换时才重新计时，无效或被拒绝的行动不会延长回合
+            loop = asyncio.get_running_loop()
+            turn = None
+            deadline = 0.0
+            while not self.battle_state.is_battle_over():
+                current_turn = (self.battle_state.turn_count, self.battle_state.current_turn_player)
+                if current_turn != turn:
+                    turn = current_turn
+                    deadline = loop.time() + TURN_TIMEOUT
+                try:
+                    user_id, request = await asyncio.wait_for(self.actions.get(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    response = self._handle_turn_timeout()
+                    # 即使引擎没有切换回合也重新计时，避免反复立即超时
+                    turn = None
+                else:
+                    if request is None:
+                        response = self._surrender(user_id, "El jugador abandonó el combate.")
+                    else:
+                        self.pending[user_id] -= 1
+                        response = self._apply(request)
+
+                self._check_win_conditions()
+                self.version += 1
+                await self._broadcast("battle_update", response)
+
+            await self._broadcast("battle_end", None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ 房间 {self.room_id} 异常终止: {e}")
+            if self.battle_state and not self.battle_state.is_battle_over():
+                self.battle_state.end_battle(GameResult.DRAW, None)
+        finally:
+            if self.on_finished:
+                self.on_finished(self)
+
+    def _apply(self, request: ActionRequest) -> ActionResponse:
+        """执行一个行动请求"""
+        if request.action_type == ActionType.SURRENDER:
+            # 投降不要求是自己的回合
+            return self._surrender(request.player_id, "Rendición.")
+
+        try:
+            response = self.action_processor.process_action(request)
+        except Exception as e:
+            print(f"❌ 房间 {self.room_id} 处理行动失败: {request.action_type.value} - {e}")
+            return ActionResponse(result=ActionResult.FAILED, action_request=request,
+                                  message="El servidor no pudo procesar la acción.")
+
+        if response.is_success():
+            self.timeouts[request.player_id] = 0
+            self.battle_state.add_action(BattleAction(
+                action_type=request.action_type.value,
+                player_id=request.player_id,
+                source_pokemon=request.source_id,
+                target_pokemon=request.target_id,
+                card_id=request.source_id,
+                effects=response.effects
+            ))
+        return response
+
+    def _surrender(self, user_id: int, message: str) -> ActionResponse:
+        """判负并结束对战"""
+        request = create_action_request(ActionType.SURRENDER.value, user_id)
+        if self.battle_state.is_battle_over():
+            return ActionResponse(result=ActionResult.NOT_ALLOWED, action_request=request,
+                                  message="El combate ya ha terminado.")
+
+        self.battle_state.end_battle(GameResult.FORFEIT, self.get_opponent_id(user_id))
+        response = ActionResponse(result=ActionResult.SUCCESS, action_request=request, message=message)
+        response.add_effect("Fin del combate")
+        return response
+
+    def _handle_turn_timeout(self) -> ActionResponse:
+        """回合超时：替当前玩家结束回合，连续超时判负"""
+        user_id = self.battle_state.current_turn_player
+        self.timeouts[user_id] += 1
+        if self.timeouts[user_id] >= MAX_TURN_TIMEOUTS:
+            return self._surrender(user_id, "Derrota por tiempo agotado repetidamente.")
+
+        # 从任何阶段直接进入回合结束，由引擎完成回合切换
+        self.battle_state.reset_to_phase(BattlePhase.END_TURN)
+        response = self.action_processor.process_action(
+            create_action_request(ActionType.END_TURN.value, user_id)
+        )
+        response.message = "Tiempo de turno agotado: turno finalizado automáticamente."
+        return response
+
+    def _check_win_conditions(self):
+        """检查胜负条件（与 BattleManager 相同的规则）"""
+        battle_state = self.battle_state
+        if battle_state.is_battle_over():
+            return
+
+        player1_id = battle_state.player1_id
+        for player_id, player_state in self.player_states.items():
+            if player_state.check_win_condition():
+                battle_state.end_battle(
+                    GameResult.PLAYER_WIN if player_id == player1_id else GameResult.OPPONENT_WIN,
+                    player_id
+                )
+                return
+
+            if player_state.check_lose_condition():
+                battle_state.end_battle(
+                    GameResult.OPPONENT_WIN if player_id == player1_id else GameResult.PLAYER_WIN,
+                    self.get_opponent_id(player_id)
+                )
+                return
+
+        if battle_state.turn_count >= battle_state.max_turns:
+            battle_state.end_battle(GameResult.DRAW, None)
+
+    # ---- 广播 ----
+
+    def get_state_for(self, user_id: int) -> Dict[str, Any]:
+        """
+        获取某一方视角的对战状态（对手手牌只显示数量）
+
+        Args:
+            user_id: 用户ID
+
+        Returns:
+            dict: 对战状态
+        """
+        battle_state = self.battle_state
+        player_state = self.player_states[user_id]
+        opponent_state = self.get_opponent_state(user_id)
+        is_my_turn = battle_state.is_player_turn(user_id) and not battle_state.is_battle_over()
+
+        player = player_state.get_field_summary()
+        player['hand'] = [_hand_entry(card) for card in player_state.hand]
+
+        return {
+            'battle_id': battle_state.battle_id,
+            'phase': battle_state.current_phase.value,
+            'turn': battle_state.turn_count,
+            'current_player': battle_state.current_turn_player,
+            'is_battle_over': battle_state.is_battle_over(),
+            'result': battle_state.result.value,
+            'winner': battle_state.winner_id,
+            'player': player,
+            'opponent': opponent_state.get_field_summary() if opponent_state else {},
+            'can_make_action': is_my_turn,
+            'available_actions': [
+                action.value for action in get_available_actions(battle_state, player_state)
+            ] if is_my_turn else [],
+        }
+
+    def _response_for(self, result: Dict[str, Any], actor_id: int, user_id: int) -> Dict[str, Any]:
+        """行动结果（对手抽到的卡只显示数量）"""
+        if actor_id != user_id and 'drawn_cards' in result['data']:
+            result = dict(result, data=dict(result['data'], drawn_cards=len(result['data']['drawn_cards'])))
+        return result
+
+    async def _broadcast(self, message_type: str, response: Optional[ActionResponse]):
+        """向双方推送状态（编码、卡牌驻留与增量由各自连接的 WireSession 处理）"""
+        result = response.to_dict() if response is not None else None
+        sends = []
+        for user_id, connection in self.connections.items():
+            user_result = self._response_for(result, response.action_request.player_id, user_id) if result else None
+            sends.append(self._send(connection, message_type, self.get_state_for(user_id), user_result))
+        await asyncio.gather(*sends)
+
+    async def _send(self, connection, message_type: str, state: Dict[str, Any], result: Optional[Dict[str, Any]]):
+        try:
+            await connection.send_state(message_type, self.room_id, self.version, state, result)
+        except Exception as e:
+            print(f"⚠️ 房间 {self.room_id} 发送失败: {e}")
+
+    def get_summary(self) -> Dict[str, Any]:
+        """房间摘要（大厅列表用）"""
+        return {
+            'room_id': self.room_id,
+            'players': list(self.player_ids),
+            'status': 'running' if self.is_running else ('waiting' if not self.is_full else 'finished'),
+            'created_at': self.created_at,
+        }
+
+
+class BattleRoomManager:
+    """
+    对战房间管理器
+
+    负责建房/加入/离开、卡组准备和结果保存；所有房间的卡牌对象共享同一份卡牌目录。
+    """
+
+    def __init__(self, db_manager, cards_json_path: str):
+        """
+        初始化房间管理器
+
+        Args:
+            db_manager: 数据库管理器（卡组、战斗记录与玩家统计）
+            cards_json_path: 卡牌目录JSON文件路径
+        """
+        self.db_manager = db_manager
+        self.cards_json_path = cards_json_path
+        self.rooms: Dict[str, BattleRoom] = {}
+        self.user_rooms: Dict[int, str] = {}
+        self._catalog: Optional[Dict[str, Card]] = None
+        self._pokemon_pool: List[Card] = []
+        self.battles_started = 0
+        self.battles_finished = 0
+
+    def _get_catalog(self) -> Dict[str, Card]:
+        """首次使用时加载卡牌目录"""
+        if self._catalog is None:
+            cards = parse_cards_from_json_file(self.cards_json_path)
+            self._catalog = {card.id: card for card in cards}
+            self._pokemon_pool = [card for card in cards if card.hp is not None]
+            print(f"📚 对战卡牌目录加载完成: {len(self._catalog)} 张")
+        return self._catalog
+
+    def build_deck(self, user_id: int, deck_id: Optional[int] = None) -> Tuple[List[Card], Optional[str]]:
+        """
+        准备卡组
+
+        Args:
+            user_id: 用户ID
+            deck_id: 用户卡组ID（None时随机组成一副Pokemon卡组）
+
+        Returns:
+            (卡牌列表, 错误信息)
+        """
+        catalog = self._get_catalog()
+
+        if deck_id is None:
+            if len(self._pokemon_pool) < RANDOM_DECK_SIZE:
+                return [], "No hay suficientes Pokémon en el catálogo."
+            return random.sample(self._pokemon_pool, RANDOM_DECK_SIZE), None
+
+        owned = {deck['id'] for deck in self.db_manager.get_user_decks(user_id)}
+        if deck_id not in owned:
+            return [], "El mazo no existe."
+
+        deck = []
+        for entry in self.db_manager.get_deck_cards(deck_id):
+            card = catalog.get(entry['card_id'])
+            if card:
+                deck.extend([card] * entry['quantity'])
+        if not any(card.hp is not None for card in deck):
+            return [], "El mazo no contiene Pokémon."
+        return deck, None
+
+    def create_room(self, user_id: int, connection, deck_id: Optional[int] = None) -> Tuple[Optional[BattleRoom], Optional[str]]:
+        """
+        创建房间
+
+        Returns:
+            (房间, 错误信息)
+        """
+        if user_id in self.user_rooms:
+            return None, "Ya estás en otra sala."
+
+        deck, error = self.build_deck(user_id, deck_id)
+        if error:
+            return None, error
+
+        room_id = secrets.token_hex(4)
+        while room_id in self.rooms:
+            room_id = secrets.token_hex(4)
+
+        room = BattleRoom(room_id, user_id, connection, deck, deck_id, on_finished=self._on_room_finished)
+        self.rooms[room_id] = room
+        self.user_rooms[user_id] = room_id
+        return room, None
+
+    def join_room(self, room_id: str, user_id: int, connection, deck_id: Optional[int] = None) -> Tuple[Optional[BattleRoom], Optional[str]]:
+        """
+        加入房间并开始对战（需在事件循环中调用）
+
+        Returns:
+            (房间, 错误信息)
+        """
+        room = self.rooms.get(room_id)
+        if room is None:
+            return None, "La sala no existe."
+        if room.is_full:
+            return None, "La sala está llena."
+        if user_id in self.user_rooms:
+            return None, "Ya estás en otra sala."
+
+        deck, error = self.build_deck(user_id, deck_id)
+        if error:
+            return None, error
+
+        room.join(user_id, connection, deck, deck_id)
+        self.user_rooms[user_id] = room_id
+
+        player1_id, player2_id = room.player_ids
+        success, battle_id = self.db_manager.create_battle_record(
+            player1_id, player2_id, room.deck_ids[0], room.deck_ids[1], "PVP"
+        )
+        room.start(battle_id if success else 0)
+        self.battles_started += 1
+        return room, None
+
+    def submit_action(self, user_id: int, data: Dict[str, Any]) -> Optional[str]:
+        """
+        提交对战行动
+
+        Returns:
+            Optional[str]: 错误信息，None表示已接受
+        """
+        room = self.get_user_room(user_id)
+        if room is None:
+            return "No estás en ningún combate."
+        return room.submit(user_id, data)
+
+    def leave(self, user_id: int, connection=None) -> bool:
+        """
+        离开房间：等待中的房间直接关闭，进行中的对战判负
+
+        Args:
+            user_id: 用户ID
+            connection: 仅当房间记录的是该连接时离开（断线时使用）
+
+        Returns:
+            bool: 是否离开了房间
+        """
+        room = self.get_user_room(user_id)
+        if room is None:
+            return False
+        if connection is not None and room.connections.get(user_id) is not connection:
+            return False
+
+        if room.is_running:
+            room.forfeit(user_id)
+        else:
+            self._close_room(room)
+        return True
+
+    def get_user_room(self, user_id: int) -> Optional[BattleRoom]:
+        """获取用户所在的房间"""
+        room_id = self.user_rooms.get(user_id)
+        return self.rooms.get(room_id) if room_id else None
+
+    def list_open_rooms(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """列出等待对手的房间"""
+        rooms = []
+        for room in self.rooms.values():
+            if not room.is_full:
+                rooms.append(room.get_summary())
+                if len(rooms) >= limit:
+                    break
+        return rooms
+
+    def _close_room(self, room: BattleRoom):
+        self.rooms.pop(room.room_id, None)
+        for user_id in room.player_ids:
+            if self.user_rooms.get(user_id) == room.room_id:
+                del self.user_rooms[user_id]
+
+    def _on_room_finished(self, room: BattleRoom):
+        """房间任务结束：保存结果并释放房间"""
+        self._close_room(room)
+        self.battles_finished += 1
+
+        battle_state = room.battle_state
+        if not battle_state or not battle_state.is_battle_over():
+            return
+        try:
+            summary = battle_state.get_battle_summary()
+            self.db_manager.update_battle_result(
+                battle_state.battle_id, battle_state.winner_id, battle_state.turn_count,
+                summary, int(battle_state.get_battle_duration())
+            )
+            for user_id in room.player_ids:
+                stats = self.db_manager.get_user_stats(user_id)
+                if not stats:
+                    continue
+                if battle_state.winner_id is None:
+                    self.db_manager.update_user_stats(user_id, games_played=stats['games_played'] + 1)
+                elif battle_state.winner_id == user_id:
+                    self.db_manager.update_user_stats(user_id, games_played=stats['games_played'] + 1,
+                                                      games_won=stats['games_won'] + 1)
+                else:
+                    self.db_manager.update_user_stats(user_id, games_played=stats['games_played'] + 1,
+                                                      games_lost=stats['games_lost'] + 1)
+        except Exception as e:
+            print(f"❌ 保存对战结果失败: {e}")
+
+    def shutdown(self):
+        """取消所有进行中的房间任务"""
+        for room in list(self.rooms.values()):
+            room.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取房间统计"""
+        running = sum(1 for room in self.rooms.values() if room.is_running)
+        return {
+            'rooms': len(self.rooms),
+            'running': running,
+            'waiting': len(self.rooms) - running,
+            'battles_started': self.battles_started,
+            'battles_finished': self.battles_finished,
+        }
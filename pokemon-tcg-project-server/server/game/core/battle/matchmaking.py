@@ -0,0 +1,202 @@
+"""
+匹配队列（按积分分段）
+积分由 game_stats 的胜负场推算；排队玩家按积分段（BAND_WIDTH）分桶，
+每个桶是按入队顺序排列的有序字典，非空桶的键保存在有序列表中：
+
+- 入队/出队：字典插入删除 O(1)，新建或清空桶时在有序键列表中二分定位 O(log 桶数)
+- 撮合在定时 tick 中批量进行：先在同一积分段内按先来先配对，
+  各段剩下的玩家按积分排序后与相邻玩家配对，可接受的积分差随等待时间放宽
+- 记录最近的排队时长，提供平均值/分位数等统计
+"""
+
+import math
+import time
+import bisect
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_RATING = 1000
+# 积分段宽度
+BAND_WIDTH = 50
+# 初始可接受的积分差、每秒放宽量与上限
+BASE_WINDOW = 50
+WINDOW_GROWTH = 10
+MAX_WINDOW = 600
+# 统计保留的最近排队时长数量
+WAIT_SAMPLES = 2048
+# 撮合间隔（秒）
+TICK_INTERVAL = 1.0
+
+
+def rating_from_stats(games_won: int, games_lost: int) -> int:
+    """
+    由胜负场推算积分（胜负比的对数，场次少时向 BASE_RATING 收敛）
+
+    Args:
+        games_won: 胜场
+        games_lost: 负场
+
+    Returns:
+        int: 积分
+    """
+    return int(round(BASE_RATING + 400 * math.log10((games_won + 1) / (games_lost + 1))))
+
+
+class MatchTicket:
+    """排队记录"""
+
+    __slots__ = ("user_id", "rating", "band", "enqueued_at", "payload")
+
+    def __init__(self, user_id: int, rating: int, enqueued_at: float, payload: Any = None):
+        self.user_id = user_id
+        self.rating = rating
+        self.band = rating // BAND_WIDTH
+        self.enqueued_at = enqueued_at
+        self.payload = payload
+
+    def window(self, now: float) -> float:
+        """当前可接受的积分差"""
+        return min(MAX_WINDOW, BASE_WINDOW + WINDOW_GROWTH * (now - self.enqueued_at))
+
+
+class MatchmakingQueue:
+    """按积分段分桶的匹配队列"""
+
+    def __init__(self):
+        self._bands: Dict[int, "OrderedDict[int, MatchTicket]"] = {}
+        self._band_keys: List[int] = []
+        self._tickets: Dict[int, MatchTicket] = {}
+        self._wait_times = deque(maxlen=WAIT_SAMPLES)
+        self.matches_formed = 0
+        self.total_enqueued = 0
+        self.total_cancelled = 0
+        self.last_tick_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._tickets
+
+    def enqueue(self, user_id: int, rating: int, payload: Any = None, now: Optional[float] = None) -> MatchTicket:
+        """
+        加入队列（已在队列中时更新积分与附带数据，保留原排队时间）
+
+        Args:
+            user_id: 用户ID
+            rating: 积分
+            payload: 附带数据（如连接与卡组ID），匹配成功时原样返回
+            now: 当前时间（默认 time.monotonic()）
+
+        Returns:
+            MatchTicket: 排队记录
+        """
+        now = time.monotonic() if now is None else now
+        previous = self._remove(user_id)
+        ticket = MatchTicket(user_id, rating, previous.enqueued_at if previous else now, payload)
+
+        band = self._bands.get(ticket.band)
+        if band is None:
+            band = self._bands[ticket.band] = OrderedDict()
+            bisect.insort(self._band_keys, ticket.band)
+        band[user_id] = ticket
+        self._tickets[user_id] = ticket
+        if previous is None:
+            self.total_enqueued += 1
+        return ticket
+
+    def dequeue(self, user_id: int) -> Optional[MatchTicket]:
+        """
+        离开队列
+
+        Returns:
+            Optional[MatchTicket]: 原排队记录，不在队列中时为None
+        """
+        ticket = self._remove(user_id)
+        if ticket is not None:
+            self.total_cancelled += 1
+        return ticket
+
+    def _remove(self, user_id: int) -> Optional[MatchTicket]:
+        ticket = self._tickets.pop(user_id, None)
+        if ticket is None:
+            return None
+        band = self._bands[ticket.band]
+        del band[user_id]
+        if not band:
+            del self._bands[ticket.band]
+            del self._band_keys[bisect.bisect_left(self._band_keys, ticket.band)]
+        return ticket
+
+    def tick(self, now: Optional[float] = None) -> List[Tuple[MatchTicket, MatchTicket]]:
+        """
+        批量撮合
+
+        Args:
+            now: 当前时间（默认 time.monotonic()）
+
+        Returns:
+            List[Tuple[MatchTicket, MatchTicket]]: 配对结果（已移出队列）
+        """
+        start = time.perf_counter()
+        now = time.monotonic() if now is None else now
+        pairs = []
+        leftovers = []
+
+        # 同一积分段内：按入队顺序两两配对
+        for key in self._band_keys:
+            band = self._bands[key]
+            tickets = iter(band.values())
+            for first in tickets:
+                second = next(tickets, None)
+                if second is None:
+                    leftovers.append(first)
+                else:
+                    pairs.append((first, second))
+
+        # 各段剩下的玩家：与积分相邻的玩家配对（等待越久可接受的差距越大）
+        leftovers.sort(key=lambda t: t.rating)
+        i = 0
+        while i + 1 < len(leftovers):
+            first, second = leftovers[i], leftovers[i + 1]
+            if second.rating - first.rating <= min(first.window(now), second.window(now)):
+                pairs.append((first, second))
+                i += 2
+            else:
+                i += 1
+
+        for first, second in pairs:
+            for ticket in (first, second):
+                self._remove(ticket.user_id)
+                self._wait_times.append(now - ticket.enqueued_at)
+        self.matches_formed += len(pairs)
+        self.last_tick_ms = (time.perf_counter() - start) * 1000
+        return pairs
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        获取队列统计（排队时长基于最近 WAIT_SAMPLES 个已匹配玩家）
+
+        Returns:
+            dict: 统计信息
+        """
+        now = time.monotonic() if now is None else now
+        waits = sorted(self._wait_times)
+
+        def percentile(p):
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3) if waits else 0.0
+
+        oldest = min((band[next(iter(band))].enqueued_at for band in self._bands.values()), default=now)
+        return {
+            'queued': len(self._tickets),
+            'bands': len(self._band_keys),
+            'oldest_wait': round(now - oldest, 3),
+            'matches_formed': self.matches_formed,
+            'total_enqueued': self.total_enqueued,
+            'total_cancelled': self.total_cancelled,
+            'wait_avg': round(sum(waits) / len(waits), 3) if waits else 0.0,
+            'wait_p50': percentile(0.5),
+            'wait_p95': percentile(0.95),
+            'wait_max': round(waits[-1], 3) if waits else 0.0,
+            'last_tick_ms': round(self.last_tick_ms, 3),
+        }
@@ -0,0 +1,250 @@
+"""
+卡牌目录分发
+服务器以自己的 card_assets/cards.json 为准维护带版本号的卡牌目录：
+刷新时按内容哈希（与客户端 card_sync 相同的算法）比较，变化的卡牌记录变化时的目录版本，
+删除的卡牌保留墓碑。客户端提交已同步到的版本，服务器返回此后新增/变更/删除的卡牌，
+按页分块并用 zlib 压缩（base64 传输），目录更新只需传输变化的卡牌。
+"""
+
+import json
+import uuid
+import zlib
+import base64
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from game.core.cards.card_data import Card
+from game.core.cards.card_sync import ROW_FIELDS, compute_content_hash, iter_json_cards
+
+# 每页的卡牌数（新增/变更的行与删除的ID合计）
+PAGE_SIZE = 200
+# zlib 压缩级别
+COMPRESSION_LEVEL = 6
+# 缓存的已压缩页数（同一版本的请求在客户端之间高度重复）
+PAGE_CACHE_SIZE = 64
+# 页内容的编码方式（告知客户端）
+PAGE_ENCODING = "zlib+base64"
+# 页中每行的列顺序
+PAGE_FIELDS = ROW_FIELDS + ('content_hash',)
+
+
+class CatalogError(Exception):
+    """目录请求无效"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class CatalogService:
+    """带版本号的卡牌目录（数据保存在数据库中，查询使用内存副本）"""
+
+    def __init__(self, connection, cards_json_path: str):
+        """
+        初始化目录服务
+
+        Args:
+            connection: 数据库连接
+            cards_json_path: 服务器的 cards.json 路径
+        """
+        self.connection = connection
+        self.cards_json_path = cards_json_path
+        self.catalog_id = ""
+        self.version = 0
+        # {卡牌ID: (行(含哈希) 或 None(已删除), 变化时的版本, 新增时的版本)}
+        self._entries: Dict[str, Tuple[Optional[Tuple], int, int]] = {}
+        self._pages: "OrderedDict[Tuple[int, int, int], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'pages_built': 0, 'page_cache_hits': 0, 'bytes_sent': 0}
+        self._create_tables()
+
+    def _create_tables(self):
+        self.connection.executescript('''
+        CREATE TABLE IF NOT EXISTS catalog_entries (
+            card_id TEXT PRIMARY KEY,
+            row TEXT,
+            content_hash TEXT,
+            version INTEGER NOT NULL,
+            added_version INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_catalog_entries_version ON catalog_entries(version);
+        CREATE TABLE IF NOT EXISTS catalog_info (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        ''')
+        self.connection.commit()
+
+    def _load(self):
+        """从数据库载入目录到内存"""
+        cursor = self.connection.cursor()
+        row = cursor.execute("SELECT value FROM catalog_info WHERE key = 'catalog_id'").fetchone()
+        self.catalog_id = row[0] if row else ""
+        entries = {}
+        version = 0
+        for card_id, row_json, entry_version, added_version, deleted in cursor.execute(
+                "SELECT card_id, row, version, added_version, deleted FROM catalog_entries"):
+            entries[card_id] = (None if deleted else tuple(json.loads(row_json)), entry_version, added_version)
+            version = max(version, entry_version)
+        with self._lock:
+            self._entries = entries
+            self.version = version
+            self._pages.clear()
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        按 cards.json 刷新目录（内容变化时版本加一）
+
+        多个工作进程同时刷新时由数据库写锁串行化，后执行的进程看不到变化，只载入结果。
+
+        Returns:
+            dict: {'version', 'added', 'changed', 'removed'}
+        """
+        source: Dict[str, Tuple] = {}
+        complete = True
+        for card_data in iter_json_cards(self.cards_json_path):
+            try:
+                card_dict = Card.from_json_card(card_data).to_dict()
+            except Exception:
+                complete = False
+                continue
+            row = tuple(card_dict[name] for name in ROW_FIELDS)
+            source[row[0]] = row + (compute_content_hash(row),)
+
+        result = {'version': 0, 'added': 0, 'changed': 0, 'removed': 0}
+        if not source:
+            # 空文件视为异常，不据此删除整个目录
+            self._load()
+            result['version'] = self.version
+            return result
+
+        cursor = self.connection.cursor()
+        if self.connection.in_transaction:
+            self.connection.commit()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if cursor.execute("SELECT 1 FROM catalog_info WHERE key = 'catalog_id'").fetchone() is None:
+                cursor.execute("INSERT INTO catalog_info (key, value) VALUES ('catalog_id', ?)", (uuid.uuid4().hex,))
+            existing = {
+                card_id: (content_hash, added_version, deleted)
+                for card_id, content_hash, added_version, deleted in cursor.execute(
+                    "SELECT card_id, content_hash, added_version, deleted FROM catalog_entries")
+            }
+            current = cursor.execute("SELECT COALESCE(MAX(version), 0) FROM catalog_entries").fetchone()[0]
+            new_version = current + 1
+
+            writes = []
+            for card_id, row in source.items():
+                old = existing.get(card_id)
+                if old is None or old[2]:
+                    result['added'] += 1
+                    writes.append((card_id, json.dumps(row, ensure_ascii=False), row[-1], new_version, new_version, 0))
+                elif old[0] != row[-1]:
+                    result['changed'] += 1
+                    writes.append((card_id, json.dumps(row, ensure_ascii=False), row[-1], new_version, old[1], 0))
+            if complete:
+                for card_id, (_, added_version, deleted) in existing.items():
+                    if not deleted and card_id not in source:
+                        result['removed'] += 1
+                        writes.append((card_id, None, None, new_version, added_version, 1))
+
+            if writes:
+                cursor.executemany('''
+                INSERT OR REPLACE INTO catalog_entries (card_id, row, content_hash, version, added_version, deleted)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', writes)
+            self.connection.commit()
+        except sqlite3.Error:
+            self.connection.rollback()
+            raise
+
+        self._load()
+        result['version'] = self.version
+        return result
+
+    def get_delta(self, since: int = 0, page: int = 0, catalog_id: str = "",
+                  version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        获取一页目录差异
+
+        Args:
+            since: 客户端已同步到的版本（0 表示没有）
+            page: 页码（从0开始）
+            catalog_id: 客户端记录的目录标识；与服务器不同（服务器数据库被重建）时返回完整目录
+            version: 第一页返回的目录版本，后续页必须一致
+
+        Returns:
+            dict: 页信息与压缩后的数据
+
+        Raises:
+            CatalogError: 参数无效，或翻页期间目录版本已变化
+        """
+        if not isinstance(since, int) or not isinstance(page, int) or page < 0:
+            raise CatalogError("invalid_request", "Parámetros de catálogo inválidos.")
+
+        with self._lock:
+            if version is not None and version != self.version:
+                raise CatalogError("catalog_changed", "El catálogo cambió durante la descarga. Vuelva a empezar.")
+            full = since <= 0 or since > self.version or catalog_id != self.catalog_id
+            since = 0 if full else since
+            key = (self.version, since, page)
+            self.stats['requests'] += 1
+
+            cached = self._pages.get(key)
+            if cached is not None:
+                self._pages.move_to_end(key)
+                self.stats['page_cache_hits'] += 1
+            else:
+                cached = self._build_page(since, page)
+                self._pages[key] = cached
+                if len(self._pages) > PAGE_CACHE_SIZE:
+                    self._pages.popitem(last=False)
+                self.stats['pages_built'] += 1
+            self.stats['bytes_sent'] += len(cached['data'])
+
+            return dict(cached, catalog_id=self.catalog_id, full=full)
+
+    def _build_page(self, since: int, page: int) -> Dict[str, Any]:
+        items: List[Tuple[str, Tuple[Optional[Tuple], int, int]]] = sorted(
+            (card_id, entry) for card_id, entry in self._entries.items()
+            if entry[1] > since
+            # 客户端从未收到过的卡牌被删除时无需通知
+            and not (entry[0] is None and entry[2] > since)
+        )
+        pages = max(1, -(-len(items) // PAGE_SIZE))
+        if page >= pages:
+            raise CatalogError("invalid_page", "Página de catálogo inexistente.")
+
+        added, changed, removed = [], [], []
+        for card_id, (row, _, added_version) in items[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]:
+            if row is None:
+                removed.append(card_id)
+            elif added_version > since:
+                added.append(row)
+            else:
+                changed.append(row)
+
+        payload = json.dumps({'added': added, 'changed': changed, 'removed': removed},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return {
+            'version': self.version,
+            'since': since,
+            'page': page,
+            'pages': pages,
+            'total': len(items),
+            'fields': list(PAGE_FIELDS),
+            'encoding': PAGE_ENCODING,
+            'raw_size': len(payload),
+            'data': base64.b64encode(zlib.compress(payload, COMPRESSION_LEVEL)).decode('ascii'),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取目录服务统计"""
+        with self._lock:
+            cards = sum(1 for row, _, _ in self._entries.values() if row is not None)
+            return dict(self.stats, version=self.version, cards=cards, cached_pages=len(self._pages))
+
@@ -9,6 +9,9 @@ from datetime import datetime
 from game.core.database.daos.user_dao import UserDAO
 from game.core.database.daos.card_dao import CardDAO
 
+# 数据库被其他连接锁定时的等待时间（秒）
+BUSY_TIMEOUT = 5.0
+
 class DatabaseManager:
     """
     管理数据库连接和所有数据库相关操作的类
@@ -42,6 +45,7 @@ class DatabaseManager:
         try:
             self.connection = sqlite3.connect(
                 self.db_path,
+                timeout=BUSY_TIMEOUT,  # 其他工作进程写入时等待而不是立即报错
                 check_same_thread=False  # 允许多线程访问
             )
             self.connection.row_factory = sqlite3.Row  # 使查询结果可以通过列名访问
@@ -49,6 +53,9 @@ class DatabaseManager:
             
             # 启用外键约束
             self.cursor.execute("PRAGMA foreign_keys = ON")
+            # 多个工作进程共享数据库文件：WAL 模式下读写互不阻塞
+            self.cursor.execute("PRAGMA journal_mode = WAL")
+            self.cursor.execute("PRAGMA synchronous = NORMAL")
             
             # 初始化DAO对象
             self.user_dao = UserDAO(self.connection)
@@ -324,12 +331,12 @@ class DatabaseManager:
                 print(f"创建索引失败: {e}")
     
     # 保留原有的用户相关方法
-    def register_user(self, username, password, email=None):
-        """注册新用户"""
+    def register_user(self, username, password, email=None, password_hash=None):
+        """注册新用户（password_hash 为已计算好的哈希，可省去同步计算）"""
         if not self.user_dao:
             return False, "数据库未初始化"
         
-        success, result = self.user_dao.create_user(username, password, email)
+        success, result = self.user_dao.create_user(username, password, email, password_hash=password_hash)
         if success:
             # 创建用户游戏统计记录
             self._create_user_stats(result)
@@ -345,6 +352,18 @@ class DatabaseManager:
             return False, "数据库未初始化"
         return self.user_dao.authenticate_user(username, password)
     
+    def get_user_credentials(self, username):
+        """获取用户ID与密码哈希（在进程池中验证密码时使用）"""
+        if not self.user_dao:
+            return None
+        return self.user_dao.get_credentials(username)
+    
+    def set_user_password_hash(self, user_id, password_hash):
+        """保存重新计算的密码哈希"""
+        if not self.user_dao:
+            return False
+        return self.user_dao.set_password_hash(user_id, password_hash)
+    
     def get_user_info(self, user_id):
         """获取用户信息"""
         if not self.user_dao:
@@ -0,0 +1,173 @@
+"""
+流量控制
+- 每个连接按动作类别使用令牌桶限流（认证类动作最严格，登出不消耗认证令牌）
+- 发送端的有界队列参数（WireSession 的写任务按队列发送，超过上限的慢速客户端被断开）
+- 事件循环延迟监控：延迟过高时拒绝新连接并拒绝代价高的请求（注册/登录）
+- 计数器：限流、丢弃、慢速客户端、拒绝的连接等
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+# 动作类别：(桶容量, 每秒补充令牌数)
+RATE_LIMITS = {
+    "auth": (5, 0.5),
+    "session": (10, 2.0),
+    "lobby": (10, 2.0),
+    "battle": (20, 10.0),
+    "ack": (60, 30.0),
+    "default": (20, 5.0),
+}
+
+ACTION_CLASSES = {
+    "register": "auth",
+    "login": "auth",
+    "logout": "session",
+    "list_rooms": "lobby",
+    "create_room": "lobby",
+    "join_room": "lobby",
+    "leave_room": "lobby",
+    "join_queue": "lobby",
+    "leave_queue": "lobby",
+    "battle_action": "battle",
+    "ack": "ack",
+}
+
+# 事件循环过载时拒绝的动作（进程池哈希，代价高）
+SHED_ACTIONS = frozenset(("register", "login"))
+
+# 连续被限流多少次后断开连接
+MAX_CONSECUTIVE_THROTTLES = 20
+
+# 每个连接发送队列的上限（消息数/字节数），超过即视为慢速客户端
+OUTBOX_MAX_MESSAGES = 256
+OUTBOX_MAX_BYTES = 4 * 1024 * 1024
+
+# 事件循环延迟检测间隔与过载阈值（秒）
+LAG_CHECK_INTERVAL = 0.1
+MAX_LOOP_LAG = 0.5
+
+# WebSocket 关闭码
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class TokenBucket:
+    """令牌桶"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """
+        取一个令牌
+
+        Returns:
+            float: 0 表示成功，否则为需要等待的秒数
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """单个连接的限流器（每个动作类别一个令牌桶，按需创建）"""
+
+    __slots__ = ("flow", "buckets", "strikes")
+
+    def __init__(self, flow: "FlowControl"):
+        self.flow = flow
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.strikes = 0
+
+    def check(self, action: str, now: Optional[float] = None) -> float:
+        """
+        检查是否允许执行动作
+
+        Args:
+            action: 动作名
+            now: 当前时间（默认 time.monotonic()）
+
+        Returns:
+            float: 0 表示允许，否则为建议的重试等待秒数
+        """
+        now = time.monotonic() if now is None else now
+        action_class = ACTION_CLASSES.get(action, "default")
+        bucket = self.buckets.get(action_class)
+        if bucket is None:
+            bucket = self.buckets[action_class] = TokenBucket(*RATE_LIMITS[action_class], now)
+
+        retry_after = bucket.take(now)
+        if retry_after:
+            self.strikes += 1
+            self.flow.counters["throttled"] += 1
+            self.flow.counters[f"throttled_{action_class}"] += 1
+        else:
+            self.strikes = 0
+        return retry_after
+
+    @property
+    def abusive(self) -> bool:
+        """连续被限流次数过多"""
+        return self.strikes >= MAX_CONSECUTIVE_THROTTLES
+
+
+class FlowControl:
+    """服务器级流量控制：计数器与事件循环延迟监控"""
+
+    def __init__(self):
+        self.counters = Counter()
+        self.loop_lag = 0.0
+        self.max_loop_lag = 0.0
+
+    def limiter(self) -> RateLimiter:
+        """为新连接创建限流器"""
+        return RateLimiter(self)
+
+    @property
+    def overloaded(self) -> bool:
+        """事件循环延迟是否超过阈值"""
+        return self.loop_lag > MAX_LOOP_LAG
+
+    def admit_connection(self) -> bool:
+        """准入控制：过载时拒绝新连接"""
+        if self.overloaded:
+            self.counters["rejected_connections"] += 1
+            return False
+        return True
+
+    def should_shed(self, action: str) -> bool:
+        """过载时拒绝代价高的动作"""
+        if self.overloaded and action in SHED_ACTIONS:
+            self.counters["shed_requests"] += 1
+            return True
+        return False
+
+    async def monitor_loop(self):
+        """测量事件循环延迟（sleep 实际耗时与预期之差）"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_CHECK_INTERVAL)
+            self.loop_lag = max(0.0, loop.time() - start - LAG_CHECK_INTERVAL)
+            self.max_loop_lag = max(self.max_loop_lag, self.loop_lag)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取流量控制统计"""
+        stats = dict(self.counters)
+        stats.update({
+            'loop_lag_ms': round(self.loop_lag * 1000, 3),
+            'max_loop_lag_ms': round(self.max_loop_lag * 1000, 3),
+            'overloaded': self.overloaded,
+        })
+        return stats
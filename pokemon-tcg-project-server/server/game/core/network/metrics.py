@@ -0,0 +1,280 @@
+"""
+服务器指标
+- LatencyHistogram: HDR 风格的对数-线性延迟直方图（每个 2 的幂区间再均分 16 段，相对误差 ≤ 6.25%），
+  记录一次只需几次整数运算和一次列表自增，不加锁（只在事件循环线程中写入）
+- Metrics: 按动作统计请求延迟与失败数，加上计数器和采集时才读取的各组件状态（连接数、事件循环延迟、
+  哈希进程池队列、会话缓存命中率等）
+- 导出为 Prometheus 文本格式（独立 HTTP 端口的 /metrics）或 JSON（get_metrics 动作）
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 每个 2 的幂区间的分段数（2^SUB_BUCKET_BITS）
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# 可记录的最大延迟（微秒），更大的值计入最后一个桶
+MAX_TRACKABLE_MICROS = 1 << 31
+BUCKET_COUNT = (MAX_TRACKABLE_MICROS.bit_length() - SUB_BUCKET_BITS) * SUB_BUCKETS
+
+# Prometheus 直方图的累计桶上界（秒）
+PROMETHEUS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                      0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# get_metrics 返回的分位数
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# 指标端口读取请求头的超时（秒）
+HTTP_TIMEOUT = 5.0
+
+# 采集器返回的样本：(名称, 类型 gauge/counter, 说明, 数值 或 [(标签字典, 数值)])
+Sample = Tuple[str, str, str, Any]
+
+
+def bucket_index(micros: int) -> int:
+    """延迟（微秒）对应的桶序号"""
+    shift = micros.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return micros if micros > 0 else 0
+    index = shift * SUB_BUCKETS + (micros >> shift)
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+
+def bucket_upper_bound(index: int) -> int:
+    """桶的上界（微秒，不含）"""
+    shift = max(0, index // SUB_BUCKETS - 1)
+    return (index - shift * SUB_BUCKETS + 1) << shift
+
+
+class LatencyHistogram:
+    """延迟直方图"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """记录一次耗时（秒）"""
+        self.counts[bucket_index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        分位数（秒，取所在桶的上界，不超过最大值）
+
+        Args:
+            q: 0~1
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= target:
+                    return min(bucket_upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def cumulative(self, bounds: Iterable[float]) -> List[int]:
+        """
+        按给定上界（秒）累计的计数，桶跨越上界时计入更大的上界
+
+        Returns:
+            List[int]: 与 bounds 一一对应
+        """
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            limit = bound * 1_000_000
+            while index < BUCKET_COUNT and bucket_upper_bound(index) <= limit:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """统计摘要（毫秒）"""
+        stats = {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+        }
+        for q in QUANTILES:
+            stats[f"p{q * 100:g}_ms".replace('.', '')] = round(self.quantile(q) * 1000, 3)
+        return stats
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class Metrics:
+    """服务器指标注册表"""
+
+    def __init__(self, prefix: str = "pokemon_tcg"):
+        """
+        初始化指标
+
+        Args:
+            prefix: Prometheus 指标名前缀
+        """
+        self.prefix = prefix
+        self.started = time.time()
+        self.actions: Dict[str, LatencyHistogram] = {}
+        self.errors = Counter()
+        self.counters = Counter()
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def observe(self, action: str, seconds: float, ok: bool = True):
+        """
+        记录一次请求处理
+
+        Args:
+            action: 动作名
+            seconds: 处理耗时
+            ok: 是否成功（失败计入 errors）
+        """
+        histogram = self.actions.get(action)
+        if histogram is None:
+            histogram = self.actions[action] = LatencyHistogram()
+        histogram.record(seconds)
+        if not ok:
+            self.errors[action] += 1
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """注册采集器（导出时调用，返回样本列表）"""
+        self._collectors.append(collector)
+
+    def _collect(self) -> List[Sample]:
+        samples: List[Sample] = [
+            ("uptime_seconds", "gauge", "Seconds since the process started", round(time.time() - self.started, 3)),
+        ]
+        samples.extend((f"{name}_total", "counter", f"Total {name.replace('_', ' ')}", value)
+                       for name, value in sorted(self.counters.items()))
+        for collector in self._collectors:
+            samples.extend(collector())
+        return samples
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON 格式的指标（get_metrics 动作）"""
+        actions = {}
+        for action, histogram in sorted(self.actions.items()):
+            actions[action] = dict(histogram.summary(), errors=self.errors[action])
+        values = {}
+        for name, _, _, value in self._collect():
+            if isinstance(value, list):
+                values[name] = {",".join(str(v) for v in labels.values()): v for labels, v in value}
+            else:
+                values[name] = value
+        return {'pid': os.getpid(), 'actions': actions, 'values': values}
+
+    def render_prometheus(self) -> str:
+        """Prometheus 文本格式"""
+        prefix = self.prefix
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Time spent handling a client message",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for action, histogram in sorted(self.actions.items()):
+            for bound, count in zip(PROMETHEUS_BUCKETS, histogram.cumulative(PROMETHEUS_BUCKETS)):
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{action="{action}",le="{bound:g}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{action="{action}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{action="{action}"}} {histogram.total!r}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{action="{action}"}} {histogram.count}')
+
+        lines.append(f"# HELP {prefix}_request_errors_total Client messages answered with success=false")
+        lines.append(f"# TYPE {prefix}_request_errors_total counter")
+        for action, count in sorted(self.errors.items()):
+            lines.append(f'{prefix}_request_errors_total{{action="{action}"}} {count}')
+
+        for name, kind, help_text, value in self._collect():
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            if isinstance(value, list):
+                for labels, v in value:
+                    lines.append(f"{prefix}_{name}{_labels(labels)} {_number(v)}")
+            else:
+                lines.append(f"{prefix}_{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+async def serve_metrics(metrics: Metrics, host: str, port: int,
+                        health: Optional[Callable[[], Tuple[bool, Dict[str, Any]]]] = None,
+                        reuse_port: bool = False) -> asyncio.AbstractServer:
+    """
+    在独立端口上提供指标（最小的 HTTP/1.0 实现，只支持 GET）
+
+    - /metrics: Prometheus 文本格式
+    - /health: JSON，健康时 200，否则 503（排空或过载）
+
+    Args:
+        metrics: 指标注册表
+        host: 监听地址
+        port: 监听端口
+        health: 返回 (是否健康, 详情) 的函数
+        reuse_port: 多工作进程热重载时新旧进程可同时监听
+
+    Returns:
+        asyncio.AbstractServer: 已启动的服务器
+    """
+    async def handle(reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), HTTP_TIMEOUT)
+            while (await asyncio.wait_for(reader.readline(), HTTP_TIMEOUT)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            method = parts[0] if parts else ""
+            path = parts[1].split("?", 1)[0] if len(parts) > 1 else ""
+
+            if method != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", "method not allowed\n"
+            elif path == "/metrics":
+                status, content_type, body = "200 OK", PROMETHEUS_CONTENT_TYPE, metrics.render_prometheus()
+            elif path == "/health":
+                healthy, details = health() if health is not None else (True, {})
+                status = "200 OK" if healthy else "503 Service Unavailable"
+                content_type = "application/json"
+                body = json.dumps(dict(details, status="ok" if healthy else "unavailable"))
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "not found\n"
+
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port, reuse_port=reuse_port)
@@ -0,0 +1,464 @@
+"""
+线协议
+默认仍是逐条 JSON 文本帧（兼容旧客户端）；客户端可用 set_protocol 协商：
+
+    {"action": "set_protocol", "encoding": "msgpack", "compact": true}
+
+- encoding: "json" 或 "msgpack"（服务器安装了 msgpack 时可用，使用二进制帧）
+- compact:  对战推送改为紧凑帧 —— 数字消息/行动编码、卡牌ID按连接驻留（首次出现时随帧下发），
+            状态只发送相对于客户端最后确认（ack）版本的增量
+
+紧凑对战帧为数组：
+    [消息编码, 房间ID, 版本, 基准版本(-1为全量), 状态或增量, 行动结果, 新驻留卡牌]
+行动结果：[结果编码, 行动编码, 玩家ID, 消息, 效果列表, 数据]
+新驻留卡牌：[[序号, 卡牌字典], ...]；手牌条目为 [实例ID, 卡牌序号]
+
+增量是嵌套字典：值为字典且基准中同键也是字典时递归合并，否则直接替换；
+"~" 键列出被删除的键。客户端收到帧后回复 {"action": "ack", "version": 版本}。
+回复请求时使用请求帧自身的编码（文本帧→JSON，二进制帧→msgpack）。
+
+调用 start() 后消息先进入有界发送队列，由写任务依次发送；队列超过上限的慢速客户端会被断开。
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Union
+
+from game.core.network.flow_control import OUTBOX_MAX_MESSAGES, OUTBOX_MAX_BYTES, CLOSE_TRY_AGAIN_LATER
+
+MSGPACK_AVAILABLE = find_spec("msgpack") is not None
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+# 增量中表示已删除键的键名
+DELETED_KEY = "~"
+# 每个连接为增量保留的未确认快照数（超过后退回全量帧）
+MAX_SNAPSHOTS = 16
+
+# 服务器推送的消息类型
+MESSAGE_CODES = {
+    "battle_start": 1,
+    "battle_update": 2,
+    "battle_end": 3,
+    "match_found": 4,
+}
+
+# 请求动作（紧凑请求中用 "a" 代替 "action"）
+ACTION_CODES = {
+    "ping": 1,
+    "register": 2,
+    "login": 3,
+    "logout": 4,
+    "get_user_info": 5,
+    "get_server_status": 6,
+    "list_rooms": 7,
+    "create_room": 8,
+    "join_room": 9,
+    "battle_action": 10,
+    "leave_room": 11,
+    "join_queue": 12,
+    "leave_queue": 13,
+    "set_protocol": 14,
+    "ack": 15,
+}
+
+# 战斗行动类型（与 ActionType 的值对应）
+BATTLE_ACTION_CODES = {
+    "draw_card": 1,
+    "gain_energy": 2,
+    "end_turn": 3,
+    "play_pokemon": 4,
+    "evolve_pokemon": 5,
+    "attack": 6,
+    "retreat": 7,
+    "switch_active": 8,
+    "use_trainer": 9,
+    "use_item": 10,
+    "use_supporter": 11,
+    "mulligan": 12,
+    "take_prize": 13,
+    "discard": 14,
+    "surrender": 15,
+}
+
+# 行动结果（与 ActionResult 的值对应）
+RESULT_CODES = {
+    "success": 0,
+    "failed": 1,
+    "invalid": 2,
+    "not_allowed": 3,
+    "insufficient_resources": 4,
+}
+
+ACTION_NAMES = {code: name for name, code in ACTION_CODES.items()}
+BATTLE_ACTION_NAMES = {code: name for name, code in BATTLE_ACTION_CODES.items()}
+
+
+class ProtocolError(ValueError):
+    """无法解码的消息"""
+
+
+def available_encodings() -> List[str]:
+    """服务器支持的编码"""
+    return [ENCODING_MSGPACK, ENCODING_JSON] if MSGPACK_AVAILABLE else [ENCODING_JSON]
+
+
+def diff_state(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    计算状态增量
+
+    Args:
+        old: 基准状态
+        new: 新状态
+
+    Returns:
+        dict: 增量（无变化时为空字典）
+    """
+    delta = {}
+    for key, value in new.items():
+        if key not in old:
+            delta[key] = value
+            continue
+        previous = old[key]
+        if previous is value:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_state(previous, value)
+            if nested:
+                delta[key] = nested
+        elif previous != value:
+            delta[key] = value
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta[DELETED_KEY] = removed
+    return delta
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    应用状态增量（客户端使用；不修改 base）
+
+    Args:
+        base: 基准状态
+        delta: diff_state 生成的增量
+
+    Returns:
+        dict: 新状态
+    """
+    state = dict(base)
+    for key in delta.get(DELETED_KEY, ()):
+        state.pop(key, None)
+    for key, value in delta.items():
+        if key == DELETED_KEY:
+            continue
+        previous = state.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            state[key] = apply_delta(previous, value)
+        else:
+            state[key] = value
+    return state
+
+
+class WireSession:
+    """
+    单个连接的协议状态：编码方式、卡牌驻留表与增量快照
+
+    对战房间与匹配服务通过它向客户端推送消息，不直接调用 websocket.send。
+    """
+
+    def __init__(self, websocket, flow=None):
+        self.websocket = websocket
+        self.flow = flow
+        self.encoding = ENCODING_JSON
+        self.compact = False
+        self.slow_consumer = False
+
+        self._outbox: deque = deque()
+        self._outbox_bytes = 0
+        self._outbox_ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closer: Optional[asyncio.Task] = None
+
+        self._card_ids: Dict[str, int] = {}
+        self._new_cards: List[list] = []
+        self._room_id: Optional[str] = None
+        self._snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._acked_version: Optional[int] = None
+
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.full_frames = 0
+        self.delta_frames = 0
+        self.dropped_messages = 0
+        self.max_outbox = 0
+        self.encode_seconds = 0.0
+
+    @property
+    def remote_address(self):
+        return self.websocket.remote_address
+
+    # ---- 协商与编解码 ----
+
+    def negotiate(self, encoding: str, compact: bool) -> Dict[str, Any]:
+        """
+        切换协议（之后的推送使用新协议）
+
+        Args:
+            encoding: "json" 或 "msgpack"
+            compact: 是否使用紧凑对战帧
+
+        Returns:
+            dict: 回复内容
+        """
+        if encoding not in available_encodings():
+            return {
+                "success": False,
+                "error": "unsupported_encoding",
+                "message": f"Codificación no soportada: {encoding}",
+                "encodings": available_encodings()
+            }
+        self.encoding = encoding
+        self.compact = bool(compact)
+        self._reset_snapshots(None)
+        return {"success": True, "action": "set_protocol", "encoding": self.encoding, "compact": self.compact}
+
+    def decode(self, raw: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        解码客户端消息（文本帧为JSON，二进制帧为msgpack），并展开紧凑请求中的数字编码
+
+        Raises:
+            ProtocolError: 消息无法解码
+        """
+        try:
+            if isinstance(raw, bytes):
+                if not MSGPACK_AVAILABLE:
+                    raise ProtocolError("不支持二进制消息")
+                data = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+            else:
+                data = json.loads(raw)
+        except ProtocolError:
+            raise
+        except Exception as e:
+            raise ProtocolError(str(e)) from e
+        if not isinstance(data, dict):
+            raise ProtocolError("消息必须是对象")
+
+        if 'a' in data and 'action' not in data:
+            data['action'] = ACTION_NAMES.get(data.pop('a'), '')
+        if isinstance(data.get('action_type'), int):
+            data['action_type'] = BATTLE_ACTION_NAMES.get(data['action_type'], '')
+        return data
+
+    def encode(self, message: Any, encoding: Optional[str] = None) -> Union[str, bytes]:
+        """
+        按连接（或指定）的编码序列化
+
+        JSON 固定使用 ensure_ascii，文本帧只含ASCII，字符数即字节数（send_raw 无需再编码一次来计算大小）
+        """
+        start = time.perf_counter()
+        if (encoding or self.encoding) == ENCODING_MSGPACK:
+            payload = msgpack.packb(message, use_bin_type=True, default=str)
+        else:
+            payload = json.dumps(message, default=str, ensure_ascii=True,
+                                 separators=(',', ':') if self.compact else None)
+        self.encode_seconds += time.perf_counter() - start
+        return payload
+
+    # ---- 发送队列 ----
+
+    def start(self):
+        """启动写任务（之后 send_raw 只入队，不等待网络）"""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._drain())
+
+    async def close(self):
+        """停止写任务并丢弃未发送的消息"""
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        self._outbox.clear()
+        self._outbox_bytes = 0
+
+    async def _drain(self):
+        while True:
+            await self._outbox_ready.wait()
+            while self._outbox:
+                payload, size = self._outbox.popleft()
+                self._outbox_bytes -= size
+                try:
+                    await self.websocket.send(payload)
+                except Exception:
+                    # 连接已关闭：由接收循环负责清理
+                    self._outbox.clear()
+                    self._outbox_bytes = 0
+                    return
+            self._outbox_ready.clear()
+
+    def _drop_slow_consumer(self):
+        """发送队列超过上限：丢弃积压并断开连接"""
+        self.dropped_messages += len(self._outbox) + 1
+        if self.flow is not None:
+            self.flow.counters["dropped_messages"] += len(self._outbox) + 1
+            self.flow.counters["slow_consumers"] += 1
+        self.slow_consumer = True
+        self._outbox.clear()
+        self._outbox_bytes = 0
+        self._closer = asyncio.create_task(self.websocket.close(CLOSE_TRY_AGAIN_LATER, "slow consumer"))
+
+    async def send_raw(self, payload: Union[str, bytes]):
+        # 文本帧由 encode 生成（仅ASCII），len 即字节数
+        size = len(payload)
+        if self._writer is None:
+            self.messages_sent += 1
+            self.bytes_sent += size
+            await self.websocket.send(payload)
+            return
+
+        if self.slow_consumer:
+            self.dropped_messages += 1
+            if self.flow is not None:
+                self.flow.counters["dropped_messages"] += 1
+            return
+        if len(self._outbox) >= OUTBOX_MAX_MESSAGES or self._outbox_bytes + size > OUTBOX_MAX_BYTES:
+            self._drop_slow_consumer()
+            return
+
+        self.messages_sent += 1
+        self.bytes_sent += size
+        self._outbox.append((payload, size))
+        self._outbox_bytes += size
+        self.max_outbox = max(self.max_outbox, len(self._outbox))
+        self._outbox_ready.set()
+
+    async def send_message(self, message: Dict[str, Any], reply_to: Union[str, bytes, None] = None):
+        """
+        发送普通消息
+
+        Args:
+            message: 消息字典
+            reply_to: 所回复的原始请求帧（回复使用请求帧的编码）
+        """
+        encoding = None
+        if reply_to is not None:
+            encoding = ENCODING_MSGPACK if isinstance(reply_to, bytes) else ENCODING_JSON
+        await self.send_raw(self.encode(message, encoding))
+
+    # ---- 对战推送 ----
+
+    async def send_state(self, message_type: str, room_id: str, version: int,
+                         state: Dict[str, Any], result: Optional[Dict[str, Any]] = None):
+        """
+        推送对战状态
+
+        Args:
+            message_type: battle_start / battle_update / battle_end
+            room_id: 房间ID
+            version: 状态版本
+            state: 本方视角的完整状态
+            result: 行动结果（ActionResponse.to_dict()）
+        """
+        if not self.compact:
+            message = {'type': message_type, 'room_id': room_id, 'version': version, 'state': state}
+            if result is not None:
+                message['result'] = result
+            await self.send_raw(self.encode(message))
+            return
+
+        start = time.perf_counter()
+        if room_id != self._room_id:
+            self._reset_snapshots(room_id)
+
+        compact_state = self._compact_state(state)
+        base = self._snapshots.get(self._acked_version) if self._acked_version is not None else None
+        if base is None:
+            base_version, payload = -1, compact_state
+            self.full_frames += 1
+        else:
+            base_version, payload = self._acked_version, diff_state(base, compact_state)
+            self.delta_frames += 1
+
+        self._snapshots[version] = compact_state
+        while len(self._snapshots) > MAX_SNAPSHOTS:
+            self._snapshots.popitem(last=False)
+
+        frame = [
+            MESSAGE_CODES.get(message_type, 0), room_id, version, base_version, payload,
+            self._compact_result(result) if result is not None else None,
+            self._take_new_cards(),
+        ]
+        self.encode_seconds += time.perf_counter() - start
+        await self.send_raw(self.encode(frame))
+
+    def ack(self, version: Any):
+        """客户端确认已应用某个版本，之后的增量以它为基准"""
+        if isinstance(version, int) and version in self._snapshots:
+            self._acked_version = version
+            while self._snapshots and next(iter(self._snapshots)) < version:
+                self._snapshots.popitem(last=False)
+
+    def _reset_snapshots(self, room_id: Optional[str]):
+        self._room_id = room_id
+        self._snapshots.clear()
+        self._acked_version = None
+
+    def _intern(self, card: Dict[str, Any]) -> int:
+        index = self._card_ids.get(card['id'])
+        if index is None:
+            index = self._card_ids[card['id']] = len(self._card_ids)
+            self._new_cards.append([index, card])
+        return index
+
+    def _take_new_cards(self) -> Optional[List[list]]:
+        if not self._new_cards:
+            return None
+        new_cards, self._new_cards = self._new_cards, []
+        return new_cards
+
+    def _compact_cards(self, entries):
+        return [[entry['instance_id'], self._intern(entry['card'])] for entry in entries]
+
+    def _compact_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        compact = dict(state)
+        player = state.get('player')
+        if player and 'hand' in player:
+            compact['player'] = dict(player, hand=self._compact_cards(player['hand']))
+        if 'available_actions' in state:
+            compact['available_actions'] = [BATTLE_ACTION_CODES.get(a, 0) for a in state['available_actions']]
+        return compact
+
+    def _compact_result(self, result: Dict[str, Any]) -> list:
+        request = result.get('action_request', {})
+        data = result.get('data') or {}
+        if isinstance(data.get('drawn_cards'), list):
+            data = dict(data, drawn_cards=self._compact_cards(data['drawn_cards']))
+        return [
+            RESULT_CODES.get(result.get('result'), -1),
+            BATTLE_ACTION_CODES.get(request.get('action_type'), 0),
+            request.get('player_id'),
+            result.get('message', ''),
+            result.get('effects', []),
+            data,
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接的发送统计"""
+        return {
+            'encoding': self.encoding,
+            'compact': self.compact,
+            'messages_sent': self.messages_sent,
+            'bytes_sent': self.bytes_sent,
+            'full_frames': self.full_frames,
+            'delta_frames': self.delta_frames,
+            'interned_cards': len(self._card_ids),
+            'outbox': len(self._outbox),
+            'max_outbox': self.max_outbox,
+            'dropped_messages': self.dropped_messages,
+            'slow_consumer': self.slow_consumer,
+        }
@@ -0,0 +1,155 @@
+"""
+多工作进程监督器
+主进程 fork 出 N 个工作进程，每个进程各自运行事件循环并以 SO_REUSEPORT 监听同一端口，
+由内核在进程之间分配新连接。主进程只负责进程管理：
+
+- SIGTERM / SIGINT：向所有工作进程转发 SIGTERM，等待它们优雅退出（超时后 SIGKILL）
+- SIGHUP：热重载 —— 先启动新一代工作进程，再让旧进程停止接受连接并在对战结束后退出
+- 工作进程意外退出时自动重启，并通过回调清理它在共享存储中的记录
+
+仅支持提供 fork 与 SO_REUSEPORT 的系统（Linux、BSD、macOS），其他系统退回单进程模式。
+"""
+
+import os
+import time
+import signal
+import socket
+import traceback
+from typing import Callable, Dict, Optional, Set
+
+REUSE_PORT_AVAILABLE = hasattr(socket, "SO_REUSEPORT") and hasattr(os, "fork")
+
+# 工作进程异常退出后重启前的等待（秒）
+RESTART_DELAY = 1.0
+# 停止时等待工作进程退出的最长时间（秒），应大于工作进程的排空时间
+STOP_TIMEOUT = 45.0
+# 主进程轮询子进程状态的间隔（秒）
+POLL_INTERVAL = 0.2
+
+
+class WorkerSupervisor:
+    """fork 并监督工作进程"""
+
+    def __init__(self, target: Callable[[int], Optional[int]], workers: int,
+                 on_worker_exit: Optional[Callable[[int], None]] = None, logger=None):
+        """
+        初始化监督器
+
+        Args:
+            target: 工作进程入口，参数为工作进程序号，返回退出码（在子进程中调用）
+            workers: 工作进程数
+            on_worker_exit: 工作进程退出后的回调，参数为进程ID（在主进程中调用）
+            logger: 日志记录器（默认 print）
+        """
+        self.target = target
+        self.workers = workers
+        self.on_worker_exit = on_worker_exit
+        self.log = logger.info if logger is not None else print
+        self.warn = logger.warning if logger is not None else print
+
+        self.children: Dict[int, int] = {}
+        self.retiring: Set[int] = set()
+        self.restarts = 0
+        self.generation = 0
+        self._stop_requested = False
+        self._reload_requested = False
+        self._stop_deadline: Optional[float] = None
+
+    def _spawn(self, index: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            # 子进程：恢复默认信号处理，由工作进程自己的事件循环接管
+            for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+                signal.signal(signum, signal.SIG_DFL)
+            code = 0
+            try:
+                code = self.target(index) or 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 0
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = index
+        return pid
+
+    def _signal_all(self, pids, signum: int):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _request_stop(self, signum, frame):
+        self._stop_requested = True
+
+    def _request_reload(self, signum, frame):
+        self._reload_requested = True
+
+    def reload(self):
+        """热重载：启动新一代工作进程后让旧进程优雅退出"""
+        old = [pid for pid in self.children if pid not in self.retiring]
+        self.generation += 1
+        self.log(f"🔄 热重载：第 {self.generation} 代，启动 {self.workers} 个新工作进程")
+        for index in range(self.workers):
+            self._spawn(index)
+        self.retiring.update(old)
+        self._signal_all(old, signal.SIGTERM)
+
+    def run(self) -> int:
+        """
+        启动工作进程并监督到全部退出
+
+        Returns:
+            int: 退出码
+        """
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_reload)
+
+        for index in range(self.workers):
+            self._spawn(index)
+        self.log(f"👷 已启动 {self.workers} 个工作进程: {sorted(self.children)}")
+
+        while self.children:
+            if self._stop_requested and self._stop_deadline is None:
+                self.log("🛑 正在停止工作进程...")
+                self._stop_deadline = time.monotonic() + STOP_TIMEOUT
+                self._signal_all(list(self.children), signal.SIGTERM)
+            if self._reload_requested and self._stop_deadline is None:
+                self._reload_requested = False
+                self.reload()
+            if self._stop_deadline is not None and time.monotonic() > self._stop_deadline:
+                self.warn("⚠️ 停止超时，强制结束剩余工作进程")
+                self._signal_all(list(self.children), signal.SIGKILL)
+                self._stop_deadline = float("inf")
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            if pid == 0:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            index = self.children.pop(pid, None)
+            if index is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if self.on_worker_exit is not None:
+                self.on_worker_exit(pid)
+
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                self.log(f"👋 旧工作进程 {pid} 已退出")
+            elif self._stop_deadline is None:
+                self.warn(f"⚠️ 工作进程 {pid} 意外退出（退出码 {code}），正在重启")
+                self.restarts += 1
+                time.sleep(RESTART_DELAY)
+                self._spawn(index)
+
+        self.log("👋 所有工作进程已退出")
+        return 0
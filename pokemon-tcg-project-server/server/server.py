@@ -4,12 +4,13 @@ Archivo principal del servidor de Pokemon TCG
 Soporta conexiones WebSocket y autenticación de usuarios
 """
 
+import argparse
 import asyncio
 import websockets
-import json
 import logging
 import signal
 import sys
+import time
 from pathlib import Path
 import os
 
@@ -31,18 +32,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tiempo máximo para que terminen los combates en curso al detener o recargar un proceso
+DRAIN_TIMEOUT = 30.0
+
 class PokemonTCGServer:
-    def __init__(self):
+    def __init__(self, session_store=None):
         self.clients = set()
-        self.authenticated_clients = {}
+        self.draining = False
+        self.stopping = asyncio.Event()
 
         # Inicializar gestores
         try:
             from game.core.auth.auth_manager import get_auth_manager
             from game.core.database.database_manager import DatabaseManager
+            from game.core.auth.password_hasher import get_password_hasher
+            from game.core.battle.battle_room import BattleRoomManager
+            from game.core.battle.matchmaking import MatchmakingQueue
+            from game.core.network.flow_control import FlowControl
+            from game.core.network.metrics import Metrics
+            from game.core.auth.session_store import create_session_store
+            from game.core.cards.catalog_service import CatalogService
 
             self.auth_manager = get_auth_manager()
             self.db_manager = DatabaseManager()
+            self.password_hasher = get_password_hasher()
+            self.battle_rooms = BattleRoomManager(self.db_manager, str(directorio_actual / "card_assets" / "cards.json"))
+            self.matchmaking = MatchmakingQueue()
+            self.flow = FlowControl()
+            # Métricas: histogramas de latencia por acción y estado de los componentes (se leen al exportar)
+            self.metrics = Metrics()
+            self.metrics.add_collector(self.collect_metrics)
+            # Clientes autenticados: en modo multiproceso se comparten entre procesos (SQLite WAL)
+            self.authenticated_clients = session_store if session_store is not None else create_session_store("memory")
+            # Catálogo de cartas versionado: los clientes descargan solo los cambios desde su versión
+            self.catalog = CatalogService(self.db_manager.connection, str(directorio_actual / "card_assets" / "cards.json"))
+            cambios = self.catalog.refresh()
+            logger.info(f"🃏 Catálogo de cartas v{cambios['version']} (+{cambios['added']} ~{cambios['changed']} -{cambios['removed']})")
             logger.info("✅ Gestores inicializados correctamente")
         except ImportError as e:
             logger.error(f"❌ Error de importación: {e}")
@@ -56,11 +81,24 @@ class PokemonTCGServer:
 
     async def register_client(self, websocket):
         """Registrar nueva conexión de cliente"""
+        from game.core.network.wire_protocol import WireSession, available_encodings
+        from game.core.network.flow_control import CLOSE_TRY_AGAIN_LATER
+
         client_ip = websocket.remote_address[0]
         client_port = websocket.remote_address[1]
         client_id = f"{client_ip}:{client_port}"
 
+        # Control de admisión: con el bucle de eventos saturado se rechazan conexiones nuevas
+        if not self.flow.admit_connection():
+            logger.warning(f"⛔ Conexión rechazada por sobrecarga: {client_id}")
+            await websocket.close(CLOSE_TRY_AGAIN_LATER, "server overloaded")
+            return
+
+        # Los envíos pasan por una cola acotada que vacía una tarea escritora
+        session = WireSession(websocket, self.flow)
+        session.start()
         self.clients.add(websocket)
+        self.metrics.counters["connections_opened"] += 1
         logger.info(f"🔗 Cliente conectado: {client_id} (Total: {len(self.clients)})")
 
         try:
@@ -69,12 +107,15 @@ class PokemonTCGServer:
                 "type": "welcome",
                 "message": "¡Bienvenido al servidor de Pokemon TCG!",
                 "server_version": "1.0.0",
-                "timestamp": str(asyncio.get_event_loop().time())
+                "timestamp": str(asyncio.get_event_loop().time()),
+                # Protocolo compacto opcional (acción "set_protocol"); JSON sigue siendo el predeterminado
+                "encodings": available_encodings(),
+                "compact": True
             }
-            await websocket.send(json.dumps(welcome_msg))
+            await session.send_message(welcome_msg)
 
             # Procesar mensajes del cliente
-            await self.handle_client(websocket, client_id)
+            await self.handle_client(session, client_id)
 
         except websockets.exceptions.ConnectionClosed:
             logger.info(f"🔌 Cliente desconectado normalmente: {client_id}")
@@ -86,29 +127,77 @@ class PokemonTCGServer:
             # Limpiar cliente
             self.clients.discard(websocket)
             if client_id in self.authenticated_clients:
+                # Desconectarse durante una partida cuenta como rendición
+                user_id = self.authenticated_clients[client_id]["user_id"]
+                self.matchmaking.dequeue(user_id)
+                self.battle_rooms.leave(user_id, session)
                 del self.authenticated_clients[client_id]
+            await session.close()
+            self.metrics.counters["connections_closed"] += 1
+            self.metrics.counters["bytes_sent"] += session.bytes_sent
+            self.metrics.counters["messages_sent"] += session.messages_sent
             logger.info(f"🗑️ Cliente eliminado: {client_id} (Restantes: {len(self.clients)})")
 
-    async def handle_client(self, websocket, client_id):
+    async def handle_client(self, session, client_id):
         """Bucle para procesar mensajes del cliente"""
-        async for message in websocket:
-            try:
-                data = json.loads(message)
-                logger.debug(f"📨 Mensaje recibido {client_id}: {data.get('action', 'unknown')}")
+        from game.core.network.wire_protocol import ProtocolError
+        from game.core.network.flow_control import CLOSE_POLICY_VIOLATION
 
-                response = await self.process_message(data, websocket, client_id)
+        limiter = self.flow.limiter()
+        async for message in session.websocket:
+            try:
+                # Texto = JSON, binario = msgpack; la respuesta usa la misma codificación que la petición
+                data = session.decode(message)
+                action = data.get('action', '')
+                logger.debug(f"📨 Mensaje recibido {client_id}: {action or 'unknown'}")
+
+                # Límite de frecuencia por clase de acción (token bucket por conexión)
+                retry_after = limiter.check(action)
+                if retry_after:
+                    if limiter.abusive:
+                        logger.warning(f"⛔ Cliente desconectado por exceso de peticiones: {client_id}")
+                        await session.websocket.close(CLOSE_POLICY_VIOLATION, "rate limit exceeded")
+                        return
+                    if action != 'ack':
+                        await session.send_message({
+                            "success": False,
+                            "action": action,
+                            "error": "rate_limited",
+                            "message": "Demasiadas peticiones. Inténtelo de nuevo más tarde.",
+                            "retry_after": round(retry_after, 3)
+                        }, reply_to=message)
+                    continue
+
+                if self.flow.should_shed(action):
+                    await session.send_message({
+                        "success": False,
+                        "action": action,
+                        "error": "server_busy",
+                        "message": "El servidor está sobrecargado. Inténtelo de nuevo más tarde."
+                    }, reply_to=message)
+                    continue
+
+                inicio = time.perf_counter()
+                response = await self.process_message(data, session, client_id)
+                # Acciones desconocidas en una sola serie para no crear histogramas arbitrarios
+                if response and response.get('error') == 'unknown_action':
+                    self.metrics.observe("unknown", time.perf_counter() - inicio, False)
+                else:
+                    self.metrics.observe(action, time.perf_counter() - inicio,
+                                         response is None or response.get('success', True))
 
                 if response:
-                    await websocket.send(json.dumps(response))
+                    await session.send_message(response, reply_to=message)
                     logger.debug(f"📤 Respuesta enviada {client_id}: {response.get('success', 'unknown')}")
 
-            except json.JSONDecodeError:
+            except ProtocolError:
                 error_response = {
                     "success": False,
                     "error": "invalid_json",
                     "message": "Formato de mensaje inválido. Envíe JSON válido."
                 }
-                await websocket.send(json.dumps(error_response))
+                await session.send_message(error_response, reply_to=message)
+                self.metrics.counters["invalid_messages"] += 1
                 logger.warning(f"⚠️ Error al analizar JSON {client_id}")
 
             except Exception as e:
@@ -117,14 +206,23 @@ class PokemonTCGServer:
                     "error": "server_error",
                     "message": "Error interno del servidor"
                 }
-                await websocket.send(json.dumps(error_response))
+                await session.send_message(error_response, reply_to=message)
+                self.metrics.counters["server_errors"] += 1
                 logger.error(f"❌ Error al procesar mensaje {client_id}: {e}")
 
-    async def process_message(self, data, websocket, client_id):
+    async def process_message(self, data, session, client_id):
         """Procesar tipo específico de mensaje"""
         action = data.get('action', '')
 
-        if action == 'ping':
+        if action == 'ack':
+            # Confirmación de estado del protocolo compacto (sin respuesta)
+            session.ack(data.get('version'))
+            return None
+
+        elif action == 'set_protocol':
+            return session.negotiate(data.get('encoding', 'json'), data.get('compact', True))
+
+        elif action == 'ping':
             return {
                 "success": True,
                 "action": "pong",
@@ -132,6 +230,8 @@ class PokemonTCGServer:
             }
 
         elif action == 'register':
+            from game.core.auth.password_hasher import HasherBusyError
+
             try:
                 username = data.get('username', '')
                 password = data.get('password', '')
@@ -140,7 +240,7 @@ class PokemonTCGServer:
                 # 添加详细日志
                 logger.info(f"开始注册用户: {username}")
                 
-                success, message = self.auth_manager.register(username, password, confirm_password)
+                success, message = await self.auth_manager.register_async(username, password, confirm_password)
                 
                 logger.info(f"注册结果: {success}, {message}")
                 
@@ -148,6 +248,8 @@ class PokemonTCGServer:
                     "success": success,
                     "message": message
                 }
+            except HasherBusyError:
+                return self._hasher_busy_response()
             except Exception as e:
                 logger.error(f"注册异常: {e}")
                 import traceback
@@ -161,7 +263,7 @@ class PokemonTCGServer:
             return await self.handle_login(data, client_id)
 
         elif action == 'logout':
-            return await self.handle_logout(data, client_id)
+            return await self.handle_logout(data, session, client_id)
 
         elif action == 'get_user_info':
             return await self.handle_get_user_info(data, client_id)
@@ -169,16 +271,42 @@ class PokemonTCGServer:
         elif action == 'get_server_status':
             return await self.handle_get_server_status(data, client_id)
 
+        elif action == 'get_metrics':
+            return {
+                "success": True,
+                "action": "metrics",
+                "metrics": self.metrics.snapshot()
+            }
+
+        elif action == 'get_catalog_delta':
+            return await self.handle_get_catalog_delta(data, client_id)
+
+        elif action in ('list_rooms', 'create_room', 'join_room', 'battle_action', 'leave_room',
+                        'join_queue', 'leave_queue'):
+            return await self.handle_battle_room(action, data, session, client_id)
+
         else:
             return {
                 "success": False,
                 "error": "unknown_action",
                 "message": f"Acción desconocida: {action}",
-                "available_actions": ["ping", "register", "login", "logout", "get_user_info", "get_server_status"]
+                "available_actions": ["ping", "set_protocol", "ack", "register", "login", "logout", "get_user_info", "get_server_status",
+                                      "get_metrics", "get_catalog_delta", "list_rooms", "create_room", "join_room", "battle_action", "leave_room",
+                                      "join_queue", "leave_queue"]
             }
 
+    def _hasher_busy_response(self):
+        """Respuesta cuando la cola de hash de contraseñas está llena (el cliente puede reintentar)"""
+        return {
+            "success": False,
+            "error": "server_busy",
+            "message": "Servidor ocupado. Inténtelo de nuevo en unos segundos."
+        }
+
     async def handle_register(self, data, client_id):
         """Procesar registro de usuario"""
+        from game.core.auth.password_hasher import HasherBusyError
+
         username = data.get('username', '').strip()
         password = data.get('password', '')
         confirm_password = data.get('confirm_password', '')
@@ -214,7 +342,7 @@ class PokemonTCGServer:
             }
 
         try:
-            success, message = self.auth_manager.register(username, password, confirm_password)
+            success, message = await self.auth_manager.register_async(username, password, confirm_password)
 
             if success:
                 logger.info(f"✅ Registro exitoso: {username}")
@@ -231,6 +359,8 @@ class PokemonTCGServer:
                     "message": message
                 }
 
+        except HasherBusyError:
+            return self._hasher_busy_response()
         except Exception as e:
             logger.error(f"❌ Excepción durante registro: {username} - {e}")
             return {
@@ -241,6 +371,8 @@ class PokemonTCGServer:
 
     async def handle_login(self, data, client_id):
         """Procesar inicio de sesión"""
+        from game.core.auth.password_hasher import HasherBusyError
+
         username = data.get('username', '').strip()
         password = data.get('password', '')
 
@@ -254,13 +386,15 @@ class PokemonTCGServer:
             }
 
         try:
-            success, message = self.auth_manager.login(username, password)
+            # La verificación de la contraseña (scrypt) se ejecuta en el pool de procesos
+            success, message = await self.auth_manager.login_async(username, password)
 
             if success:
                 user_info = self.auth_manager.get_user_info()
                 token = self.auth_manager.current_token
 
                 self.authenticated_clients[client_id] = {
+                    "user_id": user_info.get('id'),
                     "username": username,
                     "token": token,
                     "login_time": asyncio.get_event_loop().time()
@@ -286,6 +420,8 @@ class PokemonTCGServer:
                     "message": message
                 }
 
+        except HasherBusyError:
+            return self._hasher_busy_response()
         except Exception as e:
             logger.error(f"❌ Excepción durante inicio de sesión: {username} - {e}")
             return {
@@ -294,11 +430,17 @@ class PokemonTCGServer:
                 "message": "Ocurrió un error durante el inicio de sesión."
             }
 
-    async def handle_logout(self, data, client_id):
+    async def handle_logout(self, data, session, client_id):
         """Procesar cierre de sesión"""
         if client_id in self.authenticated_clients:
             username = self.authenticated_clients[client_id]["username"]
+            token = self.authenticated_clients[client_id]["token"]
+            self.matchmaking.dequeue(self.authenticated_clients[client_id]["user_id"])
+            self.battle_rooms.leave(self.authenticated_clients[client_id]["user_id"], session)
             del self.authenticated_clients[client_id]
+            self.auth_manager.revoke_token(token)
+            # Los demás procesos de trabajo aplican la revocación sin esperar a la caché de sesiones
+            self.authenticated_clients.publish_revocation(token)
             logger.info(f"👋 Usuario cerró sesión: {username}")
 
             return {
@@ -324,10 +466,11 @@ class PokemonTCGServer:
             }
 
         try:
-            self.auth_manager.current_token = token
+            # Firma HMAC + caché de sesiones: sin consultas a la base de datos en el caso común
+            user_id = self.auth_manager.verify_token(token)
+            user_info = self.db_manager.get_user_info(user_id) if user_id else None
 
-            if self.auth_manager.is_logged_in():
-                user_info = self.auth_manager.get_user_info()
+            if user_info:
 
                 return {
                     "success": True,
@@ -360,19 +503,290 @@ class PokemonTCGServer:
                 "version": "1.0.0",
                 "uptime": asyncio.get_event_loop().time(),
                 "connected_clients": len(self.clients),
-                "authenticated_clients": len(self.authenticated_clients),
+                "authenticated_clients": self.authenticated_clients.count(),
+                "worker": {
+                    "pid": os.getpid(),
+                    "connected_clients": len(self.clients),
+                    "authenticated_clients": len(self.authenticated_clients),
+                    "draining": self.draining,
+                    "session_store": self.authenticated_clients.backend
+                },
+                "password_hasher": self.password_hasher.get_stats(),
+                "battle_rooms": self.battle_rooms.get_stats(),
+                "matchmaking": self.matchmaking.get_stats(),
+                "flow_control": self.flow.get_stats(),
+                "catalog": self.catalog.get_stats(),
                 "status": "running"
             }
         }
 
+    async def handle_get_catalog_delta(self, data, client_id):
+        """Cambios del catálogo de cartas desde la versión del cliente (páginas comprimidas)"""
+        from game.core.cards.catalog_service import CatalogError
+
+        try:
+            page = self.catalog.get_delta(
+                since=data.get('since', 0),
+                page=data.get('page', 0),
+                catalog_id=data.get('catalog_id', ''),
+                version=data.get('version')
+            )
+        except CatalogError as e:
+            return {
+                "success": False,
+                "error": e.code,
+                "message": e.message,
+                "version": self.catalog.version
+            }
+
+        if page['page'] == 0:
+            logger.debug(f"🃏 Catálogo para {client_id}: v{page['since']} → v{page['version']} "
+                         f"({page['total']} cambios, {page['pages']} páginas)")
+        return dict(page, success=True, action="catalog_delta")
+
+    def collect_metrics(self):
+        """Estado de los componentes para las métricas (se evalúa solo al exportar)"""
+        hasher = self.password_hasher.get_stats()
+        cache = self.auth_manager.session_cache.get_stats()
+        consultas = cache['hits'] + cache['misses']
+        rooms = self.battle_rooms.get_stats()
+        queue = self.matchmaking.get_stats()
+        return [
+            ("connections", "gauge", "Open WebSocket connections in this worker", len(self.clients)),
+            ("authenticated_clients", "gauge", "Logged-in connections", [
+                ({'scope': 'worker'}, len(self.authenticated_clients)),
+                ({'scope': 'all'}, self.authenticated_clients.count()),
+            ]),
+            ("draining", "gauge", "1 while the worker is draining before exit", self.draining),
+            ("event_loop_lag_seconds", "gauge", "Last measured event loop lag", self.flow.loop_lag),
+            ("event_loop_lag_max_seconds", "gauge", "Highest event loop lag since start", self.flow.max_loop_lag),
+            ("flow_events_total", "counter", "Rate limiting, shedding and slow consumer events", [
+                ({'event': name}, value) for name, value in sorted(self.flow.counters.items())
+            ]),
+            ("hash_pool_workers", "gauge", "Password hashing pool size", hasher['workers']),
+            ("hash_pool_queue_depth", "gauge", "Password hashes queued or running", hasher['pending']),
+            ("hash_pool_completed_total", "counter", "Password hashes computed", hasher['completed']),
+            ("hash_pool_rejected_total", "counter", "Password hashes rejected because the queue was full",
+             hasher['rejected']),
+            ("session_cache_requests_total", "counter", "Session token cache lookups", [
+                ({'result': 'hit'}, cache['hits']),
+                ({'result': 'miss'}, cache['misses']),
+            ]),
+            ("session_cache_hit_ratio", "gauge", "Session token cache hit ratio",
+             round(cache['hits'] / consultas, 4) if consultas else 0.0),
+            ("session_cache_entries", "gauge", "Cached session tokens", [
+                ({'kind': 'live'}, cache['live']),
+                ({'kind': 'revoked'}, cache['revoked']),
+            ]),
+            ("battle_rooms", "gauge", "Battle rooms by state", [
+                ({'state': 'running'}, rooms['running']),
+                ({'state': 'waiting'}, rooms['waiting']),
+            ]),
+            ("battles_finished_total", "counter", "Battles finished", rooms['battles_finished']),
+            ("matchmaking_queued", "gauge", "Players waiting in the matchmaking queue", queue['queued']),
+            ("matchmaking_oldest_wait_seconds", "gauge", "Longest current matchmaking wait", queue['oldest_wait']),
+            ("catalog_version", "gauge", "Card catalog version served", self.catalog.version),
+        ]
+
+    def health(self):
+        """Estado para /health: no apto mientras se vacía el proceso o el bucle está saturado"""
+        return not (self.draining or self.flow.overloaded), {
+            "pid": os.getpid(),
+            "draining": self.draining,
+            "overloaded": self.flow.overloaded,
+            "connections": len(self.clients)
+        }
+
+    async def handle_battle_room(self, action, data, session, client_id):
+        """Salas de combate PvP: el servidor valida cada acción y difunde el resultado"""
+        client = self.authenticated_clients.get(client_id)
+        user_id = self.auth_manager.verify_token(client["token"]) if client else None
+        if not user_id:
+            return {
+                "success": False,
+                "error": "not_logged_in",
+                "message": "El usuario no ha iniciado sesión."
+            }
+
+        if action == 'list_rooms':
+            return {
+                "success": True,
+                "action": action,
+                "rooms": self.battle_rooms.list_open_rooms()
+            }
+
+        if self.draining and action in ('create_room', 'join_room', 'join_queue'):
+            return {
+                "success": False,
+                "action": action,
+                "error": "server_draining",
+                "message": "El servidor se está reiniciando. Vuelva a conectarse para jugar."
+            }
+
+        if action == 'join_queue':
+            return self.handle_join_queue(user_id, data, session)
+
+        if action == 'leave_queue':
+            ticket = self.matchmaking.dequeue(user_id)
+            return {
+                "success": ticket is not None,
+                "action": action,
+                "message": "Ha salido de la cola." if ticket else "No está en la cola."
+            }
+
+        if action in ('create_room', 'join_room'):
+            self.matchmaking.dequeue(user_id)
+
+        if action == 'create_room':
+            room, error = self.battle_rooms.create_room(user_id, session, data.get('deck_id'))
+            if room:
+                logger.info(f"🏟️ Sala creada: {room.room_id} por {client['username']}")
+        elif action == 'join_room':
+            room, error = self.battle_rooms.join_room(str(data.get('room_id', '')), user_id, session, data.get('deck_id'))
+            if room:
+                logger.info(f"⚔️ Combate iniciado en sala {room.room_id}: {room.player_ids}")
+        elif action == 'battle_action':
+            # El resultado se envía a ambos jugadores como mensaje "battle_update"
+            room, error = None, self.battle_rooms.submit_action(user_id, data)
+        else:
+            room, error = None, None if self.battle_rooms.leave(user_id) else "No está en ninguna sala."
+
+        if error:
+            return {
+                "success": False,
+                "action": action,
+                "error": "battle_room_error",
+                "message": error
+            }
+
+        response = {"success": True, "action": action}
+        if room:
+            response["room"] = room.get_summary()
+        return response
+
+    def handle_join_queue(self, user_id, data, session):
+        """Entrar en la cola de emparejamiento (puntuación calculada a partir de game_stats)"""
+        from game.core.battle.matchmaking import rating_from_stats
+
+        deck_id = data.get('deck_id')
+        error = None
+        if self.battle_rooms.get_user_room(user_id):
+            error = "Ya está en una sala."
+        else:
+            # Comprobar el mazo ahora para que el emparejamiento no falle después
+            _, error = self.battle_rooms.build_deck(user_id, deck_id)
+        if error:
+            return {
+                "success": False,
+                "action": "join_queue",
+                "error": "matchmaking_error",
+                "message": error
+            }
+
+        stats = self.db_manager.get_user_stats(user_id) or {}
+        rating = rating_from_stats(stats.get('games_won', 0), stats.get('games_lost', 0))
+        self.matchmaking.enqueue(user_id, rating, (session, deck_id))
+        return {
+            "success": True,
+            "action": "join_queue",
+            "rating": rating,
+            "queued": len(self.matchmaking)
+        }
+
+    async def start_match(self, first, second):
+        """Crear la sala para una pareja formada por el emparejamiento"""
+        first_session, first_deck = first.payload
+        second_session, second_deck = second.payload
+
+        room, error = self.battle_rooms.create_room(first.user_id, first_session, first_deck)
+        if error:
+            logger.warning(f"⚠️ Emparejamiento cancelado ({first.user_id} vs {second.user_id}): {error}")
+            return
+
+        # Avisar antes de iniciar la sala para que "match_found" llegue antes que "battle_start"
+        for ticket, session, opponent in ((first, first_session, second), (second, second_session, first)):
+            try:
+                await session.send_message({
+                    "type": "match_found",
+                    "room_id": room.room_id,
+                    "rating": ticket.rating,
+                    "opponent_rating": opponent.rating
+                })
+            except websockets.exceptions.ConnectionClosed:
+                pass
+
+        room, error = self.battle_rooms.join_room(room.room_id, second.user_id, second_session, second_deck)
+        if error:
+            self.battle_rooms.leave(first.user_id)
+            logger.warning(f"⚠️ Emparejamiento cancelado ({first.user_id} vs {second.user_id}): {error}")
+
+    async def matchmaking_loop(self):
+        """Formar parejas por lotes en cada tick"""
+        from game.core.battle.matchmaking import TICK_INTERVAL
+
+        while True:
+            await asyncio.sleep(TICK_INTERVAL)
+            if self.draining:
+                continue
+            try:
+                for first, second in self.matchmaking.tick():
+                    await self.start_match(first, second)
+            except Exception as e:
+                logger.error(f"❌ Error en el emparejamiento: {e}")
+
+    async def session_cleanup_loop(self):
+        """Limpiar periódicamente las sesiones expiradas (en lote)"""
+        from game.core.auth.session_tokens import CLEANUP_INTERVAL
+
+        while True:
+            await asyncio.sleep(CLEANUP_INTERVAL)
+            try:
+                expired = self.auth_manager.cleanup_sessions(force=True)
+                self.authenticated_clients.cleanup()
+                if expired:
+                    logger.info(f"🧹 Sesiones expiradas desactivadas: {expired}")
+            except Exception as e:
+                logger.error(f"❌ Error al limpiar sesiones: {e}")
+
+    async def session_sync_loop(self):
+        """Aplicar las revocaciones de sesión publicadas por otros procesos de trabajo"""
+        from game.core.auth.session_store import SYNC_INTERVAL
+
+        while True:
+            await asyncio.sleep(SYNC_INTERVAL)
+            try:
+                for token in self.authenticated_clients.poll_revocations():
+                    self.auth_manager.revoke_local(token)
+            except Exception as e:
+                logger.error(f"❌ Error al sincronizar sesiones: {e}")
+
     def setup_signal_handlers(self):
-        """Configurar manejadores de señales"""
-        def signal_handler(signum, frame):
+        """Configurar manejadores de señales (SIGINT/SIGTERM inician una parada ordenada)"""
+        def signal_handler(signum, frame=None):
             logger.info(f"🛑 Señal recibida {signum}, cerrando servidor...")
-            self.shutdown()
+            self.stopping.set()
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        loop = asyncio.get_running_loop()
+        try:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, signal_handler, signum)
+        except NotImplementedError:
+            # Sin soporte en el bucle (Windows): manejador clásico que despierta el bucle
+            def fallback_handler(signum, frame):
+                loop.call_soon_threadsafe(signal_handler, signum)
+
+            signal.signal(signal.SIGINT, fallback_handler)
+            signal.signal(signal.SIGTERM, fallback_handler)
+
+    async def drain(self, timeout=DRAIN_TIMEOUT):
+        """Dejar de crear combates y esperar a que terminen los que están en curso"""
+        self.draining = True
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self.battle_rooms.get_stats()['running'] and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.5)
+        remaining = self.battle_rooms.get_stats()['running']
+        if remaining:
+            logger.warning(f"⚠️ {remaining} combates sin terminar al cerrar el proceso")
 
     def shutdown(self):
         """Cerrar servidor"""
@@ -380,12 +794,32 @@ class PokemonTCGServer:
 
         if hasattr(self, 'db_manager'):
             self.db_manager.close()
+        if hasattr(self, 'password_hasher'):
+            self.password_hasher.shutdown()
+        if hasattr(self, 'battle_rooms'):
+            self.battle_rooms.shutdown()
+        if hasattr(self, 'authenticated_clients'):
+            self.authenticated_clients.close()
 
         logger.info("👋 Servidor cerrado")
-        sys.exit(0)
 
-async def main():
-    """Función principal"""
+def parse_args(argv=None):
+    """Argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servidor de Pokemon TCG")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("POKEMON_TCG_WORKERS", "1")),
+                        help="Procesos de trabajo que comparten el puerto (SO_REUSEPORT)")
+    parser.add_argument("--metrics-host", default="127.0.0.1", help="Dirección del puerto de métricas")
+    parser.add_argument("--metrics-port", type=int, default=int(os.environ.get("POKEMON_TCG_METRICS_PORT", "9765")),
+                        help="Puerto HTTP de métricas Prometheus y /health (0 = desactivado; proceso N usa puerto + N)")
+    parser.add_argument("--session-store", choices=("memory", "sqlite"), default=None,
+                        help="Almacén de sesiones (por defecto sqlite con varios procesos, memory con uno)")
+    return parser.parse_args(argv)
+
+async def main(args=None):
+    """Función principal (devuelve el código de salida del proceso)"""
+    args = args or parse_args([])
     print("🎮 Iniciando servidor de Pokemon TCG...")
 
     base_dir = Path(__file__).parent
@@ -393,28 +827,102 @@ async def main():
     (base_dir / "data").mkdir(exist_ok=True)
 
     try:
-        server = PokemonTCGServer()
-        server.setup_signal_handlers()
-
-        host = "0.0.0.0"
-        port = 8765
+        from game.core.auth.session_store import create_session_store
 
-        logger.info(f"🚀 Iniciando WebSocket en {host}:{port}")
+        multi_worker = args.workers > 1
+        store = create_session_store(args.session_store or ("sqlite" if multi_worker else "memory"))
+        server = PokemonTCGServer(session_store=store)
+        server.setup_signal_handlers()
 
-        async with websockets.serve(server.register_client, host, port):
+        host = args.host
+        port = args.port
+
+        logger.info(f"🚀 Iniciando WebSocket en {host}:{port} (proceso {os.getpid()})")
+
+        # permessage-deflate explícito: los clientes que lo negocien reciben los marcos comprimidos
+        # reuse_port: varios procesos de trabajo escuchan en el mismo puerto y el kernel reparte las conexiones
+        async with websockets.serve(server.register_client, host, port, compression="deflate",
+                                    reuse_port=multi_worker) as ws_server:
+            cleanup_task = asyncio.create_task(server.session_cleanup_loop())
+            matchmaking_task = asyncio.create_task(server.matchmaking_loop())
+            lag_monitor_task = asyncio.create_task(server.flow.monitor_loop())
+            session_sync_task = asyncio.create_task(server.session_sync_loop())
+            metrics_server = None
+            if args.metrics_port:
+                from game.core.network.metrics import serve_metrics
+                metrics_server = await serve_metrics(server.metrics, args.metrics_host, args.metrics_port,
+                                                     health=server.health, reuse_port=multi_worker)
+                logger.info(f"📈 Métricas en http://{args.metrics_host}:{args.metrics_port}/metrics")
             logger.info("✅ Servidor Pokemon TCG en ejecución")
             logger.info(f"📡 WebSocket disponible en: ws://{host}:{port}")
             logger.info("🎯 Esperando conexiones de clientes...")
 
-            await asyncio.Future()  # Ejecutar indefinidamente
+            await server.stopping.wait()
+
+            # Parada ordenada: dejar de aceptar conexiones, esperar a los combates en curso
+            # y cerrar el resto de conexiones con 1012 (reinicio del servicio) para que el cliente reconecte
+            ws_server.server.close()
+            await server.drain()
+            ws_server.close(code=1012, reason="server restarting")
+            await ws_server.wait_closed()
+            if metrics_server is not None:
+                metrics_server.close()
 
     except Exception as e:
         logger.error(f"❌ Error al iniciar servidor: {e}")
-        sys.exit(1)
+        return 1
+
+    server.shutdown()
+    return 0
+
+def run_workers(args):
+    """Modo multiproceso: el proceso principal supervisa los procesos de trabajo"""
+    from game.core.auth.session_tokens import load_secret
+    from game.core.auth.session_store import SQLiteSessionStore
+    from game.core.auth.password_hasher import configure_password_hasher
+    from game.core.database.database_manager import DatabaseManager
+    from game.core.network.worker_supervisor import WorkerSupervisor
+
+    (Path(__file__).parent / "data").mkdir(exist_ok=True)
+
+    # Preparar los recursos compartidos antes de crear los procesos:
+    # clave de firma común, esquema y modo WAL de la base de datos (sin conexiones abiertas al hacer fork)
+    load_secret()
+    DatabaseManager().close()
+    store = SQLiteSessionStore()
+    store.clear()
+    store.close()
+
+    def worker(index):
+        # Repartir los núcleos del pool de hash entre los procesos de trabajo
+        configure_password_hasher(max(1, (os.cpu_count() or 1) // args.workers))
+        # Cada proceso expone sus métricas en su propio puerto
+        worker_args = argparse.Namespace(**vars(args))
+        if args.metrics_port:
+            worker_args.metrics_port = args.metrics_port + index
+        return asyncio.run(main(worker_args))
+
+    def worker_exited(pid):
+        # Eliminar del almacén compartido las conexiones del proceso terminado
+        store = SQLiteSessionStore()
+        store.remove_worker(pid)
+        store.close()
+
+    logger.info(f"👷 Modo multiproceso: {args.workers} procesos en {args.host}:{args.port} (SIGHUP = recarga)")
+    return WorkerSupervisor(worker, args.workers, on_worker_exit=worker_exited, logger=logger).run()
 
 if __name__ == "__main__":
+    from game.core.network.worker_supervisor import REUSE_PORT_AVAILABLE
+
+    args = parse_args()
+    if args.workers > 1 and not REUSE_PORT_AVAILABLE:
+        print("⚠️ SO_REUSEPORT no disponible en este sistema, se usa un solo proceso")
+        args.workers = 1
+
     try:
-        asyncio.run(main())
+        if args.workers > 1:
+            sys.exit(run_workers(args))
+        sys.exit(asyncio.run(main(args)))
     except KeyboardInterrupt:
         print("\n👋 Servidor interrumpido por el usuario")
     except Exception as e:
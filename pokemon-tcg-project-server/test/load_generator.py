@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generador de carga para el servidor WebSocket de Pokemon TCG
+Lanza miles de clientes asyncio simulados contra un servidor (opcionalmente iniciado localmente)
+y mide rendimiento y latencia por acción (p50/p95/p99) y tasas de error.
+Las respuestas rate_limited (que el cliente reintenta) se cuentan aparte y no entran en la tasa de error.
+
+Escenarios:
+    connect_storm  conectar, recibir bienvenida, ping y desconectar, en bucle
+    auth_churn     registrar una vez y luego login / get_user_info / logout en bucle
+    idle           conexiones abiertas que solo envían ping cada --interval segundos
+    battle         login, cola de emparejamiento y partidas completas con acciones de combate
+    mixed          reparte los clientes entre los cuatro escenarios anteriores
+
+El resultado en JSON (--output) se puede comparar entre versiones del servidor con --compare.
+
+Uso (desde la raíz del proyecto):
+    python pokemon-tcg-project-server/test/load_generator.py --spawn-server --scenario connect_storm --clients 1000
+    python pokemon-tcg-project-server/test/load_generator.py --spawn-server --workers 4 --scenario auth_churn --clients 200
+    python pokemon-tcg-project-server/test/load_generator.py --scenario battle --clients 200 --duration 60 --output nuevo.json
+    python pokemon-tcg-project-server/test/load_generator.py --compare base.json nuevo.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+
+DIRECTORIO_SERVIDOR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server")
+sys.path.insert(0, DIRECTORIO_SERVIDOR)
+
+try:
+    import websockets
+except ImportError:
+    print("❌ Error: Módulo 'websockets' no encontrado")
+    print("Instale con: pip install websockets")
+    sys.exit(1)
+
+from game.core.network.wire_protocol import (
+    MSGPACK_AVAILABLE, ENCODING_JSON, ENCODING_MSGPACK, MESSAGE_CODES, BATTLE_ACTION_CODES,
+    MAX_SNAPSHOTS, apply_delta
+)
+
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+ESCENARIOS = ("connect_storm", "auth_churn", "idle", "battle")
+CONTRASENA = "carga123"
+# Tiempo máximo de espera de una respuesta o de un mensaje del combate
+TIEMPO_ESPERA = 30.0
+
+NOMBRES_MENSAJE = {codigo: nombre for nombre, codigo in MESSAGE_CODES.items()}
+NOMBRES_ACCION_COMBATE = {codigo: nombre for nombre, codigo in BATTLE_ACTION_CODES.items()}
+
+
+class Metricas:
+    """Latencias, conteos y errores por acción (las respuestas rate_limited se cuentan aparte)"""
+
+    def __init__(self):
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(Counter)
+        self.limitadas = Counter()
+        self.conexiones_abiertas = 0
+        self.max_conexiones = 0
+
+    def registrar(self, accion, segundos, error=None):
+        self.latencias[accion].append(segundos)
+        if error:
+            self.errores[accion][error] += 1
+
+    def limitada(self, accion):
+        """Petición rechazada por el límite de ritmo del servidor (el cliente la reintenta; no es un fallo)"""
+        self.limitadas[accion] += 1
+
+    def fallo(self, accion, error):
+        """Fallo sin latencia medible (p. ej. conexión rechazada o tiempo agotado)"""
+        self.errores[accion][error] += 1
+
+    def conexion(self, delta):
+        self.conexiones_abiertas += delta
+        self.max_conexiones = max(self.max_conexiones, self.conexiones_abiertas)
+
+    def resumen(self, duracion):
+        acciones = {}
+        for accion in sorted(set(self.latencias) | set(self.errores) | set(self.limitadas)):
+            muestras = sorted(self.latencias.get(accion, ()))
+            errores = sum(self.errores[accion].values())
+            total = max(len(muestras), errores)
+
+            def percentil(p):
+                return round(muestras[min(len(muestras) - 1, int(p * len(muestras)))] * 1000, 3) if muestras else None
+
+            acciones[accion] = {
+                "count": total,
+                "errors": errores,
+                "error_rate": round(errores / total, 4) if total else 0.0,
+                "throttled": self.limitadas[accion],
+                "throughput": round(len(muestras) / duracion, 2) if duracion else 0.0,
+                "p50_ms": percentil(0.50),
+                "p95_ms": percentil(0.95),
+                "p99_ms": percentil(0.99),
+                "max_ms": round(muestras[-1] * 1000, 3) if muestras else None,
+                "error_types": dict(self.errores[accion]),
+            }
+        return acciones
+
+
+class ClienteSimulado:
+    """Un cliente WebSocket: respuestas en orden de petición, mensajes del servidor en una cola"""
+
+    def __init__(self, url, metricas, encoding, compact):
+        self.url = url
+        self.metricas = metricas
+        self.encoding = encoding
+        self.compact = compact
+        self.websocket = None
+        self.lector = None
+        self.pendientes = deque()
+        self.eventos = asyncio.Queue()
+        self.bienvenida = None
+        # Estado del protocolo compacto
+        self.estados = {}
+        self.cartas = {}
+
+    async def conectar(self):
+        inicio = time.perf_counter()
+        try:
+            self.websocket = await websockets.connect(
+                self.url, compression="deflate", max_size=None, open_timeout=TIEMPO_ESPERA
+            )
+            self.bienvenida = self._decodificar(await asyncio.wait_for(self.websocket.recv(), TIEMPO_ESPERA))
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+            self.metricas.fallo("connect", type(e).__name__)
+            await self.cerrar()
+            return False
+        self.metricas.registrar("connect", time.perf_counter() - inicio)
+        self.metricas.conexion(1)
+        self.lector = asyncio.create_task(self._leer())
+
+        if self.encoding != ENCODING_JSON or self.compact:
+            respuesta = await self.peticion("set_protocol", encoding=self.encoding, compact=self.compact)
+            if not respuesta or not respuesta.get("success"):
+                await self.cerrar()
+                return False
+        return True
+
+    @property
+    def conectado(self):
+        return self.lector is not None and not self.lector.done()
+
+    async def cerrar(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+            self.websocket = None
+            if self.lector is not None:
+                await asyncio.gather(self.lector, return_exceptions=True)
+                self.lector = None
+                self.metricas.conexion(-1)
+        for futuro in self.pendientes:
+            if not futuro.done():
+                futuro.set_result(None)
+        self.pendientes.clear()
+
+    def _decodificar(self, payload):
+        if isinstance(payload, bytes):
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        return json.loads(payload)
+
+    def _codificar(self, mensaje):
+        if self.encoding == ENCODING_MSGPACK:
+            return msgpack.packb(mensaje, use_bin_type=True)
+        return json.dumps(mensaje)
+
+    async def _leer(self):
+        try:
+            async for payload in self.websocket:
+                mensaje = self._decodificar(payload)
+                if isinstance(mensaje, list):
+                    await self._marco_compacto(mensaje)
+                elif "type" in mensaje:
+                    self.eventos.put_nowait(mensaje)
+                elif self.pendientes:
+                    futuro = self.pendientes.popleft()
+                    if not futuro.done():
+                        futuro.set_result(mensaje)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            self.metricas.fallo("protocol", type(e).__name__)
+        finally:
+            for futuro in self.pendientes:
+                if not futuro.done():
+                    futuro.set_result(None)
+            self.eventos.put_nowait({"type": "closed"})
+
+    async def _marco_compacto(self, marco):
+        """Reconstruir el estado completo a partir de un marco compacto y confirmarlo"""
+        codigo, room_id, version, base, estado, resultado, nuevas = marco
+        for indice, carta in nuevas or ():
+            self.cartas[indice] = carta
+        if base != -1:
+            estado = apply_delta(self.estados[base], estado)
+        # El servidor calcula el delta respecto a la última versión confirmada, que puede no ser la más reciente
+        self.estados[version] = estado
+        for antigua in [v for v in self.estados if v < version - MAX_SNAPSHOTS]:
+            del self.estados[antigua]
+        await self.enviar({"action": "ack", "version": version})
+
+        estado = dict(estado, available_actions=[NOMBRES_ACCION_COMBATE.get(a) for a in estado.get("available_actions", ())])
+        jugador = estado.get("player")
+        if jugador and "hand" in jugador:
+            estado["player"] = dict(jugador, hand=[
+                {"instance_id": instancia, "card": self.cartas[indice]} for instancia, indice in jugador["hand"]
+            ])
+        self.eventos.put_nowait({
+            "type": NOMBRES_MENSAJE.get(codigo, "unknown"), "room_id": room_id, "version": version, "state": estado
+        })
+
+    async def enviar(self, mensaje):
+        try:
+            await self.websocket.send(self._codificar(mensaje))
+        except (AttributeError, websockets.exceptions.ConnectionClosed):
+            pass
+
+    async def peticion(self, accion, **campos):
+        """Enviar una acción y esperar su respuesta (el servidor responde en orden)"""
+        if not self.conectado:
+            self.metricas.fallo(accion, "disconnected")
+            return None
+        futuro = asyncio.get_running_loop().create_future()
+        self.pendientes.append(futuro)
+        inicio = time.perf_counter()
+        await self.enviar(dict(campos, action=accion))
+        try:
+            respuesta = await asyncio.wait_for(futuro, TIEMPO_ESPERA)
+        except asyncio.TimeoutError:
+            self.metricas.fallo(accion, "timeout")
+            return None
+        if respuesta is None:
+            self.metricas.fallo(accion, "disconnected")
+            return None
+        error = None if respuesta.get("success", True) else respuesta.get("error", "failed")
+        if error == "rate_limited":
+            # Respetar el límite del servidor antes de la siguiente petición
+            self.metricas.limitada(accion)
+            await asyncio.sleep(respuesta.get("retry_after", 1.0))
+            return respuesta
+        self.metricas.registrar(accion, time.perf_counter() - inicio, error)
+        return respuesta
+
+    async def evento(self, tipos, limite=TIEMPO_ESPERA):
+        """Esperar el siguiente mensaje del servidor de uno de los tipos indicados"""
+        fin = time.monotonic() + limite
+        while True:
+            restante = fin - time.monotonic()
+            if restante <= 0:
+                return None
+            try:
+                mensaje = await asyncio.wait_for(self.eventos.get(), restante)
+            except asyncio.TimeoutError:
+                return None
+            if mensaje["type"] in tipos or mensaje["type"] == "closed":
+                return mensaje
+
+
+class Simulacion:
+    """Ejecuta los escenarios hasta que se acaba el tiempo"""
+
+    def __init__(self, args):
+        self.args = args
+        self.metricas = Metricas()
+        self.prefijo = "lg" + uuid.uuid4().hex[:6]
+        self.fin = 0.0
+        self.partidas = Counter()
+
+    def cliente(self):
+        return ClienteSimulado(self.args.url, self.metricas, self.args.encoding, self.args.compact)
+
+    def activo(self):
+        return time.monotonic() < self.fin
+
+    async def connect_storm(self, indice):
+        while self.activo():
+            cliente = self.cliente()
+            if await cliente.conectar():
+                await cliente.peticion("ping")
+            await cliente.cerrar()
+
+    async def registrar_y_entrar(self, cliente, indice):
+        usuario = f"{self.prefijo}_{indice}"
+        await cliente.peticion("register", username=usuario, password=CONTRASENA, confirm_password=CONTRASENA)
+        respuesta = await cliente.peticion("login", username=usuario, password=CONTRASENA)
+        return bool(respuesta and respuesta.get("success"))
+
+    async def auth_churn(self, indice):
+        cliente = self.cliente()
+        if not await cliente.conectar():
+            return
+        usuario = f"{self.prefijo}_{indice}"
+        await cliente.peticion("register", username=usuario, password=CONTRASENA, confirm_password=CONTRASENA)
+        while self.activo() and cliente.conectado:
+            respuesta = await cliente.peticion("login", username=usuario, password=CONTRASENA)
+            if respuesta and respuesta.get("success"):
+                await cliente.peticion("get_user_info", token=respuesta["token"])
+                await cliente.peticion("logout")
+        await cliente.cerrar()
+
+    async def idle(self, indice):
+        cliente = self.cliente()
+        if not await cliente.conectar():
+            return
+        # Repartir los pings para no sincronizar a todos los clientes
+        await asyncio.sleep(random.uniform(0, self.args.interval))
+        while self.activo() and cliente.conectado:
+            await cliente.peticion("ping")
+            await asyncio.sleep(self.args.interval)
+        await cliente.cerrar()
+
+    async def battle(self, indice):
+        cliente = self.cliente()
+        if not await cliente.conectar():
+            return
+        if not await self.registrar_y_entrar(cliente, indice):
+            await cliente.cerrar()
+            return
+
+        while self.activo() and cliente.conectado:
+            inicio = time.perf_counter()
+            respuesta = await cliente.peticion("join_queue")
+            if not respuesta or not respuesta.get("success"):
+                break
+            mensaje = await cliente.evento(("battle_start",), limite=TIEMPO_ESPERA * 2)
+            if mensaje is None or mensaje["type"] == "closed":
+                self.metricas.fallo("match_wait", "timeout" if mensaje is None else "disconnected")
+                await cliente.peticion("leave_queue")
+                continue
+            self.metricas.registrar("match_wait", time.perf_counter() - inicio)
+            resultado = await self.jugar(cliente, mensaje["state"])
+            self.partidas[resultado] += 1
+        await cliente.cerrar()
+
+    async def jugar(self, cliente, estado):
+        """Jugar una partida con una política sencilla hasta "battle_end" """
+        pasos = []
+        turno = None
+        while True:
+            if estado.get("is_battle_over"):
+                await cliente.evento(("battle_end",), limite=5)
+                return "finished"
+
+            if estado.get("can_make_action"):
+                if estado["turn"] != turno:
+                    turno = estado["turn"]
+                    pasos = self.pasos_turno(estado)
+                accion = pasos.pop(0) if pasos else {"action_type": "end_turn"}
+                inicio = time.perf_counter()
+                respuesta = await cliente.peticion("battle_action", **accion)
+                if respuesta and respuesta.get("error") == "rate_limited":
+                    pasos.insert(0, accion)
+                    continue
+                if not respuesta or not respuesta.get("success"):
+                    return "error"
+            else:
+                inicio = None
+
+            mensaje = await cliente.evento(("battle_update", "battle_end"), limite=TIEMPO_ESPERA * 3)
+            if mensaje is None or mensaje["type"] == "closed":
+                self.metricas.fallo("battle_update", "timeout" if mensaje is None else "disconnected")
+                return "error"
+            if inicio is not None:
+                # Tiempo desde el envío de la acción hasta recibir el nuevo estado
+                self.metricas.registrar("battle_update", time.perf_counter() - inicio)
+            if mensaje["type"] == "battle_end":
+                return "finished"
+            estado = mensaje["state"]
+
+    def pasos_turno(self, estado):
+        pasos = [{"action_type": "draw_card"}, {"action_type": "gain_energy"}]
+        jugador = estado["player"]
+        pokemon = [entrada for entrada in jugador.get("hand", ()) if entrada["card"].get("hp")]
+        if pokemon and len(jugador.get("bench_pokemon", ())) < 3:
+            pasos.append({"action_type": "play_pokemon", "source_id": random.choice(pokemon)["instance_id"]})
+        pasos += [
+            {"action_type": "attack", "parameters": {"attack_index": 0}},
+            {"action_type": "end_turn"},
+            {"action_type": "end_turn"},
+        ]
+        return pasos
+
+    async def estado_servidor(self):
+        """Versión (del mensaje de bienvenida) y estado del servidor al terminar"""
+        cliente = self.cliente()
+        if not await cliente.conectar():
+            return None, None
+        respuesta = await cliente.peticion("get_server_status")
+        await cliente.cerrar()
+        return cliente.bienvenida.get("server_version"), respuesta.get("server_status") if respuesta else None
+
+    async def ejecutar(self):
+        args = self.args
+        escenarios = ESCENARIOS if args.scenario == "mixed" else (args.scenario,)
+        tareas = []
+        inicio = time.monotonic()
+        self.fin = inicio + args.ramp + args.duration
+
+        for indice in range(args.clients):
+            # Rampa: repartir el arranque de los clientes en --ramp segundos
+            retardo = args.ramp * indice / max(1, args.clients)
+            escenario = getattr(self, escenarios[indice % len(escenarios)])
+            tareas.append(asyncio.create_task(self._arrancar(escenario, indice, retardo)))
+
+        await asyncio.gather(*tareas)
+        duracion = time.monotonic() - inicio
+        version, estado = await self.estado_servidor()
+        return self.informe(duracion, version, estado)
+
+    async def _arrancar(self, escenario, indice, retardo):
+        await asyncio.sleep(retardo)
+        try:
+            await escenario(indice)
+        except Exception as e:
+            self.metricas.fallo("client", type(e).__name__)
+
+    def informe(self, duracion, version, estado):
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "server_version": version,
+            "config": {
+                "url": self.args.url,
+                "scenario": self.args.scenario,
+                "clients": self.args.clients,
+                "duration": self.args.duration,
+                "ramp": self.args.ramp,
+                "encoding": self.args.encoding,
+                "compact": self.args.compact,
+                "workers": self.args.workers if self.args.spawn_server else None,
+            },
+            "elapsed": round(duracion, 3),
+            "max_connections": self.metricas.max_conexiones,
+            "games": dict(self.partidas),
+            "actions": self.metricas.resumen(duracion),
+            "server_status": estado,
+        }
+
+
+def esperar_puerto(host, puerto, limite=30.0):
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        try:
+            with socket.create_connection((host, puerto), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def iniciar_servidor(trabajadores=1):
+    """Iniciar server.py (con --workers procesos) en un subproceso y esperar a que acepte conexiones"""
+    proceso = subprocess.Popen(
+        [sys.executable, "server.py", "--workers", str(trabajadores)], cwd=DIRECTORIO_SERVIDOR,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    if not esperar_puerto("127.0.0.1", 8765):
+        proceso.kill()
+        print("❌ El servidor local no arrancó")
+        sys.exit(1)
+    return proceso
+
+
+def imprimir_informe(informe):
+    config = informe["config"]
+    print("=" * 92)
+    print(f"📊 Escenario: {config['scenario']}  clientes: {config['clients']}  "
+          f"duración: {informe['elapsed']}s  conexiones máx: {informe['max_connections']}")
+    if informe["games"]:
+        print(f"   Partidas: {informe['games']}")
+    print(f"   {'acción':18s} {'n':>8s} {'ops/s':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'máx ms':>9s} {'error %':>8s} {'limit.':>7s}")
+
+    def celda(valor):
+        return f"{valor:9.2f}" if valor is not None else f"{'-':>9s}"
+
+    for accion, datos in informe["actions"].items():
+        print(f"   {accion:18s} {datos['count']:8d} {datos['throughput']:9.1f} {celda(datos['p50_ms'])} "
+              f"{celda(datos['p95_ms'])} {celda(datos['p99_ms'])} {celda(datos['max_ms'])} "
+              f"{datos['error_rate'] * 100:7.2f}% {datos.get('throttled', 0):7d}")
+        if datos["error_types"]:
+            print(f"   {'':18s} errores: {datos['error_types']}")
+
+
+def comparar(ruta_base, ruta_nueva):
+    """Mostrar la diferencia por acción entre dos resultados JSON"""
+    with open(ruta_base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(ruta_nueva, encoding="utf-8") as f:
+        nueva = json.load(f)
+
+    print(f"🔍 {ruta_base} → {ruta_nueva}")
+    print(f"   {'acción':18s} {'métrica':10s} {'base':>10s} {'nueva':>10s} {'cambio':>9s}")
+    for accion in sorted(set(base["actions"]) | set(nueva["actions"])):
+        antes = base["actions"].get(accion, {})
+        despues = nueva["actions"].get(accion, {})
+        for metrica in ("throughput", "p50_ms", "p95_ms", "p99_ms", "error_rate", "throttled"):
+            a, d = antes.get(metrica), despues.get(metrica)
+            if a is None and d is None:
+                continue
+            cambio = f"{(d - a) / a * 100:+8.1f}%" if a and d is not None else f"{'-':>9s}"
+            print(f"   {accion:18s} {metrica:10s} {a if a is not None else '-':>10} {d if d is not None else '-':>10} {cambio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor WebSocket")
+    parser.add_argument("--url", default="ws://127.0.0.1:8765", help="URL del servidor")
+    parser.add_argument("--scenario", choices=ESCENARIOS + ("mixed",), default="connect_storm")
+    parser.add_argument("--clients", type=int, default=100, help="Clientes simulados")
+    parser.add_argument("--duration", type=float, default=30, help="Duración tras la rampa (s)")
+    parser.add_argument("--ramp", type=float, default=5, help="Tiempo de arranque de los clientes (s)")
+    parser.add_argument("--interval", type=float, default=10, help="Intervalo de ping del escenario idle (s)")
+    parser.add_argument("--encoding", choices=(ENCODING_JSON, ENCODING_MSGPACK), default=ENCODING_JSON)
+    parser.add_argument("--compact", action="store_true", help="Usar los marcos compactos de combate")
+    parser.add_argument("--spawn-server", action="store_true", help="Iniciar server.py localmente")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos del servidor iniciado con --spawn-server")
+    parser.add_argument("--output", help="Guardar el resultado en JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NUEVO"), help="Comparar dos resultados JSON")
+    args = parser.parse_args()
+
+    if args.compare:
+        comparar(*args.compare)
+        return
+    if args.encoding == ENCODING_MSGPACK and not MSGPACK_AVAILABLE:
+        parser.error("msgpack no está instalado")
+
+    # Cada cliente usa un descriptor de archivo
+    limite, maximo = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if limite < args.clients + 100:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(maximo, args.clients + 1024), maximo))
+        except (ValueError, OSError):
+            print(f"⚠️ Límite de descriptores ({limite}) menor que el número de clientes")
+
+    servidor = iniciar_servidor(args.workers) if args.spawn_server else None
+    try:
+        informe = asyncio.run(Simulacion(args).ejecutar())
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait(timeout=30)
+
+    imprimir_informe(informe)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultado guardado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulación de la cola de emparejamiento
+Encola ráfagas de jugadores con estadísticas aleatorias, ejecuta el tick con tiempo simulado
+y muestra el coste por tick y los tiempos de espera.
+
+Uso (desde la raíz del proyecto):
+    python pokemon-tcg-project-server/test/matchmaking_benchmark.py
+    python pokemon-tcg-project-server/test/matchmaking_benchmark.py --players 50000 --burst 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+DIRECTORIO_SERVIDOR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server")
+sys.path.insert(0, DIRECTORIO_SERVIDOR)
+
+from game.core.battle.matchmaking import MatchmakingQueue, rating_from_stats, TICK_INTERVAL
+
+
+def estadisticas_aleatorias(rng):
+    """Victorias/derrotas de un jugador simulado (habilidad con distribución normal)"""
+    partidas = rng.randint(0, 300)
+    habilidad = min(0.95, max(0.05, rng.gauss(0.5, 0.12)))
+    victorias = sum(1 for _ in range(partidas) if rng.random() < habilidad)
+    return victorias, partidas - victorias
+
+
+def simular(jugadores, rafaga, cancelaciones, segundos, semilla):
+    rng = random.Random(semilla)
+    cola = MatchmakingQueue()
+    ratings = [rating_from_stats(*estadisticas_aleatorias(rng)) for _ in range(jugadores)]
+
+    ahora = 0.0
+    siguiente = 0
+    ticks_ms = []
+    encolar_ms = 0.0
+    diferencias = []
+
+    while ahora < segundos and (siguiente < jugadores or len(cola)):
+        # Ráfaga: en el primer segundo llega `rafaga` jugadores, luego un goteo constante
+        llegadas = rafaga if ahora == 0 else max(1, (jugadores - rafaga) // max(1, int(segundos / 2)))
+        inicio = time.perf_counter()
+        for _ in range(min(llegadas, jugadores - siguiente)):
+            cola.enqueue(siguiente, ratings[siguiente], now=ahora)
+            siguiente += 1
+        encolar_ms += (time.perf_counter() - inicio) * 1000
+
+        # Algunos jugadores abandonan la cola
+        for _ in range(int(len(cola) * cancelaciones)):
+            cola.dequeue(rng.randrange(max(1, siguiente)))
+
+        inicio = time.perf_counter()
+        parejas = cola.tick(now=ahora)
+        ticks_ms.append((time.perf_counter() - inicio) * 1000)
+        diferencias.extend(abs(a.rating - b.rating) for a, b in parejas)
+        ahora += TICK_INTERVAL
+
+    return cola, ticks_ms, encolar_ms, diferencias, ahora
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación de la cola de emparejamiento")
+    parser.add_argument("--players", type=int, default=30000, help="Jugadores totales")
+    parser.add_argument("--burst", type=int, default=20000, help="Jugadores que llegan en el primer tick")
+    parser.add_argument("--cancel", type=float, default=0.01, help="Fracción de la cola que abandona por tick")
+    parser.add_argument("--seconds", type=float, default=120, help="Tiempo simulado (s)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cola, ticks_ms, encolar_ms, diferencias, duracion = simular(
+        args.players, args.burst, args.cancel, args.seconds, args.seed
+    )
+    stats = cola.get_stats(now=duracion)
+    diferencias.sort()
+
+    print("🎯 Simulación de emparejamiento")
+    print(f"   Jugadores: {args.players}  (ráfaga inicial: {args.burst})")
+    print(f"   Tiempo simulado: {duracion:.0f}s, ticks: {len(ticks_ms)}")
+    print(f"   Encolar: {encolar_ms / max(1, stats['total_enqueued']) * 1000:.2f} µs/jugador")
+    print(f"   Tick: máx {max(ticks_ms):.2f} ms, medio {sum(ticks_ms) / len(ticks_ms):.2f} ms")
+    print(f"   Parejas: {stats['matches_formed']}, en cola: {stats['queued']}, abandonos: {stats['total_cancelled']}")
+    print(f"   Espera: media {stats['wait_avg']}s, p50 {stats['wait_p50']}s, "
+          f"p95 {stats['wait_p95']}s, máx {stats['wait_max']}s")
+    if diferencias:
+        print(f"   Diferencia de puntuación: p50 {diferencias[len(diferencias) // 2]}, "
+              f"p95 {diferencias[int(len(diferencias) * 0.95)]}, máx {diferencias[-1]}")
+
+
+if __name__ == "__main__":
+    main()
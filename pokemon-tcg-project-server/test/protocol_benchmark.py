@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Comparación de protocolos de red en una partida simulada
+Juega partidas completas en una sala de combate con conexiones falsas y mide, para cada protocolo,
+los bytes enviados por turno (sin comprimir y con deflate como permessage-deflate) y el coste de codificación.
+
+Uso (desde la raíz del proyecto):
+    python pokemon-tcg-project-server/test/protocol_benchmark.py
+    python pokemon-tcg-project-server/test/protocol_benchmark.py --games 20
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import zlib
+
+DIRECTORIO_SERVIDOR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server")
+sys.path.insert(0, DIRECTORIO_SERVIDOR)
+
+from game.core.battle.battle_room import BattleRoomManager
+from game.core.network.wire_protocol import (
+    WireSession, MSGPACK_AVAILABLE, ENCODING_JSON, ENCODING_MSGPACK, apply_delta
+)
+
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+
+class SocketFalso:
+    """Registra los marcos enviados y su tamaño con deflate (contexto compartido, como permessage-deflate)"""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self):
+        self.marcos = []
+        self.bytes_deflate = 0
+        self._deflate = zlib.compressobj(6, zlib.DEFLATED, -12, 5)
+
+    async def send(self, payload):
+        datos = payload if isinstance(payload, bytes) else payload.encode("utf-8")
+        self.marcos.append(payload)
+        self.bytes_deflate += len(self._deflate.compress(datos) + self._deflate.flush(zlib.Z_SYNC_FLUSH)) - 4
+
+
+class ClienteCompacto:
+    """Reconstruye el estado a partir de los marcos compactos y confirma cada versión"""
+
+    def __init__(self, sesion):
+        self.sesion = sesion
+        self.estados = {}
+        self.cartas = {}
+
+    def procesar(self, payload):
+        if isinstance(payload, bytes):
+            marco = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        else:
+            marco = json.loads(payload)
+        _, _, version, base, estado, _, nuevas = marco
+        for indice, carta in nuevas or ():
+            self.cartas[indice] = carta
+        self.estados[version] = estado if base == -1 else apply_delta(self.estados[base], estado)
+        self.sesion.ack(version)
+        return self.estados[version]
+
+
+PROTOCOLOS = [
+    ("json (legado)", ENCODING_JSON, False),
+    ("json compacto", ENCODING_JSON, True),
+]
+if MSGPACK_AVAILABLE:
+    PROTOCOLOS.append(("msgpack compacto", ENCODING_MSGPACK, True))
+
+
+async def esperar(sala, version):
+    while sala.version < version and sala.is_running:
+        await asyncio.sleep(0)
+
+
+async def jugar(gestor, encoding, compact, rng):
+    sockets = [SocketFalso(), SocketFalso()]
+    sesiones = [WireSession(s) for s in sockets]
+    for sesion in sesiones:
+        sesion.negotiate(encoding, compact)
+    clientes = [ClienteCompacto(s) for s in sesiones]
+
+    sala, _ = gestor.create_room(1, sesiones[0])
+    gestor.join_room(sala.room_id, 2, sesiones[1])
+    await asyncio.sleep(0)
+
+    leidos = [0, 0]
+    turnos = 0
+    while sala.is_running and turnos < 40:
+        jugador = sala.battle_state.current_turn_player
+        estado = sala.get_state_for(jugador)
+        acciones = [("draw_card", {}), ("gain_energy", {})]
+        mano = [c for c in estado["player"]["hand"] if c["card"].get("hp")]
+        if mano and len(estado["player"]["bench_pokemon"]) < 3:
+            acciones.append(("play_pokemon", {"source_id": rng.choice(mano)["instance_id"]}))
+        acciones += [("attack", {"parameters": {"attack_index": 0}}), ("end_turn", {}), ("end_turn", {})]
+
+        for tipo, extra in acciones:
+            if not sala.is_running:
+                break
+            version = sala.version + 1
+            sala.submit(jugador, dict(extra, action_type=tipo))
+            await esperar(sala, version)
+            # Los clientes confirman cada versión recibida
+            for i, cliente in enumerate(clientes):
+                for payload in sockets[i].marcos[leidos[i]:]:
+                    if compact:
+                        cliente.procesar(payload)
+                leidos[i] = len(sockets[i].marcos)
+        turnos += 1
+
+    if sala.is_running:
+        gestor.leave(1)
+    await sala.task
+    return sockets, sesiones, turnos
+
+
+async def principal(partidas, semilla):
+    class BDFalsa:
+        def create_battle_record(self, *args):
+            return True, 0
+
+        def update_battle_result(self, *args):
+            return True
+
+        def get_user_stats(self, user_id):
+            return None
+
+    gestor = BattleRoomManager(BDFalsa(), os.path.join(DIRECTORIO_SERVIDOR, "card_assets", "cards.json"))
+    print("📡 Comparación de protocolos")
+    for nombre, encoding, compact in PROTOCOLOS:
+        rng = random.Random(semilla)
+        random.seed(semilla)
+        total_bytes = total_deflate = total_marcos = total_turnos = 0
+        segundos = 0.0
+        for _ in range(partidas):
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                sockets, sesiones, turnos = await jugar(gestor, encoding, compact, rng)
+            total_turnos += turnos
+            for sesion, socket in zip(sesiones, sockets):
+                total_bytes += sesion.bytes_sent
+                total_deflate += socket.bytes_deflate
+                total_marcos += sesion.messages_sent
+                segundos += sesion.encode_seconds
+        print(f"   {nombre:18s} bytes/turno {total_bytes / total_turnos:8.0f}  "
+              f"deflate/turno {total_deflate / total_turnos:7.0f}  "
+              f"codificación {segundos / total_marcos * 1e6:6.1f} µs/marco  ({total_marcos} marcos)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparación de protocolos de red")
+    parser.add_argument("--games", type=int, default=10, help="Partidas por protocolo")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(principal(args.games, args.seed))
+
+
+if __name__ == "__main__":
+    main()
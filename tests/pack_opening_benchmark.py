@@ -0,0 +1,121 @@
+"""
+开包动画帧时间基准
+以固定时间步长驱动 PackOpeningWindow 走完 选择 → 开包 → 展示 → 完成 流程，
+统计每个动画阶段 update() 与 draw() 的耗时（不含帧率等待）以及粒子数峰值。
+
+用法（在项目根目录）：
+    python tests/pack_opening_benchmark.py
+    python tests/pack_opening_benchmark.py --quality legendary --selection-seconds 10
+    python tests/pack_opening_benchmark.py --rarity "Rare Secret"   # 稀有卡揭示时的粒子爆发
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+import pygame
+
+FRAME_DT = 1 / 60
+
+
+class _FakeGameManager:
+    """只提供开包流程所需接口，避免依赖数据库"""
+
+    def __init__(self, rarity: str = "Rare"):
+        self.rarity = rarity
+
+    def open_pack_complete_flow(self, pack_type):
+        cards = [{"id": f"bench-{i}", "name": f"Card {i}", "rarity": self.rarity, "image": ""}
+                 for i in range(5)]
+        return {"success": True, "cards": cards}
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+    return values[index]
+
+
+def run(quality_index: int, selection_seconds: float, rarity: str = "Rare", completed_frames: int = 30):
+    """
+    驱动开包窗口并按阶段收集耗时
+
+    Returns:
+        (draw耗时, update耗时, 粒子数峰值): 耗时为 {阶段名: 每帧耗时ms}
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+
+    from game.scenes.windows.package.pack_opening_window import PackOpeningWindow, AnimationState
+
+    window = PackOpeningWindow(1280, 720, _FakeGameManager(rarity))
+    window.show()
+    window.selected_pack_index = quality_index
+    window.current_pack_quality = window.available_packs[quality_index]
+
+    timings = {}
+    update_timings = {}
+    peak_particles = 0
+    selection_frames = int(selection_seconds / FRAME_DT)
+    frame = 0
+    started = False
+
+    while len(timings.get(AnimationState.COMPLETED.name, ())) < completed_frames:
+        if not started and frame >= selection_frames:
+            window.start_pack_opening()
+            started = True
+
+        start = time.perf_counter()
+        window.update(FRAME_DT)
+        update_timings.setdefault(window.animation_state.name, []).append((time.perf_counter() - start) * 1000)
+        peak_particles = max(peak_particles, window.particles.count)
+        screen.fill((20, 20, 30))
+
+        start = time.perf_counter()
+        window.draw(screen)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        timings.setdefault(window.animation_state.name, []).append(elapsed)
+        frame += 1
+
+    window.cleanup()
+    pygame.quit()
+    return timings, update_timings, peak_particles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="开包动画帧时间基准")
+    parser.add_argument("--quality", choices=["basic", "premium", "legendary"], default="legendary")
+    parser.add_argument("--selection-seconds", type=float, default=5.0, help="选择阶段持续时间")
+    parser.add_argument("--rarity", default="Rare", help="获得卡牌的稀有度（决定粒子发射器）")
+    parser.add_argument("--completed-frames", type=int, default=30, help="完成阶段统计的帧数")
+    args = parser.parse_args()
+
+    quality_index = ["basic", "premium", "legendary"].index(args.quality)
+    timings, update_timings, peak_particles = run(quality_index, args.selection_seconds,
+                                                  args.rarity, args.completed_frames)
+
+    print(f"🎴 开包动画 draw() 耗时（{args.quality}，{args.rarity}，1280x720）:")
+    all_values = []
+    for state, values in timings.items():
+        all_values.extend(values)
+        updates = update_timings.get(state, [0.0])
+        print(f"  {state:<10} 帧数 {len(values):>4}  中位数 {statistics.median(values):6.2f} ms  "
+              f"p95 {_percentile(values, 95):6.2f} ms  最大 {max(values):6.2f} ms  "
+              f"update p95 {_percentile(updates, 95):5.2f} ms")
+    print(f"  {'ALL':<10} 帧数 {len(all_values):>4}  中位数 {statistics.median(all_values):6.2f} ms  "
+          f"p95 {_percentile(all_values, 95):6.2f} ms")
+    print(f"  粒子数峰值 {peak_particles}")
+
+
+if __name__ == "__main__":
+    main()
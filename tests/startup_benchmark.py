@@ -0,0 +1,122 @@
+"""
+启动性能基准
+多次冷启动 Main.py，统计首帧时间（time-to-first-frame）与进程总耗时，
+并单独测量关键模块的导入耗时。
+
+用法（在项目根目录）：
+    python tests/startup_benchmark.py            # 默认5次
+    python tests/startup_benchmark.py --runs 10 --headless
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_FRAME_PATTERN = re.compile(r"STARTUP_FIRST_FRAME_MS=([\d.]+)")
+IMPORT_PATTERN = re.compile(r"IMPORT_MS=([\d.]+)")
+
+# 需要单独测量导入耗时的模块（首屏路径 + 应当延迟导入的重模块）
+IMPORT_PROBES = [
+    "game.core.scene_manager",
+    "game.scenes.welcome_scene",
+    "game.scenes.login_scene",
+    "game.scenes.main_scene",
+    "game.scenes.dex_page",
+    "game.core.battle.battle_manager",
+    "PIL.Image",
+    "cv2",
+]
+
+
+def _child_env(headless: bool) -> dict:
+    env = dict(os.environ)
+    env["PYOKEMON_EXIT_AFTER_FIRST_FRAME"] = "1"
+    if headless:
+        env["SDL_VIDEODRIVER"] = "dummy"
+        env["SDL_AUDIODRIVER"] = "dummy"
+    return env
+
+
+def measure_first_frame(runs: int, headless: bool):
+    """
+    冷启动多次并收集首帧时间
+
+    Returns:
+        (首帧时间列表ms, 进程总耗时列表ms)
+    """
+    first_frames, wall_times = [], []
+    env = _child_env(headless)
+
+    for i in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "Main.py"],
+            cwd=PROJECT_ROOT, env=env,
+            capture_output=True, text=True, timeout=120
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        match = FIRST_FRAME_PATTERN.search(result.stdout)
+        if not match:
+            print(f"❌ 第 {i + 1} 次运行未报告首帧时间（退出码 {result.returncode}）")
+            print(result.stdout[-2000:])
+            print(result.stderr[-2000:])
+            continue
+
+        first_frames.append(float(match.group(1)))
+        wall_times.append(wall_ms)
+        print(f"  运行 {i + 1}: 首帧 {first_frames[-1]:.1f} ms, 进程 {wall_ms:.1f} ms")
+
+    return first_frames, wall_times
+
+
+def measure_import(module: str, headless: bool):
+    """在新进程中测量单个模块的导入耗时（ms），失败返回None"""
+    code = (
+        "import time, importlib; t = time.perf_counter(); "
+        f"importlib.import_module({module!r}); "
+        "print('IMPORT_MS=%.3f' % ((time.perf_counter() - t) * 1000))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT, env=_child_env(headless),
+        capture_output=True, text=True, timeout=120
+    )
+    match = IMPORT_PATTERN.search(result.stdout)
+    return float(match.group(1)) if match else None
+
+
+def _summary(values):
+    if not values:
+        return "无数据"
+    return (f"中位数 {statistics.median(values):.1f} ms, "
+            f"最小 {min(values):.1f} ms, 最大 {max(values):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动性能基准（首帧时间）")
+    parser.add_argument("--runs", type=int, default=5, help="冷启动次数")
+    parser.add_argument("--headless", action="store_true", help="使用SDL dummy驱动（无窗口）")
+    parser.add_argument("--skip-imports", action="store_true", help="跳过模块导入耗时测量")
+    args = parser.parse_args()
+
+    print(f"🚀 冷启动 {args.runs} 次...")
+    first_frames, wall_times = measure_first_frame(args.runs, args.headless)
+    print(f"⏱️ 首帧时间: {_summary(first_frames)}")
+    print(f"⏱️ 进程总耗时（含退出）: {_summary(wall_times)}")
+
+    if not args.skip_imports:
+        print("📦 模块导入耗时（独立进程）:")
+        for module in IMPORT_PROBES:
+            elapsed = measure_import(module, args.headless)
+            label = f"{elapsed:.1f} ms" if elapsed is not None else "不可用"
+            print(f"  {module:<36} {label}")
+
+
+if __name__ == "__main__":
+    main()